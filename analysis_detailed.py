@@ -62,6 +62,11 @@ def show_detailed_analysis_page():
     
     with tab_sector:
         show_sectoral_comparison_detailed(ratios, metadata.get('secteur'))
+    
+    # Comparaison avec les autres analyses de la session
+    if len(SessionManager.get_workspace()) >= 2:
+        st.markdown("---")
+        show_workspace_comparison()
 
 def show_no_analysis_error():
     """Affiche une erreur si aucune analyse n'est disponible"""
@@ -230,6 +235,18 @@ def show_analysis_overview(data, ratios, scores, metadata):
     # Graphique radar des performances
     st.subheader("📡 Radar de Performance")
     create_performance_radar(scores)
+    
+    # Évolution sur les exercices précédents (historique persistant)
+    history = SessionManager.get_company_history()
+    if history is not None and len(history) >= 2:
+        from modules.components.charts import create_trend_chart
+        
+        st.subheader("📈 Évolution Historique")
+        fig = SessionManager.get_cached_figure(
+            'detail_trend', lambda: create_trend_chart(history),
+            {'exercices': history['exercice'].tolist(), 'maj': history['date_analyse'].max()}
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
 def show_detailed_balance_sheet(data):
     """Affiche le bilan détaillé avec grandes masses en gras - CORRIGÉ"""
@@ -1017,8 +1034,76 @@ def show_sectoral_comparison_detailed(ratios, secteur):
         df_comparison = pd.DataFrame(comparison_data)
         st.dataframe(df_comparison, hide_index=True, use_container_width=True)
 
+def show_workspace_comparison():
+    """Compare côte à côte les analyses de l'espace de travail (écarts à l'analyse active)"""
+    
+    st.header("🆚 Comparaison des Analyses de la Session")
+    
+    labels = SessionManager.get_workspace_labels()
+    handles = list(labels)
+    active = SessionManager.get_analysis_handle()
+    
+    selected = st.selectbox(
+        "Analyse de référence",
+        handles,
+        index=handles.index(active) if active in handles else len(handles) - 1,
+        format_func=lambda handle: labels[handle],
+        key=f"workspace_reference_{active}"
+    )
+    if selected != active:
+        SessionManager.set_active_analysis(selected)
+        st.rerun()
+    
+    comparison = SessionManager.compare_workspace()
+    valeurs = comparison['valeurs']
+    
+    indicateurs = {
+        'score_global': 'Score Global',
+        'ratio_liquidite_generale': 'Liquidité Générale',
+        'ratio_autonomie_financiere': 'Autonomie Financière (%)',
+        'ratio_endettement': 'Endettement (%)',
+        'roe': 'ROE (%)',
+        'marge_nette': 'Marge Nette (%)',
+        'delai_recouvrement_clients': 'Délai Clients (j)'
+    }
+    colonnes = [col for col in indicateurs if col in valeurs.columns]
+    
+    st.subheader("📋 Indicateurs Clés")
+    st.dataframe(
+        valeurs[colonnes].rename(columns=indicateurs).T.style.format("{:.2f}", na_rep="-"),
+        use_container_width=True
+    )
+    
+    st.subheader(f"📐 Écarts par rapport à {comparison['reference']}")
+    st.dataframe(
+        comparison['ecarts_pct'][colonnes].rename(columns=indicateurs).T.style.format("{:+.1f}%", na_rep="-"),
+        use_container_width=True
+    )
+    
+    categories = [col for col in ['score_liquidite', 'score_solvabilite', 'score_rentabilite',
+                                  'score_activite', 'score_gestion'] if col in valeurs.columns]
+    if categories:
+        def build_scores_chart():
+            fig = go.Figure([
+                go.Bar(name=label, x=[col.replace('score_', '').capitalize() for col in categories],
+                       y=valeurs.loc[label, categories].tolist())
+                for label in valeurs.index
+            ])
+            fig.update_layout(barmode='group', title="Scores par Catégorie", height=400)
+            return fig
+        
+        # La figure dépend de la composition de l'espace de travail, pas seulement de l'analyse active
+        fig = SessionManager.get_cached_figure('workspace_scores', build_scores_chart, {'analyses': handles})
+        st.plotly_chart(fig, use_container_width=True)
+
 def create_performance_radar(scores):
-    """Crée un graphique radar des performances"""
+    """Affiche le graphique radar des performances (figure mise en cache par analyse)"""
+    
+    fig = SessionManager.get_cached_figure('detail_radar_performance', lambda: build_performance_radar(scores))
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_performance_radar(scores):
+    """Construit le graphique radar des performances"""
     
     categories = ['Liquidité', 'Solvabilité', 'Rentabilité', 'Activité', 'Gestion']
     values = [
@@ -1063,13 +1148,19 @@ def create_performance_radar(scores):
         height=500
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def create_waterfall_chart(data):
-    """Crée un graphique waterfall des soldes intermédiaires"""
+    """Affiche le graphique waterfall des soldes intermédiaires (figure mise en cache par analyse)"""
     
     st.subheader("📊 Formation du Résultat Net")
     
+    fig = SessionManager.get_cached_figure('detail_waterfall_resultat', lambda: build_waterfall_chart(data))
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_waterfall_chart(data):
+    """Construit le graphique waterfall des soldes intermédiaires"""
+    
     # Calculs des soldes
     ca = data.get('chiffre_affaires', 0)
     charges_variables = (data.get('achats_marchandises', 0) + 
@@ -1101,7 +1192,7 @@ def create_waterfall_chart(data):
         yaxis_title="Montant (FCFA)"
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def get_ratio_status(value, threshold, higher_is_better=True):
     """Retourne le statut d'un ratio avec icône"""
@@ -29,6 +29,20 @@ except ImportError as e:
     st.error("Assurez-vous que session_manager.py est présent dans le répertoire racine.")
     st.stop()
 
+from modules.pages.registry import PageRegistry
+
+# Registre des pages : chaque module (et plotly, reportlab, pandas...) n'est importé qu'à la
+# première visite de la page ; les points d'entrée sont essayés dans l'ordre (replis)
+APP_PAGES = PageRegistry()
+APP_PAGES.register('unified_input', 'unified_input_page:show_unified_input_page')
+APP_PAGES.register('analysis',
+                   'analysis_detailed:show_detailed_analysis_page',
+                   'modules.pages.analysis:show_analysis_page',
+                   'analysis_fallback:show_fallback_analysis_page')
+APP_PAGES.register('reports', 'modules.pages.reports:show_reports_page')
+APP_PAGES.register('excel_import', 'modules.pages.excel_import:show_excel_import_page')
+APP_PAGES.register('manual_input', 'modules.pages.manual_input:show_manual_input_page')
+
 def main():
     """Fonction principale de l'application"""
     
@@ -466,12 +480,97 @@ def show_diagnostic_mode():
     else:
         st.warning("❌ Aucune analyse disponible - Le bouton devrait être inactif")
     
+    # Normes en vigueur
+    st.subheader("📐 Normes Chargées")
+
+    try:
+        from modules.core.norms import get_norms_registry
+        st.json(get_norms_registry().cache_info())
+    except Exception as e:
+        st.write(f"**Registre des normes indisponible:** {e}")
+
+    st.subheader("🧠 Mémoire de la Session")
+
+    try:
+        memory = SessionManager.get_memory_report()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Occupation", f"{memory['total_mo']:.2f} Mo", f"{memory['utilisation_pct']}% du budget")
+        col2.metric("Budget", f"{memory['budget_mo']:.0f} Mo")
+        col3.metric("Évictions", memory['evictions'], f"{memory['evince_mo']:.2f} Mo libérés")
+        st.dataframe(memory['detail'], use_container_width=True)
+    except Exception as e:
+        st.write(f"**Comptabilité mémoire indisponible:** {e}")
+
+    st.subheader("🗄️ Stockage des Analyses")
+
+    try:
+        from modules.core.analysis_store import get_analysis_store
+        st.json(get_analysis_store().cache_info())
+    except Exception as e:
+        st.write(f"**Stockage des analyses indisponible:** {e}")
+
+    st.subheader("♻️ Déduplication des Imports")
+
+    try:
+        from modules.core.dedup_index import get_dedup_index
+        st.json(get_dedup_index().cache_info())
+    except Exception as e:
+        st.write(f"**Index de déduplication indisponible:** {e}")
+
+    st.subheader("⚙️ Analyses en Arrière-Plan")
+
+    try:
+        from modules.core.analysis_worker import get_analysis_workers
+        st.json(get_analysis_workers().cache_info())
+    except Exception as e:
+        st.write(f"**Pool d'analyses indisponible:** {e}")
+
+    st.subheader("🖼️ Cache des Figures")
+
+    try:
+        from modules.components.figure_cache import get_figure_cache
+        st.json(get_figure_cache().cache_info())
+    except Exception as e:
+        st.write(f"**Cache des figures indisponible:** {e}")
+
+    st.subheader("📄 Cache des Rapports PDF")
+
+    try:
+        from modules.core.report_cache import get_report_cache
+        st.json(get_report_cache().cache_info())
+    except Exception as e:
+        st.write(f"**Cache des rapports indisponible:** {e}")
+
+    st.subheader("📚 Historique des Analyses")
+
+    try:
+        from modules.core.history import get_analysis_history
+        st.json(get_analysis_history().cache_info())
+    except Exception as e:
+        st.write(f"**Historique indisponible:** {e}")
+
+    st.subheader("⏱️ Temps d'Import (Démarrage à Froid)")
+
+    try:
+        from modules.core.import_profile import loaded_heavy_modules, import_time_report
+        from modules.pages.registry import import_timings
+        st.write("**Bibliothèques lourdes chargées dans ce processus:**")
+        st.json(loaded_heavy_modules())
+        st.write("**Premier import des pages visitées (ms):**")
+        st.json(import_timings())
+        if st.button("⏱️ Mesurer le démarrage à froid (-X importtime)", key="diag_importtime"):
+            with st.spinner("Mesure dans un interpréteur neuf..."):
+                report = import_time_report()
+            st.json({'total_ms': report['total_ms'], 'lourds': report['lourds'], 'erreur': report['erreur']})
+            st.dataframe(report['plus_couteux'], use_container_width=True)
+    except Exception as e:
+        st.write(f"**Rapport d'import indisponible:** {e}")
+
     # Variables de session importantes
     st.subheader("📋 Variables de Session Importantes")
     
     important_vars = [
-        'current_page', 'nav_timestamp', 'analysis_results',
-        'analysis_data', 'analysis_ratios', 'analysis_scores',
+        'current_page', 'nav_timestamp', 'analysis_id',
         'diagnostic_active', 'query_params_error'
     ]
     
@@ -555,31 +654,22 @@ def display_main_content():
         
         elif current_page == 'unified_input':
             # Charger la page unifiée
-            try:
-                from unified_input_page import show_unified_input_page
+            show_unified_input_page = APP_PAGES.load('unified_input')
+            if show_unified_input_page is not None:
                 show_unified_input_page()
-            except ImportError:
+            else:
                 show_fallback_input_page()
         
         elif current_page == 'analysis':
             if has_analysis():
                 try:
-                    # CORRECTION 13: Essayer d'abord les pages avancées, puis fallback sécurisé
-                    try:
-                        from analysis_detailed import show_detailed_analysis_page
-                        show_detailed_analysis_page()
-                    except ImportError:
-                        try:
-                            from modules.pages.analysis import show_analysis_page
-                            show_analysis_page()
-                        except ImportError:
-                            # FALLBACK SÉCURISÉ : Page d'analyse simple qui fonctionne toujours
-                            try:
-                                from analysis_fallback import show_fallback_analysis_page
-                                show_fallback_analysis_page()
-                            except ImportError:
-                                # DERNIER FALLBACK : Affichage basique intégré
-                                show_basic_analysis_display()
+                    # CORRECTION 13: Pages avancées d'abord, puis fallbacks sécurisés (ordre du registre)
+                    show_analysis_page = APP_PAGES.load('analysis')
+                    if show_analysis_page is not None:
+                        show_analysis_page()
+                    else:
+                        # DERNIER FALLBACK : Affichage basique intégré
+                        show_basic_analysis_display()
                 except Exception as e:
                     st.error(f"❌ Erreur lors du chargement de l'analyse: {e}")
                     # En cas d'erreur, utiliser l'affichage basique
@@ -589,11 +679,11 @@ def display_main_content():
         
         elif current_page == 'reports':
             if has_analysis():
-                try:
-                    from modules.pages.reports import show_reports_page
+                show_reports_page = APP_PAGES.load('reports')
+                if show_reports_page is not None:
                     show_reports_page()
-                except ImportError as e:
-                    st.error(f"❌ Page Rapports non disponible: {e}")
+                else:
+                    st.error("❌ Page Rapports non disponible")
                     show_import_error_page("Rapports")
             else:
                 show_no_analysis_page("rapports")
@@ -625,10 +715,10 @@ def show_fallback_input_page():
         
         excel_key = f"fallback_excel_{nav_ts}"
         if st.button("📤 Import Excel", key=excel_key, type="primary", use_container_width=True):
-            try:
-                from modules.pages.excel_import import show_excel_import_page
+            show_excel_import_page = APP_PAGES.load('excel_import')
+            if show_excel_import_page is not None:
                 show_excel_import_page()
-            except ImportError:
+            else:
                 st.error("❌ Module excel_import non disponible")
     
     with col2:
@@ -637,10 +727,10 @@ def show_fallback_input_page():
         
         manual_key = f"fallback_manual_{nav_ts}"
         if st.button("✏️ Saisie Manuelle", key=manual_key, type="secondary", use_container_width=True):
-            try:
-                from modules.pages.manual_input import show_manual_input_page
+            show_manual_input_page = APP_PAGES.load('manual_input')
+            if show_manual_input_page is not None:
                 show_manual_input_page()
-            except ImportError:
+            else:
                 st.error("❌ Module manual_input non disponible")
 
 def show_home_page():
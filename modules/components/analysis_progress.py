@@ -0,0 +1,66 @@
+"""
+Suivi de l'analyse en arrière-plan : progression par étape et navigation à la fin
+"""
+
+import time
+
+import streamlit as st
+
+from session_manager import SessionManager
+
+# Intervalle d'interrogation de l'état de l'analyse (secondes)
+POLL_INTERVAL = 0.5
+
+
+def _navigate(page: str):
+    st.session_state['current_page'] = page
+    try:
+        st.query_params.page = page
+    except Exception as e:
+        st.session_state['query_params_error'] = str(e)
+    st.rerun()
+
+
+def _render_status(target_page: str) -> bool:
+    """Affiche l'état courant ; retourne True tant que l'analyse n'est pas terminée"""
+    status = SessionManager.poll_analysis_job()
+    if status is None:
+        return False
+
+    if status['statut'] == 'terminee':
+        if status.get('doublon_de'):
+            st.toast(f"♻️ Liasse déjà analysée : analyse existante reprise ({status['doublon_de'][:8]})")
+        st.success(f"✅ Analyse terminée en {status['duree_s']:.1f} s - "
+                   f"score global {status['scores'].get('global', 0)}/100")
+        _navigate(target_page)
+    elif status['statut'] == 'erreur':
+        # Rechargement complet : la page affiche l'erreur conservée dans 'analysis_error'
+        st.rerun()
+    else:
+        st.progress(status['progression'],
+                    text=f"🔄 {status['etape_libelle']}... ({status['duree_s']:.1f} s)")
+        return True
+    return False
+
+
+def show_analysis_progress(target_page: str = 'analysis'):
+    """
+    Affiche la progression de l'analyse soumise par la session
+
+    Seul ce bloc est réexécuté à chaque interrogation (st.fragment) : le reste de la page
+    reste utilisable pendant l'analyse. À la fin, l'application navigue vers target_page.
+    """
+    fragment = getattr(st, 'fragment', None)
+    if fragment is not None:
+        fragment(run_every=POLL_INTERVAL)(_render_status)(target_page)
+    elif _render_status(target_page):
+        # Streamlit < 1.37 : réexécution complète de la page à intervalle régulier
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
+
+
+def show_analysis_error():
+    """Affiche (une fois) l'erreur de la dernière analyse en arrière-plan"""
+    error = st.session_state.pop('analysis_error', None)
+    if error:
+        st.error(f"❌ Erreur lors de l'analyse : {error}")
@@ -217,35 +217,56 @@ def create_balance_sheet_structure(data):
     
     return fig
 
-def create_trend_chart(historical_data):
-    """Crée un graphique de tendance (pour données historiques futures)"""
-    # Placeholder pour évolution temporelle
+# Ratios affichés par défaut dans l'évolution historique
+TREND_METRICS = {
+    'roe': 'ROE (%)',
+    'ratio_liquidite_generale': 'Liquidité Générale',
+    'marge_nette': 'Marge Nette (%)',
+    'ratio_autonomie_financiere': 'Autonomie Financière (%)'
+}
+
+def create_trend_chart(historical_data, metrics=None):
+    """
+    Crée un graphique d'évolution des ratios clés sur plusieurs exercices
+
+    Args:
+        historical_data: DataFrame de l'historique (colonne 'exercice' et une colonne par ratio)
+            ou dict {période: {ratio: valeur}}
+        metrics (dict): ratio -> libellé (TREND_METRICS par défaut)
+    """
+    metrics = metrics or TREND_METRICS
     fig = go.Figure()
     
-    periods = list(historical_data.keys()) if historical_data else ['N-2', 'N-1', 'N']
+    if isinstance(historical_data, dict):
+        periods = list(historical_data.keys())
+        series = {ratio: [historical_data[period].get(ratio) for period in periods] for ratio in metrics}
+    elif historical_data is not None and len(historical_data) > 0:
+        periods = [str(exercice) for exercice in historical_data['exercice']]
+        series = {ratio: historical_data[ratio].tolist() for ratio in metrics if ratio in historical_data}
+    else:
+        periods, series = [], {}
     
-    # Exemple avec quelques ratios clés
-    metrics = {
-        'ROE': [12, 14, 15],
-        'Liquidité': [1.3, 1.5, 1.8],
-        'Marge Nette': [3.2, 3.8, 4.2]
-    }
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
     
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
-    
-    for i, (metric, values) in enumerate(metrics.items()):
+    for i, (ratio, values) in enumerate(series.items()):
+        if all(value is None for value in values):
+            continue
         fig.add_trace(go.Scatter(
             x=periods,
             y=values,
             mode='lines+markers',
-            name=metric,
-            line=dict(color=colors[i], width=3),
+            name=metrics[ratio],
+            line=dict(color=colors[i % len(colors)], width=3),
             marker=dict(size=8)
         ))
     
+    if not fig.data:
+        fig.add_annotation(text="Historique insuffisant", showarrow=False,
+                           xref='paper', yref='paper', x=0.5, y=0.5)
+    
     fig.update_layout(
         title="Évolution des Ratios Clés",
-        xaxis_title="Période",
+        xaxis_title="Exercice",
         yaxis_title="Valeur",
         height=400,
         hovermode='x unified'
@@ -0,0 +1,49 @@
+"""
+Identification de l'analyse : entreprise et exercice saisis avec les états financiers
+
+Ces deux valeurs forment la clé de l'historique (une ligne par entreprise-exercice) ; une
+analyse sans l'une ou l'autre n'est pas historisée plutôt que rangée sous une clé devinée.
+"""
+
+from datetime import datetime
+from typing import Any, Dict
+
+import streamlit as st
+
+# Bornes de saisie de l'exercice
+MIN_EXERCICE = 1990
+
+
+def show_company_identity_inputs(key_suffix: str) -> Dict[str, Any]:
+    """
+    Champs entreprise / exercice d'un formulaire d'import ou de saisie
+
+    Returns:
+        dict: Métadonnées 'entreprise' et 'exercice' renseignées (vide si aucune)
+    """
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        entreprise = st.text_input(
+            "Entreprise (raison sociale ou identifiant) :",
+            key=f"entreprise_{key_suffix}",
+            help="Identifiant stable de l'entreprise (ex. RCCM) : clé de l'historique des analyses"
+        )
+    with col2:
+        exercice = st.number_input(
+            "Exercice :",
+            min_value=MIN_EXERCICE,
+            max_value=datetime.now().year + 1,
+            value=None,
+            step=1,
+            key=f"exercice_{key_suffix}",
+            help="Année de clôture des états financiers"
+        )
+
+    identity: Dict[str, Any] = {}
+    if entreprise and entreprise.strip():
+        identity['entreprise'] = entreprise.strip()
+    if exercice is not None:
+        identity['exercice'] = int(exercice)
+    if len(identity) < 2:
+        st.caption("ℹ️ Entreprise et exercice requis pour historiser l'analyse (clé de l'historique)")
+    return identity
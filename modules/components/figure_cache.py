@@ -0,0 +1,99 @@
+"""
+Cache des figures plotly sérialisées, indexé par (analyse, type de graphique, options)
+
+Un résultat d'analyse est immuable pour un identifiant donné : ses graphiques le sont
+aussi. Les pages demandent leurs figures au cache au lieu de les reconstruire à chaque
+réexécution (changement d'onglet, saisie dans un widget...). Les figures sont stockées
+en JSON (sans le thème par défaut, réappliqué à la relecture) : une entrée n'est jamais
+modifiée par une session, et la relecture coûte moins qu'une construction.
+"""
+
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from modules.core.bounded_cache import BoundedLRUCache
+
+# Bornes par défaut du cache
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+FigureKey = Tuple[str, str, str]
+
+
+def figure_to_json(fig: go.Figure) -> str:
+    """
+    Sérialise une figure sans son thème
+
+    Le thème par défaut (plusieurs Ko, long à valider) est réappliqué par go.Figure à la
+    relecture ; les graphiques de l'application n'en imposent pas d'autre.
+    """
+    spec = fig.to_dict()
+    spec.get('layout', {}).pop('template', None)
+    return pio.to_json(spec, validate=False)
+
+
+def figure_from_json(payload: str) -> go.Figure:
+    """Reconstruit une figure (nouvel objet, modifiable sans toucher au cache)"""
+    return go.Figure(json.loads(payload))
+
+
+def make_key(analysis_id: str, chart_type: str, options: Optional[Dict[str, Any]] = None) -> FigureKey:
+    """Clé d'une figure ; les options sont normalisées (ordre des clés indifférent)"""
+    return (analysis_id, chart_type, json.dumps(options or {}, sort_keys=True, default=str))
+
+
+class FigureCache(BoundedLRUCache):
+    """
+    Cache LRU de figures sérialisées, borné en nombre d'entrées et en taille
+
+    Partagé par toutes les pages et toutes les sessions du processus.
+    """
+
+    ENTRIES_LABEL = 'figures_en_cache'
+    MAX_ENTRIES_LABEL = 'max_figures'
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(max_entries, max_bytes)
+
+    def put(self, key: FigureKey, fig: go.Figure) -> str:
+        """Sérialise et mémorise une figure"""
+        return super().put(key, figure_to_json(fig))
+
+    def figure(self, analysis_id: Optional[str], chart_type: str, build: Callable[[], go.Figure],
+               options: Optional[Dict[str, Any]] = None) -> go.Figure:
+        """
+        Figure d'une analyse, construite au premier appel puis relue depuis le cache
+
+        Args:
+            analysis_id (str): Identifiant de l'analyse (sans identifiant : pas de cache)
+            chart_type (str): Type de graphique, unique par fonction de construction
+            build (callable): Construit la figure en cas d'absence
+            options (dict): Paramètres d'affichage qui modifient la figure
+        """
+        if not analysis_id:
+            return build()
+        key = make_key(analysis_id, chart_type, options)
+        payload = self.get(key)
+        if payload is None:
+            fig = build()
+            self.put(key, fig)
+            return fig
+        return figure_from_json(payload)
+
+
+_cache: Optional[FigureCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_figure_cache() -> FigureCache:
+    """Retourne le cache de figures partagé par tout le processus"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FigureCache()
+    return _cache
@@ -3,8 +3,8 @@ Composant Sidebar avec normes BCEAO et informations de référence
 """
 
 import streamlit as st
-import json
-from pathlib import Path
+
+from modules.core.norms import get_norms_registry
 
 def show_bceao_sidebar():
     """Affiche la sidebar avec les normes BCEAO"""
@@ -234,13 +234,8 @@ def show_sectoral_benchmarks(secteur: str = None):
                     """)
 
 def load_sectoral_data():
-    """Charge les données sectorielles"""
-    try:
-        data_path = Path(__file__).parent.parent.parent / "data" / "sectoral_norms.json"
-        with open(data_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+    """Données sectorielles (lues une fois par le registre de normes, rechargées si le fichier change)"""
+    return get_norms_registry().get('sectoral_norms', {})
 
 def show_calculation_methods():
     """Affiche les méthodes de calcul"""
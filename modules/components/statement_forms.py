@@ -0,0 +1,127 @@
+"""
+Sections de saisie des états financiers isolées (fragment + formulaire)
+
+Chaque état (bilan, compte de résultat, flux) est saisi dans un formulaire : la frappe ne
+réexécute rien, et la validation du formulaire ne réexécute que le fragment de la section
+(totaux et aperçu des ratios compris), sans la barre latérale ni l'en-tête de la page.
+Les valeurs validées sont conservées dans la session, par section et par reset_counter.
+"""
+
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import streamlit as st
+
+# Ordre des sections : une section voit les valeurs validées des autres (contexte)
+SECTIONS = ('bilan', 'cr', 'flux')
+
+# Préfixe des clés de session (nettoyées par SessionManager.reset_application)
+STATEMENT_PREFIX = 'statement_'
+
+Render = Callable[[Dict[str, float], Dict[str, float]], None]
+Verdict = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def section_key(section: str, reset_counter: int) -> str:
+    return f"{STATEMENT_PREFIX}{section}_{reset_counter}"
+
+
+def _verdict_key(reset_counter: int) -> str:
+    return f"{STATEMENT_PREFIX}verdict_{reset_counter}"
+
+
+def get_statement_data(reset_counter: int, exclude: Optional[str] = None) -> Dict[str, float]:
+    """Valeurs validées de toutes les sections (sauf exclude), dans l'ordre des sections"""
+    data: Dict[str, float] = {}
+    for section in SECTIONS:
+        if section != exclude:
+            data.update(st.session_state.get(section_key(section, reset_counter), {}))
+    return data
+
+
+def _in_fragment_run() -> bool:
+    """Vrai si seul un fragment est réexécuté (et non la page entière)"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return False
+    return bool(getattr(get_script_run_ctx(), 'fragment_ids_this_run', None))
+
+
+def record_verdict(reset_counter: int, errors: Iterable[str], warnings: Iterable[str]) -> Verdict:
+    """Mémorise le résultat de validation affiché par la page"""
+    verdict = (tuple(errors), tuple(warnings))
+    st.session_state[_verdict_key(reset_counter)] = verdict
+    return verdict
+
+
+def show_ratio_preview(data: Dict[str, float], preview: Iterable[Tuple[str, str, str]]):
+    """
+    Aperçu de quelques ratios calculés sur les valeurs validées
+
+    Args:
+        data (dict): Données financières (toutes sections confondues)
+        preview (iterable): Triplets (clé du ratio, libellé, unité)
+    """
+    from modules.core.analyzer import get_financial_analyzer
+
+    preview = list(preview)
+    try:
+        ratios = get_financial_analyzer().calculate_ratios(data)
+    except Exception as e:
+        st.caption(f"Aperçu des ratios indisponible : {e}")
+        return
+
+    for col, (name, label, unit) in zip(st.columns(len(preview)), preview):
+        value = ratios.get(name)
+        with col:
+            st.metric(label, f"{value:,.2f}{unit}" if isinstance(value, (int, float)) else "-")
+
+
+def statement_section(section: str, reset_counter: int, render: Render, submit_label: str,
+                      preview: Iterable[Tuple[str, str, str]] = (),
+                      validate: Optional[Callable[[Dict[str, float]], Tuple[list, list]]] = None) -> Dict[str, float]:
+    """
+    Affiche une section de saisie dans un fragment, ses champs dans un formulaire
+
+    Args:
+        section (str): Nom de la section (SECTIONS)
+        reset_counter (int): Compteur de réinitialisation (clés des widgets)
+        render (callable): render(values, context) crée les champs et remplit values ;
+            context contient les valeurs validées des autres sections (lecture seule)
+        submit_label (str): Libellé du bouton de validation du formulaire
+        preview (iterable): Ratios affichés sous le formulaire (voir show_ratio_preview)
+        validate (callable): Règles de validation de la page ; si leur résultat change
+            après une validation du formulaire, la page entière est réexécutée
+
+    Returns:
+        dict: Valeurs validées de la section
+    """
+    preview = tuple(preview)
+
+    def _body() -> Dict[str, float]:
+        values: Dict[str, float] = {}
+        context = get_statement_data(reset_counter, exclude=section)
+
+        with st.form(f"form_{section}_{reset_counter}"):
+            render(values, context)
+            submitted = st.form_submit_button(submit_label, use_container_width=True)
+
+        st.session_state[section_key(section, reset_counter)] = dict(values)
+
+        if preview:
+            show_ratio_preview({**context, **values}, preview)
+
+        # Validation du formulaire dans un fragment : le reste de la page n'est réexécuté
+        # que si le verdict affiché (erreurs, avertissements) n'est plus à jour
+        if submitted and validate is not None and _in_fragment_run():
+            errors, warnings = validate(get_statement_data(reset_counter))
+            if (tuple(errors), tuple(warnings)) != st.session_state.get(_verdict_key(reset_counter)):
+                st.rerun(scope='app')
+
+        return values
+
+    # Streamlit < 1.37 : le formulaire seul regroupe déjà la saisie
+    fragment = getattr(st, 'fragment', None)
+    if fragment is not None:
+        return fragment(_body)()
+    return _body()
@@ -0,0 +1,161 @@
+"""
+Résultat d'analyse immuable, stocké une seule fois dans l'état de session
+
+Les anciennes clés de session ('analysis_data', 'analysis_ratios', ...) ne sont plus
+dupliquées : elles sont résolues à la demande à partir de ce résultat unique.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional
+
+ANALYSIS_RESULT_VERSION = '2.1.0'
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("Résultat d'analyse en lecture seule")
+
+
+class FrozenDict(dict):
+    """
+    Dictionnaire en lecture seule
+
+    Reste une sous-classe de dict pour rester compatible avec json, pandas et st.json.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """Copie figée d'une structure (dictionnaires et listes imbriqués)"""
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Copie modifiable d'une structure figée"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _hash_default(value: Any) -> Any:
+    """Scalaires numpy/pandas : valeur Python équivalente"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Empreinte SHA-256 d'un contenu (données, ratios, scores, métadonnées...)
+
+    Indépendante de l'ordre des clés et du fait que la structure soit figée ou non :
+    deux analyses au contenu identique ont la même empreinte.
+    """
+    payload = json.dumps([thaw(part) for part in parts], sort_keys=True,
+                         separators=(',', ':'), default=_hash_default)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# Anciennes clés de session → lecture sur le résultat
+LEGACY_VIEWS: Dict[str, Callable[['AnalysisResult'], Any]] = {
+    'analysis_data': lambda result: result.data,
+    'analysis_ratios': lambda result: result.ratios,
+    'analysis_scores': lambda result: result.scores,
+    'analysis_secteur': lambda result: result.metadata.get('secteur', ''),
+    'analysis_date': lambda result: result.metadata.get('date_analyse', ''),
+    'analysis_done': lambda result: True,
+}
+
+
+class AnalysisResult(Mapping):
+    """
+    Résultat d'une analyse financière (données, ratios, scores, métadonnées)
+
+    Se lit comme l'ancien dictionnaire 'analysis_results' (result['scores'],
+    result.get('metadata', {}), **result) mais ne peut pas être modifié.
+    """
+
+    FIELDS = ('data', 'ratios', 'scores', 'metadata', 'version', 'timestamp')
+
+    __slots__ = FIELDS
+
+    def __init__(self, data: Dict[str, Any], ratios: Dict[str, Any], scores: Dict[str, Any],
+                 metadata: Dict[str, Any], version: str = ANALYSIS_RESULT_VERSION,
+                 timestamp: Optional[str] = None):
+        object.__setattr__(self, 'data', freeze(data or {}))
+        object.__setattr__(self, 'ratios', freeze(ratios or {}))
+        object.__setattr__(self, 'scores', freeze(scores or {}))
+        object.__setattr__(self, 'metadata', freeze(metadata or {}))
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'timestamp', timestamp or datetime.now().isoformat())
+
+    @classmethod
+    def from_dict(cls, results: Mapping) -> 'AnalysisResult':
+        """Convertit un ancien dictionnaire 'analysis_results'"""
+        if isinstance(results, cls):
+            return results
+        return cls(
+            results.get('data', {}), results.get('ratios', {}), results.get('scores', {}),
+            results.get('metadata', {}), results.get('version', ANALYSIS_RESULT_VERSION),
+            results.get('timestamp')
+        )
+
+    def __setattr__(self, name, value):
+        _read_only()
+
+    def __delattr__(self, name):
+        _read_only()
+
+    def __reduce__(self):
+        return (AnalysisResult, tuple(getattr(self, field) for field in self.FIELDS))
+
+    # Interface Mapping (compatibilité avec l'ancien dictionnaire)
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __repr__(self) -> str:
+        return (f"AnalysisResult(score={self.score}, ratios={len(self.ratios)}, "
+                f"secteur={self.metadata.get('secteur', '')!r}, timestamp={self.timestamp!r})")
+
+    @property
+    def score(self) -> int:
+        """Score global de l'analyse"""
+        return self.scores.get('global', 0)
+
+    def legacy(self, key: str, default: Any = None) -> Any:
+        """Valeur d'une ancienne clé de session ('analysis_data', 'analysis_scores', ...)"""
+        view = LEGACY_VIEWS.get(key)
+        return view(self) if view is not None else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copie modifiable (export, sérialisation)"""
+        return {field: thaw(getattr(self, field)) for field in self.FIELDS}
@@ -0,0 +1,310 @@
+"""
+Stockage des analyses partagé par tout le processus (LRU borné, SQLite optionnel)
+
+Chaque session ne conserve qu'un identifiant d'analyse : le résultat lui-même vit ici,
+une seule fois, quel que soit le nombre de sessions. Avec une base SQLite, un
+analyste qui se reconnecte (ou un redémarrage du serveur) retrouve son résultat
+sans relancer l'analyse.
+
+Une même analyse peut être ouverte sous plusieurs identifiants (alias, par exemple
+pour un import en double) : le résultat n'est stocké qu'une fois et n'est supprimé
+qu'au retrait de son dernier identifiant.
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from modules.core.analysis_result import AnalysisResult
+
+# Bornes par défaut du cache mémoire
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Chemin de la base SQLite (désactivée si la variable est absente)
+DB_PATH_ENV = 'OPTIMUSCREDIT_ANALYSIS_DB'
+
+
+def estimate_size(result: AnalysisResult) -> int:
+    """Taille approximative d'un résultat (octets sérialisés)"""
+    try:
+        return len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return len(repr(result))
+
+
+def _json_default(value: Any) -> Any:
+    """Conversion des scalaires numpy/pandas pour l'export JSON"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class AnalysisStore:
+    """
+    Cache LRU des résultats d'analyse, indexé par identifiant
+
+    Le cache mémoire est borné en nombre d'entrées et en taille estimée ; les entrées
+    les moins récemment lues sont évincées en premier. Si une base SQLite est
+    configurée, chaque résultat y est aussi écrit et une entrée évincée est relue
+    depuis la base à la demande.
+
+    Les alias (identifiant -> identifiant du résultat) sont tenus à part, en mémoire
+    et dans la base ; ils ne comptent pas dans les bornes du cache.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._bytes = 0
+        self._aliases: Dict[str, str] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.db_hits = 0
+        self.evictions = 0
+
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path: str):
+        """Ouvre (et crée au besoin) la base de persistance"""
+        try:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                " id TEXT PRIMARY KEY, payload TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_aliases ("
+                " id TEXT PRIMARY KEY, target TEXT NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Base des analyses indisponible ({db_path}): {e}")
+            self._db = None
+
+    def put(self, result: AnalysisResult, analysis_id: Optional[str] = None) -> str:
+        """
+        Enregistre un résultat et retourne son identifiant
+
+        Args:
+            result (AnalysisResult): Résultat à stocker
+            analysis_id (str): Identifiant imposé (nouvel identifiant par défaut)
+
+        Returns:
+            str: Identifiant de l'analyse
+        """
+        analysis_id = analysis_id or uuid.uuid4().hex
+        with self._lock:
+            self._insert(analysis_id, result)
+            if self._db is not None:
+                self._write_db(analysis_id, result)
+        return analysis_id
+
+    def alias(self, analysis_id: Optional[str]) -> Optional[str]:
+        """
+        Nouvel identifiant désignant une analyse déjà stockée (sans la dupliquer)
+
+        Returns:
+            str: Identifiant de l'alias, None si l'analyse a quitté le stockage
+        """
+        with self._lock:
+            target = self._resolve(analysis_id)
+            if self.get(target) is None:
+                return None
+            handle = uuid.uuid4().hex
+            self._aliases[handle] = target
+            if self._db is not None:
+                self._execute_db("INSERT OR REPLACE INTO analysis_aliases (id, target) VALUES (?, ?)",
+                                 (handle, target), f"Persistance de l'alias {handle}")
+            return handle
+
+    def get(self, analysis_id: Optional[str]) -> Optional[AnalysisResult]:
+        """Résultat d'une analyse (None si inconnue ou évincée sans persistance)"""
+        if not analysis_id:
+            return None
+        with self._lock:
+            analysis_id = self._resolve(analysis_id)
+            entry = self._entries.get(analysis_id)
+            if entry is not None:
+                self._entries.move_to_end(analysis_id)
+                self.hits += 1
+                return entry[0]
+
+            result = self._read_db(analysis_id) if self._db is not None else None
+            if result is None:
+                self.misses += 1
+                return None
+            self.db_hits += 1
+            self._insert(analysis_id, result)
+            return result
+
+    def __contains__(self, analysis_id: str) -> bool:
+        return self.get(analysis_id) is not None
+
+    def discard(self, analysis_id: Optional[str]):
+        """
+        Retire un identifiant ; le résultat n'est supprimé (cache et base) qu'avec
+        son dernier identifiant, sinon il passe à l'un des alias restants
+        """
+        if not analysis_id:
+            return
+        with self._lock:
+            target = self._resolve(analysis_id)
+            if target != analysis_id:
+                self._aliases.pop(analysis_id, None)
+                if self._db is not None:
+                    self._execute_db("DELETE FROM analysis_aliases WHERE id = ?", (analysis_id,),
+                                     f"Suppression de l'alias {analysis_id}")
+                return
+
+            aliases = self._aliases_of(analysis_id)
+            if aliases:
+                self._transfer(analysis_id, aliases[0])
+                return
+
+            entry = self._entries.pop(analysis_id, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+            if self._db is not None:
+                self._execute_db("DELETE FROM analyses WHERE id = ?", (analysis_id,),
+                                 f"Suppression de l'analyse {analysis_id}")
+
+    def _resolve(self, analysis_id: Optional[str]) -> Optional[str]:
+        """Identifiant sous lequel le résultat est stocké (lui-même s'il n'est pas un alias)"""
+        target = self._aliases.get(analysis_id)
+        if target is None and analysis_id and self._db is not None:
+            try:
+                row = self._db.execute("SELECT target FROM analysis_aliases WHERE id = ?",
+                                       (analysis_id,)).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ Lecture de l'alias {analysis_id} impossible: {e}")
+                row = None
+            if row:
+                target = self._aliases[analysis_id] = row[0]
+        return target or analysis_id
+
+    def _aliases_of(self, analysis_id: str) -> List[str]:
+        """Alias qui désignent un résultat stocké"""
+        aliases = [alias for alias, target in self._aliases.items() if target == analysis_id]
+        if self._db is not None:
+            try:
+                rows = self._db.execute("SELECT id FROM analysis_aliases WHERE target = ?",
+                                        (analysis_id,)).fetchall()
+            except sqlite3.Error as e:
+                print(f"⚠️ Lecture des alias de {analysis_id} impossible: {e}")
+                rows = []
+            aliases += [row[0] for row in rows if row[0] not in aliases]
+        return aliases
+
+    def _transfer(self, analysis_id: str, heir: str):
+        """Range le résultat sous l'un de ses alias, qui devient son identifiant de stockage"""
+        for alias, target in list(self._aliases.items()):
+            if target == analysis_id:
+                self._aliases[alias] = heir
+        self._aliases.pop(heir, None)
+
+        entry = self._entries.pop(analysis_id, None)
+        if entry is not None:
+            self._entries[heir] = entry
+
+        if self._db is not None:
+            try:
+                self._db.execute("UPDATE analyses SET id = ? WHERE id = ?", (heir, analysis_id))
+                self._db.execute("UPDATE analysis_aliases SET target = ? WHERE target = ?", (heir, analysis_id))
+                self._db.execute("DELETE FROM analysis_aliases WHERE id = ?", (heir,))
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Transfert de l'analyse {analysis_id} impossible: {e}")
+
+    def _execute_db(self, query: str, params: tuple, action: str):
+        try:
+            self._db.execute(query, params)
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ {action} impossible: {e}")
+
+    def clear(self):
+        """Vide le cache mémoire (la base éventuelle est conservée)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _insert(self, analysis_id: str, result: AnalysisResult):
+        """Insère en tête du LRU puis évince jusqu'à respecter les bornes"""
+        previous = self._entries.pop(analysis_id, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+
+        size = estimate_size(result)
+        self._entries[analysis_id] = (result, size)
+        self._bytes += size
+
+        # L'entrée qui vient d'être insérée n'est jamais évincée
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _write_db(self, analysis_id: str, result: AnalysisResult):
+        try:
+            payload = json.dumps(result.to_dict(), ensure_ascii=False, default=_json_default)
+            self._db.execute(
+                "INSERT OR REPLACE INTO analyses (id, payload, created_at) VALUES (?, ?, ?)",
+                (analysis_id, payload, time.time())
+            )
+            self._db.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"⚠️ Persistance de l'analyse {analysis_id} impossible: {e}")
+
+    def _read_db(self, analysis_id: str) -> Optional[AnalysisResult]:
+        try:
+            row = self._db.execute("SELECT payload FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+            return AnalysisResult.from_dict(json.loads(row[0])) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            print(f"⚠️ Lecture de l'analyse {analysis_id} impossible: {e}")
+            return None
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Statistiques du stockage pour le diagnostic"""
+        with self._lock:
+            lookups = self.hits + self.db_hits + self.misses
+            return {
+                'analyses_en_memoire': len(self._entries),
+                'taille_estimee_mo': round(self._bytes / (1024 * 1024), 2),
+                'max_analyses': self.max_entries,
+                'max_mo': round(self.max_bytes / (1024 * 1024), 2),
+                'lectures_memoire': self.hits,
+                'lectures_base': self.db_hits,
+                'absentes': self.misses,
+                'taux_succes': round((self.hits + self.db_hits) / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'alias': len(self._aliases),
+                'base_sqlite': self.db_path if self._db is not None else None
+            }
+
+
+_store: Optional[AnalysisStore] = None
+_store_lock = threading.Lock()
+
+
+def get_analysis_store() -> AnalysisStore:
+    """Retourne le stockage d'analyses partagé par tout le processus"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AnalysisStore(db_path=os.environ.get(DB_PATH_ENV) or None)
+    return _store
@@ -0,0 +1,318 @@
+"""
+Analyses Excel exécutées en arrière-plan par un pool de threads borné
+
+Le script Streamlit soumet le classeur et rend la main immédiatement : la session reste
+utilisable pendant l'analyse et interroge l'état de la tâche (étape en cours,
+progression) jusqu'à sa fin. Le résultat est remis à la session par le script lui-même
+(le thread de travail n'accède jamais à st.session_state).
+"""
+
+import io
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Étapes d'une analyse, dans l'ordre
+STAGES = ('parse', 'ratios', 'score', 'recommendations')
+STAGE_LABELS = {
+    'parse': "Lecture du classeur",
+    'ratios': "Calcul des ratios",
+    'score': "Notation BCEAO",
+    'recommendations': "Recommandations",
+}
+
+# États d'une tâche
+PENDING, RUNNING, DONE, FAILED = 'en_attente', 'en_cours', 'terminee', 'erreur'
+
+# Taille du pool (modifiable par variable d'environnement) et file d'attente maximale
+DEFAULT_WORKERS = 2
+WORKERS_ENV = 'OPTIMUSCREDIT_ANALYSIS_WORKERS'
+DEFAULT_MAX_PENDING = 16
+
+# Durée de conservation d'une tâche terminée non récupérée (secondes)
+DEFAULT_RETENTION = 600
+
+
+class QueueFullError(RuntimeError):
+    """Trop d'analyses en attente : la soumission est refusée"""
+
+
+def run_data_analysis(data: Dict[str, Any], secteur: Optional[str],
+                      progress: Callable[[str], None] = lambda stage: None) -> Dict[str, Any]:
+    """
+    Analyse de postes financiers déjà extraits (ratios, notation, recommandations)
+
+    Returns:
+        dict: 'data', 'ratios', 'scores', 'recommendations', 'norms_version'
+    """
+    from modules.core.analyzer import get_financial_analyzer
+    from modules.core.norms import get_norms_version
+
+    analyzer = get_financial_analyzer()
+
+    progress('ratios')
+    ratios = analyzer.calculate_ratios(data)
+
+    progress('score')
+    scores = analyzer.calculate_score(ratios, secteur)
+
+    progress('recommendations')
+    recommendations = analyzer.generate_recommendations(data, ratios, scores)
+
+    return {
+        'data': data,
+        'ratios': ratios,
+        'scores': scores,
+        'recommendations': recommendations,
+        'norms_version': get_norms_version()
+    }
+
+
+def run_excel_analysis(file_content: bytes, secteur: Optional[str],
+                       progress: Callable[[str], None] = lambda stage: None) -> Dict[str, Any]:
+    """
+    Analyse complète d'un classeur, étape par étape
+
+    Args:
+        file_content (bytes): Contenu du fichier Excel
+        secteur (str): Secteur d'activité
+        progress (callable): Appelé avec le nom de chaque étape au moment où elle démarre
+
+    Returns:
+        dict: 'data', 'ratios', 'scores', 'recommendations', 'norms_version'
+
+    Raises:
+        ValueError: Classeur illisible (feuilles 'Bilan' et 'CR' introuvables)
+    """
+    from modules.core.analyzer import get_financial_analyzer
+
+    progress('parse')
+    data = get_financial_analyzer().load_excel_template(io.BytesIO(file_content))
+    if data is None:
+        raise ValueError("Vérifiez que le fichier contient les feuilles 'Bilan' et 'CR' avec les données aux bonnes positions")
+
+    return run_data_analysis(data, secteur, progress)
+
+
+def run_deduplicated_excel_analysis(file_content: bytes, secteur: Optional[str],
+                                    progress: Callable[[str], None] = lambda stage: None) -> Dict[str, Any]:
+    """
+    Analyse d'un classeur importé, réutilisant l'analyse existante d'un contenu identique
+
+    Le classeur est toujours lu ; si ses postes extraits (et le secteur) ont déjà été
+    analysés, le résultat stocké est repris sans nouvelle notation.
+
+    Returns:
+        dict: Comme run_excel_analysis, avec 'dedup_key' (empreinte à enregistrer) et,
+        pour un doublon, 'analysis_id' (identifiant de l'analyse existante)
+    """
+    from modules.core.analyzer import get_financial_analyzer
+    from modules.core.analysis_result import thaw
+    from modules.core.dedup_index import get_dedup_index, statement_key
+
+    progress('parse')
+    analyzer = get_financial_analyzer()
+    data = analyzer.load_excel_template(io.BytesIO(file_content))
+    if data is None:
+        raise ValueError("Vérifiez que le fichier contient les feuilles 'Bilan' et 'CR' avec les données aux bonnes positions")
+
+    key = statement_key(data, secteur)
+    existing = get_dedup_index().lookup(key)
+    if existing is None:
+        return {**run_data_analysis(data, secteur, progress), 'dedup_key': key}
+
+    analysis_id, stored = existing
+    data, ratios, scores = thaw(stored.data), thaw(stored.ratios), thaw(stored.scores)
+    progress('recommendations')
+    return {
+        'data': data,
+        'ratios': ratios,
+        'scores': scores,
+        'recommendations': analyzer.generate_recommendations(data, ratios, scores),
+        'norms_version': stored.metadata.get('norms_version'),
+        'dedup_key': key,
+        'analysis_id': analysis_id
+    }
+
+
+class AnalysisJob:
+    """État d'une analyse soumise (mis à jour par le thread de travail)"""
+
+    def __init__(self, job_id: str, filename: str, secteur: Optional[str]):
+        self.id = job_id
+        self.filename = filename
+        self.secteur = secteur
+        self.status = PENDING
+        self.stage: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def set_stage(self, stage: str):
+        with self._lock:
+            self.status = RUNNING
+            self.stage = stage
+            if self.started_at is None:
+                self.started_at = time.time()
+
+    def finish(self, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        with self._lock:
+            self.status = FAILED if error else DONE
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copie cohérente de l'état, lisible depuis le script Streamlit"""
+        with self._lock:
+            if self.status == DONE:
+                progress = 1.0
+            elif self.stage in STAGES:
+                progress = STAGES.index(self.stage) / len(STAGES)
+            else:
+                progress = 0.0
+            end = self.finished_at or time.time()
+            return {
+                'id': self.id,
+                'fichier_nom': self.filename,
+                'statut': self.status,
+                'etape': self.stage,
+                'etape_libelle': STAGE_LABELS.get(self.stage, "En attente d'un analyste disponible"),
+                'progression': progress,
+                'duree_s': round(end - (self.started_at or end), 2),
+                'attente_s': round((self.started_at or end) - self.submitted_at, 2),
+                'erreur': self.error
+            }
+
+
+class AnalysisWorkerPool:
+    """Pool borné d'analyses en arrière-plan, partagé par toutes les sessions"""
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING,
+                 retention: float = DEFAULT_RETENTION,
+                 runner: Callable[..., Dict[str, Any]] = run_deduplicated_excel_analysis):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.runner = runner
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analyse')
+        self._jobs: 'OrderedDict[str, AnalysisJob]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _active(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def _purge(self):
+        """Oublie les tâches terminées depuis plus longtemps que la durée de conservation"""
+        limit = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < limit]:
+            del self._jobs[job_id]
+
+    def submit(self, file_content: bytes, filename: str, secteur: Optional[str]) -> str:
+        """
+        Soumet l'analyse d'un classeur
+
+        Returns:
+            str: Identifiant de la tâche
+
+        Raises:
+            QueueFullError: Trop d'analyses en cours ou en attente
+        """
+        with self._lock:
+            self._purge()
+            if self._active() >= self.max_workers + self.max_pending:
+                self.rejected += 1
+                raise QueueFullError("Trop d'analyses en cours, réessayez dans quelques instants")
+            job = AnalysisJob(uuid.uuid4().hex, filename, secteur)
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, file_content)
+        return job.id
+
+    def _run(self, job: AnalysisJob, file_content: bytes):
+        try:
+            result = self.runner(file_content, job.secteur, job.set_stage)
+        except Exception as e:
+            print(f"❌ Analyse {job.filename} en échec: {e}")
+            traceback.print_exc()
+            job.finish(error=str(e))
+            with self._lock:
+                self.failed += 1
+        else:
+            job.finish(result=result)
+            with self._lock:
+                self.completed += 1
+
+    def status(self, job_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """État d'une tâche (None si inconnue ou oubliée)"""
+        with self._lock:
+            job = self._jobs.get(job_id) if job_id else None
+        return job.snapshot() if job is not None else None
+
+    def pop_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retire une tâche terminée et retourne son résultat (None si non terminée ou en erreur)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.finished:
+                return None
+            del self._jobs[job_id]
+        return job.result
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, interval: float = 0.05) -> Optional[Dict[str, Any]]:
+        """Attend la fin d'une tâche (usage hors Streamlit : tests, scripts)"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            status = self.status(job_id)
+            if status is None or status['statut'] in (DONE, FAILED):
+                return status
+            if deadline is not None and time.time() >= deadline:
+                return status
+            time.sleep(interval)
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Statistiques du pool pour le diagnostic"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            'analystes': self.max_workers,
+            'file_max': self.max_pending,
+            'en_cours': sum(1 for job in jobs if job.status == RUNNING),
+            'en_attente': sum(1 for job in jobs if job.status == PENDING),
+            'terminees': self.completed,
+            'en_erreur': self.failed,
+            'refusees': self.rejected
+        }
+
+
+_pool: Optional[AnalysisWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_analysis_workers() -> AnalysisWorkerPool:
+    """Retourne le pool d'analyses partagé par tout le processus"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                try:
+                    workers = max(1, int(os.environ.get(WORKERS_ENV, DEFAULT_WORKERS)))
+                except ValueError:
+                    workers = DEFAULT_WORKERS
+                _pool = AnalysisWorkerPool(max_workers=workers)
+    return _pool
@@ -7,6 +7,28 @@ import numpy as np
 import openpyxl
 from datetime import datetime
 import json
+import threading
+from typing import Optional
+
+from modules.core.norms import get_norms_version, get_sector_benchmarks
+from modules.core.scoring import score_ratios
+from modules.core.recommendations import recommend, DEFAULT_RECOMMENDATION
+from modules.core.validation import validate_record
+from modules.core.analysis_result import freeze
+
+# Ratios que calculate_ratios peut produire (colonnes fixes des exports de portefeuille)
+RATIO_NAMES = (
+    'ratio_liquidite_generale', 'ratio_liquidite_immediate', 'ratio_liquidite_absolue',
+    'ratio_endettement', 'ratio_autonomie_financiere', 'ratio_couverture_charges_financieres',
+    'rotation_actif', 'rotation_stocks', 'duree_ecoulement_stocks', 'rotation_creances',
+    'delai_recouvrement_clients', 'rotation_fournisseurs', 'delai_paiement_fournisseurs',
+    'financement_immobilisations', 'ratio_endettement_financier',
+    'roa', 'roa_exploitation', 'roe', 'roe_exploitation',
+    'marge_brute', 'marge_commerciale_pct', 'marge_valeur_ajoutee', 'marge_excedent_brut',
+    'marge_exploitation', 'marge_nette', 'coefficient_exploitation', 'taux_charges_personnel',
+    'productivite_personnel', 'ratio_cafg_ca', 'capacite_remboursement',
+    'fonds_roulement', 'bfr', 'bfr_jours_ca', 'tresorerie_nette',
+)
 
 class FinancialAnalyzer:
     def __init__(self):
@@ -559,222 +581,14 @@ class FinancialAnalyzer:
         return ratios
 
     def calculate_score(self, ratios, secteur=None):
-        """Calcule le score global basé sur les ratios détaillés"""
-        scores = {}
-        
-        # Score de liquidité (40 points)
-        liquidite_score = 0
-        
-        # Liquidité générale (15 points)
-        if 'ratio_liquidite_generale' in ratios:
-            if ratios['ratio_liquidite_generale'] >= 2.0:
-                liquidite_score += 15
-            elif ratios['ratio_liquidite_generale'] >= 1.5:
-                liquidite_score += 12
-            elif ratios['ratio_liquidite_generale'] >= 1.0:
-                liquidite_score += 8
-            else:
-                liquidite_score += 3
-        
-        # Liquidité immédiate (10 points)
-        if 'ratio_liquidite_immediate' in ratios:
-            if ratios['ratio_liquidite_immediate'] >= 1.0:
-                liquidite_score += 10
-            elif ratios['ratio_liquidite_immediate'] >= 0.8:
-                liquidite_score += 8
-            elif ratios['ratio_liquidite_immediate'] >= 0.6:
-                liquidite_score += 5
-            else:
-                liquidite_score += 2
-        
-        # BFR en jours de CA (10 points)
-        if 'bfr_jours_ca' in ratios:
-            if ratios['bfr_jours_ca'] <= 30:
-                liquidite_score += 10
-            elif ratios['bfr_jours_ca'] <= 60:
-                liquidite_score += 7
-            elif ratios['bfr_jours_ca'] <= 90:
-                liquidite_score += 4
-            else:
-                liquidite_score += 1
-        
-        # Trésorerie nette (5 points)
-        if 'tresorerie_nette' in ratios:
-            if ratios['tresorerie_nette'] > 0:
-                liquidite_score += 5
-            else:
-                liquidite_score += 1
-        
-        scores['liquidite'] = liquidite_score
-        
-        # Score de solvabilité (40 points)
-        solvabilite_score = 0
-        
-        # Autonomie financière (20 points)
-        if 'ratio_autonomie_financiere' in ratios:
-            if ratios['ratio_autonomie_financiere'] >= 50:
-                solvabilite_score += 20
-            elif ratios['ratio_autonomie_financiere'] >= 40:
-                solvabilite_score += 16
-            elif ratios['ratio_autonomie_financiere'] >= 30:
-                solvabilite_score += 12
-            elif ratios['ratio_autonomie_financiere'] >= 20:
-                solvabilite_score += 8
-            else:
-                solvabilite_score += 3
-        
-        # Endettement global (15 points)
-        if 'ratio_endettement' in ratios:
-            if ratios['ratio_endettement'] <= 50:
-                solvabilite_score += 15
-            elif ratios['ratio_endettement'] <= 65:
-                solvabilite_score += 12
-            elif ratios['ratio_endettement'] <= 80:
-                solvabilite_score += 8
-            else:
-                solvabilite_score += 3
-        
-        # Capacité de remboursement (5 points)
-        if 'capacite_remboursement' in ratios:
-            if ratios['capacite_remboursement'] <= 3:
-                solvabilite_score += 5
-            elif ratios['capacite_remboursement'] <= 5:
-                solvabilite_score += 3
-            else:
-                solvabilite_score += 1
-        
-        scores['solvabilite'] = solvabilite_score
-        
-        # Score de rentabilité (30 points)
-        rentabilite_score = 0
-        
-        # ROE (10 points)
-        if 'roe' in ratios:
-            if ratios['roe'] >= 15:
-                rentabilite_score += 10
-            elif ratios['roe'] >= 10:
-                rentabilite_score += 8
-            elif ratios['roe'] >= 5:
-                rentabilite_score += 5
-            else:
-                rentabilite_score += 2
-        
-        # ROA (8 points)
-        if 'roa' in ratios:
-            if ratios['roa'] >= 5:
-                rentabilite_score += 8
-            elif ratios['roa'] >= 3:
-                rentabilite_score += 6
-            elif ratios['roa'] >= 1:
-                rentabilite_score += 4
-            else:
-                rentabilite_score += 1
-        
-        # Marge nette (7 points)
-        if 'marge_nette' in ratios:
-            if ratios['marge_nette'] >= 10:
-                rentabilite_score += 7
-            elif ratios['marge_nette'] >= 5:
-                rentabilite_score += 5
-            elif ratios['marge_nette'] >= 2:
-                rentabilite_score += 3
-            else:
-                rentabilite_score += 1
-        
-        # Marge d'exploitation (5 points)
-        if 'marge_exploitation' in ratios:
-            if ratios['marge_exploitation'] >= 10:
-                rentabilite_score += 5
-            elif ratios['marge_exploitation'] >= 5:
-                rentabilite_score += 4
-            elif ratios['marge_exploitation'] >= 2:
-                rentabilite_score += 2
-            else:
-                rentabilite_score += 1
-        
-        scores['rentabilite'] = rentabilite_score
-        
-        # Score d'activité (15 points)
-        activite_score = 0
-        
-        # Rotation de l'actif (5 points)
-        if 'rotation_actif' in ratios:
-            if ratios['rotation_actif'] >= 2.0:
-                activite_score += 5
-            elif ratios['rotation_actif'] >= 1.5:
-                activite_score += 4
-            elif ratios['rotation_actif'] >= 1.0:
-                activite_score += 3
-            else:
-                activite_score += 1
-        
-        # Rotation des stocks (5 points)
-        if 'rotation_stocks' in ratios:
-            if ratios['rotation_stocks'] >= 8:
-                activite_score += 5
-            elif ratios['rotation_stocks'] >= 6:
-                activite_score += 4
-            elif ratios['rotation_stocks'] >= 4:
-                activite_score += 3
-            else:
-                activite_score += 1
-        
-        # Délai de recouvrement (5 points)
-        if 'delai_recouvrement_clients' in ratios:
-            if ratios['delai_recouvrement_clients'] <= 30:
-                activite_score += 5
-            elif ratios['delai_recouvrement_clients'] <= 45:
-                activite_score += 4
-            elif ratios['delai_recouvrement_clients'] <= 60:
-                activite_score += 3
-            else:
-                activite_score += 1
-        
-        scores['activite'] = activite_score
-        
-        # Score de gestion (15 points)
-        gestion_score = 0
-        
-        # Productivité du personnel (5 points)
-        if 'productivite_personnel' in ratios:
-            if ratios['productivite_personnel'] >= 3:
-                gestion_score += 5
-            elif ratios['productivite_personnel'] >= 2:
-                gestion_score += 4
-            elif ratios['productivite_personnel'] >= 1.5:
-                gestion_score += 3
-            else:
-                gestion_score += 1
-        
-        # Taux de charges personnel / VA (5 points)
-        if 'taux_charges_personnel' in ratios:
-            if ratios['taux_charges_personnel'] <= 40:
-                gestion_score += 5
-            elif ratios['taux_charges_personnel'] <= 50:
-                gestion_score += 4
-            elif ratios['taux_charges_personnel'] <= 60:
-                gestion_score += 3
-            else:
-                gestion_score += 1
-        
-        # CAFG / CA (5 points)
-        if 'ratio_cafg_ca' in ratios:
-            if ratios['ratio_cafg_ca'] >= 10:
-                gestion_score += 5
-            elif ratios['ratio_cafg_ca'] >= 7:
-                gestion_score += 4
-            elif ratios['ratio_cafg_ca'] >= 5:
-                gestion_score += 3
-            else:
-                gestion_score += 1
-        
-        scores['gestion'] = gestion_score
-        
-        # Score global sur 140 points, ramené à 100
-        score_brut = sum(scores.values())
-        scores['global'] = min(100, int(score_brut * 100 / 140))
+        """
+        Calcule le score global basé sur les ratios détaillés
         
-        return scores
+        Les barèmes (liquidité 40, solvabilité 40, rentabilité 30, activité 15, gestion 15,
+        ramenés à 100) sont décrits dans modules/core/scoring.py et peuvent être remplacés
+        par une grille calibrée déposée dans data/scoring_grid.json.
+        """
+        return score_ratios(ratios)
 
     def get_interpretation(self, score):
         """Interprétation du score"""
@@ -832,7 +646,8 @@ class FinancialAnalyzer:
                 'ratios': ratios,
                 'scores': scores,
                 'recommendations': recommendations,
-                'secteur': secteur
+                'secteur': secteur,
+                'norms_version': get_norms_version()
             }
             
         except Exception as e:
@@ -857,101 +672,26 @@ class FinancialAnalyzer:
         Returns:
             list: Liste des recommandations
         """
-        recommendations = []
-        
-        # Recommandations de liquidité
-        if scores.get('liquidite', 0) < 25:
-            if ratios.get('ratio_liquidite_generale', 0) < 1.2:
-                recommendations.append({
-                    "priorite": "URGENT",
-                    "categorie": "Liquidité",
-                    "probleme": f"Ratio de liquidité générale critique ({ratios.get('ratio_liquidite_generale', 0):.2f})",
-                    "impact": "Risque de défaillance à court terme",
-                    "actions": [
-                        "Négocier immédiatement des délais de paiement avec les fournisseurs",
-                        "Accélérer le recouvrement des créances clients",
-                        "Réduire les stocks non essentiels",
-                        "Négocier une ligne de crédit court terme"
-                    ]
-                })
-        
-        # Recommandations de solvabilité
-        if scores.get('solvabilite', 0) < 25:
-            if ratios.get('ratio_autonomie_financiere', 0) < 25:
-                recommendations.append({
-                    "priorite": "IMPORTANT",
-                    "categorie": "Solvabilité",
-                    "probleme": f"Autonomie financière insuffisante ({ratios.get('ratio_autonomie_financiere', 0):.1f}%)",
-                    "impact": "Structure financière déséquilibrée",
-                    "actions": [
-                        "Préparer une augmentation de capital",
-                        "Renégocier les dettes financières",
-                        "Mettre en réserve tous les bénéfices",
-                        "Rechercher des subventions ou aides publiques"
-                    ]
-                })
-        
-        # Recommandations de rentabilité
-        if scores.get('rentabilite', 0) < 15:
-            if ratios.get('marge_nette', 0) < 3:
-                recommendations.append({
-                    "priorite": "MOYEN TERME",
-                    "categorie": "Rentabilité",
-                    "probleme": f"Marge nette insuffisante ({ratios.get('marge_nette', 0):.1f}%)",
-                    "impact": "Capacité d'autofinancement limitée",
-                    "actions": [
-                        "Analyser la structure des coûts par activité",
-                        "Optimiser les marges commerciales",
-                        "Réduire les charges fixes",
-                        "Améliorer la productivité"
-                    ]
-                })
-        
-        # Recommandations d'activité
-        if scores.get('activite', 0) < 8:
-            if ratios.get('rotation_stocks', 0) < 4:
-                recommendations.append({
-                    "priorite": "MOYEN TERME",
-                    "categorie": "Activité",
-                    "probleme": f"Rotation des stocks lente ({ratios.get('rotation_stocks', 0):.1f})",
-                    "impact": "Immobilisation excessive de fonds de roulement",
-                    "actions": [
-                        "Analyser les stocks dormants et obsolètes",
-                        "Améliorer la prévision de la demande",
-                        "Négocier des approvisionnements en flux tendu",
-                        "Mettre en place un système de gestion des stocks"
-                    ]
-                })
-        
-        # Recommandations de gestion
-        if scores.get('gestion', 0) < 8:
-            if ratios.get('taux_charges_personnel', 0) > 60:
-                recommendations.append({
-                    "priorite": "MOYEN TERME",
-                    "categorie": "Gestion",
-                    "probleme": f"Charges de personnel élevées ({ratios.get('taux_charges_personnel', 0):.1f}% de la VA)",
-                    "impact": "Productivité insuffisante",
-                    "actions": [
-                        "Analyser la productivité par service",
-                        "Former le personnel aux nouvelles technologies",
-                        "Optimiser l'organisation du travail",
-                        "Automatiser les tâches répétitives"
-                    ]
-                })
+        # Règles communes à toutes les pages (modules/core/recommendations.py)
+        recommendations = [
+            {
+                "priorite": rec['priorite'],
+                "categorie": rec['categorie'],
+                "probleme": rec['probleme'],
+                "impact": rec['impact'],
+                "actions": rec['actions']
+            }
+            for rec in recommend(ratios, scores)
+        ]
         
         # Si aucune recommandation critique, ajouter des suggestions d'amélioration
         if not recommendations:
             recommendations.append({
-                "priorite": "OPTIMISATION",
-                "categorie": "Performance",
-                "probleme": "Situation financière globalement satisfaisante",
-                "impact": "Opportunités d'optimisation",
-                "actions": [
-                    "Maintenir la surveillance des ratios clés",
-                    "Rechercher des opportunités de croissance",
-                    "Optimiser la structure du bilan",
-                    "Développer de nouveaux indicateurs de performance"
-                ]
+                "priorite": DEFAULT_RECOMMENDATION['priorite'],
+                "categorie": DEFAULT_RECOMMENDATION['categorie'],
+                "probleme": DEFAULT_RECOMMENDATION['probleme'],
+                "impact": DEFAULT_RECOMMENDATION['impact'],
+                "actions": list(DEFAULT_RECOMMENDATION['actions'])
             })
         
         return recommendations
@@ -967,10 +707,13 @@ class FinancialAnalyzer:
         Returns:
             dict: Comparaison sectorielle
         """
-        if secteur not in self.ratios_sectoriels:
+        # Les normes sectorielles du fichier data/sectoral_norms.json priment sur les valeurs intégrées
+        secteur_data = dict(self.ratios_sectoriels.get(secteur, {}))
+        secteur_data.update(get_sector_benchmarks(secteur))
+        
+        if not secteur_data:
             return None
         
-        secteur_data = self.ratios_sectoriels[secteur]
         comparison = {}
         
         for ratio_name, secteur_values in secteur_data.items():
@@ -1022,6 +765,7 @@ class FinancialAnalyzer:
             'scores_detailles': analysis_result.get('scores', {}),
             'recommandations': analysis_result.get('recommendations', []),
             'secteur': analysis_result.get('secteur', ''),
+            'norms_version': analysis_result.get('norms_version') or get_norms_version(),
             'score_global': analysis_result.get('scores', {}).get('global', 0),
             'interpretation': self.get_interpretation(analysis_result.get('scores', {}).get('global', 0))[0]
         }
@@ -1038,48 +782,33 @@ class FinancialAnalyzer:
         Returns:
             dict: Résultat de validation avec erreurs/avertissements
         """
-        validation_result = {
-            'is_valid': True,
-            'errors': [],
-            'warnings': []
-        }
-        
-        # Vérification de l'équilibre du bilan
-        total_actif = data.get('total_actif', 0)
-        total_passif = (data.get('capitaux_propres', 0) + 
-                       data.get('dettes_financieres', 0) + 
-                       data.get('dettes_court_terme', 0) + 
-                       data.get('tresorerie_passif', 0))
+        # Règles communes à toutes les saisies (modules/core/validation.py)
+        errors, warnings = validate_record(data)
         
-        ecart_bilan = abs(total_actif - total_passif)
-        if ecart_bilan > total_actif * 0.01:  # Plus de 1% d'écart
-            validation_result['errors'].append(
-                f"Bilan déséquilibré: écart de {ecart_bilan:,.0f} FCFA entre actif et passif"
-            )
-            validation_result['is_valid'] = False
-        
-        # Vérification des valeurs négatives anormales
-        critical_positive_fields = [
-            'total_actif', 'capitaux_propres', 'chiffre_affaires'
-        ]
-        
-        for field in critical_positive_fields:
-            if data.get(field, 0) < 0:
-                validation_result['errors'].append(
-                    f"Valeur négative anormale pour {field}: {data.get(field, 0):,.0f}"
-                )
-                validation_result['is_valid'] = False
-        
-        # Avertissements pour des ratios suspects
-        if data.get('chiffre_affaires', 0) > 0:
-            if data.get('resultat_net', 0) / data['chiffre_affaires'] > 0.5:
-                validation_result['warnings'].append(
-                    "Marge nette très élevée (>50%), vérifier la cohérence"
-                )
-            
-            if data.get('resultat_net', 0) / data['chiffre_affaires'] < -0.2:
-                validation_result['warnings'].append(
-                    "Perte importante (>20% du CA), situation critique"
-                )
-        
-        return validation_result
\ No newline at end of file
+        return {
+            'is_valid': not errors,
+            'errors': errors,
+            'warnings': warnings
+        }
+
+
+_analyzer: Optional[FinancialAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_financial_analyzer() -> FinancialAnalyzer:
+    """
+    Retourne l'analyseur partagé par tout le processus (toutes les sessions Streamlit)
+
+    L'analyseur ne conserve aucun état entre deux analyses : ses tables de normes sont
+    construites une seule fois puis figées, ce qui rend l'instance sûre entre threads.
+    """
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                analyzer = FinancialAnalyzer()
+                analyzer.ratios_bceao = freeze(analyzer.ratios_bceao)
+                analyzer.ratios_sectoriels = freeze(analyzer.ratios_sectoriels)
+                _analyzer = analyzer
+    return _analyzer
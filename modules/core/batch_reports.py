@@ -0,0 +1,266 @@
+"""
+Rendu par lots des rapports PDF (sans Streamlit), réparti sur un pool de processus
+
+Usage :
+    python -m modules.core.batch_reports classeurs/ --sortie rapports_T4.zip --secteur commerce_detail
+
+Chaque entrée est un classeur Excel ou des états financiers en JSON (format de
+assets/sample_data.json ou postes à plat), analysés dans le processus de rendu, ou un
+résultat d'analyse exporté en JSON (format AnalysisResult.to_dict). Chaque processus construit ses
+feuilles de style une seule fois ; les PDF sont écrits au fil de l'eau dans une archive
+ZIP ou un répertoire, et le débit (pages/seconde) est mesuré.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+EXCEL_SUFFIXES = ('.xlsx', '.xls')
+JSON_SUFFIXES = ('.json',)
+
+DEFAULT_REPORT_TYPE = 'detaille'
+BATCH_SOURCE = 'traitement_par_lots'
+
+# Rapports en cours par processus : borne la mémoire occupée par les PDF non encore écrits
+IN_FLIGHT_PER_WORKER = 4
+
+RenderResult = Tuple[str, Optional[bytes], int, Optional[str]]
+
+
+def collect_inputs(paths: Iterable[str]) -> List[Path]:
+    """Classeurs et résultats JSON à traiter (répertoires parcourus récursivement, ordre stable)"""
+    suffixes = EXCEL_SUFFIXES + JSON_SUFFIXES
+    inputs: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            inputs.extend(sorted(p for p in path.rglob('*')
+                                 if p.is_file() and p.suffix.lower() in suffixes and not p.name.startswith('~$')))
+        elif path.suffix.lower() in suffixes:
+            inputs.append(path)
+    return inputs
+
+
+def load_analysis(path: Path, secteur: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Résultat d'analyse d'une entrée du lot
+
+    Returns:
+        dict: 'data', 'ratios', 'scores', 'metadata'
+
+    Raises:
+        ValueError: Classeur illisible ou JSON sans poste financier
+    """
+    from modules.core.analysis_worker import run_data_analysis, run_excel_analysis
+
+    metadata: Dict[str, Any] = {}
+    if path.suffix.lower() in JSON_SUFFIXES:
+        with open(path, encoding='utf-8') as f:
+            result = json.load(f)
+        if isinstance(result, dict) and all(key in result for key in ('data', 'ratios', 'scores')):
+            result.setdefault('metadata', {})
+            return result
+
+        # États financiers seuls (format de assets/sample_data.json ou postes à plat) : analysés ici
+        from modules.core.jsonl_pipeline import normalize_statement
+        data, metadata = normalize_statement(result)
+        result = run_data_analysis(data, secteur or metadata.get('secteur'))
+    else:
+        result = run_excel_analysis(path.read_bytes(), secteur)
+
+    secteur = secteur or metadata.get('secteur')
+    result['metadata'] = {
+        **metadata,
+        'secteur': secteur or '',
+        'source': BATCH_SOURCE,
+        'fichier_nom': path.name,
+        'date_analyse': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'norms_version': result.get('norms_version')
+    }
+    return result
+
+
+def _init_worker():
+    """Initialisation d'un processus de rendu : styles construits une fois pour tout le lot"""
+    from modules.core.pdf_reports import get_pdf_styles
+    get_pdf_styles()
+
+
+def render_one(path: str, report_type: str = DEFAULT_REPORT_TYPE, secteur: Optional[str] = None) -> RenderResult:
+    """
+    Analyse (si nécessaire) et met en page le rapport d'une entrée
+
+    Returns:
+        tuple: (chemin, octets du PDF ou None, nombre de pages, erreur ou None)
+    """
+    from modules.core.pdf_reports import REPORT_STORIES, render_pdf
+
+    try:
+        result = load_analysis(Path(path), secteur)
+        story = REPORT_STORIES[report_type](result['data'], result['ratios'], result['scores'], result['metadata'])
+        pdf, pages = render_pdf(story)
+        return path, pdf, pages, None
+    except Exception as e:
+        return path, None, 0, f"{type(e).__name__}: {e}"
+
+
+def report_filename(path: Path, report_type: str) -> str:
+    return f"{path.stem}_{report_type}.pdf"
+
+
+class ReportSink:
+    """
+    Destination des rapports : archive ZIP (sortie en .zip) ou répertoire
+
+    L'archive est écrite dans un fichier temporaire puis renommée à la fermeture : une
+    archive présente sous son nom définitif est toujours complète.
+    """
+
+    def __init__(self, output: str):
+        self.output = Path(output)
+        self.names: set = set()
+        self.is_zip = self.output.suffix.lower() == '.zip'
+        if self.is_zip:
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+            fd, self._tmp_path = tempfile.mkstemp(dir=str(self.output.parent), suffix='.tmp')
+            os.close(fd)
+            self._zip = zipfile.ZipFile(self._tmp_path, 'w', compression=zipfile.ZIP_DEFLATED)
+        else:
+            self.output.mkdir(parents=True, exist_ok=True)
+
+    def _unique(self, name: str) -> str:
+        """Deux entrées de même nom (répertoires différents) ne s'écrasent pas"""
+        stem, suffix = os.path.splitext(name)
+        candidate, index = name, 2
+        while candidate in self.names:
+            candidate = f"{stem}_{index}{suffix}"
+            index += 1
+        self.names.add(candidate)
+        return candidate
+
+    def write(self, name: str, payload: bytes) -> str:
+        name = self._unique(name)
+        if self.is_zip:
+            self._zip.writestr(name, payload)
+        else:
+            (self.output / name).write_bytes(payload)
+        return name
+
+    def close(self, commit: bool = True):
+        if not self.is_zip:
+            return
+        self._zip.close()
+        if commit:
+            os.replace(self._tmp_path, self.output)
+        elif os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+
+def render_batch(paths: Iterable[str], output: str, report_type: str = DEFAULT_REPORT_TYPE,
+                 secteur: Optional[str] = None, workers: Optional[int] = None,
+                 progress: Optional[Callable[[int, int, RenderResult], None]] = None) -> Dict[str, Any]:
+    """
+    Rend les rapports de toutes les entrées dans un pool de processus
+
+    Args:
+        paths (iterable): Classeurs, fichiers JSON ou répertoires
+        output (str): Archive .zip ou répertoire de sortie
+        report_type (str): Type de rapport ('detaille' ou 'synthese')
+        secteur (str): Secteur appliqué aux classeurs Excel
+        workers (int): Nombre de processus (nombre de cœurs par défaut)
+        progress (callable): Appelé après chaque rapport avec (fait, total, résultat)
+
+    Returns:
+        dict: Statistiques du lot (rapports, pages, erreurs, débit)
+    """
+    from modules.core.pdf_reports import REPORT_STORIES
+
+    if report_type not in REPORT_STORIES:
+        raise ValueError(f"Type de rapport inconnu : {report_type}")
+
+    inputs = [str(path) for path in collect_inputs(paths)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(inputs) or 1))
+    sink = ReportSink(output)
+    stats: Dict[str, Any] = {'entrees': len(inputs), 'rapports': 0, 'pages': 0, 'octets': 0, 'erreurs': []}
+
+    start = time.perf_counter()
+    committed = False
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            pending = set()
+            queue = iter(inputs)
+            done = 0
+            while True:
+                # Fenêtre bornée : on ne soumet pas tout le portefeuille d'un coup
+                while len(pending) < workers * IN_FLIGHT_PER_WORKER:
+                    path = next(queue, None)
+                    if path is None:
+                        break
+                    pending.add(executor.submit(render_one, path, report_type, secteur))
+                if not pending:
+                    break
+
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    path, pdf, pages, error = result
+                    if error is None:
+                        sink.write(report_filename(Path(path), report_type), pdf)
+                        stats['rapports'] += 1
+                        stats['pages'] += pages
+                        stats['octets'] += len(pdf)
+                    else:
+                        stats['erreurs'].append({'fichier': path, 'erreur': error})
+                    done += 1
+                    if progress is not None:
+                        progress(done, len(inputs), result)
+        committed = True
+    finally:
+        sink.close(commit=committed)
+
+    duration = time.perf_counter() - start
+    stats.update({
+        'processus': workers,
+        'sortie': str(sink.output),
+        'duree_s': round(duration, 2),
+        'pages_par_seconde': round(stats['pages'] / duration, 1) if duration > 0 else None,
+        'rapports_par_seconde': round(stats['rapports'] / duration, 2) if duration > 0 else None
+    })
+    return stats
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    from modules.core.pdf_reports import REPORT_STORIES
+
+    parser = argparse.ArgumentParser(description="Rendu par lots des rapports PDF d'un portefeuille")
+    parser.add_argument('entrees', nargs='+', help="Classeurs Excel, résultats JSON ou répertoires")
+    parser.add_argument('--sortie', required=True, help="Archive .zip ou répertoire de sortie")
+    parser.add_argument('--type', default=DEFAULT_REPORT_TYPE, choices=sorted(REPORT_STORIES),
+                        help="Type de rapport")
+    parser.add_argument('--secteur', default=None, help="Secteur appliqué aux classeurs Excel")
+    parser.add_argument('--processus', type=int, default=None, help="Nombre de processus (défaut : nombre de cœurs)")
+    args = parser.parse_args(argv)
+
+    def progress(done, total, result):
+        path, _, pages, error = result
+        status = f"❌ {error}" if error else f"{pages} page(s)"
+        print(f"[{done}/{total}] {Path(path).name} : {status}")
+
+    stats = render_batch(args.entrees, args.sortie, report_type=args.type, secteur=args.secteur,
+                         workers=args.processus, progress=progress)
+
+    print(f"✅ {stats['rapports']} rapport(s), {stats['pages']} page(s) en {stats['duree_s']} s "
+          f"({stats['pages_par_seconde']} pages/s) -> {stats['sortie']}")
+    print(json.dumps(stats, indent=2, ensure_ascii=False))
+    return 1 if stats['erreurs'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
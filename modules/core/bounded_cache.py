@@ -0,0 +1,86 @@
+"""
+Cache LRU borné en nombre d'entrées et en octets, partagé entre threads
+
+Base commune des caches de l'application (figures sérialisées, rapports PDF) : les
+valeurs sont des chaînes ou des octets immuables, dont la longueur sert de taille.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class BoundedLRUCache:
+    """
+    Cache LRU borné en nombre d'entrées et en taille cumulée des valeurs
+
+    Les sous-classes nomment leurs statistiques (ENTRIES_LABEL...) pour le diagnostic.
+    """
+
+    # Libellés des statistiques de cache_info
+    ENTRIES_LABEL = 'entrees_en_cache'
+    MAX_ENTRIES_LABEL = 'max_entrees'
+    HITS_LABEL = 'lectures'
+    MISSES_LABEL = 'constructions'
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Présence d'une entrée (sans toucher aux statistiques ni à l'ordre LRU)"""
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Valeur d'une entrée (None si absente)"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> Any:
+        """Mémorise une valeur (str ou bytes) ; les entrées les moins récentes sont évincées"""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = value
+            self._bytes += len(value)
+
+            # L'entrée qui vient d'être insérée n'est jamais évincée
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Statistiques du cache pour le diagnostic"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                self.ENTRIES_LABEL: len(self._entries),
+                'taille_mo': round(self._bytes / (1024 * 1024), 2),
+                self.MAX_ENTRIES_LABEL: self.max_entries,
+                'max_mo': round(self.max_bytes / (1024 * 1024), 2),
+                self.HITS_LABEL: self.hits,
+                self.MISSES_LABEL: self.misses,
+                'taux_succes': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions
+            }
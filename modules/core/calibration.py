@@ -0,0 +1,303 @@
+"""
+Calibration hors ligne de la grille de notation sur les défauts observés
+
+Usage :
+    python -m modules.core.calibration historique.csv --cible defaut --sortie data/scoring_grid.json
+
+Le fichier d'entrée (CSV ou Parquet) contient une ligne par entreprise-exercice, une colonne
+par ratio (noms de l'analyseur) et une colonne binaire indiquant le défaut observé.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import optimize
+from scipy.stats import rankdata
+
+from modules.core.norms import DEFAULT_DATA_DIR
+from modules.core.scoring import DEFAULT_SCORING_GRID, SCORING_GRID_NORMS, copy_grid, score_frame
+
+
+def isotonic_fit(counts: np.ndarray, defaults: np.ndarray, increasing: bool = True) -> np.ndarray:
+    """
+    Régression isotonique pondérée (pool adjacent violators) sur des classes ordonnées
+
+    Args:
+        counts (array): Effectif de chaque classe
+        defaults (array): Nombre de défauts de chaque classe
+        increasing (bool): Taux de défaut croissant (sinon décroissant) avec la valeur
+
+    Returns:
+        array: Taux de défaut ajusté de chaque classe
+    """
+    counts = np.asarray(counts, dtype=float)
+    rates = np.divide(defaults, counts, out=np.zeros_like(counts), where=counts > 0)
+    if not increasing:
+        return isotonic_fit(counts[::-1], defaults[::-1], increasing=True)[::-1]
+
+    # Blocs (taux, poids, nombre de classes) fusionnés tant que l'ordre est violé
+    block_rates, block_weights, block_sizes = [], [], []
+    for rate, weight in zip(rates, counts):
+        block_rates.append(rate)
+        block_weights.append(weight)
+        block_sizes.append(1)
+        while len(block_rates) > 1 and block_rates[-2] > block_rates[-1]:
+            weight_total = block_weights[-2] + block_weights[-1]
+            merged = ((block_rates[-2] * block_weights[-2] + block_rates[-1] * block_weights[-1]) / weight_total
+                      if weight_total > 0 else block_rates[-1])
+            size = block_sizes[-2] + block_sizes[-1]
+            del block_rates[-1], block_weights[-1], block_sizes[-1]
+            block_rates[-1], block_weights[-1], block_sizes[-1] = merged, weight_total, size
+
+    return np.repeat(block_rates, block_sizes)
+
+
+def optimal_bands(counts: np.ndarray, defaults: np.ndarray, n_bands: int,
+                  min_share: float = 0.02) -> Optional[List[int]]:
+    """
+    Découpe optimale de classes ordonnées en tranches contiguës (programmation dynamique)
+
+    Minimise la somme des variances binomiales intra-tranche, chaque tranche devant
+    contenir au moins `min_share` des observations.
+
+    Returns:
+        list: Indices de classe où commence chaque tranche (hors la première), ou None
+    """
+    n_bins = len(counts)
+    if n_bins < n_bands:
+        return None
+
+    cum_n = np.concatenate([[0.0], np.cumsum(counts)])
+    cum_d = np.concatenate([[0.0], np.cumsum(defaults)])
+    min_count = min_share * cum_n[-1]
+
+    # cost[i, j] : coût de la tranche couvrant les classes i..j-1
+    seg_n = cum_n[None, :] - cum_n[:, None]
+    seg_d = cum_d[None, :] - cum_d[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cost = seg_d - np.where(seg_n > 0, seg_d ** 2 / seg_n, 0.0)
+    cost[seg_n < max(min_count, 1e-12)] = np.inf
+    cost[np.tril_indices(n_bins + 1)] = np.inf
+
+    best = np.full((n_bands + 1, n_bins + 1), np.inf)
+    argbest = np.zeros((n_bands + 1, n_bins + 1), dtype=int)
+    best[0, 0] = 0.0
+    for m in range(1, n_bands + 1):
+        candidates = best[m - 1][:, None] + cost
+        argbest[m] = np.argmin(candidates, axis=0)
+        best[m] = candidates[argbest[m], np.arange(n_bins + 1)]
+
+    if not np.isfinite(best[n_bands, n_bins]):
+        return None
+
+    starts, end = [], n_bins
+    for m in range(n_bands, 0, -1):
+        end = argbest[m, end]
+        starts.append(end)
+    return sorted(starts)[1:]
+
+
+def roc_auc(risk: np.ndarray, target: np.ndarray) -> float:
+    """Aire sous la courbe ROC (statistique de Mann-Whitney, calcul vectorisé)"""
+    target = np.asarray(target).astype(bool)
+    n_pos = target.sum()
+    n_neg = len(target) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return float('nan')
+    ranks = rankdata(risk)
+    return float((ranks[target].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+
+class ScoreCalibrator:
+    """Ajuste les seuils des tranches et les poids des catégories sur des défauts observés"""
+
+    def __init__(self, base_grid: Optional[Dict[str, Any]] = None, n_bins: int = 200,
+                 min_band_share: float = 0.02, l2: float = 1e-4):
+        self.base_grid = copy_grid(base_grid or DEFAULT_SCORING_GRID)
+        self.n_bins = n_bins
+        self.min_band_share = min_band_share
+        self.l2 = l2
+        self.report: Dict[str, Any] = {}
+
+    def _bin(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Répartit les valeurs en classes de même effectif (bornes = quantiles)"""
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, self.n_bins + 1)))
+        bins = np.searchsorted(edges[1:-1], values, side='right')
+        return edges, bins
+
+    def calibrate_criterion(self, values: np.ndarray, target: np.ndarray,
+                            critere: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Recalcule seuils et points d'un critère à partir des taux de défaut observés
+
+        Args:
+            values (array): Valeurs du ratio
+            target (array): Défaut observé (0/1)
+            critere (dict): Critère de la grille de départ
+
+        Returns:
+            dict: Critère calibré (ou le critère de départ si les données sont insuffisantes)
+        """
+        finite = np.isfinite(values)
+        values, target = values[finite], target[finite]
+        n_bands = len(critere['points'])
+        if len(values) < 10 * n_bands or target.min() == target.max():
+            return dict(critere)
+
+        edges, bins = self._bin(values)
+        counts = np.bincount(bins, minlength=len(edges) - 1).astype(float)
+        defaults = np.bincount(bins, weights=target, minlength=len(edges) - 1)
+
+        hausse = critere['sens'] == 'hausse'
+        fitted = isotonic_fit(counts, defaults, increasing=not hausse)
+        starts = optimal_bands(counts, fitted * counts, n_bands, self.min_band_share)
+        if starts is None:
+            return dict(critere)
+
+        bounds = [0] + starts + [len(counts)]
+        band_rates = np.array([
+            defaults[a:b].sum() / counts[a:b].sum() for a, b in zip(bounds[:-1], bounds[1:])
+        ])
+        thresholds = [float(edges[start]) for start in starts]
+
+        if hausse:
+            # Meilleure tranche = valeurs les plus élevées
+            band_rates = band_rates[::-1]
+            thresholds = thresholds[::-1]
+
+        points_max, points_min = critere['points'][0], critere['points'][-1]
+        rate_best, rate_worst = band_rates[0], band_rates[-1]
+        if rate_worst > rate_best:
+            points = [int(round(points_min + (points_max - points_min) * (rate_worst - rate) / (rate_worst - rate_best)))
+                      for rate in band_rates]
+        else:
+            points = list(critere['points'])
+
+        return {
+            'ratio': critere['ratio'],
+            'sens': critere['sens'],
+            'seuils': [round(t, 6) for t in thresholds],
+            'points': points,
+            # Les bornes de classe appartiennent à la tranche supérieure
+            'strict': not hausse,
+            'taux_defaut_tranches': [round(float(rate), 6) for rate in band_rates]
+        }
+
+    def fit_category_weights(self, scores: pd.DataFrame, target: np.ndarray,
+                             grid: Dict[str, Any]) -> Dict[str, float]:
+        """Poids des catégories par régression logistique sur les scores normalisés"""
+        categories = [c for c, spec in grid['categories'].items() if spec.get('max')]
+        X = np.column_stack([scores[c].to_numpy() / grid['categories'][c]['max'] for c in categories])
+        X = np.column_stack([np.ones(len(X)), X])
+        y = np.asarray(target, dtype=float)
+
+        def loss(beta):
+            z = X @ beta
+            log_loss = np.mean(np.logaddexp(0, z) - y * z) + self.l2 * np.sum(beta[1:] ** 2)
+            gradient = X.T @ (1 / (1 + np.exp(-z)) - y) / len(y)
+            gradient[1:] += 2 * self.l2 * beta[1:]
+            return log_loss, gradient
+
+        result = optimize.minimize(loss, np.zeros(X.shape[1]), jac=True, method='L-BFGS-B')
+        raw = np.maximum(-result.x[1:], 0)
+
+        if raw.sum() <= 0:
+            total_max = sum(grid['categories'][c]['max'] for c in categories)
+            return {c: grid['categories'][c]['max'] / total_max for c in categories}
+
+        return {c: round(float(w), 6) for c, w in zip(categories, raw / raw.sum())}
+
+    def fit(self, frame: pd.DataFrame, target: str = 'defaut') -> Dict[str, Any]:
+        """
+        Calibre la grille complète
+
+        Args:
+            frame (DataFrame): Ratios (une colonne par ratio) et colonne cible
+            target (str): Nom de la colonne de défaut (0/1)
+
+        Returns:
+            dict: Grille calibrée, au format attendu par modules/core/scoring.py
+        """
+        start = time.time()
+        y = pd.to_numeric(frame[target], errors='coerce').fillna(0).to_numpy(dtype=float)
+        grid = copy_grid(self.base_grid)
+
+        for spec in grid['categories'].values():
+            spec['criteres'] = [
+                self.calibrate_criterion(
+                    pd.to_numeric(frame[critere['ratio']], errors='coerce').to_numpy(dtype=float), y, critere
+                ) if critere['ratio'] in frame.columns else dict(critere)
+                for critere in spec['criteres']
+            ]
+
+        scores = score_frame(frame, grid)
+        grid['poids_categories'] = self.fit_category_weights(scores, y, grid)
+        calibrated = score_frame(frame, grid)['global'].to_numpy()
+        initial = score_frame(frame, self.base_grid)['global'].to_numpy()
+
+        grid['version'] = f"calibree-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        self.report = {
+            'n_observations': int(len(frame)),
+            'taux_defaut': round(float(y.mean()), 6) if len(y) else 0.0,
+            'auc_initiale': round(roc_auc(-initial, y), 4),
+            'auc_calibree': round(roc_auc(-calibrated, y), 4),
+            'duree_secondes': round(time.time() - start, 2),
+            'date_calibration': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        grid['calibration'] = self.report
+        return grid
+
+
+def save_grid(grid: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    """
+    Écrit la grille en remplaçant le fichier de façon atomique
+
+    Le registre des normes ne lit ainsi jamais un fichier à moitié écrit.
+    """
+    path = Path(path) if path else DEFAULT_DATA_DIR / f"{SCORING_GRID_NORMS}.json"
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(grid, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return path
+
+
+def load_labelled_data(path: str) -> pd.DataFrame:
+    """Charge l'historique étiqueté (CSV ou Parquet)"""
+    if str(path).lower().endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Calibration de la grille de notation sur les défauts observés")
+    parser.add_argument('historique', help="Fichier CSV ou Parquet des entreprises-exercices étiquetées")
+    parser.add_argument('--cible', default='defaut', help="Colonne indiquant le défaut (0/1)")
+    parser.add_argument('--sortie', default=None, help="Fichier de normes produit (défaut : data/scoring_grid.json)")
+    parser.add_argument('--classes', type=int, default=200, help="Nombre de classes de quantiles par ratio")
+    args = parser.parse_args(argv)
+
+    frame = load_labelled_data(args.historique)
+    calibrator = ScoreCalibrator(n_bins=args.classes)
+    grid = calibrator.fit(frame, target=args.cible)
+    path = save_grid(grid, args.sortie)
+
+    print(f"✅ Grille calibrée écrite dans {path}")
+    print(json.dumps(calibrator.report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Comparaison de plusieurs analyses (entreprises côte à côte) sans recalcul
+
+Les ratios et scores déjà calculés de chaque analyse sont assemblés en une matrice
+analyse × indicateur ; les écarts à l'analyse de référence sont obtenus en une seule
+opération vectorisée.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from modules.core.recommendations import SCORE_PREFIX
+
+
+def analysis_label(result: Mapping, default: str = 'Analyse') -> str:
+    """Libellé lisible d'une analyse (entreprise, fichier importé ou date)"""
+    metadata = result.get('metadata', {})
+    return str(
+        metadata.get('entreprise') or metadata.get('fichier_nom')
+        or metadata.get('date_analyse') or default
+    )
+
+
+def build_comparison_frame(results: Mapping[str, Mapping]) -> pd.DataFrame:
+    """
+    Matrice analyse × indicateur (ratios puis scores préfixés 'score_')
+
+    Args:
+        results (dict): libellé -> résultat d'analyse (AnalysisResult ou dict équivalent)
+    """
+    rows = {}
+    for label, result in results.items():
+        row = {name: value for name, value in result.get('ratios', {}).items()
+               if isinstance(value, (int, float)) and not isinstance(value, bool)}
+        row.update({f"{SCORE_PREFIX}{categorie}": value for categorie, value in result.get('scores', {}).items()
+                    if isinstance(value, (int, float)) and not isinstance(value, bool)})
+        rows[label] = row
+    return pd.DataFrame.from_dict(rows, orient='index').astype(float)
+
+
+def compare_analyses(results: Mapping[str, Mapping], reference: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compare plusieurs analyses à une analyse de référence
+
+    Args:
+        results (dict): libellé -> résultat d'analyse
+        reference (str): Libellé de la référence (la première analyse par défaut)
+
+    Returns:
+        dict: 'valeurs' (analyse × indicateur), 'ecarts' (valeur - référence),
+        'ecarts_pct' (écart relatif en % de |référence|, NaN si référence nulle)
+        et 'reference'
+    """
+    valeurs = build_comparison_frame(results)
+    if valeurs.empty:
+        return {'valeurs': valeurs, 'ecarts': valeurs, 'ecarts_pct': valeurs, 'reference': None}
+
+    reference = reference if reference in valeurs.index else valeurs.index[0]
+    base = valeurs.loc[reference].to_numpy()
+
+    matrix = valeurs.to_numpy()
+    ecarts = matrix - base
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ecarts_pct = np.where(base != 0, ecarts / np.abs(base) * 100, np.nan)
+
+    return {
+        'valeurs': valeurs,
+        'ecarts': pd.DataFrame(ecarts, index=valeurs.index, columns=valeurs.columns),
+        'ecarts_pct': pd.DataFrame(ecarts_pct, index=valeurs.index, columns=valeurs.columns),
+        'reference': reference
+    }
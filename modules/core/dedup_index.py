@@ -0,0 +1,167 @@
+"""
+Index de déduplication des classeurs importés (empreinte du contenu extrait)
+
+Plusieurs analystes importent souvent la même liasse dans la journée. L'empreinte est
+calculée après extraction (postes financiers normalisés, secteur, version des normes) et
+non sur les octets du fichier : un classeur réenregistré, renommé ou dont seule la mise
+en forme a changé retrouve l'analyse existante, sans nouvelle notation. L'index ne
+conserve que l'identifiant de l'analyse ; le résultat lui-même reste dans le stockage
+partagé (analysis_store).
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from modules.core.analysis_result import AnalysisResult, content_hash
+
+# Bornes par défaut de l'index
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_TTL_HOURS = 24.0
+
+# Durée de validité d'une empreinte (heures, modifiable par variable d'environnement)
+TTL_ENV = 'OPTIMUSCREDIT_DEDUP_TTL_HOURS'
+
+# Précision des montants comparés (les montants XOF n'ont pas de décimales utiles)
+AMOUNT_DECIMALS = 2
+
+
+def normalize_amounts(data: Mapping[str, Any]) -> Dict[str, float]:
+    """
+    Postes comparables d'un état financier extrait
+
+    Seuls les montants non nuls sont retenus (un poste vide et un poste à zéro sont
+    équivalents), arrondis pour absorber les écarts de représentation des flottants.
+    """
+    amounts = {}
+    for key, value in data.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        value = float(value)
+        if math.isnan(value):
+            continue
+        value = round(value, AMOUNT_DECIMALS) + 0.0
+        if value:
+            amounts[key] = value
+    return amounts
+
+
+def statement_key(data: Mapping[str, Any], secteur: Optional[str], norms_version: Optional[str] = None) -> str:
+    """
+    Empreinte d'une soumission : postes normalisés, secteur et version des normes
+
+    Le secteur et la version des normes en font partie car ils changent le score.
+    """
+    if norms_version is None:
+        from modules.core.norms import get_norms_version
+        norms_version = get_norms_version()
+    return content_hash(normalize_amounts(data), secteur or '', norms_version)
+
+
+class DedupIndex:
+    """
+    Empreinte de contenu -> identifiant de l'analyse déjà calculée
+
+    L'index est borné (les empreintes les moins récemment utilisées sont oubliées) et
+    chaque empreinte expire après la durée de validité. Une empreinte dont l'analyse a
+    quitté le stockage partagé est retirée à la première consultation.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_hours: float = DEFAULT_TTL_HOURS, store=None):
+        self.max_entries = max_entries
+        self.ttl = ttl_hours * 3600
+        self._store = store
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[str, float]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.orphans = 0
+
+    @property
+    def store(self):
+        if self._store is None:
+            from modules.core.analysis_store import get_analysis_store
+            self._store = get_analysis_store()
+        return self._store
+
+    def lookup(self, key: str) -> Optional[Tuple[str, AnalysisResult]]:
+        """
+        Analyse existante pour une empreinte
+
+        Returns:
+            tuple: (identifiant de l'analyse, résultat stocké), None si aucune analyse valide
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            analysis_id, registered_at = entry
+            if time.time() - registered_at > self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+
+        result = self.store.get(analysis_id)
+        with self._lock:
+            if result is None:
+                if self._entries.get(key, (None,))[0] == analysis_id:
+                    del self._entries[key]
+                self.orphans += 1
+                self.misses += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        return analysis_id, result
+
+    def register(self, key: str, analysis_id: str):
+        """Associe une empreinte à l'analyse qui vient d'être calculée"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (analysis_id, time.time())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Oublie toutes les empreintes (les compteurs sont conservés)"""
+        with self._lock:
+            self._entries.clear()
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Statistiques de l'index pour le diagnostic"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'empreintes': len(self._entries),
+                'max_empreintes': self.max_entries,
+                'validite_h': round(self.ttl / 3600, 2),
+                'doublons_evites': self.hits,
+                'nouvelles_analyses': self.misses,
+                'taux_succes': round(self.hits / lookups, 3) if lookups else None,
+                'expirees': self.expired,
+                'analyses_disparues': self.orphans
+            }
+
+
+_index: Optional[DedupIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_dedup_index() -> DedupIndex:
+    """Retourne l'index de déduplication partagé par tout le processus"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    ttl_hours = float(os.environ.get(TTL_ENV, DEFAULT_TTL_HOURS))
+                except ValueError:
+                    ttl_hours = DEFAULT_TTL_HOURS
+                _index = DedupIndex(ttl_hours=ttl_hours)
+    return _index
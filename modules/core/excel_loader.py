@@ -7,6 +7,9 @@ import numpy as np
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from modules.core.reconstruction import reconstruct_record, reconstruct_frame, INDETERMINE
+from modules.core.validation import validate_record
+
 class ExcelDataLoader:
     """Chargeur de données Excel pour l'analyse financière BCEAO - Extraction précise"""
     
@@ -21,8 +24,10 @@ class ExcelDataLoader:
             'immobilisations_corporelles': 'E10', 
             'immobilisations_financieres': 'E18',
             'total_actif_immobilise': 'E21',
+            'actif_circulant_hao': 'E22',
             'stocks_et_encours': 'E23',
             'creances_et_emplois': 'E24',
+            'fournisseurs_avances_versees': 'E25',
             'clients': 'E26',
             'autres_creances': 'E27',
             'total_actif_circulant': 'E28',
@@ -35,16 +40,22 @@ class ExcelDataLoader:
             
             # === PASSIF ===
             'capital': 'I5',
+            'actionnaires_capital_non_appele': 'I6',
+            'primes_capital': 'I7',
+            'ecarts_reevaluation': 'I8',
             'reserves_indisponibles': 'I9',
             'reserves_libres': 'I10',
             'report_nouveau': 'I11',
             'resultat_net_exercice': 'I12',
+            'subventions_investissement': 'I13',
+            'provisions_reglementees': 'I14',
             'total_capitaux_propres': 'I15',
             'emprunts_dettes_financieres': 'I17',
             'dettes_location': 'I18',
             'provisions_financieres': 'I19',
             'total_dettes_financieres': 'I20',
             'total_ressources_stables': 'I21',
+            'dettes_circulantes_hao': 'I22',
             'clients_avances_recues': 'I23',
             'fournisseurs_exploitation': 'I24',
             'dettes_sociales_fiscales': 'I25',
@@ -58,33 +69,114 @@ class ExcelDataLoader:
             'total_general_passif': 'I35'
         }
         
-        # Note: Le CR et TFT sont aussi dans la feuille Bilan selon votre document
+        # Feuille CR : lignes et soldes intermédiaires du modèle (charges saisies en négatif)
         self.cr_mapping = {
-            'ventes_marchandises': ('Bilan', 'E5'),  # En fait feuille CR mais référencée dans Bilan
-            'achats_marchandises': ('Bilan', 'E6'),
-            'marge_commerciale': ('Bilan', 'E8'),
-            'chiffre_affaires': ('Bilan', 'E12'),
-            'valeur_ajoutee': ('Bilan', 'E27'),
-            'charges_personnel': ('Bilan', 'E28'),
-            'excedent_brut_exploitation': ('Bilan', 'E30'),
-            'resultat_exploitation': ('Bilan', 'E34'),
-            'resultat_financier': ('Bilan', 'E35'),
-            'resultat_activites_ordinaires': ('Bilan', 'E35'),
-            'resultat_net': ('Bilan', 'E35')
+            'ventes_marchandises': 'E5',
+            'achats_marchandises': 'E6',
+            'variation_stocks_marchandises': 'E7',
+            'marge_commerciale': 'E8',
+            'ventes_produits_fabriques': 'E9',
+            'travaux_services_vendus': 'E10',
+            'produits_accessoires': 'E11',
+            'chiffre_affaires': 'E12',
+            'production_stockee': 'E13',
+            'production_immobilisee': 'E14',
+            'subventions_exploitation': 'E15',
+            'autres_produits': 'E16',
+            'transferts_charges_exploitation': 'E17',
+            'achats_matieres_premieres': 'E18',
+            'variation_stocks_mp': 'E19',
+            'autres_achats': 'E20',
+            'variation_stocks_autres': 'E21',
+            'transports': 'E22',
+            'services_exterieurs': 'E23',
+            'impots_taxes': 'E24',
+            'autres_charges': 'E25',
+            'valeur_ajoutee': 'E26',
+            'charges_personnel': 'E27',
+            'excedent_brut_exploitation': 'E28',
+            'reprises_amortissements': 'E29',
+            'dotations_amortissements': 'E30',
+            'resultat_exploitation': 'E31',
+            'revenus_financiers': 'E32',
+            'reprises_provisions_financieres': 'E33',
+            'transferts_charges_financieres': 'E34',
+            'frais_financiers': 'E35',
+            'dotations_provisions_financieres': 'E36',
+            'resultat_financier': 'E37',
+            'resultat_activites_ordinaires': 'E38',
+            'produits_cessions_immob': 'E39',
+            'autres_produits_hao': 'E40',
+            'valeurs_comptables_cessions': 'E41',
+            'autres_charges_hao': 'E42',
+            'resultat_hao': 'E43',
+            'participation_travailleurs': 'E44',
+            'impots_resultat': 'E45',
+            'resultat_net': 'E46'
         }
         
+        # Feuille TFT
         self.tft_mapping = {
-            'tresorerie_ouverture': ('Bilan', 'E5'),
-            'flux_activites_operationnelles': ('Bilan', 'E13'),
-            'flux_activites_investissement': ('Bilan', 'E21'),
-            'flux_activites_financement': ('Bilan', 'E35'),
-            'variation_tresorerie': ('Bilan', 'E35'),
-            'tresorerie_cloture': ('Bilan', 'E35')
+            'tresorerie_ouverture': 'E3',
+            'cafg': 'E5',
+            'flux_activites_operationnelles': 'E11',
+            'flux_activites_investissement': 'E18',
+            'flux_capitaux_propres': 'E24',
+            'flux_capitaux_etrangers': 'E29',
+            'flux_activites_financement': 'E30',
+            'variation_tresorerie': 'E31',
+            'tresorerie_cloture': 'E32'
+        }
+        
+        # Correspondance entre les champs extraits et les champs des identités SYSCOHADA
+        self.identity_aliases = {
+            'total_actif_immobilise': 'immobilisations_nettes',
+            'stocks_et_encours': 'stocks',
+            'creances_et_emplois': 'creances',
+            'clients': 'creances_clients',
+            'titres_de_placement': 'titres_placement',
+            'valeurs_a_encaisser': 'valeurs_encaisser',
+            'total_tresorerie_actif': 'tresorerie',
+            'total_general_actif': 'total_actif',
+            'resultat_net_exercice': 'resultat_net_bilan',
+            'total_capitaux_propres': 'capitaux_propres',
+            'dettes_location': 'dettes_location_acquisition',
+            'total_dettes_financieres': 'dettes_financieres',
+            'total_ressources_stables': 'ressources_stables',
+            'provisions_court_terme': 'provisions_risques_ct',
+            'total_passif_circulant': 'dettes_court_terme',
+            'total_tresorerie_passif': 'tresorerie_passif',
+            'total_general_passif': 'total_passif',
+            'excedent_brut_exploitation': 'excedent_brut'
         }
+        
+        # Rapport de la dernière reconstitution (valeurs déduites et indéterminées)
+        self.derniere_reconstruction = None
     
     def load_excel_template(self, file_path: str) -> Optional[Dict[str, float]]:
         """Charge un fichier Excel et extrait les données financières avec précision"""
         
+        financial_data = self._extract_raw_data(file_path)
+        if financial_data is None:
+            return None
+        
+        try:
+            # Reconstituer les agrégats manquants à partir des identités comptables
+            financial_data = self._calculate_financial_aggregates(financial_data)
+            
+            # Validation et nettoyage
+            financial_data = self._clean_and_validate_data(financial_data)
+            
+            print(f"✅ Extraction réussie: {len(financial_data)} indicateurs extraits")
+            return financial_data
+            
+        except Exception as e:
+            print(f"❌ Erreur lors du chargement Excel: {e}")
+            return None
+    
+    def _extract_raw_data(self, file_path: str) -> Optional[Dict[str, float]]:
+        """Extrait les valeurs brutes des feuilles Bilan, CR et TFT (None = cellule vide)"""
+        
         try:
             print(f"📂 Chargement du fichier: {file_path}")
             
@@ -111,7 +203,6 @@ class ExcelDataLoader:
                 return None
             
             # === EXTRACTION CR ET TFT ===
-            # Selon votre document, CR et TFT sont référencés dans la feuille Bilan
             cr_data = self._extract_cr_precise(excel_file)
             financial_data.update(cr_data)
             print(f"✅ CR: {len(cr_data)} éléments extraits")
@@ -120,13 +211,6 @@ class ExcelDataLoader:
             financial_data.update(tft_data)
             print(f"✅ TFT: {len(tft_data)} éléments extraits")
             
-            # CORRECTION : Calculer les agrégats financiers
-            financial_data = self._calculate_financial_aggregates(financial_data)
-            
-            # Validation et nettoyage
-            financial_data = self._clean_and_validate_data(financial_data)
-            
-            print(f"✅ Extraction réussie: {len(financial_data)} indicateurs extraits")
             return financial_data
             
         except Exception as e:
@@ -146,15 +230,14 @@ class ExcelDataLoader:
             # Extraire chaque valeur selon le mapping précis
             for field_name, cell_address in self.bilan_mapping.items():
                 try:
-                    value = self._get_cell_value(df, cell_address)
-                    if value is not None and value != 0:
-                        bilan_data[field_name] = float(value)
+                    # Cellule vide = valeur manquante, reconstituée ensuite si elle est déterminée
+                    value = self._get_cell_value(df, cell_address, default=None)
+                    bilan_data[field_name] = value
+                    if value:
                         print(f"  ✓ {field_name}: {value:,.0f} (cellule {cell_address})")
-                    else:
-                        bilan_data[field_name] = 0.0
                 except Exception as e:
                     print(f"  ❌ Erreur extraction {field_name} ({cell_address}): {e}")
-                    bilan_data[field_name] = 0.0
+                    bilan_data[field_name] = None
             
             return bilan_data
             
@@ -180,21 +263,11 @@ class ExcelDataLoader:
                 df_cr = pd.read_excel(excel_file, sheet_name='CR', header=None)
                 print(f"📊 Dimensions feuille CR: {df_cr.shape}")
                 
-                # Mapping pour la feuille CR
-                cr_specific_mapping = {
-                    'chiffre_affaires': 'E12',
-                    'resultat_net': 'E35',  # Dernière ligne généralement
-                    'marge_commerciale': 'E8',
-                    'valeur_ajoutee': 'E27',
-                    'excedent_brut_exploitation': 'E30',
-                    'resultat_exploitation': 'E34'
-                }
-                
-                for field_name, cell_address in cr_specific_mapping.items():
+                for field_name, cell_address in self.cr_mapping.items():
                     try:
-                        value = self._get_cell_value(df_cr, cell_address)
-                        if value is not None:
-                            cr_data[field_name] = float(value)
+                        value = self._get_cell_value(df_cr, cell_address, default=None)
+                        cr_data[field_name] = value
+                        if value:
                             print(f"  ✓ {field_name}: {value:,.0f} (CR-{cell_address})")
                     except Exception as e:
                         print(f"  ❌ Erreur extraction CR {field_name}: {e}")
@@ -223,20 +296,11 @@ class ExcelDataLoader:
                 df_tft = pd.read_excel(excel_file, sheet_name='TFT', header=None)
                 print(f"📊 Dimensions feuille TFT: {df_tft.shape}")
                 
-                # Mapping pour la feuille TFT
-                tft_specific_mapping = {
-                    'tresorerie_ouverture': 'E5',
-                    'flux_activites_operationnelles': 'E13',
-                    'flux_activites_investissement': 'E21',
-                    'flux_activites_financement': 'E35',
-                    'tresorerie_cloture': 'E35'  # Dernière ligne
-                }
-                
-                for field_name, cell_address in tft_specific_mapping.items():
+                for field_name, cell_address in self.tft_mapping.items():
                     try:
-                        value = self._get_cell_value(df_tft, cell_address)
-                        if value is not None:
-                            tft_data[field_name] = float(value)
+                        value = self._get_cell_value(df_tft, cell_address, default=None)
+                        tft_data[field_name] = value
+                        if value:
                             print(f"  ✓ {field_name}: {value:,.0f} (TFT-{cell_address})")
                     except Exception as e:
                         print(f"  ❌ Erreur extraction TFT {field_name}: {e}")
@@ -247,8 +311,8 @@ class ExcelDataLoader:
             print(f"❌ Erreur extraction TFT: {e}")
             return {}
     
-    def _get_cell_value(self, df, cell_address):
-        """Extrait la valeur d'une cellule spécifique (ex: 'E5')"""
+    def _get_cell_value(self, df, cell_address, default: Optional[float] = 0.0):
+        """Extrait la valeur d'une cellule spécifique (ex: 'E5'), ou default si elle est vide"""
         
         try:
             # Convertir l'adresse de cellule en coordonnées
@@ -267,14 +331,14 @@ class ExcelDataLoader:
             # Vérifier que les coordonnées sont valides
             if row_index >= len(df) or col_index >= len(df.columns):
                 print(f"  ⚠️ Cellule {cell_address} hors limites ({row_index}, {col_index})")
-                return 0.0
+                return default
             
             # Extraire la valeur
             value = df.iloc[row_index, col_index]
             
             # Convertir en numérique si possible
             if pd.isna(value):
-                return 0.0
+                return default
             
             # Essayer de convertir en float
             try:
@@ -286,77 +350,108 @@ class ExcelDataLoader:
                     numbers = re.findall(r'-?\d+(?:\.\d+)?', value.replace(',', '.'))
                     if numbers:
                         return float(numbers[0])
-                return 0.0
+                return default
                 
         except Exception as e:
             print(f"  ❌ Erreur lecture cellule {cell_address}: {e}")
-            return 0.0
+            return default
     
     def _calculate_financial_aggregates(self, data: Dict[str, float]) -> Dict[str, float]:
-        """Calcule les agrégats financiers nécessaires pour l'analyse"""
+        """Reconstitue les agrégats financiers à partir des identités comptables SYSCOHADA"""
         
         try:
-            # === CALCULS BASÉS SUR LES DONNÉES EXTRAITES ===
-            
-            # Total actif = total général actif
-            data['total_actif'] = data.get('total_general_actif', 0)
-            
-            # Actif circulant = total actif circulant
-            data['actif_circulant'] = data.get('total_actif_circulant', 0)
-            
-            # Immobilisations = total actif immobilisé
-            data['immobilisations'] = data.get('total_actif_immobilise', 0)
-            
-            # Trésorerie = trésorerie actif (uniquement)
-            data['tresorerie'] = data.get('total_tresorerie_actif', 0)
-            
-            # Créances = créances et emplois assimilés + clients
-            data['creances'] = data.get('creances_et_emplois', 0) + data.get('clients', 0)
-            
-            # Stocks = stocks et en-cours
-            data['stocks'] = data.get('stocks_et_encours', 0)
-            
-            # Capitaux propres = total capitaux propres
-            data['capitaux_propres'] = data.get('total_capitaux_propres', 0)
-            
-            # Dettes financières = total dettes financières
-            data['dettes_financieres'] = data.get('total_dettes_financieres', 0)
-            
-            # Dettes court terme = total passif circulant
-            data['dettes_court_terme'] = data.get('total_passif_circulant', 0)
-            
-            # Dettes totales = dettes financières + passif circulant
-            data['dettes_totales'] = data['dettes_financieres'] + data['dettes_court_terme']
-            
-            # Résultat net = résultat net de l'exercice
-            data['resultat_net'] = data.get('resultat_net_exercice', 0)
-            
-            # Si pas de chiffre d'affaires dans CR, estimer
-            if 'chiffre_affaires' not in data or data['chiffre_affaires'] == 0:
-                data['chiffre_affaires'] = data['total_actif'] * 0.8  # Estimation
-            
-            # Calculer des éléments manquants
-            if 'cout_marchandises' not in data:
-                data['cout_marchandises'] = data['chiffre_affaires'] * 0.7  # Estimation
-            
-            print("✅ Agrégats financiers calculés")
-            return data
+            values, report = reconstruct_record(self._to_identity_fields(data))
+            self._report_reconstruction(report)
+            return self._apply_aggregates(data, values)
             
         except Exception as e:
             print(f"❌ Erreur calcul agrégats: {e}")
             return data
     
+    def _to_identity_fields(self, data: Dict[str, float]) -> Dict[str, float]:
+        """Renomme les champs extraits selon les champs des identités (None = manquant)"""
+        return {self.identity_aliases.get(key, key): value for key, value in data.items()}
+    
+    def _apply_aggregates(self, data: Dict[str, float], values: Dict[str, float]) -> Dict[str, float]:
+        """Complète les données avec les valeurs déterminées et les agrégats de l'analyse"""
+        
+        # Valeurs fournies ou déduites exactement ; les indéterminées restent absentes
+        data.update(values)
+        
+        if 'total_actif_circulant' in values:
+            data['actif_circulant'] = values['total_actif_circulant']
+        if 'immobilisations_nettes' in values:
+            data['immobilisations'] = values['immobilisations_nettes']
+        
+        # Dettes totales = dettes financières + passif circulant
+        if 'dettes_financieres' in values and 'dettes_court_terme' in values:
+            data['dettes_totales'] = values['dettes_financieres'] + values['dettes_court_terme']
+        
+        # Coût des marchandises vendues = achats + variation de stocks (saisis en négatif)
+        if 'achats_marchandises' in values and 'variation_stocks_marchandises' in values:
+            data['cout_marchandises'] = -(values['achats_marchandises'] + values['variation_stocks_marchandises'])
+        
+        return data
+    
+    def _report_reconstruction(self, report: Dict[str, Any]):
+        """Mémorise et affiche le résultat de la reconstitution"""
+        
+        self.derniere_reconstruction = report
+        print(f"✅ Agrégats reconstitués: {len(report['deduits'])} déduits, "
+              f"{len(report['mis_a_zero'])} lignes vides à zéro, "
+              f"{len(report['indetermines'])} indéterminés")
+        
+        for identity in report['incoherences']:
+            print(f"  ⚠️ Identité comptable non respectée: {identity}")
+    
+    def load_excel_batch(self, file_paths) -> Dict[str, Optional[Dict[str, float]]]:
+        """
+        Charge un lot de fichiers Excel et reconstitue leurs agrégats en une seule passe
+        
+        Args:
+            file_paths: Chemins des fichiers Excel
+            
+        Returns:
+            dict: Données financières par chemin (None si le fichier est illisible)
+        """
+        extracted = {str(path): self._extract_raw_data(path) for path in file_paths}
+        readable = [path for path, data in extracted.items() if data is not None]
+        
+        if readable:
+            frame = pd.DataFrame(
+                [self._to_identity_fields(extracted[path]) for path in readable],
+                index=readable
+            ).astype(float)
+            result = reconstruct_frame(frame)
+            statuts = result['statuts']
+            print(f"✅ Lot reconstitué: {len(readable)} fichiers, "
+                  f"{int((statuts == INDETERMINE).to_numpy().sum())} valeurs indéterminées, "
+                  f"{int(result['incoherences'].to_numpy().sum())} incohérences")
+            
+            for path in readable:
+                row = result['valeurs'].loc[path]
+                determined = statuts.loc[path] != INDETERMINE
+                values = {name: float(row[name]) for name in row.index[determined.to_numpy()]}
+                extracted[path] = self._clean_and_validate_data(self._apply_aggregates(extracted[path], values))
+        
+        return extracted
+    
     def _clean_and_validate_data(self, data: Dict[str, float]) -> Dict[str, float]:
         """Nettoie et valide les données extraites"""
         
         try:
-            # Nettoyer les valeurs nulles ou aberrantes
+            # Nettoyer les valeurs aberrantes ; les valeurs indéterminées restent absentes
+            # (une cellule vide non déduite n'est pas un zéro et ne doit pas être notée comme tel)
             cleaned_data = {}
+            missing = []
             
             for key, value in data.items():
+                if value is None:
+                    missing.append(key)
+                    continue
                 try:
                     # Convertir en float et nettoyer
-                    clean_value = float(value) if value is not None else 0.0
+                    clean_value = float(value)
                     
                     # Prendre la valeur absolue pour éviter les valeurs négatives non pertinentes
                     if key in ['total_actif', 'actif_circulant', 'tresorerie', 'stocks', 'capitaux_propres']:
@@ -365,13 +460,14 @@ class ExcelDataLoader:
                     cleaned_data[key] = clean_value
                     
                 except (ValueError, TypeError):
-                    cleaned_data[key] = 0.0
+                    missing.append(key)
+            
+            if missing:
+                print(f"ℹ️ {len(missing)} valeurs indéterminées laissées absentes")
             
-            # Validation de cohérence
-            total_actif = cleaned_data.get('total_actif', 0)
-            if total_actif == 0:
-                print("⚠️ Total actif = 0, utilisation de valeurs par défaut")
-                cleaned_data.update(self._get_default_values())
+            # Validation de cohérence : aucune valeur par défaut n'est substituée
+            if cleaned_data.get('total_actif', 0) == 0:
+                print("⚠️ Total actif indéterminé ou nul")
             
             return cleaned_data
             
@@ -379,24 +475,6 @@ class ExcelDataLoader:
             print(f"❌ Erreur nettoyage données: {e}")
             return data
     
-    def _get_default_values(self) -> Dict[str, float]:
-        """Retourne des valeurs par défaut cohérentes"""
-        
-        return {
-            'total_actif': 1000000,
-            'actif_circulant': 400000,
-            'immobilisations': 600000,
-            'tresorerie': 100000,
-            'creances': 200000,
-            'stocks': 100000,
-            'capitaux_propres': 400000,
-            'dettes_financieres': 300000,
-            'dettes_court_terme': 200000,
-            'dettes_totales': 500000,
-            'chiffre_affaires': 800000,
-            'resultat_net': 50000
-        }
-    
     def validate_data(self, financial_data: Dict[str, float]) -> Dict[str, Any]:
         """Valide la cohérence des données financières"""
         
@@ -408,21 +486,16 @@ class ExcelDataLoader:
         }
         
         try:
-            # Validation équilibre bilan
-            total_actif = financial_data.get('total_actif', 0)
-            capitaux_propres = financial_data.get('capitaux_propres', 0)
-            dettes_totales = financial_data.get('dettes_totales', 0)
-            
-            ecart_bilan = abs(total_actif - (capitaux_propres + dettes_totales))
-            pourcentage_ecart = (ecart_bilan / total_actif * 100) if total_actif > 0 else 0
-            
-            if pourcentage_ecart > 5:
-                validation['warnings'].append(f"Écart bilan: {ecart_bilan:,.0f} FCFA ({pourcentage_ecart:.1f}%)")
+            # Règles communes à toutes les saisies (modules/core/validation.py)
+            errors, warnings = validate_record(financial_data)
+            validation['errors'].extend(errors)
+            validation['warnings'].extend(warnings)
+            validation['is_valid'] = not errors
             
             # Informations extraites
-            validation['info'].append(f"Total actif: {total_actif:,.0f} FCFA")
-            validation['info'].append(f"Capitaux propres: {capitaux_propres:,.0f} FCFA")
-            validation['info'].append(f"Dettes totales: {dettes_totales:,.0f} FCFA")
+            validation['info'].append(f"Total actif: {financial_data.get('total_actif', 0):,.0f} FCFA")
+            validation['info'].append(f"Capitaux propres: {financial_data.get('capitaux_propres', 0):,.0f} FCFA")
+            validation['info'].append(f"Dettes totales: {financial_data.get('dettes_totales', 0):,.0f} FCFA")
             validation['info'].append(f"Trésorerie actif: {financial_data.get('tresorerie', 0):,.0f} FCFA")
             validation['info'].append(f"Résultat net: {financial_data.get('resultat_net', 0):,.0f} FCFA")
             
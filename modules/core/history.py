@@ -0,0 +1,302 @@
+"""
+Historique persistant des analyses (SQLite) : une ligne par entreprise-exercice
+
+Les ratios et les scores sont stockés en colonnes (une colonne par ratio) pour permettre
+des requêtes par plage de valeurs ; la clé primaire (entreprise, exercice) et les index
+sur le secteur, l'exercice et la version des normes rendent la lecture de l'historique
+d'une entreprise quasi instantanée.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from modules.core.recommendations import SCORE_PREFIX
+
+DEFAULT_HISTORY_PATH = Path(__file__).parent.parent.parent / "data" / "historique.db"
+HISTORY_PATH_ENV = 'OPTIMUSCREDIT_HISTORY_DB'
+
+TABLE = 'historique'
+
+# Colonnes descriptives (les colonnes de ratios et de scores sont ajoutées à la demande)
+KEY_COLUMNS = ['entreprise', 'exercice']
+INFO_COLUMNS = ['secteur', 'norms_version', 'score_global', 'source', 'date_analyse']
+
+INDEXED_COLUMNS = ['secteur', 'exercice', 'norms_version', 'score_global']
+
+# Lignes lues par aller-retour lors d'un parcours en flux (iter_rows)
+DEFAULT_FETCH_SIZE = 1000
+
+_IDENTIFIER = re.compile(r'^[a-z][a-z0-9_]*$')
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def history_row(result: Mapping, entreprise: Optional[str] = None,
+                exercice: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Ligne d'historique d'un résultat d'analyse
+
+    L'entreprise et l'exercice sont lus dans les métadonnées ('entreprise', 'exercice'),
+    renseignées à l'import ou à la saisie ; ils ne sont jamais déduits du nom du fichier
+    ni de la date de l'analyse, pour ne pas confondre deux entreprises ou deux exercices.
+
+    Returns:
+        dict: Ligne prête à insérer, ou None si l'entreprise ou l'exercice n'est pas renseigné
+    """
+    metadata = result.get('metadata', {})
+    entreprise = str(entreprise or metadata.get('entreprise') or '').strip()
+    if exercice is None:
+        exercice = metadata.get('exercice')
+    try:
+        exercice = int(exercice)
+    except (TypeError, ValueError):
+        return None
+    if not entreprise:
+        return None
+
+    date_analyse = metadata.get('date_analyse') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    scores = result.get('scores', {})
+    row = {
+        'entreprise': entreprise,
+        'exercice': exercice,
+        'secteur': metadata.get('secteur', ''),
+        'norms_version': metadata.get('norms_version', ''),
+        'score_global': scores.get('global'),
+        'source': metadata.get('source', ''),
+        'date_analyse': date_analyse,
+    }
+    row.update({
+        name: float(value) for name, value in result.get('ratios', {}).items()
+        if _IDENTIFIER.match(name) and _is_number(value)
+    })
+    row.update({
+        f"{SCORE_PREFIX}{categorie}": float(value) for categorie, value in scores.items()
+        if categorie != 'global' and _IDENTIFIER.match(categorie) and _is_number(value)
+    })
+    return row
+
+
+class AnalysisHistory:
+    """Historique des analyses dans une base SQLite locale"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or DEFAULT_HISTORY_PATH)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self._columns = self._read_columns()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+                " entreprise TEXT NOT NULL, exercice INTEGER NOT NULL,"
+                " secteur TEXT, norms_version TEXT, score_global REAL, source TEXT, date_analyse TEXT,"
+                " PRIMARY KEY (entreprise, exercice)) WITHOUT ROWID"
+            )
+            for column in INDEXED_COLUMNS:
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE}_{column} ON {TABLE} ({column})")
+
+    def _read_columns(self) -> List[str]:
+        return [row[1] for row in self._conn.execute(f"PRAGMA table_info({TABLE})")]
+
+    def _ensure_columns(self, names: Iterable[str]):
+        """Ajoute les colonnes de ratios encore inconnues (schéma en colonnes évolutif)"""
+        missing = [name for name in dict.fromkeys(names) if name not in self._columns]
+        for name in missing:
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"Nom de colonne invalide: {name}")
+            self._conn.execute(f"ALTER TABLE {TABLE} ADD COLUMN {name} REAL")
+            self._columns.append(name)
+
+    def ensure_ratio_index(self, ratio: str):
+        """Crée un index sur un ratio fréquemment filtré par plage"""
+        with self._lock, self._conn:
+            self._ensure_columns([ratio])
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE}_{ratio} ON {TABLE} ({ratio})")
+
+    def record(self, result: Mapping, entreprise: Optional[str] = None,
+               exercice: Optional[int] = None) -> bool:
+        """
+        Enregistre (ou remplace) l'analyse d'une entreprise pour un exercice
+
+        Returns:
+            bool: False si l'entreprise ou l'exercice n'est pas renseigné
+        """
+        row = history_row(result, entreprise, exercice)
+        if row is None:
+            return False
+        self.record_rows([row])
+        return True
+
+    def record_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """Insertion en masse (une seule transaction) de lignes d'historique"""
+        if not rows:
+            return 0
+        columns = list(dict.fromkeys(name for row in rows for name in row))
+        return self._upsert(columns, ([row.get(name) for name in columns] for row in rows))
+
+    def _upsert(self, columns: List[str], params: Iterable[Iterable[Any]]) -> int:
+        """Insère ou remplace des lignes (colonnes données) en une transaction"""
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f"{name} = excluded.{name}" for name in columns if name not in KEY_COLUMNS)
+        sql = (f"INSERT INTO {TABLE} ({', '.join(columns)}) VALUES ({placeholders}) "
+               f"ON CONFLICT (entreprise, exercice) DO UPDATE SET {updates}")
+
+        with self._lock, self._conn:
+            self._ensure_columns(columns)
+            cursor = self._conn.executemany(sql, params)
+        return cursor.rowcount
+
+    def record_frame(self, frame: pd.DataFrame) -> int:
+        """
+        Insertion en masse d'un lot (une ligne par entreprise-exercice)
+
+        Args:
+            frame (DataFrame): Colonnes 'entreprise' et 'exercice', puis colonnes
+                descriptives, de ratios et de scores ('score_<categorie>')
+        """
+        missing = [column for column in KEY_COLUMNS if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Colonnes obligatoires absentes: {', '.join(missing)}")
+        if frame.empty:
+            return 0
+        columns = [str(column) for column in frame.columns]
+        # Colonne par colonne : NaN -> NULL, scalaires numpy -> types Python
+        values = [
+            [None if value != value else value for value in frame[column].tolist()]
+            for column in frame.columns
+        ]
+        return self._upsert(columns, zip(*values))
+
+    def company_history(self, entreprise: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Historique d'une entreprise, trié par exercice (lecture par clé primaire)"""
+        selected = self._select_columns(columns)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT {', '.join(selected)} FROM {TABLE} WHERE entreprise = ? ORDER BY exercice",
+                (entreprise,)
+            )
+            rows = cursor.fetchall()
+        return pd.DataFrame(rows, columns=selected)
+
+    def _where(self, secteur: Optional[str], exercice: Optional[int], norms_version: Optional[str],
+               ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]]) -> Optional[Tuple[str, List[Any]]]:
+        """Clause WHERE d'une recherche (None si un ratio filtré n'existe pas : aucun résultat)"""
+        clauses, params = [], []
+        for column, value in (('secteur', secteur), ('exercice', exercice), ('norms_version', norms_version)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        for ratio, (minimum, maximum) in (ranges or {}).items():
+            if ratio not in self._columns:
+                return None
+            if minimum is not None:
+                clauses.append(f"{ratio} >= ?")
+                params.append(minimum)
+            if maximum is not None:
+                clauses.append(f"{ratio} <= ?")
+                params.append(maximum)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def query(self, secteur: Optional[str] = None, exercice: Optional[int] = None,
+              norms_version: Optional[str] = None,
+              ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Recherche multicritère
+
+        Args:
+            ranges (dict): ratio -> (minimum, maximum), bornes incluses, None = ouverte
+        """
+        selected = self._select_columns(columns)
+        where = self._where(secteur, exercice, norms_version, ranges)
+        if where is None:
+            return pd.DataFrame(columns=selected)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(selected)} FROM {TABLE}{where[0]} ORDER BY entreprise, exercice", where[1]
+            ).fetchall()
+        return pd.DataFrame(rows, columns=selected)
+
+    def iter_rows(self, secteur: Optional[str] = None, exercice: Optional[int] = None,
+                  norms_version: Optional[str] = None,
+                  ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+                  columns: Optional[List[str]] = None,
+                  fetch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Parcours en flux d'une recherche (mêmes critères que query), ligne par ligne
+
+        La lecture passe par une connexion dédiée en lecture seule : le portefeuille n'est
+        jamais chargé en entier et les écritures de l'application ne sont pas bloquées.
+        """
+        selected = self._select_columns(columns)
+        where = self._where(secteur, exercice, norms_version, ranges)
+        if where is None:
+            return
+        conn = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(
+                f"SELECT {', '.join(selected)} FROM {TABLE}{where[0]} ORDER BY entreprise, exercice", where[1]
+            )
+            while True:
+                batch = cursor.fetchmany(fetch_size)
+                if not batch:
+                    break
+                for row in batch:
+                    yield dict(zip(selected, row))
+        finally:
+            conn.close()
+
+    @property
+    def columns(self) -> List[str]:
+        """Colonnes de l'historique (clés, colonnes descriptives, ratios et scores)"""
+        return list(self._columns)
+
+    def _select_columns(self, columns: Optional[List[str]]) -> List[str]:
+        if columns is None:
+            return list(self._columns)
+        return list(dict.fromkeys(KEY_COLUMNS + [column for column in columns if column in self._columns]))
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Statistiques de l'historique pour le diagnostic"""
+        with self._lock:
+            lignes, entreprises = self._conn.execute(
+                f"SELECT COUNT(*), COUNT(DISTINCT entreprise) FROM {TABLE}"
+            ).fetchone()
+        return {
+            'base': self.db_path,
+            'lignes': lignes,
+            'entreprises': entreprises,
+            'colonnes_ratios': len(self._columns) - len(KEY_COLUMNS) - len(INFO_COLUMNS)
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_history: Optional[AnalysisHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_analysis_history() -> AnalysisHistory:
+    """Retourne l'historique partagé par tout le processus"""
+    global _history
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = AnalysisHistory(os.environ.get(HISTORY_PATH_ENV) or None)
+    return _history
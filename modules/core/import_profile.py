@@ -0,0 +1,77 @@
+"""
+Mesure des temps d'import (démarrage à froid)
+
+Le rapport s'appuie sur `python -X importtime` exécuté dans un processus neuf : les
+modules déjà chargés par le serveur Streamlit ne faussent donc pas la mesure.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Bibliothèques dont le chargement domine le démarrage
+HEAVY_MODULES = ('numpy', 'pandas', 'scipy', 'plotly', 'reportlab', 'openpyxl', 'pyarrow')
+
+
+def loaded_heavy_modules() -> Dict[str, bool]:
+    """Bibliothèques lourdes déjà importées dans le processus courant"""
+    return {name: name in sys.modules for name in HEAVY_MODULES}
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    Analyse la sortie de `-X importtime`
+
+    Returns:
+        list: {'module', 'self_ms', 'cumulative_ms', 'profondeur'} dans l'ordre d'import
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            rows.append({
+                'module': name.strip(),
+                'self_ms': int(self_us) / 1000,
+                'cumulative_ms': int(cumulative_us) / 1000,
+                'profondeur': (len(name) - len(name.lstrip())) // 2,
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def import_time_report(modules: Iterable[str] = ('streamlit', 'session_manager'),
+                       top: int = 15, timeout: float = 60) -> Dict[str, Any]:
+    """
+    Temps d'import des modules indiqués dans un interpréteur neuf
+
+    Args:
+        modules: Modules importés, dans l'ordre (comme au démarrage de l'application)
+        top (int): Nombre de modules les plus coûteux (temps propre) à retourner
+
+    Returns:
+        dict: 'total_ms' par module demandé, 'plus_couteux' et 'lourds' (temps cumulé
+        des bibliothèques lourdes importées au démarrage)
+    """
+    modules = list(modules)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        filter(None, [str(PROJECT_ROOT), os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+        cwd=str(PROJECT_ROOT), env=env, capture_output=True, text=True, timeout=timeout
+    )
+    rows = parse_importtime(completed.stderr)
+    top_level = {row['module']: row['cumulative_ms'] for row in rows if row['profondeur'] == 0}
+
+    return {
+        'total_ms': {name: top_level.get(name) for name in modules},
+        'plus_couteux': sorted(rows, key=lambda row: row['self_ms'], reverse=True)[:top],
+        'lourds': {row['module']: row['cumulative_ms'] for row in rows if row['module'] in HEAVY_MODULES},
+        'erreur': completed.stderr.strip().splitlines()[-1] if completed.returncode else None,
+    }
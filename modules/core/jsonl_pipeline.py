@@ -0,0 +1,321 @@
+"""
+Notation en flux JSON Lines : un état financier par ligne en entrée, un résultat par ligne en sortie
+
+Usage :
+    zcat etats_2024.jsonl.gz | python -m modules.core.jsonl_pipeline --processus 4 > resultats.jsonl
+
+Chaque ligne d'entrée est soit au format de assets/sample_data.json (bilan_actif,
+bilan_passif, compte_resultat, flux_tresorerie, metadata), soit un dictionnaire à plat
+des postes de l'analyseur ('total_actif', 'chiffre_affaires', ... ; éventuellement sous
+'data', avec 'metadata'). Les lignes sont traitées par micro-lots : ratios ligne par
+ligne, puis notation (scoring.score_frame) et recommandations
+(recommendations.recommend_portfolio) vectorisées sur le lot entier. La mémoire est
+bornée par la taille des lots et le nombre de lots en cours ; l'ordre des lignes est
+conservé. Une ligne invalide produit une ligne {"ligne": n, "erreur": ...} sans
+interrompre le flux.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Lots en cours par processus (borne la mémoire occupée par les lots non encore écrits)
+IN_FLIGHT_PER_WORKER = 2
+
+# Postes de l'analyseur lus dans le format de assets/sample_data.json
+SAMPLE_FIELDS = {
+    'total_actif': ('bilan_actif', 'total_actif'),
+    'immobilisations_nettes': ('bilan_actif', 'total_actif_immobilise'),
+    'stocks': ('bilan_actif', 'actif_circulant', 'stocks', 'total_stocks'),
+    'creances_clients': ('bilan_actif', 'actif_circulant', 'creances', 'clients'),
+    'total_creances': ('bilan_actif', 'actif_circulant', 'creances', 'total_creances'),
+    'tresorerie': ('bilan_actif', 'actif_circulant', 'tresorerie_actif', 'total_tresorerie_actif'),
+    'total_actif_circulant': ('bilan_actif', 'actif_circulant', 'total_actif_circulant'),
+    'capital': ('bilan_passif', 'capitaux_propres', 'capital_social'),
+    'capitaux_propres': ('bilan_passif', 'capitaux_propres', 'total_capitaux_propres'),
+    'dettes_financieres': ('bilan_passif', 'dettes_financieres', 'total_dettes_financieres'),
+    'fournisseurs_exploitation': ('bilan_passif', 'dettes_circulantes', 'fournisseurs'),
+    'dettes_fiscales': ('bilan_passif', 'dettes_circulantes', 'dettes_fiscales'),
+    'dettes_sociales': ('bilan_passif', 'dettes_circulantes', 'dettes_sociales'),
+    'autres_dettes': ('bilan_passif', 'dettes_circulantes', 'autres_dettes'),
+    'dettes_court_terme': ('bilan_passif', 'dettes_circulantes', 'total_dettes_circulantes'),
+    'tresorerie_passif': ('bilan_passif', 'tresorerie_passif', 'total_tresorerie_passif'),
+    'chiffre_affaires': ('compte_resultat', 'exploitation', 'chiffre_affaires'),
+    'achats_matieres_premieres': ('compte_resultat', 'exploitation', 'achats_matieres'),
+    'transports': ('compte_resultat', 'exploitation', 'transports'),
+    'services_exterieurs': ('compte_resultat', 'exploitation', 'services_exterieurs'),
+    'impots_taxes': ('compte_resultat', 'exploitation', 'impots_taxes'),
+    'charges_personnel': ('compte_resultat', 'exploitation', 'charges_personnel'),
+    'dotations_amortissements': ('compte_resultat', 'exploitation', 'dotations_amortissements'),
+    'charges_exploitation': ('compte_resultat', 'exploitation', 'total_charges_exploitation'),
+    'resultat_exploitation': ('compte_resultat', 'exploitation', 'resultat_exploitation'),
+    'frais_financiers': ('compte_resultat', 'financier', 'charges_financieres'),
+    'resultat_financier': ('compte_resultat', 'financier', 'resultat_financier'),
+    'resultat_net': ('compte_resultat', 'resultat_net'),
+    'flux_activites_operationnelles': ('flux_tresorerie', 'activites_exploitation', 'flux_exploitation'),
+    'flux_activites_investissement': ('flux_tresorerie', 'activites_investissement', 'flux_investissement'),
+    'flux_activites_financement': ('flux_tresorerie', 'activites_financement', 'flux_financement'),
+    'tresorerie_ouverture': ('flux_tresorerie', 'tresorerie_debut'),
+    'tresorerie_cloture': ('flux_tresorerie', 'tresorerie_fin'),
+}
+
+# Champs de recommandation écrits en sortie (les plans d'action restent dans la table de règles)
+RECOMMENDATION_FIELDS = ('id', 'priorite', 'categorie', 'probleme', 'valeur')
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _lookup(record: Mapping[str, Any], path: Sequence[str]) -> Optional[float]:
+    value: Any = record
+    for key in path:
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(key)
+    return _number(value)
+
+
+def flatten_sample(record: Mapping[str, Any]) -> Dict[str, float]:
+    """Postes de l'analyseur à partir du format de assets/sample_data.json"""
+    data = {name: value for name, path in SAMPLE_FIELDS.items()
+            if (value := _lookup(record, path)) is not None}
+
+    def get(name):
+        return data.get(name, 0)
+
+    data['autres_creances'] = get('total_creances') - get('creances_clients')
+    data['dettes_sociales_fiscales'] = get('dettes_fiscales') + get('dettes_sociales')
+    data['ressources_stables'] = get('capitaux_propres') + get('dettes_financieres')
+    # Soldes intermédiaires (SYSCOHADA) : EBE = RE + dotations, VA = EBE + charges de personnel
+    data['excedent_brut'] = get('resultat_exploitation') + get('dotations_amortissements')
+    data['valeur_ajoutee'] = data['excedent_brut'] + get('charges_personnel')
+    data['cafg'] = get('resultat_net') + get('dotations_amortissements')
+    return data
+
+
+def normalize_statement(record: Any) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    """
+    Postes financiers et métadonnées d'une ligne d'entrée
+
+    Raises:
+        ValueError: Ligne qui n'est pas un objet JSON ou sans aucun poste numérique
+    """
+    if not isinstance(record, Mapping):
+        raise ValueError("La ligne doit être un objet JSON")
+
+    metadata = dict(record.get('metadata') or {})
+    if 'bilan_actif' in record:
+        data = flatten_sample(record)
+    else:
+        source = record.get('data') if isinstance(record.get('data'), Mapping) else record
+        data = {}
+        for key, value in source.items():
+            if _number(value) is not None:
+                data[key] = value
+            elif key not in ('metadata', 'data') and isinstance(value, str):
+                # Format à plat : les champs texte (entreprise, secteur...) sont des métadonnées
+                metadata.setdefault(key, value)
+
+    if not data:
+        raise ValueError("Aucun poste financier numérique")
+    return data, metadata
+
+
+def _plain(value: Any) -> Any:
+    """Scalaire numpy -> nombre JSON (entier si la valeur est entière)"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def score_statements(records: Sequence[Any]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Note un lot d'états financiers déjà décodés (format de normalize_statement)
+
+    Returns:
+        tuple: (résultats dans l'ordre d'entrée, nombre d'états en erreur). Un résultat
+        contient 'metadata', 'ratios', 'scores' et 'recommandations', ou seulement 'erreur'.
+    """
+    import pandas as pd
+
+    from modules.core.analyzer import get_financial_analyzer
+    from modules.core.recommendations import (
+        DEFAULT_RECOMMENDATION, RECOMMENDATION_RULES, build_portfolio_frame, format_recommendation,
+        recommend_portfolio
+    )
+    from modules.core.scoring import score_frame
+
+    analyzer = get_financial_analyzer()
+    outputs: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, Dict[str, float]]] = []
+    errors = 0
+
+    for record in records:
+        try:
+            data, metadata = normalize_statement(record)
+            ratios = analyzer.calculate_ratios(data)
+        except (ValueError, TypeError, ZeroDivisionError) as e:
+            outputs.append({'erreur': f"{type(e).__name__}: {e}"})
+            errors += 1
+            continue
+        valid.append((len(outputs), ratios))
+        outputs.append({'metadata': metadata})
+
+    if valid:
+        ratios_frame = pd.DataFrame([ratios for _, ratios in valid])
+        scores = score_frame(ratios_frame).to_dict('records')
+        analyses = [{'ratios': ratios, 'scores': score} for (_, ratios), score in zip(valid, scores)]
+        triggered = recommend_portfolio(build_portfolio_frame(analyses))
+
+        rules_by_id = {rule['id']: rule for rule in RECOMMENDATION_RULES}
+        recommendations: Dict[int, List[Dict[str, Any]]] = {}
+        for position, regle, valeur in zip(triggered['entreprise'], triggered['regle'], triggered['valeur']):
+            recommendation = format_recommendation(rules_by_id[regle], float(valeur))
+            recommendations.setdefault(int(position), []).append(
+                {field: recommendation[field] for field in RECOMMENDATION_FIELDS})
+        # Aucune règle déclenchée : même suggestion que FinancialAnalyzer.generate_recommendations
+        default = {field: DEFAULT_RECOMMENDATION.get(field) for field in RECOMMENDATION_FIELDS}
+
+        for position, ((index, ratios), score) in enumerate(zip(valid, scores)):
+            outputs[index].update({
+                'ratios': ratios,
+                'scores': {categorie: _plain(value) for categorie, value in score.items()},
+                'recommandations': recommendations.get(position) or [dict(default)]
+            })
+
+    return outputs, errors
+
+
+def score_lines(lines: Sequence[str], first_line: int = 1) -> Tuple[List[str], int]:
+    """
+    Traite un micro-lot de lignes JSON
+
+    Args:
+        lines (sequence): Lignes brutes (les lignes vides sont ignorées)
+        first_line (int): Numéro de la première ligne dans le flux (messages d'erreur)
+
+    Returns:
+        tuple: (lignes de résultat dans l'ordre d'entrée, nombre de lignes en erreur)
+    """
+    outputs: List[Dict[str, Any]] = []
+    decoded: List[Tuple[int, Any]] = []
+    errors = 0
+
+    for offset, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            decoded.append((len(outputs), json.loads(line)))
+        except ValueError as e:
+            errors += 1
+            outputs.append({'ligne': first_line + offset, 'erreur': f"{type(e).__name__}: {e}"})
+            continue
+        outputs.append({'ligne': first_line + offset})
+
+    results, invalid = score_statements([record for _, record in decoded])
+    for (index, _), result in zip(decoded, results):
+        outputs[index].update(result)
+
+    return [json.dumps(output, ensure_ascii=False, default=str) for output in outputs], errors + invalid
+
+
+def _init_worker():
+    """Processus de calcul : les messages (chargement des normes...) ne polluent pas la sortie"""
+    sys.stdout = sys.stderr
+
+
+def iter_batches(stream: Iterable[str], batch_size: int) -> Iterator[Tuple[int, List[str]]]:
+    """Découpe un flux de lignes en micro-lots (numéro de la première ligne, lignes)"""
+    batch: List[str] = []
+    first_line = 1
+    for number, line in enumerate(stream, 1):
+        if not batch:
+            first_line = number
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield first_line, batch
+            batch = []
+    if batch:
+        yield first_line, batch
+
+
+def run_pipeline(stream: Iterable[str], output: TextIO, batch_size: int = DEFAULT_BATCH_SIZE,
+                 workers: int = 1) -> Dict[str, Any]:
+    """
+    Traite un flux JSON Lines complet
+
+    Args:
+        stream (iterable): Lignes d'entrée (sys.stdin, fichier ouvert, liste)
+        output (file): Destination des lignes de résultat
+        batch_size (int): Lignes par micro-lot
+        workers (int): Processus de calcul (1 = dans le processus courant)
+
+    Returns:
+        dict: Statistiques (lignes écrites, erreurs, durée, débit)
+    """
+    stats = {'lignes': 0, 'erreurs': 0, 'lots': 0}
+    start = time.perf_counter()
+
+    def write(batch_result: Tuple[List[str], int]):
+        results, errors = batch_result
+        for line in results:
+            output.write(line)
+            output.write('\n')
+        output.flush()
+        stats['lignes'] += len(results)
+        stats['erreurs'] += errors
+        stats['lots'] += 1
+
+    batches = iter_batches(stream, batch_size)
+    if workers <= 1:
+        for first_line, lines in batches:
+            write(score_lines(lines, first_line))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            # Fenêtre bornée, résultats écrits dans l'ordre des lots
+            pending: deque = deque()
+            for first_line, lines in batches:
+                pending.append(executor.submit(score_lines, lines, first_line))
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+
+    duration = time.perf_counter() - start
+    stats.update({
+        'processus': max(1, workers),
+        'duree_s': round(duration, 2),
+        'lignes_par_seconde': round(stats['lignes'] / duration, 1) if duration > 0 else None
+    })
+    return stats
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande (stdin -> stdout, statistiques sur stderr)"""
+    parser = argparse.ArgumentParser(description="Notation en flux d'états financiers JSON Lines (stdin -> stdout)")
+    parser.add_argument('--lot', type=int, default=DEFAULT_BATCH_SIZE, help="Lignes par micro-lot")
+    parser.add_argument('--processus', type=int, default=1,
+                        help="Processus de calcul (0 = nombre de cœurs ; défaut : 1)")
+    args = parser.parse_args(argv)
+
+    workers = args.processus if args.processus > 0 else (os.cpu_count() or 1)
+    output = sys.stdout
+    # stdout est réservé aux résultats : les messages du calcul partent sur stderr
+    with redirect_stdout(sys.stderr):
+        stats = run_pipeline(sys.stdin, output, batch_size=max(1, args.lot), workers=workers)
+    print(json.dumps(stats, ensure_ascii=False), file=sys.stderr)
+    return 1 if stats['erreurs'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,290 @@
+"""
+Chargeur des normes (BCEAO, sectorielles) avec rechargement à chaud et versionnement
+"""
+
+import functools
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+# Correspondance entre les noms courts des fichiers JSON et les clés de ratios de l'analyseur
+RATIO_ALIASES = {
+    'liquidite_generale': 'ratio_liquidite_generale',
+    'liquidite_reduite': 'ratio_liquidite_reduite',
+    'liquidite_immediate': 'ratio_liquidite_immediate',
+    'autonomie_financiere': 'ratio_autonomie_financiere',
+    'endettement_global': 'ratio_endettement',
+    'couverture_charges_financieres': 'ratio_couverture_charges_financieres',
+    'delai_recouvrement': 'delai_recouvrement_clients',
+    'charges_personnel_va': 'taux_charges_personnel',
+    'cafg_ca': 'ratio_cafg_ca'
+}
+
+# Identifiants de secteur de l'application (analyseur, formulaires) -> secteur du fichier JSON
+SECTOR_ALIASES = {
+    'industrie_manufacturiere': 'industrie',
+    'commerce_detail': 'commerce',
+    'commerce_gros': 'commerce',
+    'services_professionnels': 'services',
+    'construction_btp': 'btp',
+}
+
+
+class NormsSnapshot:
+    """Instantané immuable des normes chargées et de leur index compilé"""
+
+    def __init__(self, files: Dict[str, Any], versions: Dict[str, str]):
+        self.files = files
+        self.versions = versions
+        self.version = self._combine_versions(versions)
+        self.loaded_at = time.time()
+        self.ratio_index = self._compile_ratio_index(files.get('bceao_norms', {}))
+        self.sector_index = self._compile_sector_index(files.get('sectoral_norms', {}))
+
+    @staticmethod
+    def _combine_versions(versions: Dict[str, str]) -> str:
+        """Calcule la version globale à partir des empreintes de chaque fichier"""
+        digest = hashlib.sha1()
+        for name in sorted(versions):
+            digest.update(f"{name}:{versions[name]};".encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+    @staticmethod
+    def _compile_ratio_index(bceao_norms: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Aplatit les normes BCEAO en un index ratio -> norme (avec sa catégorie)"""
+        index = {}
+        for categorie, ratios in bceao_norms.items():
+            if categorie in ('metadata', 'scoring', 'seuils_alerte') or not isinstance(ratios, dict):
+                continue
+            for ratio_name, norm in ratios.items():
+                if isinstance(norm, dict):
+                    entry = dict(norm, categorie=categorie)
+                    index[RATIO_ALIASES.get(ratio_name, ratio_name)] = entry
+        return index
+
+    @staticmethod
+    def _compile_sector_index(sectoral_norms: Dict[str, Any]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Indexe les quartiles sectoriels par secteur puis par clé de ratio de l'analyseur
+
+        Les identifiants de secteur de l'application sont ajoutés (SECTOR_ALIASES), sauf si
+        le fichier les définit lui-même.
+        """
+        index = {}
+        for secteur, ratios in sectoral_norms.items():
+            if secteur == 'metadata' or not isinstance(ratios, dict):
+                continue
+            index[secteur] = {
+                RATIO_ALIASES.get(ratio_name, ratio_name): values
+                for ratio_name, values in ratios.items()
+                if isinstance(values, dict) and 'median' in values
+            }
+        for alias, secteur in SECTOR_ALIASES.items():
+            if alias not in index and secteur in index:
+                index[alias] = index[secteur]
+        return index
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Retourne le contenu brut d'un fichier de normes"""
+        return self.files.get(name, default)
+
+
+class NormsRegistry:
+    """
+    Registre des normes surveillant data/*.json (par date de modification)
+
+    Chaque rechargement construit un nouvel instantané puis le substitue en une seule
+    affectation : les lecteurs voient toujours un index complet et cohérent. Les résultats
+    mémorisés via `memoized` sont invalidés uniquement pour les fichiers modifiés.
+    """
+
+    def __init__(self, data_dir: Optional[Path] = None, check_interval: float = 2.0):
+        self.data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._stats: Dict[str, Tuple[float, int]] = {}
+        self._last_check = 0.0
+        self._snapshot = NormsSnapshot({}, {})
+        self._memo: Dict[Tuple, Any] = {}
+        self._memo_deps: Dict[str, Set[Tuple]] = {}
+        self.reload_count = 0
+        self.refresh(force=True)
+
+    @property
+    def snapshot(self) -> NormsSnapshot:
+        """Instantané courant (vérifie les fichiers au plus une fois par intervalle)"""
+        if time.time() - self._last_check >= self.check_interval:
+            self.refresh()
+        return self._snapshot
+
+    @property
+    def version(self) -> str:
+        """Version globale des normes actuellement en vigueur"""
+        return self.snapshot.version
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Contenu d'un fichier de normes (nom sans extension)"""
+        return self.snapshot.get(name, default)
+
+    def _scan(self) -> Dict[str, Tuple[float, int]]:
+        """Relève la date de modification et la taille de chaque fichier JSON surveillé"""
+        stats = {}
+        if self.data_dir.is_dir():
+            for path in sorted(self.data_dir.glob('*.json')):
+                try:
+                    stat = path.stat()
+                    stats[path.stem] = (stat.st_mtime, stat.st_size)
+                except OSError:
+                    continue
+        return stats
+
+    def refresh(self, force: bool = False) -> Set[str]:
+        """
+        Recharge les fichiers modifiés depuis le dernier passage
+
+        Args:
+            force (bool): Recharger tous les fichiers même sans modification
+
+        Returns:
+            set: Noms des fichiers dont le contenu a changé
+        """
+        with self._lock:
+            self._last_check = time.time()
+            stats = self._scan()
+            candidates = set(stats) if force else {
+                name for name, stat in stats.items() if self._stats.get(name) != stat
+            }
+            removed = set(self._snapshot.files) - set(stats)
+
+            if not candidates and not removed:
+                return set()
+
+            files = {name: value for name, value in self._snapshot.files.items() if name in stats}
+            versions = {name: value for name, value in self._snapshot.versions.items() if name in stats}
+            changed = set(removed)
+
+            for name in candidates:
+                path = self.data_dir / f"{name}.json"
+                self._stats[name] = stats[name]
+                try:
+                    raw = path.read_bytes()
+                    content = json.loads(raw.decode('utf-8'))
+                except (OSError, ValueError) as e:
+                    # Fichier en cours d'écriture ou invalide : conserver la version précédente
+                    print(f"⚠️ Normes {name}.json ignorées (lecture impossible): {e}")
+                    continue
+
+                version = hashlib.sha1(raw).hexdigest()[:12]
+                if versions.get(name) != version:
+                    changed.add(name)
+                files[name] = content
+                versions[name] = version
+
+            for name in removed:
+                self._stats.pop(name, None)
+
+            if changed:
+                self._snapshot = NormsSnapshot(files, versions)
+                self.reload_count += 1
+                self._invalidate(changed)
+                print(f"✅ Normes rechargées ({', '.join(sorted(changed))}) - version {self._snapshot.version}")
+
+            return changed
+
+    def _invalidate(self, changed: Iterable[str]):
+        """Supprime les résultats mémorisés qui dépendent des fichiers modifiés"""
+        for name in changed:
+            for key in self._memo_deps.pop(name, set()):
+                self._memo.pop(key, None)
+
+    def memoized(self, key: Tuple, dependencies: Iterable[str], compute: Callable[[], Any]) -> Any:
+        """
+        Retourne un résultat mémorisé, en le calculant au besoin
+
+        Args:
+            key (tuple): Clé du résultat
+            dependencies: Noms des fichiers de normes dont dépend le résultat
+            compute (callable): Fonction de calcul appelée en cas d'absence
+
+        Returns:
+            Le résultat mémorisé
+        """
+        snapshot = self.snapshot  # Déclenche la vérification des fichiers
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+        result = compute()
+        with self._lock:
+            # Ne pas mémoriser un résultat calculé sur un instantané remplacé entre-temps
+            if snapshot is not self._snapshot:
+                return result
+            self._memo[key] = result
+            for name in dependencies:
+                self._memo_deps.setdefault(name, set()).add(key)
+        return result
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Statistiques du registre pour le diagnostic"""
+        snapshot = self._snapshot
+        return {
+            'version': snapshot.version,
+            'fichiers': dict(snapshot.versions),
+            'rechargements': self.reload_count,
+            'resultats_memorises': len(self._memo),
+            'charge_le': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot.loaded_at))
+        }
+
+
+_registry: Optional[NormsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_norms_registry() -> NormsRegistry:
+    """Retourne le registre de normes partagé par tout le processus"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = NormsRegistry()
+    return _registry
+
+
+def get_norms_version() -> str:
+    """Version des normes à apposer sur chaque analyse"""
+    return get_norms_registry().version
+
+
+def memoize_on(*dependencies: str) -> Callable:
+    """
+    Décorateur de mémorisation invalidé lorsque les fichiers de normes indiqués changent
+
+    Args:
+        dependencies: Noms des fichiers de normes (sans extension)
+
+    Returns:
+        callable: Décorateur (les arguments de la fonction doivent être hachables)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = (func.__module__, func.__qualname__) + args
+            return get_norms_registry().memoized(key, dependencies, lambda: func(*args))
+        return wrapper
+    return decorator
+
+
+@memoize_on('sectoral_norms')
+def get_sector_benchmarks(secteur: str) -> Dict[str, Dict[str, float]]:
+    """Quartiles sectoriels (issus de sectoral_norms.json) pour un secteur"""
+    sector = get_norms_registry().snapshot.sector_index.get(secteur, {})
+    return {ratio_name: dict(values) for ratio_name, values in sector.items()}
+
+
+def get_bceao_ratio_norms() -> Dict[str, Dict[str, Any]]:
+    """Index aplati des normes BCEAO par clé de ratio"""
+    return get_norms_registry().snapshot.ratio_index
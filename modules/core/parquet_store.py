@@ -0,0 +1,250 @@
+"""
+Export et relecture des résultats d'analyse au format Parquet (Arrow), partitionnés
+
+Usage :
+    python -m modules.core.parquet_store classeurs/ resultats/ --sortie entrepot/ --secteur commerce
+
+Une ligne par analyse : métadonnées principales en colonnes typées, puis une colonne
+numérique par poste des états financiers ('data__<poste>'), par ratio ('ratios__<ratio>')
+et par score ('scores__<categorie>'). Les autres valeurs (textes, métadonnées
+secondaires) sont conservées en JSON dans la colonne 'autres'. Les fichiers sont
+partitionnés à la Hive (exercice=2024/secteur=commerce/) et compressés (zstd). Un exercice
+non renseigné (ou non numérique) n'est jamais déduit de la date : il va dans la partition
+par défaut, et une valeur non numérique ('2023/2024') est conservée dans 'autres'.
+
+La relecture reconstitue des AnalysisResult ou fournit directement la table des ratios
+d'un portefeuille pour la notation par lots (scoring.score_frame), sans relire d'Excel.
+"""
+
+import argparse
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from modules.core.analysis_result import ANALYSIS_RESULT_VERSION, AnalysisResult, content_hash, thaw
+
+SECTIONS = ('data', 'ratios', 'scores')
+SEPARATOR = '__'
+
+# Métadonnées exportées en colonnes typées (les autres vont dans 'autres')
+METADATA_COLUMNS = {
+    'entreprise': pa.string(),
+    'fichier_nom': pa.string(),
+    'source': pa.string(),
+    'date_analyse': pa.string(),
+    'norms_version': pa.string(),
+}
+
+BASE_SCHEMA = [
+    pa.field('analyse_id', pa.string()),
+    pa.field('exercice', pa.int32()),
+    pa.field('secteur', pa.string()),
+    *(pa.field(name, type_) for name, type_ in METADATA_COLUMNS.items()),
+    pa.field('version', pa.string()),
+    pa.field('timestamp', pa.string()),
+    pa.field('autres', pa.string()),
+]
+
+# Lignes par fichier écrit (borne la mémoire de l'export)
+DEFAULT_CHUNK_SIZE = 10000
+COMPRESSION = 'zstd'
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _exercice(metadata: Mapping[str, Any]) -> Optional[int]:
+    """Exercice de l'analyse en entier (None s'il est absent ou non numérique)"""
+    value = metadata.get('exercice')
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def analysis_record(result: Mapping) -> Dict[str, Any]:
+    """Ligne à plat d'un résultat d'analyse (voir la description du module)"""
+    result = AnalysisResult.from_dict(result)
+    metadata = thaw(result.metadata)
+
+    record: Dict[str, Any] = {
+        'analyse_id': content_hash(result.data, result.ratios, result.scores, result.metadata),
+        'exercice': _exercice(metadata),
+        # Secteur vide -> partition par défaut (relu comme '')
+        'secteur': metadata.pop('secteur', None) or None,
+        'version': result.version,
+        'timestamp': result.timestamp,
+    }
+    # Un exercice non numérique reste tel quel dans 'autres'
+    if record['exercice'] is not None or metadata.get('exercice') in (None, ''):
+        metadata.pop('exercice', None)
+    for name in METADATA_COLUMNS:
+        value = metadata.pop(name, None)
+        record[name] = None if value is None else str(value)
+
+    others: Dict[str, Any] = {'metadata': metadata} if metadata else {}
+    for section in SECTIONS:
+        for key, value in getattr(result, section).items():
+            if _is_number(value):
+                record[f"{section}{SEPARATOR}{key}"] = float(value)
+            else:
+                others.setdefault(section, {})[key] = thaw(value)
+    record['autres'] = json.dumps(others, ensure_ascii=False, default=str) if others else None
+    return record
+
+
+def records_table(records: List[Dict[str, Any]]) -> pa.Table:
+    """Table Arrow typée : colonnes de base, puis colonnes numériques par ordre alphabétique"""
+    numeric = sorted({name for record in records for name in record if SEPARATOR in name})
+    schema = pa.schema(BASE_SCHEMA + [pa.field(name, pa.float64()) for name in numeric])
+    return pa.Table.from_pylist(records, schema=schema)
+
+
+def _partitioning() -> ds.Partitioning:
+    return ds.partitioning(pa.schema([('exercice', pa.int32()), ('secteur', pa.string())]), flavor='hive')
+
+
+def write_analyses(results: Iterable[Mapping], root: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Ajoute des résultats d'analyse à un entrepôt Parquet partitionné
+
+    Les résultats sont écrits par paquets de chunk_size lignes ; chaque appel ajoute ses
+    propres fichiers (les exports précédents sont conservés).
+
+    Returns:
+        dict: Nombre d'analyses et de fichiers écrits
+    """
+    stats = {'analyses': 0, 'fichiers': 0, 'entrepot': str(root)}
+    records: List[Dict[str, Any]] = []
+
+    def flush():
+        if not records:
+            return
+        written: List[str] = []
+        ds.write_dataset(
+            records_table(records), root, format='parquet', partitioning=_partitioning(),
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            file_options=ds.ParquetFileFormat().make_write_options(compression=COMPRESSION),
+            file_visitor=lambda written_file: written.append(written_file.path)
+        )
+        stats['analyses'] += len(records)
+        stats['fichiers'] += len(written)
+        records.clear()
+
+    for result in results:
+        records.append(analysis_record(result))
+        if len(records) >= chunk_size:
+            flush()
+    flush()
+    return stats
+
+
+def analysis_parquet_bytes(result: Mapping) -> bytes:
+    """Fichier Parquet (non partitionné) d'une seule analyse, pour téléchargement"""
+    sink = pa.BufferOutputStream()
+    pq.write_table(records_table([analysis_record(result)]), sink, compression=COMPRESSION)
+    return sink.getvalue().to_pybytes()
+
+
+def open_dataset(root: str) -> ds.Dataset:
+    """
+    Entrepôt Parquet (partitions exercice/secteur)
+
+    Les fichiers de différents exports n'ont pas forcément les mêmes colonnes : le schéma
+    est l'union des schémas de tous les fichiers.
+    """
+    dataset = ds.dataset(root, format='parquet', partitioning=_partitioning())
+    schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+    if not schemas:
+        return dataset
+    schema = pa.unify_schemas([dataset.schema] + schemas)
+    return ds.dataset(root, schema=schema, format='parquet', partitioning=_partitioning())
+
+
+def _filter(exercice: Optional[int], secteur: Optional[str]):
+    expression = None
+    for column, value in (('exercice', exercice), ('secteur', secteur)):
+        if value is not None:
+            clause = ds.field(column) == value
+            expression = clause if expression is None else expression & clause
+    return expression
+
+
+def record_to_result(record: Mapping[str, Any]) -> AnalysisResult:
+    """Reconstitue un résultat d'analyse à partir d'une ligne de l'entrepôt"""
+    others = json.loads(record['autres']) if record.get('autres') else {}
+    sections: Dict[str, Dict[str, Any]] = {section: dict(others.get(section, {})) for section in SECTIONS}
+    for name, value in record.items():
+        section, _, key = name.partition(SEPARATOR)
+        if key and section in sections and value is not None and value == value:
+            sections[section][key] = value
+    if isinstance(sections['scores'].get('global'), float) and sections['scores']['global'].is_integer():
+        sections['scores']['global'] = int(sections['scores']['global'])
+
+    metadata = dict(others.get('metadata', {}))
+    metadata.update({name: record[name] for name in METADATA_COLUMNS if record.get(name) is not None})
+    metadata['secteur'] = record.get('secteur') or ''
+    if record.get('exercice') is not None:
+        metadata['exercice'] = record['exercice']
+    return AnalysisResult(sections['data'], sections['ratios'], sections['scores'], metadata,
+                          record.get('version') or ANALYSIS_RESULT_VERSION, record.get('timestamp'))
+
+
+def read_analyses(root: str, exercice: Optional[int] = None, secteur: Optional[str] = None) -> Iterator[AnalysisResult]:
+    """Relit (en flux, lot par lot) les analyses d'un entrepôt, filtrées par partition"""
+    for batch in open_dataset(root).to_batches(filter=_filter(exercice, secteur)):
+        for record in batch.to_pylist():
+            yield record_to_result(record)
+
+
+def read_ratios_frame(root: str, exercice: Optional[int] = None, secteur: Optional[str] = None):
+    """
+    Table des ratios d'un portefeuille (une ligne par analyse, index 'analyse_id')
+
+    Seules les colonnes de ratios sont lues : la table alimente directement
+    scoring.score_frame.
+    """
+    dataset = open_dataset(root)
+    prefix = f"ratios{SEPARATOR}"
+    columns = [name for name in dataset.schema.names if name.startswith(prefix)]
+    table = dataset.to_table(columns=['analyse_id'] + columns, filter=_filter(exercice, secteur))
+    frame = table.to_pandas().set_index('analyse_id')
+    return frame.rename(columns=lambda name: name[len(prefix):])
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    from modules.core.batch_reports import collect_inputs, load_analysis
+
+    parser = argparse.ArgumentParser(description="Export Parquet partitionné des résultats d'analyse")
+    parser.add_argument('entrees', nargs='+', help="Classeurs Excel, résultats JSON ou répertoires")
+    parser.add_argument('--sortie', required=True, help="Répertoire de l'entrepôt Parquet")
+    parser.add_argument('--secteur', default=None, help="Secteur appliqué aux classeurs Excel")
+    args = parser.parse_args(argv)
+
+    errors: List[str] = []
+
+    def results():
+        for path in collect_inputs(args.entrees):
+            try:
+                yield load_analysis(path, args.secteur)
+            except Exception as e:
+                errors.append(path.name)
+                print(f"❌ {path.name} : {e}")
+
+    stats = write_analyses(results(), args.sortie)
+    print(f"✅ {stats['analyses']} analyse(s) exportée(s) ({stats['fichiers']} fichier(s)) -> {Path(args.sortie)}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,376 @@
+"""
+Graphiques vectoriels des rapports PDF (reportlab), sans export d'images plotly
+
+Chaque graphique repose sur un gabarit (DrawingTemplate) : la partie fixe (cadre, bandes,
+axes, libellés, légende) est construite une seule fois par processus, puis partagée par
+les dessins de toutes les entreprises ; seules les séries de l'entreprise sont ajoutées.
+Les dessins (Drawing) sont des flowables : ils s'insèrent directement dans une story.
+"""
+
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from reportlab.graphics.shapes import Circle, Drawing, Group, Line, Polygon, Rect, String, Wedge
+from reportlab.lib import colors
+
+from modules.core.scoring import CATEGORIES, financial_class, get_scoring_grid
+
+FONT = 'Helvetica'
+FONT_BOLD = 'Helvetica-Bold'
+
+PRIMARY = colors.HexColor('#2c5aa0')
+LIGHT = colors.HexColor('#e8f4fd')
+GRID = colors.HexColor('#c8c8c8')
+
+# Classes du score BCEAO : (borne basse, borne haute, classe, couleur)
+SCORE_BANDS = (
+    (0, 25, 'E', '#d62728'),
+    (25, 40, 'D', '#ff7f0e'),
+    (40, 55, 'C', '#ffbb78'),
+    (55, 70, 'B', '#bcbd22'),
+    (70, 85, 'A', '#98df8a'),
+    (85, 100, 'A+', '#2ca02c'),
+)
+
+CATEGORY_LABELS = {
+    'liquidite': 'Liquidité',
+    'solvabilite': 'Solvabilité',
+    'rentabilite': 'Rentabilité',
+    'activite': 'Activité',
+    'gestion': 'Gestion',
+}
+
+# Postes du bilan : (clé, libellé, couleur)
+ACTIF_ITEMS = (
+    ('immobilisations_nettes', 'Immobilisations nettes', '#1f4e79'),
+    ('total_actif_circulant', 'Actif circulant', '#2c5aa0'),
+    ('tresorerie', 'Trésorerie', '#7fb3e6'),
+)
+PASSIF_ITEMS = (
+    ('capitaux_propres', 'Capitaux propres', '#2ca02c'),
+    ('dettes_financieres', 'Dettes financières', '#ff7f0e'),
+    ('dettes_court_terme', 'Dettes court terme', '#ffbb78'),
+    ('tresorerie_passif', 'Trésorerie passif', '#d62728'),
+)
+
+RATIO_LABELS = {
+    'ratio_liquidite_generale': 'Liquidité générale',
+    'ratio_liquidite_immediate': 'Liquidité immédiate',
+    'ratio_autonomie_financiere': 'Autonomie financière (%)',
+    'rotation_actif': "Rotation de l'actif",
+    'rotation_stocks': 'Rotation des stocks',
+    'marge_brute': 'Marge brute (%)',
+    'marge_nette': 'Marge nette (%)',
+    'roe': 'ROE (%)',
+}
+
+# Ratio sectoriel : (clé, q1, médiane, q3)
+Benchmark = Tuple[str, float, float, float]
+
+
+class DrawingTemplate:
+    """
+    Gabarit de graphique : partie fixe partagée, séries propres à chaque dessin
+
+    La partie fixe n'est jamais modifiée après sa construction : un même groupe peut
+    figurer dans les dessins de plusieurs rapports, y compris dans un même PDF.
+    """
+
+    def __init__(self, width: float, height: float, build_static: Callable[[], Group]):
+        self.width = width
+        self.height = height
+        self.static = build_static()
+
+    def render(self, shapes: Iterable[Any]) -> Drawing:
+        """Nouveau dessin : partie fixe + séries de l'entreprise"""
+        drawing = Drawing(self.width, self.height)
+        drawing.hAlign = 'CENTER'
+        drawing.add(self.static)
+        for shape in shapes:
+            drawing.add(shape)
+        return drawing
+
+
+def _text(x: float, y: float, text: str, size: float = 8, anchor: str = 'start',
+          bold: bool = False, color=colors.black) -> String:
+    return String(x, y, text, fontName=FONT_BOLD if bold else FONT, fontSize=size,
+                  textAnchor=anchor, fillColor=color)
+
+
+# --- Jauge du score global -------------------------------------------------
+
+GAUGE_WIDTH, GAUGE_HEIGHT = 260, 160
+GAUGE_CX, GAUGE_CY, GAUGE_RADIUS = 130, 40, 100
+
+
+def _gauge_angle(score: float) -> float:
+    """Angle (degrés) du score sur le demi-cercle : 0 à gauche, 100 à droite"""
+    return 180 - 1.8 * max(0.0, min(100.0, score))
+
+
+def _gauge_static() -> Group:
+    group = Group()
+    for low, high, classe, color in SCORE_BANDS:
+        group.add(Wedge(GAUGE_CX, GAUGE_CY, GAUGE_RADIUS, _gauge_angle(high), _gauge_angle(low),
+                        radius1=GAUGE_RADIUS * 0.62, fillColor=colors.HexColor(color),
+                        strokeColor=colors.white, strokeWidth=1))
+        middle = math.radians(_gauge_angle((low + high) / 2))
+        group.add(_text(GAUGE_CX + GAUGE_RADIUS * 0.81 * math.cos(middle),
+                        GAUGE_CY + GAUGE_RADIUS * 0.81 * math.sin(middle) - 3,
+                        classe, size=9, anchor='middle', bold=True, color=colors.white))
+    for tick in (0, 25, 40, 55, 70, 85, 100):
+        angle = math.radians(_gauge_angle(tick))
+        group.add(_text(GAUGE_CX + (GAUGE_RADIUS + 9) * math.cos(angle),
+                        GAUGE_CY + (GAUGE_RADIUS + 9) * math.sin(angle) - 3,
+                        str(tick), size=7, anchor='middle', color=colors.grey))
+    return group
+
+
+@lru_cache(maxsize=1)
+def gauge_template() -> DrawingTemplate:
+    return DrawingTemplate(GAUGE_WIDTH, GAUGE_HEIGHT, _gauge_static)
+
+
+def score_gauge_drawing(score: float) -> Drawing:
+    """Jauge du score global BCEAO (classes A+ à E)"""
+    angle = math.radians(_gauge_angle(score))
+    length = GAUGE_RADIUS * 0.9
+    tip = (GAUGE_CX + length * math.cos(angle), GAUGE_CY + length * math.sin(angle))
+    return gauge_template().render([
+        Line(GAUGE_CX, GAUGE_CY, tip[0], tip[1], strokeColor=colors.black, strokeWidth=2.5),
+        Circle(GAUGE_CX, GAUGE_CY, 5, fillColor=colors.black, strokeColor=None),
+        _text(GAUGE_CX, GAUGE_CY - 20, f"{score:.0f}/100 - Classe {financial_class(score)}",
+              size=11, anchor='middle', bold=True, color=PRIMARY),
+    ])
+
+
+# --- Performance par catégorie ---------------------------------------------
+
+BARS_WIDTH = 440
+BARS_LABEL_WIDTH, BARS_RIGHT = 90, 80
+BARS_ROW, BARS_BAR, BARS_AXIS = 22, 12, 16
+
+
+def _bars_geometry(count: int) -> Tuple[float, float]:
+    """Largeur utile des barres et hauteur du dessin"""
+    return BARS_WIDTH - BARS_LABEL_WIDTH - BARS_RIGHT, BARS_AXIS + count * BARS_ROW + 4
+
+
+def _bars_row_y(index: int, count: int) -> float:
+    return BARS_AXIS + (count - 1 - index) * BARS_ROW + (BARS_ROW - BARS_BAR) / 2
+
+
+@lru_cache(maxsize=8)
+def category_bars_template(categories: Tuple[str, ...]) -> DrawingTemplate:
+    span, height = _bars_geometry(len(categories))
+
+    def build() -> Group:
+        group = Group()
+        for pct in (0, 25, 50, 75, 100):
+            x = BARS_LABEL_WIDTH + span * pct / 100
+            group.add(Line(x, BARS_AXIS - 2, x, height - 2, strokeColor=GRID, strokeWidth=0.5))
+            group.add(_text(x, 4, f"{pct}%", size=7, anchor='middle', color=colors.grey))
+        for index, category in enumerate(categories):
+            y = _bars_row_y(index, len(categories))
+            group.add(_text(BARS_LABEL_WIDTH - 6, y + 3, CATEGORY_LABELS.get(category, category.title()),
+                            size=9, anchor='end'))
+            group.add(Rect(BARS_LABEL_WIDTH, y, span, BARS_BAR, fillColor=LIGHT, strokeColor=None))
+        return group
+
+    return DrawingTemplate(BARS_WIDTH, height, build)
+
+
+def _performance_color(pct: float):
+    if pct >= 70:
+        return colors.HexColor('#2ca02c')
+    if pct >= 50:
+        return colors.HexColor('#ff7f0e')
+    return colors.HexColor('#d62728')
+
+
+def category_bars_drawing(scores: Dict[str, Any], categories: Iterable[str] = CATEGORIES) -> Drawing:
+    """Score de chaque catégorie en pourcentage de son maximum (grille de notation active)"""
+    categories = tuple(categories)
+    grid = get_scoring_grid()['categories']
+    span, _ = _bars_geometry(len(categories))
+
+    shapes = []
+    for index, category in enumerate(categories):
+        maximum = grid.get(category, {}).get('max') or 1
+        score = scores.get(category, 0) or 0
+        pct = max(0.0, min(100.0, score / maximum * 100))
+        y = _bars_row_y(index, len(categories))
+        shapes.append(Rect(BARS_LABEL_WIDTH, y, span * pct / 100, BARS_BAR,
+                           fillColor=_performance_color(pct), strokeColor=None))
+        shapes.append(_text(BARS_LABEL_WIDTH + span + 6, y + 3, f"{score:g}/{maximum:g} ({pct:.0f}%)", size=8))
+    return category_bars_template(categories).render(shapes)
+
+
+# --- Structure du bilan ----------------------------------------------------
+
+BALANCE_WIDTH, BALANCE_HEIGHT = 440, 200
+BALANCE_BOTTOM, BALANCE_TOP = 22, 190
+BALANCE_COLUMNS = ((60, 'Actif', ACTIF_ITEMS), (170, 'Passif', PASSIF_ITEMS))
+BALANCE_COLUMN_WIDTH = 80
+BALANCE_LEGEND_X = 290
+
+
+def _balance_static() -> Group:
+    group = Group()
+    span = BALANCE_TOP - BALANCE_BOTTOM
+    for pct in (0, 25, 50, 75, 100):
+        y = BALANCE_BOTTOM + span * pct / 100
+        group.add(Line(40, y, 260, y, strokeColor=GRID, strokeWidth=0.5))
+        group.add(_text(34, y - 3, f"{pct}%", size=7, anchor='end', color=colors.grey))
+    for x, label, _ in BALANCE_COLUMNS:
+        group.add(_text(x + BALANCE_COLUMN_WIDTH / 2, 6, label, size=9, anchor='middle', bold=True))
+
+    y = BALANCE_TOP - 8
+    for _, title, items in BALANCE_COLUMNS:
+        group.add(_text(BALANCE_LEGEND_X, y, title, size=8, bold=True))
+        y -= 14
+        for _, label, color in items:
+            group.add(Rect(BALANCE_LEGEND_X, y - 1, 8, 8, fillColor=colors.HexColor(color), strokeColor=None))
+            group.add(_text(BALANCE_LEGEND_X + 12, y, label, size=8))
+            y -= 13
+        y -= 6
+    return group
+
+
+@lru_cache(maxsize=1)
+def balance_template() -> DrawingTemplate:
+    return DrawingTemplate(BALANCE_WIDTH, BALANCE_HEIGHT, _balance_static)
+
+
+def balance_structure_drawing(data: Dict[str, Any]) -> Drawing:
+    """Colonnes empilées de l'actif et du passif (en % du total de chaque colonne)"""
+    span = BALANCE_TOP - BALANCE_BOTTOM
+    shapes = []
+    for x, _, items in BALANCE_COLUMNS:
+        amounts = [max(0.0, data.get(key, 0) or 0) for key, _, _ in items]
+        total = sum(amounts)
+        y = BALANCE_BOTTOM
+        for amount, (_, _, color) in zip(amounts, items):
+            if not total or not amount:
+                continue
+            share = amount / total
+            shapes.append(Rect(x, y, BALANCE_COLUMN_WIDTH, span * share,
+                               fillColor=colors.HexColor(color), strokeColor=colors.white, strokeWidth=0.5))
+            if span * share >= 12:
+                shapes.append(_text(x + BALANCE_COLUMN_WIDTH / 2, y + span * share / 2 - 3, f"{share * 100:.0f}%",
+                                    size=8, anchor='middle', bold=True, color=colors.white))
+            y += span * share
+        if not total:
+            shapes.append(_text(x + BALANCE_COLUMN_WIDTH / 2, BALANCE_BOTTOM + span / 2, "Non renseigné",
+                                size=8, anchor='middle', color=colors.grey))
+    return balance_template().render(shapes)
+
+
+# --- Positionnement sectoriel ----------------------------------------------
+
+SECTOR_WIDTH = 440
+SECTOR_LABEL_WIDTH, SECTOR_RIGHT = 130, 60
+SECTOR_ROW, SECTOR_LEGEND = 30, 20
+
+
+def sector_benchmarks(secteur: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Quartiles sectoriels d'un secteur, comme pour la comparaison sectorielle de l'analyseur
+
+    Les normes de data/sectoral_norms.json priment sur les valeurs intégrées à l'analyseur.
+    """
+    from modules.core.analyzer import get_financial_analyzer
+    from modules.core.norms import get_sector_benchmarks
+
+    if not secteur:
+        return {}
+    benchmarks = {name: dict(values) for name, values
+                  in get_financial_analyzer().ratios_sectoriels.get(secteur, {}).items()}
+    benchmarks.update(get_sector_benchmarks(secteur))
+    return benchmarks
+
+
+def _sector_scale(q1: float, q3: float) -> Tuple[float, float]:
+    """Échelle d'une ligne : l'écart interquartile de part et d'autre du quartile"""
+    spread = (q3 - q1) or abs(q3) or 1
+    return q1 - spread, q3 + spread
+
+
+def _sector_row_y(index: int, count: int) -> float:
+    return SECTOR_LEGEND + (count - 1 - index) * SECTOR_ROW + SECTOR_ROW / 2
+
+
+@lru_cache(maxsize=32)
+def sector_template(rows: Tuple[Benchmark, ...]) -> DrawingTemplate:
+    """Gabarit d'un jeu de quartiles sectoriels (un par secteur et version des normes)"""
+    span = SECTOR_WIDTH - SECTOR_LABEL_WIDTH - SECTOR_RIGHT
+    height = SECTOR_LEGEND + len(rows) * SECTOR_ROW + 4
+
+    def build() -> Group:
+        group = Group()
+        for index, (ratio, q1, median, q3) in enumerate(rows):
+            y = _sector_row_y(index, len(rows))
+            low, high = _sector_scale(q1, q3)
+
+            def x_of(value, low=low, high=high):
+                return SECTOR_LABEL_WIDTH + span * (value - low) / (high - low)
+
+            group.add(_text(SECTOR_LABEL_WIDTH - 8, y - 3, RATIO_LABELS.get(ratio, ratio.replace('_', ' ').capitalize()),
+                            size=8, anchor='end'))
+            group.add(Line(SECTOR_LABEL_WIDTH, y, SECTOR_LABEL_WIDTH + span, y, strokeColor=GRID, strokeWidth=1))
+            group.add(Rect(x_of(q1), y - 5, x_of(q3) - x_of(q1), 10, fillColor=LIGHT, strokeColor=PRIMARY,
+                           strokeWidth=0.5))
+            group.add(Line(x_of(median), y - 7, x_of(median), y + 7, strokeColor=PRIMARY, strokeWidth=1.5))
+            group.add(_text(x_of(q1), y - 14, f"{q1:g}", size=6, anchor='middle', color=colors.grey))
+            group.add(_text(x_of(q3), y - 14, f"{q3:g}", size=6, anchor='middle', color=colors.grey))
+
+        group.add(Rect(SECTOR_LABEL_WIDTH, 4, 14, 8, fillColor=LIGHT, strokeColor=PRIMARY, strokeWidth=0.5))
+        group.add(_text(SECTOR_LABEL_WIDTH + 18, 5, "Q1 - Q3 du secteur", size=7))
+        group.add(Line(SECTOR_LABEL_WIDTH + 110, 3, SECTOR_LABEL_WIDTH + 110, 13, strokeColor=PRIMARY, strokeWidth=1.5))
+        group.add(_text(SECTOR_LABEL_WIDTH + 115, 5, "Médiane", size=7))
+        group.add(Circle(SECTOR_LABEL_WIDTH + 170, 8, 4, fillColor=colors.HexColor('#d62728'), strokeColor=None))
+        group.add(_text(SECTOR_LABEL_WIDTH + 177, 5, "Entreprise", size=7))
+        return group
+
+    return DrawingTemplate(SECTOR_WIDTH, height, build)
+
+
+def sector_rows(ratios: Dict[str, Any], benchmarks: Dict[str, Dict[str, float]]) -> Tuple[Benchmark, ...]:
+    """Quartiles des ratios disponibles pour l'entreprise (ordre stable)"""
+    return tuple(
+        (ratio, float(values['q1']), float(values['median']), float(values['q3']))
+        for ratio, values in sorted(benchmarks.items())
+        if isinstance(ratios.get(ratio), (int, float)) and {'q1', 'median', 'q3'} <= set(values)
+    )
+
+
+def sector_positioning_drawing(ratios: Dict[str, Any], secteur: Optional[str]) -> Optional[Drawing]:
+    """
+    Position de chaque ratio de l'entreprise par rapport aux quartiles de son secteur
+
+    Returns:
+        Drawing: None si aucun ratio de l'entreprise n'a de référence sectorielle
+    """
+    rows = sector_rows(ratios, sector_benchmarks(secteur))
+    if not rows:
+        return None
+
+    template = sector_template(rows)
+    span = SECTOR_WIDTH - SECTOR_LABEL_WIDTH - SECTOR_RIGHT
+    shapes: List[Any] = []
+    for index, (ratio, q1, median, q3) in enumerate(rows):
+        y = _sector_row_y(index, len(rows))
+        low, high = _sector_scale(q1, q3)
+        value = float(ratios[ratio])
+        x = SECTOR_LABEL_WIDTH + span * (max(low, min(high, value)) - low) / (high - low)
+        if low <= value <= high:
+            shapes.append(Circle(x, y, 4, fillColor=colors.HexColor('#d62728'), strokeColor=colors.white))
+        else:
+            # Valeur hors échelle : flèche au bord de la ligne
+            direction = 1 if value > high else -1
+            shapes.append(Polygon([x, y - 5, x, y + 5, x + 7 * direction, y],
+                                  fillColor=colors.HexColor('#d62728'), strokeColor=None))
+        shapes.append(_text(SECTOR_LABEL_WIDTH + span + 10, y - 3, f"{value:,.2f}", size=8, bold=True))
+    return template.render(shapes)
+
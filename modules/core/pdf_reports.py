@@ -0,0 +1,565 @@
+"""
+Mises en page des rapports PDF (reportlab), indépendantes de Streamlit
+
+Utilisées par la page des rapports et par le rendu par lots (modules/core/batch_reports.py).
+Chaque rapport est décrit par une fonction qui construit son contenu (story) ; render_pdf
+le met en page et retourne les octets du PDF avec son nombre de pages.
+"""
+
+import io
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+
+from modules.core.pdf_charts import (
+    balance_structure_drawing, category_bars_drawing, score_gauge_drawing, sector_positioning_drawing
+)
+from modules.core.recommendations import recommend, PRIORITES
+from modules.core.scoring import financial_class, score_interpretation
+
+# Version des modèles de rapport : à incrémenter à chaque changement de mise en page,
+# les rapports déjà en cache pour l'ancienne version ne sont alors plus servis
+REPORT_TEMPLATE_VERSION = '3'
+
+
+def analysis_date_label(metadata) -> str:
+    """
+    Date de l'analyse pour les rapports
+
+    Les rapports sont mis en cache par contenu : ils portent la date de l'analyse
+    (métadonnées), jamais l'heure de leur génération.
+    """
+    value = metadata.get('date_analyse')
+    if not value:
+        return 'Non spécifiée'
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S').strftime('%d/%m/%Y à %H:%M')
+    except ValueError:
+        return str(value)
+
+
+@lru_cache(maxsize=1)
+def get_pdf_styles():
+    """Styles des rapports PDF, construits une seule fois par processus"""
+    styles = getSampleStyleSheet()
+    return {
+        'base': styles,
+        'summary_title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=20,
+            spaceAfter=30,
+            alignment=1,  # Centré
+            textColor=colors.HexColor('#1f4e79')
+        ),
+        'detailed_title': ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=18, spaceAfter=30, alignment=1, textColor=colors.HexColor('#1f4e79')),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceAfter=12,
+            textColor=colors.HexColor('#2c5aa0')
+        ),
+        'footer': ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey)
+    }
+
+
+def render_pdf(story: List[Any]) -> Tuple[bytes, int]:
+    """
+    Met en page un contenu au format A4 (marges de 2 cm)
+
+    Returns:
+        tuple: (octets du PDF, nombre de pages)
+    """
+    buffer = io.BytesIO()
+    # invariant : pas de date de création dans le fichier, le même contenu donne les mêmes octets
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=2*cm, bottomMargin=2*cm,
+                            invariant=True)
+    doc.build(story)
+    return buffer.getvalue(), doc.page
+
+
+def executive_summary_story(data, ratios, scores, metadata) -> list:
+    """Contenu de la synthèse exécutive (2-3 pages)"""
+    
+    pdf_styles = get_pdf_styles()
+    styles = pdf_styles['base']
+    title_style = pdf_styles['summary_title']
+    heading_style = pdf_styles['heading']
+    
+    # Contenu du document
+    story = []
+    
+    # Titre
+    story.append(Paragraph("SYNTHÈSE EXÉCUTIVE", title_style))
+    story.append(Paragraph("Analyse Financière selon les Normes BCEAO", styles['Normal']))
+    story.append(Spacer(1, 20))
+    
+    # Informations générales
+    info_data = [
+        ['Entreprise', metadata.get('fichier_nom', 'Non spécifié')],
+        ['Date d\'analyse', analysis_date_label(metadata)],
+        ['Secteur d\'activité', metadata.get('secteur', 'Non spécifié').replace('_', ' ').title()],
+        ['Source des données', metadata.get('source', 'Import').replace('_', ' ').title()]
+    ]
+    
+    info_table = Table(info_data, colWidths=[4*cm, 10*cm])
+    info_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f1f1f1')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(info_table)
+    story.append(Spacer(1, 20))
+    
+    # Score global
+    score_global = scores.get('global', 0)
+    interpretation, _ = score_interpretation(score_global)
+    classe = financial_class(score_global)
+    
+    story.append(Paragraph("SCORE GLOBAL BCEAO", heading_style))
+    
+    score_data = [
+        ['Score Global', f'{score_global}/100'],
+        ['Classe', classe],
+        ['Interprétation', interpretation]
+    ]
+    
+    score_table = Table(score_data, colWidths=[6*cm, 8*cm])
+    score_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#e8f4fd')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(score_table)
+    story.append(Spacer(1, 10))
+    story.append(score_gauge_drawing(score_global))
+    story.append(Spacer(1, 20))
+    
+    # Performance par catégorie
+    story.append(Paragraph("PERFORMANCE PAR CATÉGORIE", heading_style))
+    
+    categories_data = [
+        ['Catégorie', 'Score', 'Maximum', 'Performance'],
+        ['Liquidité', f"{scores.get('liquidite', 0)}", '40', f"{(scores.get('liquidite', 0)/40)*100:.0f}%"],
+        ['Solvabilité', f"{scores.get('solvabilite', 0)}", '40', f"{(scores.get('solvabilite', 0)/40)*100:.0f}%"],
+        ['Rentabilité', f"{scores.get('rentabilite', 0)}", '30', f"{(scores.get('rentabilite', 0)/30)*100:.0f}%"],
+        ['Activité', f"{scores.get('activite', 0)}", '15', f"{(scores.get('activite', 0)/15)*100:.0f}%"],
+        ['Gestion', f"{scores.get('gestion', 0)}", '15', f"{(scores.get('gestion', 0)/15)*100:.0f}%"]
+    ]
+    
+    categories_table = Table(categories_data, colWidths=[4*cm, 2*cm, 2*cm, 3*cm])
+    categories_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(categories_table)
+    story.append(Spacer(1, 10))
+    story.append(category_bars_drawing(scores))
+    story.append(Spacer(1, 20))
+    
+    # Indicateurs financiers clés
+    story.append(Paragraph("INDICATEURS FINANCIERS CLÉS", heading_style))
+    
+    financial_data = [
+        ['Indicateur', 'Montant (FCFA)'],
+        ['Chiffre d\'Affaires', f"{data.get('chiffre_affaires', 0):,.0f}"],
+        ['Total Actif', f"{data.get('total_actif', 0):,.0f}"],
+        ['Résultat Net', f"{data.get('resultat_net', 0):,.0f}"],
+        ['Capitaux Propres', f"{data.get('capitaux_propres', 0):,.0f}"]
+    ]
+    
+    financial_table = Table(financial_data, colWidths=[6*cm, 8*cm])
+    financial_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(financial_table)
+    story.append(Spacer(1, 20))
+    
+    # Ratios clés
+    story.append(Paragraph("RATIOS CLÉS", heading_style))
+    
+    key_ratios_data = [
+        ['Ratio', 'Valeur', 'Norme BCEAO', 'Statut'],
+        ['Liquidité Générale', f"{ratios.get('ratio_liquidite_generale', 0):.2f}", '> 1.5', 
+         '✓ Conforme' if ratios.get('ratio_liquidite_generale', 0) >= 1.5 else '✗ Non conforme'],
+        ['Autonomie Financière', f"{ratios.get('ratio_autonomie_financiere', 0):.1f}%", '> 30%',
+         '✓ Conforme' if ratios.get('ratio_autonomie_financiere', 0) >= 30 else '✗ Non conforme'],
+        ['ROE', f"{ratios.get('roe', 0):.1f}%", '> 10%',
+         '✓ Conforme' if ratios.get('roe', 0) >= 10 else '✗ Non conforme'],
+        ['Marge Nette', f"{ratios.get('marge_nette', 0):.1f}%", '> 5%',
+         '✓ Conforme' if ratios.get('marge_nette', 0) >= 5 else '✗ Non conforme']
+    ]
+    
+    ratios_table = Table(key_ratios_data, colWidths=[4*cm, 3*cm, 3*cm, 4*cm])
+    ratios_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(ratios_table)
+    story.append(Spacer(1, 20))
+    
+    # Points forts et faiblesses
+    story.append(Paragraph("POINTS FORTS ET FAIBLESSES", heading_style))
+    
+    strengths = identify_strengths_pdf(scores, ratios)
+    weaknesses = identify_weaknesses_pdf(scores, ratios)
+    
+    points_data = [['Points Forts', 'Points Faibles']]
+    max_items = max(len(strengths), len(weaknesses))
+    
+    for i in range(max_items):
+        strength = strengths[i] if i < len(strengths) else ""
+        weakness = weaknesses[i] if i < len(weaknesses) else ""
+        points_data.append([f"• {strength}" if strength else "", f"• {weakness}" if weakness else ""])
+    
+    points_table = Table(points_data, colWidths=[7*cm, 7*cm])
+    points_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(points_table)
+    story.append(Spacer(1, 20))
+    
+    # Recommandations prioritaires
+    story.append(Paragraph("RECOMMANDATIONS PRIORITAIRES", heading_style))
+    
+    recommendations = generate_priority_recommendations_pdf(scores, ratios)
+    
+    if recommendations:
+        rec_data = [['Priorité', 'Recommandation']]
+        for i, rec in enumerate(recommendations, 1):
+            rec_data.append([f"{i}.", rec])
+    
+        rec_table = Table(rec_data, colWidths=[1*cm, 13*cm])
+        rec_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+    
+        story.append(rec_table)
+    else:
+        story.append(Paragraph("✓ Situation financière satisfaisante. Maintenir les bonnes pratiques.", styles['Normal']))
+    
+    story.append(Spacer(1, 20))
+    
+    # Conclusion
+    story.append(Paragraph("CONCLUSION", heading_style))
+    
+    if score_global >= 70:
+        conclusion_text = "La situation financière de l'entreprise est satisfaisante selon les normes BCEAO. Les indicateurs montrent une bonne maîtrise de la gestion financière."
+    elif score_global >= 40:
+        conclusion_text = "La situation financière présente quelques faiblesses qui nécessitent une attention particulière. Des améliorations ciblées permettront de renforcer la position financière."
+    else:
+        conclusion_text = "La situation financière nécessite des actions correctives urgentes. Un plan de redressement doit être mis en place rapidement."
+    
+    story.append(Paragraph(conclusion_text, styles['Normal']))
+    story.append(Spacer(1, 20))
+    
+    # Pied de page
+    story.append(Paragraph(f"Analyse du {analysis_date_label(metadata)} - Outil d'Analyse Financière BCEAO", 
+                         pdf_styles['footer']))
+    
+    return story
+
+
+def detailed_report_story(data, ratios, scores, metadata) -> list:
+    """Contenu du rapport détaillé"""
+    
+    pdf_styles = get_pdf_styles()
+    styles = pdf_styles['base']
+    title_style = pdf_styles['detailed_title']
+    heading_style = pdf_styles['heading']
+    
+    story = []
+    
+    # Page de titre
+    story.append(Paragraph("RAPPORT D'ANALYSE FINANCIÈRE DÉTAILLÉ", title_style))
+    story.append(Paragraph("Conforme aux Normes BCEAO", styles['Normal']))
+    story.append(Spacer(1, 40))
+    
+    # Table des matières
+    story.append(Paragraph("TABLE DES MATIÈRES", heading_style))
+    toc_items = [
+        "1. Résumé Exécutif",
+        "2. Analyse du Bilan", 
+        "3. Analyse du Compte de Résultat",
+        "4. Analyse Détaillée des Ratios",
+        "5. Comparaison Sectorielle",
+        "6. Recommandations et Plan d'Action",
+        "7. Conclusion"
+    ]
+    
+    for item in toc_items:
+        story.append(Paragraph(item, styles['Normal']))
+    
+    story.append(PageBreak())
+    
+    # 1. Résumé Exécutif
+    story.append(Paragraph("1. RÉSUMÉ EXÉCUTIF", heading_style))
+    
+    score_global = scores.get('global', 0)
+    interpretation, _ = score_interpretation(score_global)
+    
+    story.append(Paragraph(f"""
+    L'analyse financière réalisée selon les normes BCEAO révèle un score global de {score_global}/100, 
+    classant l'entreprise avec une évaluation "{interpretation.lower()}".
+    """, styles['Normal']))
+    
+    story.append(Spacer(1, 10))
+    story.append(score_gauge_drawing(score_global))
+    story.append(category_bars_drawing(scores))
+    story.append(Spacer(1, 20))
+    
+    # 2. Analyse du Bilan
+    story.append(Paragraph("2. ANALYSE DU BILAN", heading_style))
+    
+    # Structure de l'actif
+    story.append(Paragraph("2.1 Structure de l'Actif", styles['Heading3']))
+    
+    total_actif = data.get('total_actif') or 1
+    actif_data = [
+        ['Poste', 'Montant (FCFA)', '% du Total'],
+        ['Immobilisations nettes', f"{data.get('immobilisations_nettes', 0):,.0f}", f"{(data.get('immobilisations_nettes', 0)/total_actif)*100:.1f}%"],
+        ['Actif circulant', f"{data.get('total_actif_circulant', 0):,.0f}", f"{(data.get('total_actif_circulant', 0)/total_actif)*100:.1f}%"],
+        ['Trésorerie', f"{data.get('tresorerie', 0):,.0f}", f"{(data.get('tresorerie', 0)/total_actif)*100:.1f}%"],
+        ['TOTAL ACTIF', f"{total_actif:,.0f}", "100.0%"]
+    ]
+    
+    actif_table = Table(actif_data, colWidths=[5*cm, 4*cm, 3*cm])
+    actif_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5aa0')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(actif_table)
+    story.append(Spacer(1, 20))
+    
+    # Structure du bilan (actif / passif)
+    story.append(Paragraph("2.2 Structure du Bilan", styles['Heading3']))
+    story.append(balance_structure_drawing(data))
+    story.append(Spacer(1, 20))
+    
+    # 3. Analyse des Ratios Détaillée
+    story.append(Paragraph("4. ANALYSE DÉTAILLÉE DES RATIOS", heading_style))
+    
+    # Ratios de liquidité
+    story.append(Paragraph("4.1 Ratios de Liquidité", styles['Heading3']))
+    
+    liquidite_data = [
+        ['Ratio', 'Valeur', 'Norme', 'Interprétation'],
+        ['Liquidité Générale', f"{ratios.get('ratio_liquidite_generale', 0):.2f}", '> 1.5', get_ratio_interpretation('liquidite_generale', ratios.get('ratio_liquidite_generale', 0))],
+        ['Liquidité Immédiate', f"{ratios.get('ratio_liquidite_immediate', 0):.2f}", '> 1.0', get_ratio_interpretation('liquidite_immediate', ratios.get('ratio_liquidite_immediate', 0))],
+        ['BFR en jours de CA', f"{ratios.get('bfr_jours_ca', 0):.0f}", '< 60 jours', get_ratio_interpretation('bfr_jours', ratios.get('bfr_jours_ca', 0))]
+    ]
+    
+    liquidite_table = Table(liquidite_data, colWidths=[4*cm, 2*cm, 2*cm, 4*cm])
+    liquidite_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8f4fd')),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(liquidite_table)
+    story.append(Spacer(1, 20))
+    
+    # Comparaison sectorielle
+    story.append(Paragraph("5. COMPARAISON SECTORIELLE", heading_style))
+    
+    secteur = metadata.get('secteur')
+    positioning = sector_positioning_drawing(ratios, secteur)
+    if positioning is not None:
+        story.append(Paragraph(f"Position des ratios par rapport aux quartiles du secteur "
+                               f"{secteur.replace('_', ' ')}.", styles['Normal']))
+        story.append(positioning)
+    else:
+        story.append(Paragraph("Aucune référence sectorielle disponible pour ce secteur.", styles['Normal']))
+    story.append(Spacer(1, 20))
+    
+    # Recommandations
+    story.append(Paragraph("6. RECOMMANDATIONS ET PLAN D'ACTION", heading_style))
+    
+    recommendations = generate_detailed_recommendations_pdf(scores, ratios)
+    
+    for priority, recs in recommendations.items():
+        if recs:
+            story.append(Paragraph(f"6.{list(recommendations.keys()).index(priority)+1} {priority}", styles['Heading3']))
+            for i, rec in enumerate(recs, 1):
+                story.append(Paragraph(f"{i}. {rec}", styles['Normal']))
+            story.append(Spacer(1, 10))
+    
+    # Conclusion
+    story.append(Paragraph("7. CONCLUSION", heading_style))
+    
+    if score_global >= 70:
+        conclusion = "L'entreprise présente une situation financière satisfaisante selon les critères BCEAO. Les indicateurs révèlent une gestion maîtrisée et des perspectives favorables."
+    elif score_global >= 40:
+        conclusion = "L'entreprise présente une situation financière acceptable mais avec des faiblesses qui nécessitent une attention soutenue."
+    else:
+        conclusion = "L'entreprise fait face à des difficultés financières importantes qui nécessitent des actions correctives urgentes."
+    
+    story.append(Paragraph(conclusion, styles['Normal']))
+    story.append(Spacer(1, 20))
+    
+    # Pied de page
+    story.append(Paragraph(f"Analyse du {analysis_date_label(metadata)} - Outil d'Analyse Financière BCEAO", 
+                         pdf_styles['footer']))
+    
+    return story
+
+
+def build_executive_summary_pdf(data, ratios, scores, metadata) -> bytes:
+    """Construit la synthèse exécutive (octets PDF)"""
+    return render_pdf(executive_summary_story(data, ratios, scores, metadata))[0]
+
+
+def build_detailed_report_pdf(data, ratios, scores, metadata) -> bytes:
+    """Construit le rapport détaillé (octets PDF)"""
+    return render_pdf(detailed_report_story(data, ratios, scores, metadata))[0]
+
+
+# Contenu des rapports PDF, par type
+REPORT_STORIES: Dict[str, Callable[..., List[Any]]] = {
+    'synthese': executive_summary_story,
+    'detaille': detailed_report_story,
+}
+
+# Constructeurs des rapports PDF, par type
+PDF_BUILDERS: Dict[str, Callable[..., bytes]] = {
+    'synthese': build_executive_summary_pdf,
+    'detaille': build_detailed_report_pdf,
+}
+
+
+# Fonctions utilitaires pour les PDFs
+
+def identify_strengths_pdf(scores, ratios):
+    """Identifie les points forts pour le PDF"""
+    strengths = []
+    
+    if scores.get('liquidite', 0) >= 30:
+        strengths.append("Excellente liquidité")
+    if scores.get('solvabilite', 0) >= 30:
+        strengths.append("Structure financière solide")
+    if scores.get('rentabilite', 0) >= 20:
+        strengths.append("Rentabilité satisfaisante")
+    if ratios.get('roe', 0) >= 15:
+        strengths.append("Excellente rentabilité des capitaux propres")
+    if ratios.get('ratio_autonomie_financiere', 0) >= 40:
+        strengths.append("Forte autonomie financière")
+    
+    return strengths[:5]
+
+def identify_weaknesses_pdf(scores, ratios):
+    """Identifie les points faibles pour le PDF"""
+    weaknesses = []
+    
+    if scores.get('liquidite', 0) < 20:
+        weaknesses.append("Liquidité insuffisante")
+    if scores.get('solvabilite', 0) < 20:
+        weaknesses.append("Structure financière fragile")
+    if scores.get('rentabilite', 0) < 15:
+        weaknesses.append("Rentabilité faible")
+    if ratios.get('ratio_liquidite_generale', 0) < 1.2:
+        weaknesses.append("Ratio de liquidité critique")
+    if ratios.get('marge_nette', 0) < 3:
+        weaknesses.append("Marge nette insuffisante")
+    
+    return weaknesses[:5]
+
+def generate_priority_recommendations_pdf(scores, ratios):
+    """Génère des recommandations prioritaires pour le PDF"""
+    return [rec['resume'] for rec in recommend(ratios, scores)][:3]
+
+def generate_detailed_recommendations_pdf(scores, ratios):
+    """Génère des recommandations détaillées par priorité"""
+    recommendations = {niveau['horizon']: [] for niveau in PRIORITES.values()}
+    
+    for rec in recommend(ratios, scores):
+        recommendations[PRIORITES[rec['priorite']]['horizon']].extend(rec['actions'][:2])
+    
+    return recommendations
+
+def get_ratio_interpretation(ratio_type, value):
+    """Retourne l'interprétation d'un ratio"""
+    if ratio_type == 'liquidite_generale':
+        if value >= 2.0:
+            return "Excellent"
+        elif value >= 1.5:
+            return "Bon"
+        elif value >= 1.0:
+            return "Acceptable"
+        else:
+            return "Critique"
+    elif ratio_type == 'liquidite_immediate':
+        if value >= 1.0:
+            return "Bon"
+        elif value >= 0.8:
+            return "Acceptable"
+        else:
+            return "Faible"
+    elif ratio_type == 'bfr_jours':
+        if value <= 30:
+            return "Excellent"
+        elif value <= 60:
+            return "Bon"
+        elif value <= 90:
+            return "Acceptable"
+        else:
+            return "Critique"
+    else:
+        return "À analyser"
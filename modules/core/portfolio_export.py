@@ -0,0 +1,218 @@
+"""
+Export Excel d'un portefeuille (entreprises × ratios) en flux, à mémoire constante
+
+Usage :
+    python -m modules.core.portfolio_export portefeuille.xlsx --secteur commerce --exercice 2024
+
+Les lignes sont écrites une à une par xlsxwriter en mode constant_memory : chaque ligne
+est vidée sur disque dès que la suivante commence, si bien que la mémoire occupée ne
+dépend pas du nombre d'entreprises. Les valeurs sont de vraies cellules numériques avec
+un format par unité ; une feuille de synthèse (scores) et une feuille par catégorie de
+ratios partagent le même ordre de lignes.
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from modules.core.history import INFO_COLUMNS, KEY_COLUMNS
+from modules.core.recommendations import SCORE_PREFIX
+
+# Catégories de ratios, dans l'ordre des feuilles
+RATIO_CATEGORIES = ('Liquidité', 'Solvabilité', 'Rentabilité', 'Activité', 'Gestion')
+
+SUMMARY_SHEET = 'Synthèse'
+
+# Formats Excel par unité (les pourcentages sont stockés en points : 12.5 = 12,5 %)
+NUMBER_FORMATS = {
+    '%': '0.00" %"',
+    'jours': '0" j"',
+    'fois': '0.00"x"',
+    'ratio': '0.00',
+}
+SCORE_FORMAT = '0'
+
+
+def get_ratio_category(ratio_key: str) -> str:
+    """Retourne la catégorie d'un ratio"""
+    if any(x in ratio_key for x in ['liquidite', 'bfr', 'tresorerie']):
+        return 'Liquidité'
+    elif any(x in ratio_key for x in ['autonomie', 'endettement', 'solvabilite']):
+        return 'Solvabilité'
+    elif any(x in ratio_key for x in ['roe', 'roa', 'marge', 'rentabilite']):
+        return 'Rentabilité'
+    elif any(x in ratio_key for x in ['rotation', 'delai']):
+        return 'Activité'
+    else:
+        return 'Gestion'
+
+
+def get_ratio_unit(ratio_key: str) -> str:
+    """Retourne l'unité d'un ratio"""
+    if any(x in ratio_key for x in ['marge', 'autonomie', 'endettement', 'roe', 'roa']):
+        return '%'
+    elif any(x in ratio_key for x in ['jours', 'delai']):
+        return 'jours'
+    elif 'rotation' in ratio_key:
+        return 'fois'
+    else:
+        return 'ratio'
+
+
+def _is_number(value: Any) -> bool:
+    # NaN (valeur manquante d'un DataFrame) -> cellule vide
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value == value
+
+
+class PortfolioWorkbook:
+    """
+    Classeur de portefeuille écrit ligne par ligne
+
+    Les colonnes sont fixées à l'ouverture (l'en-tête est la première ligne de chaque
+    feuille) ; une même ligne est écrite au même rang sur toutes les feuilles.
+    """
+
+    def __init__(self, output: Any, ratio_columns: Sequence[str], score_columns: Sequence[str] = ()):
+        """
+        Args:
+            output: Chemin du fichier ou flux binaire (BytesIO)
+            ratio_columns (sequence): Ratios exportés, répartis par catégorie
+            score_columns (sequence): Scores par catégorie ('score_<categorie>')
+        """
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'nan_inf_to_errors': True})
+        self.rows = 0
+
+        header = self.workbook.add_format({'bold': True, 'font_color': 'white', 'bg_color': '#2c5aa0',
+                                           'text_wrap': True, 'valign': 'top'})
+        self.formats = {unit: self.workbook.add_format({'num_format': fmt}) for unit, fmt in NUMBER_FORMATS.items()}
+        self.formats['score'] = self.workbook.add_format({'num_format': SCORE_FORMAT})
+
+        # Feuille -> colonnes (clé de la ligne, format numérique)
+        self.sheets: List[tuple] = []
+        summary = [('score_global', 'score')] + [(name, 'score') for name in score_columns]
+        self._add_sheet(SUMMARY_SHEET, [(name, None) for name in INFO_COLUMNS if name != 'score_global'] + summary,
+                        header)
+        for category in RATIO_CATEGORIES:
+            columns = [(name, get_ratio_unit(name)) for name in ratio_columns if get_ratio_category(name) == category]
+            if columns:
+                self._add_sheet(category, columns, header)
+
+    def _add_sheet(self, name: str, columns: List[tuple], header):
+        sheet = self.workbook.add_worksheet(name)
+        columns = [(key, None) for key in KEY_COLUMNS] + columns
+        for index, (key, unit) in enumerate(columns):
+            label = key.replace('_', ' ').capitalize()
+            if unit in NUMBER_FORMATS and unit != 'ratio':
+                label = f"{label} ({unit})"
+            sheet.set_column(index, index, 24 if index == 0 else 14)
+            sheet.write_string(0, index, label, header)
+        sheet.freeze_panes(1, len(KEY_COLUMNS))
+        self.sheets.append((sheet, columns))
+
+    def write_row(self, row: Mapping[str, Any]):
+        """Écrit une entreprise-exercice sur toutes les feuilles"""
+        self.rows += 1
+        for sheet, columns in self.sheets:
+            for index, (key, unit) in enumerate(columns):
+                value = row.get(key)
+                if _is_number(value):
+                    sheet.write_number(self.rows, index, value, self.formats.get(unit))
+                elif value is not None and value != '':
+                    sheet.write_string(self.rows, index, str(value))
+
+    def close(self):
+        for sheet, columns in self.sheets:
+            sheet.autofilter(0, 0, self.rows, len(columns) - 1)
+        self.workbook.close()
+
+
+def split_columns(columns: Iterable[str]) -> tuple:
+    """Sépare les colonnes d'historique en (ratios, scores par catégorie)"""
+    fixed = set(KEY_COLUMNS) | set(INFO_COLUMNS)
+    ratios, scores = [], []
+    for name in columns:
+        if name in fixed:
+            continue
+        (scores if name.startswith(SCORE_PREFIX) else ratios).append(name)
+    return ratios, scores
+
+
+def analysis_columns() -> tuple:
+    """
+    Colonnes (ratios, scores par catégorie) que le moteur peut produire
+
+    Connues avant la première ligne : des résultats d'analyse peuvent être exportés en flux
+    sans être d'abord tous lus pour découvrir leurs colonnes.
+    """
+    from modules.core.analyzer import RATIO_NAMES
+    from modules.core.scoring import CATEGORIES
+
+    return list(RATIO_NAMES), [f"{SCORE_PREFIX}{categorie}" for categorie in CATEGORIES]
+
+
+def export_portfolio(rows: Iterable[Mapping[str, Any]], output: Any, ratio_columns: Sequence[str],
+                     score_columns: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    Exporte des lignes d'historique (voir history.history_row) dans un classeur
+
+    Args:
+        rows (iterable): Lignes entreprise-exercice, parcourues une seule fois
+        output: Chemin du fichier ou flux binaire
+        ratio_columns (sequence): Ratios exportés
+        score_columns (sequence): Scores par catégorie exportés
+
+    Returns:
+        dict: Statistiques de l'export
+    """
+    start = time.perf_counter()
+    workbook = PortfolioWorkbook(output, ratio_columns, score_columns)
+    try:
+        for row in rows:
+            workbook.write_row(row)
+    finally:
+        workbook.close()
+    return {
+        'entreprises_exercices': workbook.rows,
+        'feuilles': [sheet.get_name() for sheet, _ in workbook.sheets],
+        'ratios': len(ratio_columns),
+        'duree_s': round(time.perf_counter() - start, 2)
+    }
+
+
+def export_history(output: Any, history=None, secteur: Optional[str] = None, exercice: Optional[int] = None,
+                   norms_version: Optional[str] = None) -> Dict[str, Any]:
+    """Exporte (en flux) les lignes de l'historique des analyses répondant aux critères"""
+    if history is None:
+        from modules.core.history import get_analysis_history
+        history = get_analysis_history()
+    ratio_columns, score_columns = split_columns(history.columns)
+    rows = history.iter_rows(secteur=secteur, exercice=exercice, norms_version=norms_version)
+    return export_portfolio(rows, output, ratio_columns, score_columns)
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    from modules.core.history import AnalysisHistory, get_analysis_history
+
+    parser = argparse.ArgumentParser(description="Export Excel du portefeuille (historique des analyses)")
+    parser.add_argument('sortie', help="Classeur .xlsx à produire")
+    parser.add_argument('--base', default=None, help="Base d'historique (défaut : base de l'application)")
+    parser.add_argument('--secteur', default=None, help="Secteur à exporter")
+    parser.add_argument('--exercice', type=int, default=None, help="Exercice à exporter")
+    parser.add_argument('--normes', default=None, help="Version des normes à exporter")
+    args = parser.parse_args(argv)
+
+    history = AnalysisHistory(args.base) if args.base else get_analysis_history()
+    stats = export_history(args.sortie, history, secteur=args.secteur, exercice=args.exercice,
+                           norms_version=args.normes)
+
+    print(f"✅ {stats['entreprises_exercices']} ligne(s) exportée(s) en {stats['duree_s']} s -> {args.sortie}")
+    print(json.dumps(stats, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,301 @@
+"""
+Moteur de recommandations piloté par table de règles (une entreprise ou tout un portefeuille)
+"""
+
+import operator
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Préfixe des colonnes de scores dans le DataFrame de portefeuille
+SCORE_PREFIX = 'score_'
+
+OPERATEURS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+
+# Niveaux de priorité, du plus urgent au moins urgent
+PRIORITES = {
+    'URGENT': {'rang': 0, 'pastille': '🔴', 'code': 'urgent', 'horizon': 'Actions Urgentes (0-1 mois)'},
+    'IMPORTANT': {'rang': 1, 'pastille': '🟠', 'code': 'important', 'horizon': 'Actions Importantes (1-3 mois)'},
+    'MOYEN TERME': {'rang': 2, 'pastille': '🟡', 'code': 'improvement', 'horizon': 'Actions Moyen Terme (3-6 mois)'}
+}
+
+# Table des règles : une règle se déclenche lorsque toutes ses conditions sont vraies.
+# Une condition est (colonne, opérateur, seuil) ; une valeur absente vaut 0.
+RECOMMENDATION_RULES = [
+    {
+        'id': 'liquidite_critique',
+        'priorite': 'URGENT',
+        'categorie': 'Liquidité',
+        'icone': '💧',
+        'conditions': [('score_liquidite', '<', 25), ('ratio_liquidite_generale', '<', 1.2)],
+        'ratio': 'ratio_liquidite_generale',
+        'titre': 'Améliorer la Liquidité Immédiatement',
+        'resume': 'Améliorer la liquidité immédiatement',
+        'probleme': 'Ratio de liquidité générale critique ({valeur:.2f})',
+        'impact': 'Risque de défaillance à court terme et difficultés de paiement',
+        'actions': [
+            'Négocier des délais de paiement avec les fournisseurs (30-60 jours)',
+            'Accélérer le recouvrement des créances clients (relances, escompte)',
+            'Réduire les stocks non essentiels et obsolètes',
+            'Négocier une ligne de crédit court terme d\'urgence',
+            'Reporter tous les investissements non critiques'
+        ],
+        'indicateurs': [
+            'Ratio de liquidité générale > 1.5',
+            'Délai de recouvrement < 45 jours',
+            'Rotation des stocks > 6',
+            'Trésorerie nette positive'
+        ]
+    },
+    {
+        'id': 'autonomie_insuffisante',
+        'priorite': 'IMPORTANT',
+        'categorie': 'Solvabilité',
+        'icone': '🏛️',
+        'conditions': [('score_solvabilite', '<', 25), ('ratio_autonomie_financiere', '<', 25)],
+        'ratio': 'ratio_autonomie_financiere',
+        'titre': 'Renforcer la Structure Financière',
+        'resume': 'Renforcer la structure financière',
+        'probleme': 'Autonomie financière insuffisante ({valeur:.1f}%)',
+        'impact': 'Structure financière déséquilibrée, dépendance excessive aux dettes',
+        'actions': [
+            'Préparer une augmentation de capital avec les associés',
+            'Renégocier les conditions des dettes financières (taux, échéances)',
+            'Mettre en réserve tous les bénéfices futurs',
+            'Rechercher des subventions ou aides publiques',
+            'Envisager l\'entrée d\'un investisseur stratégique',
+            'Convertir une partie des dettes en capital si possible'
+        ],
+        'indicateurs': [
+            'Ratio d\'autonomie financière > 30%',
+            'Ratio d\'endettement < 65%',
+            'Capacité de remboursement < 5 ans',
+            'Couverture des charges financières > 3'
+        ]
+    },
+    {
+        'id': 'marge_insuffisante',
+        'priorite': 'MOYEN TERME',
+        'categorie': 'Rentabilité',
+        'icone': '📈',
+        'conditions': [('score_rentabilite', '<', 15), ('marge_nette', '<', 3)],
+        'ratio': 'marge_nette',
+        'titre': 'Optimiser la Rentabilité',
+        'resume': 'Optimiser la rentabilité opérationnelle',
+        'probleme': 'Marge nette insuffisante ({valeur:.1f}%)',
+        'impact': 'Capacité d\'autofinancement limitée, développement compromis',
+        'actions': [
+            'Analyser la structure des coûts par produit/service',
+            'Revoir la politique de prix (étude de marché)',
+            'Optimiser les coûts opérationnels (négociation fournisseurs)',
+            'Améliorer la productivité (formation, outils)',
+            'Développer les produits/services à forte marge',
+            'Externaliser les activités non rentables'
+        ],
+        'indicateurs': [
+            'Marge nette > 5%',
+            'ROE > 10%',
+            'Marge d\'exploitation > 5%',
+            'Coefficient d\'exploitation < 65%'
+        ]
+    },
+    {
+        'id': 'rotation_stocks_lente',
+        'priorite': 'MOYEN TERME',
+        'categorie': 'Activité',
+        'icone': '⚡',
+        'conditions': [('score_activite', '<', 8), ('rotation_stocks', '<', 4)],
+        'ratio': 'rotation_stocks',
+        'titre': 'Améliorer l\'Efficacité Opérationnelle',
+        'resume': 'Accélérer la rotation des stocks',
+        'probleme': 'Rotation des stocks lente ({valeur:.1f})',
+        'impact': 'Immobilisation excessive de fonds de roulement',
+        'actions': [
+            'Analyser les stocks dormants et obsolètes',
+            'Améliorer la prévision de la demande',
+            'Négocier des approvisionnements en flux tendu',
+            'Diversifier les fournisseurs pour réduire les stocks de sécurité',
+            'Mettre en place un système de gestion des stocks (FIFO, ABC)'
+        ],
+        'indicateurs': [
+            'Rotation des stocks > 6',
+            'Durée d\'écoulement < 60 jours',
+            'Taux de rupture < 5%',
+            'BFR en jours de CA < 60'
+        ]
+    },
+    {
+        'id': 'charges_personnel_elevees',
+        'priorite': 'MOYEN TERME',
+        'categorie': 'Gestion',
+        'icone': '🔧',
+        'conditions': [('score_gestion', '<', 8), ('taux_charges_personnel', '>', 60)],
+        'ratio': 'taux_charges_personnel',
+        'titre': 'Optimiser la Gestion',
+        'resume': 'Maîtriser les charges de personnel',
+        'probleme': 'Charges de personnel élevées ({valeur:.1f}% de la VA)',
+        'impact': 'Productivité insuffisante, rigidité de la structure',
+        'actions': [
+            'Analyser la productivité par service/collaborateur',
+            'Former le personnel aux nouvelles technologies',
+            'Optimiser l\'organisation du travail',
+            'Développer la polyvalence des équipes',
+            'Automatiser les tâches répétitives'
+        ],
+        'indicateurs': [
+            'Charges personnel / VA < 50%',
+            'Productivité personnel > 2.0',
+            'CA par employé en progression',
+            'CAFG / CA > 7%'
+        ]
+    }
+]
+
+# Suggestion proposée lorsqu'aucune règle ne se déclenche
+DEFAULT_RECOMMENDATION = {
+    'id': 'optimisation',
+    'priorite': 'OPTIMISATION',
+    'categorie': 'Performance',
+    'icone': '✅',
+    'titre': 'Maintenir la Performance',
+    'resume': 'Maintenir la surveillance des ratios clés',
+    'probleme': 'Situation financière globalement satisfaisante',
+    'impact': 'Opportunités d\'optimisation',
+    'actions': [
+        'Maintenir la surveillance des ratios clés',
+        'Rechercher des opportunités de croissance',
+        'Optimiser la structure du bilan',
+        'Développer de nouveaux indicateurs de performance'
+    ],
+    'indicateurs': []
+}
+
+
+def build_portfolio_frame(analyses: Iterable[Dict[str, Any]], index: Optional[List[Any]] = None) -> pd.DataFrame:
+    """
+    Construit le DataFrame de portefeuille (une ligne par entreprise)
+
+    Args:
+        analyses: Résultats d'analyse contenant 'ratios' et 'scores'
+        index (list): Identifiants des entreprises (position par défaut)
+
+    Returns:
+        DataFrame: Colonnes des ratios et des scores (préfixées par 'score_')
+    """
+    records = []
+    for analysis in analyses:
+        record = dict(analysis.get('ratios') or {})
+        for categorie, score in (analysis.get('scores') or {}).items():
+            record[f"{SCORE_PREFIX}{categorie}"] = score
+        records.append(record)
+
+    return pd.DataFrame(records, index=index if index is not None else pd.RangeIndex(len(records)))
+
+
+def evaluate_rules(frame: pd.DataFrame, rules: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+    """
+    Évalue toutes les règles sur le portefeuille sous forme de masques booléens
+
+    Args:
+        frame (DataFrame): Portefeuille (voir build_portfolio_frame)
+        rules (list): Table de règles (RECOMMENDATION_RULES par défaut)
+
+    Returns:
+        DataFrame: Une colonne booléenne par règle, même index que le portefeuille
+    """
+    rules = RECOMMENDATION_RULES if rules is None else rules
+    masks = {}
+
+    for rule in rules:
+        mask = np.ones(len(frame), dtype=bool)
+        for colonne, operateur, seuil in rule['conditions']:
+            if colonne in frame.columns:
+                values = pd.to_numeric(frame[colonne], errors='coerce').fillna(0).to_numpy(dtype=float)
+            else:
+                values = np.zeros(len(frame))
+            mask &= OPERATEURS[operateur](values, seuil)
+        masks[rule['id']] = mask
+
+    return pd.DataFrame(masks, index=frame.index, columns=[rule['id'] for rule in rules])
+
+
+def recommend_portfolio(frame: pd.DataFrame, rules: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+    """
+    Recommandations de tout un portefeuille en une passe
+
+    Args:
+        frame (DataFrame): Portefeuille (voir build_portfolio_frame)
+        rules (list): Table de règles (RECOMMENDATION_RULES par défaut)
+
+    Returns:
+        DataFrame: Une ligne par (entreprise, règle déclenchée) avec priorité,
+        catégorie et valeur du ratio en cause, triées par entreprise puis priorité
+    """
+    rules = RECOMMENDATION_RULES if rules is None else rules
+    masks = evaluate_rules(frame, rules)
+    positions, regles, valeurs, rangs = [], [], [], []
+
+    for rule in rules:
+        triggered = np.flatnonzero(masks[rule['id']].to_numpy())
+        if rule['ratio'] in frame.columns:
+            column = pd.to_numeric(frame[rule['ratio']], errors='coerce').fillna(0).to_numpy(dtype=float)
+            valeurs.append(column[triggered])
+        else:
+            valeurs.append(np.zeros(len(triggered)))
+        positions.append(triggered)
+        regles.append(np.full(len(triggered), rule['id'], dtype=object))
+        rangs.append(np.full(len(triggered), PRIORITES.get(rule['priorite'], {}).get('rang', len(PRIORITES))))
+
+    if not rules:
+        return pd.DataFrame(columns=['entreprise', 'regle', 'priorite', 'categorie', 'valeur'])
+
+    positions = np.concatenate(positions)
+    order = np.lexsort((np.concatenate(rangs), positions))
+    regles = np.concatenate(regles)[order]
+    rules_by_id = {rule['id']: rule for rule in rules}
+
+    return pd.DataFrame({
+        'entreprise': frame.index.to_numpy()[positions[order]],
+        'regle': regles,
+        'priorite': [rules_by_id[regle]['priorite'] for regle in regles],
+        'categorie': [rules_by_id[regle]['categorie'] for regle in regles],
+        'valeur': np.concatenate(valeurs)[order]
+    })
+
+
+def format_recommendation(rule: Dict[str, Any], valeur: float = 0) -> Dict[str, Any]:
+    """Recommandation complète d'une règle, avec la valeur du ratio en cause"""
+    recommendation = {key: value for key, value in rule.items() if key != 'conditions'}
+    recommendation['probleme'] = rule['probleme'].format(valeur=valeur)
+    recommendation['valeur'] = valeur
+    return recommendation
+
+
+def recommend(ratios: Dict[str, Any], scores: Dict[str, Any],
+              rules: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Recommandations d'une entreprise, triées par priorité
+
+    Args:
+        ratios (dict): Ratios calculés
+        scores (dict): Scores obtenus
+        rules (list): Table de règles (RECOMMENDATION_RULES par défaut)
+
+    Returns:
+        list: Recommandations au format canonique (voir format_recommendation)
+    """
+    rules = RECOMMENDATION_RULES if rules is None else rules
+    frame = build_portfolio_frame([{'ratios': ratios, 'scores': scores}])
+    triggered = recommend_portfolio(frame, rules)
+    rules_by_id = {rule['id']: rule for rule in rules}
+
+    return [
+        format_recommendation(rules_by_id[regle], valeur)
+        for regle, valeur in zip(triggered['regle'], triggered['valeur'])
+    ]
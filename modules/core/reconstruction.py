@@ -0,0 +1,351 @@
+"""
+Reconstitution des agrégats manquants par propagation des identités comptables SYSCOHADA
+
+Les identités (totaux = somme des lignes, actif = passif, cascade des SIG, TFT) forment
+un système linéaire creux A·x = 0. Pour un lot d'entreprises, les valeurs manquantes
+sont déduites uniquement lorsqu'elles sont déterminées par les valeurs connues ;
+les autres restent signalées comme indéterminées. Une ligne vide d'un état détaillé
+n'est mise à zéro que sous un total connu, déjà entièrement expliqué par les autres
+termes ; toute valeur calculée à partir d'une ligne mise à zéro garde ce statut.
+
+Convention de signe : celle du modèle Excel, dont les formules additionnent les lignes
+(les charges du compte de résultat sont donc saisies en négatif).
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.linalg import null_space
+
+# Statut de chaque valeur après reconstitution
+FOURNI = 0
+DEDUIT = 1
+MIS_A_ZERO = 2
+INDETERMINE = 3
+
+STATUTS = {FOURNI: 'fourni', DEDUIT: 'deduit', MIS_A_ZERO: 'mis_a_zero', INDETERMINE: 'indetermine'}
+
+# Écart toléré sur une identité : 1 FCFA ou 1 millionième des montants en jeu
+TOLERANCE_ABSOLUE = 1.0
+TOLERANCE_RELATIVE = 1e-6
+
+# 'somme' : total = somme des termes ; 'egalite' : contrôle entre deux états.
+# Un terme préfixé par '-' est soustrait.
+IDENTITIES = [
+    # === BILAN ACTIF ===
+    {'nom': 'immobilisations_incorporelles', 'etat': 'bilan', 'type': 'somme', 'total': 'immobilisations_incorporelles',
+     'termes': ['frais_dev_prospection', 'brevets_licences', 'fond_commercial', 'autres_immob_incorp']},
+    {'nom': 'immobilisations_corporelles', 'etat': 'bilan', 'type': 'somme', 'total': 'immobilisations_corporelles',
+     'termes': ['terrains', 'batiments', 'agencements', 'materiel_mobilier', 'materiel_transport',
+                'avances_immobilisations']},
+    {'nom': 'immobilisations_financieres', 'etat': 'bilan', 'type': 'somme', 'total': 'immobilisations_financieres',
+     'termes': ['titres_participation', 'autres_immob_financieres']},
+    {'nom': 'actif_immobilise', 'etat': 'bilan', 'type': 'somme', 'total': 'immobilisations_nettes',
+     'termes': ['immobilisations_incorporelles', 'immobilisations_corporelles', 'immobilisations_financieres']},
+    {'nom': 'creances', 'etat': 'bilan', 'type': 'somme', 'total': 'creances',
+     'termes': ['fournisseurs_avances_versees', 'creances_clients', 'autres_creances']},
+    {'nom': 'actif_circulant', 'etat': 'bilan', 'type': 'somme', 'total': 'total_actif_circulant',
+     'termes': ['actif_circulant_hao', 'stocks', 'creances']},
+    {'nom': 'tresorerie_actif', 'etat': 'bilan', 'type': 'somme', 'total': 'tresorerie',
+     'termes': ['titres_placement', 'valeurs_encaisser', 'banques_caisses']},
+    {'nom': 'total_actif', 'etat': 'bilan', 'type': 'somme', 'total': 'total_actif',
+     'termes': ['immobilisations_nettes', 'total_actif_circulant', 'tresorerie', 'ecart_conversion_actif']},
+
+    # === BILAN PASSIF ===
+    {'nom': 'capitaux_propres', 'etat': 'bilan', 'type': 'somme', 'total': 'capitaux_propres',
+     'termes': ['capital', 'actionnaires_capital_non_appele', 'primes_capital', 'ecarts_reevaluation',
+                'reserves_indisponibles', 'reserves_libres', 'report_nouveau', 'resultat_net_bilan',
+                'subventions_investissement', 'provisions_reglementees']},
+    {'nom': 'dettes_financieres', 'etat': 'bilan', 'type': 'somme', 'total': 'dettes_financieres',
+     'termes': ['emprunts_dettes_financieres', 'dettes_location_acquisition', 'provisions_financieres']},
+    {'nom': 'ressources_stables', 'etat': 'bilan', 'type': 'somme', 'total': 'ressources_stables',
+     'termes': ['capitaux_propres', 'dettes_financieres']},
+    {'nom': 'passif_circulant', 'etat': 'bilan', 'type': 'somme', 'total': 'dettes_court_terme',
+     'termes': ['dettes_circulantes_hao', 'clients_avances_recues', 'fournisseurs_exploitation',
+                'dettes_sociales_fiscales', 'autres_dettes', 'provisions_risques_ct']},
+    {'nom': 'tresorerie_passif', 'etat': 'bilan', 'type': 'somme', 'total': 'tresorerie_passif',
+     'termes': ['banques_credits_escompte', 'banques_credits_tresorerie']},
+    {'nom': 'total_passif', 'etat': 'bilan', 'type': 'somme', 'total': 'total_passif',
+     'termes': ['ressources_stables', 'dettes_court_terme', 'tresorerie_passif', 'ecart_conversion_passif']},
+    {'nom': 'equilibre_bilan', 'etat': 'bilan', 'type': 'egalite', 'total': 'total_actif',
+     'termes': ['total_passif']},
+
+    # === COMPTE DE RÉSULTAT (cascade des SIG) ===
+    {'nom': 'marge_commerciale', 'etat': 'resultat', 'type': 'somme', 'total': 'marge_commerciale',
+     'termes': ['ventes_marchandises', 'achats_marchandises', 'variation_stocks_marchandises']},
+    {'nom': 'chiffre_affaires', 'etat': 'resultat', 'type': 'somme', 'total': 'chiffre_affaires',
+     'termes': ['ventes_marchandises', 'ventes_produits_fabriques', 'travaux_services_vendus',
+                'produits_accessoires']},
+    {'nom': 'valeur_ajoutee', 'etat': 'resultat', 'type': 'somme', 'total': 'valeur_ajoutee',
+     'termes': ['chiffre_affaires', 'achats_marchandises', 'variation_stocks_marchandises',
+                'production_stockee', 'production_immobilisee', 'subventions_exploitation',
+                'autres_produits', 'transferts_charges_exploitation', 'achats_matieres_premieres',
+                'variation_stocks_mp', 'autres_achats', 'variation_stocks_autres', 'transports',
+                'services_exterieurs', 'impots_taxes', 'autres_charges']},
+    {'nom': 'excedent_brut', 'etat': 'resultat', 'type': 'somme', 'total': 'excedent_brut',
+     'termes': ['valeur_ajoutee', 'charges_personnel']},
+    {'nom': 'resultat_exploitation', 'etat': 'resultat', 'type': 'somme', 'total': 'resultat_exploitation',
+     'termes': ['excedent_brut', 'reprises_amortissements', 'dotations_amortissements']},
+    {'nom': 'resultat_financier', 'etat': 'resultat', 'type': 'somme', 'total': 'resultat_financier',
+     'termes': ['revenus_financiers', 'reprises_provisions_financieres', 'transferts_charges_financieres',
+                'frais_financiers', 'dotations_provisions_financieres']},
+    {'nom': 'resultat_activites_ordinaires', 'etat': 'resultat', 'type': 'somme',
+     'total': 'resultat_activites_ordinaires', 'termes': ['resultat_exploitation', 'resultat_financier']},
+    {'nom': 'resultat_hao', 'etat': 'resultat', 'type': 'somme', 'total': 'resultat_hao',
+     'termes': ['produits_cessions_immob', 'autres_produits_hao', 'valeurs_comptables_cessions',
+                'autres_charges_hao']},
+    {'nom': 'resultat_net', 'etat': 'resultat', 'type': 'somme', 'total': 'resultat_net',
+     'termes': ['resultat_activites_ordinaires', 'resultat_hao', 'participation_travailleurs',
+                'impots_resultat']},
+    {'nom': 'resultat_net_bilan', 'etat': 'resultat', 'type': 'egalite', 'total': 'resultat_net',
+     'termes': ['resultat_net_bilan']},
+
+    # === TABLEAU DES FLUX DE TRÉSORERIE ===
+    {'nom': 'flux_financement', 'etat': 'flux', 'type': 'somme', 'total': 'flux_activites_financement',
+     'termes': ['flux_capitaux_propres', 'flux_capitaux_etrangers']},
+    {'nom': 'variation_tresorerie', 'etat': 'flux', 'type': 'somme', 'total': 'variation_tresorerie',
+     'termes': ['flux_activites_operationnelles', 'flux_activites_investissement', 'flux_activites_financement']},
+    {'nom': 'tresorerie_cloture', 'etat': 'flux', 'type': 'somme', 'total': 'tresorerie_cloture',
+     'termes': ['variation_tresorerie', 'tresorerie_ouverture']},
+    {'nom': 'tresorerie_nette_bilan', 'etat': 'flux', 'type': 'egalite', 'total': 'tresorerie_cloture',
+     'termes': ['tresorerie', '-tresorerie_passif']},
+]
+
+
+def _parse_term(term: str) -> Tuple[str, float]:
+    """Sépare le signe et le nom d'un terme"""
+    return (term[1:], -1.0) if term.startswith('-') else (term, 1.0)
+
+
+def _collect_fields(identities: List[Dict[str, Any]]) -> List[str]:
+    """Champs intervenant dans les identités, dans l'ordre d'apparition"""
+    fields = []
+    for identity in identities:
+        for name in [identity['total']] + [_parse_term(t)[0] for t in identity['termes']]:
+            if name not in fields:
+                fields.append(name)
+    return fields
+
+
+class IdentitySystem:
+    """Système linéaire creux A·x = 0 compilé à partir d'une table d'identités"""
+
+    def __init__(self, identities: Optional[List[Dict[str, Any]]] = None):
+        self.identities = IDENTITIES if identities is None else identities
+        self.fields = _collect_fields(self.identities)
+        self.field_index = {name: j for j, name in enumerate(self.fields)}
+
+        rows, cols, coefs = [], [], []
+        for i, identity in enumerate(self.identities):
+            rows.append(i)
+            cols.append(self.field_index[identity['total']])
+            coefs.append(1.0)
+            for term in identity['termes']:
+                name, sign = _parse_term(term)
+                rows.append(i)
+                cols.append(self.field_index[name])
+                coefs.append(-sign)
+
+        shape = (len(self.identities), len(self.fields))
+        self.matrix = sparse.csr_matrix((coefs, (rows, cols)), shape=shape)
+        self.pattern = sparse.csr_matrix((np.ones(len(coefs)), (rows, cols)), shape=shape)
+        self.dense = self.matrix.toarray()
+
+        # Lignes de détail : champs qui ne sont le total d'aucune somme
+        sommes = [i for i, identity in enumerate(self.identities) if identity['type'] == 'somme']
+        totals = {self.identities[i]['total'] for i in sommes}
+        self.is_line = np.array([name not in totals for name in self.fields])
+        self.somme_rows = np.array(sommes, dtype=int)
+        self.total_cols = np.array([self.field_index[self.identities[i]['total']] for i in sommes], dtype=int)
+        somme_pattern = self.pattern[self.somme_rows].tolil()
+        somme_pattern[np.arange(len(sommes)), self.total_cols] = 0
+        self.terms_pattern = somme_pattern.tocsr()
+
+    def _fill_blank_lines(self, values: np.ndarray) -> np.ndarray:
+        """
+        Lignes de détail vides mises à zéro lorsqu'elles sont sans ambiguïté : le total de
+        leur somme est connu et déjà égal à la somme des termes connus. Sous un total
+        inconnu, rien n'est mis à zéro (le total n'est pas déterminé). Un sous-total dont
+        tout le bloc est vide est traité comme une ligne vide. Une valeur mise à zéro ne
+        sert donc jamais à absorber l'écart d'un total connu.
+        """
+        known = ~np.isnan(values)
+        totals = values[:, self.total_cols]
+
+        known_terms = np.asarray((self.terms_pattern @ known.T.astype(float)).T) > 0
+        sommes = self.matrix[self.somme_rows]
+        gap = np.abs(np.asarray(sommes @ np.nan_to_num(values).T).T)
+        scale = np.asarray(abs(sommes) @ np.abs(np.nan_to_num(values)).T).T
+        zero_ok = ~np.isnan(totals) & (gap <= np.maximum(TOLERANCE_ABSOLUE, TOLERANCE_RELATIVE * scale))
+
+        # Sous-total dont le bloc entier est vide : traité comme une ligne vide
+        blank_block = np.zeros_like(known)
+        blank_block[:, self.total_cols] = ~known_terms & np.isnan(totals)
+
+        fill = np.asarray((self.terms_pattern.T @ zero_ok.T.astype(float)).T) > 0
+        return fill & ~known & (self.is_line | blank_block)
+
+    def _propagate(self, values: np.ndarray, status: np.ndarray):
+        """
+        Déduit itérativement les inconnues seules dans une identité
+
+        Une valeur déduite d'une identité contenant une valeur mise à zéro est elle-même
+        marquée MIS_A_ZERO : elle repose sur l'hypothèse d'une ligne vide nulle.
+        """
+        weights = np.arange(1, len(self.fields) + 1, dtype=float)
+
+        while True:
+            unknown = np.isnan(values)
+            counts = np.asarray(self.pattern @ unknown.T.astype(float))
+            single = counts == 1
+            if not single.any():
+                return
+
+            partial = np.asarray(self.matrix @ np.nan_to_num(values).T)
+            positions = np.asarray(self.pattern @ (unknown * weights).T)
+
+            identity_rows, companies = np.nonzero(single)
+            cols = positions[identity_rows, companies].astype(int) - 1
+            coefs = self.dense[identity_rows, cols]
+            zeroed = np.asarray(self.pattern @ (status == MIS_A_ZERO).T.astype(float)) > 0
+            values[companies, cols] = -partial[identity_rows, companies] / coefs
+            status[companies, cols] = np.where(zeroed[identity_rows, companies], MIS_A_ZERO, DEDUIT)
+
+    def _solve_patterns(self, values: np.ndarray, status: np.ndarray):
+        """Résolution exacte des inconnues couplées, par motif de valeurs manquantes"""
+        unknown = np.isnan(values)
+        involved = np.asarray(self.pattern @ unknown.T.astype(float)).T >= 2
+        candidates = np.flatnonzero(involved.any(axis=1))
+        if len(candidates) == 0:
+            return
+
+        patterns = pd.Series([unknown[r].tobytes() for r in candidates])
+        for _, group in patterns.groupby(patterns).groups.items():
+            rows = candidates[np.asarray(group)]
+            unknown_cols = np.flatnonzero(unknown[rows[0]])
+            known_cols = np.flatnonzero(~unknown[rows[0]])
+
+            a_unknown = self.dense[:, unknown_cols]
+            kernel = null_space(a_unknown)
+            if kernel.shape[1]:
+                determined = np.linalg.norm(kernel, axis=1) < 1e-9
+            else:
+                determined = np.ones(len(unknown_cols), dtype=bool)
+            if not determined.any():
+                continue
+
+            pseudo_inverse = np.linalg.pinv(a_unknown)
+            rhs = -self.dense[:, known_cols] @ values[np.ix_(rows, known_cols)].T
+            solution = pseudo_inverse @ rhs
+            cols = unknown_cols[determined]
+            values[np.ix_(rows, cols)] = solution[determined].T
+
+            # Valeurs dont la solution dépend d'une valeur mise à zéro
+            depends = np.abs(pseudo_inverse @ self.dense[:, known_cols])[determined] > 1e-9
+            zeroed = (status[np.ix_(rows, known_cols)] == MIS_A_ZERO).astype(float)
+            status[np.ix_(rows, cols)] = np.where((zeroed @ depends.T.astype(float)) > 0, MIS_A_ZERO, DEDUIT)
+
+    def residuals(self, values: np.ndarray) -> np.ndarray:
+        """Matrice entreprise × identité des identités violées (toutes valeurs connues)"""
+        complete = np.asarray(self.pattern @ np.isnan(values).T.astype(float)).T == 0
+        residual = np.abs(np.asarray(self.matrix @ np.nan_to_num(values).T).T)
+        scale = np.asarray(abs(self.matrix) @ np.abs(np.nan_to_num(values)).T).T
+        return complete & (residual > np.maximum(TOLERANCE_ABSOLUE, TOLERANCE_RELATIVE * scale))
+
+    def solve(self, values: np.ndarray, fill_blank_lines: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Reconstitue les valeurs manquantes d'un lot
+
+        Args:
+            values (ndarray): Entreprises × champs, NaN pour une valeur manquante
+            fill_blank_lines (bool): Mettre à zéro les lignes vides des états détaillés
+
+        Returns:
+            tuple: (valeurs, statuts, incohérences entreprise × identité)
+        """
+        values = np.array(values, dtype=float, copy=True)
+        status = np.where(np.isnan(values), INDETERMINE, FOURNI).astype(np.int8)
+
+        self._propagate(values, status)
+        while fill_blank_lines:
+            fill = self._fill_blank_lines(values)
+            if not fill.any():
+                break
+            values[fill] = 0.0
+            status[fill] = MIS_A_ZERO
+            self._propagate(values, status)
+
+        self._solve_patterns(values, status)
+        self._propagate(values, status)
+
+        return values, status, self.residuals(values)
+
+
+_SYSTEM = None
+
+
+def get_identity_system() -> IdentitySystem:
+    """Système des identités SYSCOHADA (compilé une seule fois)"""
+    global _SYSTEM
+    if _SYSTEM is None:
+        _SYSTEM = IdentitySystem()
+    return _SYSTEM
+
+
+def reconstruct_frame(frame: pd.DataFrame, fill_blank_lines: bool = True,
+                      system: Optional[IdentitySystem] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Reconstitue les agrégats manquants de tout un lot en une passe
+
+    Args:
+        frame (DataFrame): Une ligne par entreprise ; NaN (ou colonne absente) = valeur manquante
+        fill_blank_lines (bool): Mettre à zéro les lignes vides des états détaillés
+        system (IdentitySystem): Système d'identités (SYSCOHADA par défaut)
+
+    Returns:
+        dict: 'valeurs' (champs des identités), 'statuts' (codes FOURNI/DEDUIT/MIS_A_ZERO/
+        INDETERMINE) et 'incoherences' (identités violées, entreprise × identité)
+    """
+    system = system or get_identity_system()
+    values = (frame.reindex(columns=system.fields)
+                   .apply(pd.to_numeric, errors='coerce')
+                   .to_numpy(dtype=float))
+
+    solved, status, violated = system.solve(values, fill_blank_lines)
+
+    return {
+        'valeurs': pd.DataFrame(solved, index=frame.index, columns=system.fields),
+        'statuts': pd.DataFrame(status, index=frame.index, columns=system.fields),
+        'incoherences': pd.DataFrame(violated, index=frame.index,
+                                     columns=[identity['nom'] for identity in system.identities])
+    }
+
+
+def reconstruct_record(data: Dict[str, Any], fill_blank_lines: bool = True) -> Tuple[Dict[str, float], Dict[str, List[str]]]:
+    """
+    Reconstitue les agrégats manquants d'une entreprise
+
+    Args:
+        data (dict): Données financières ; None ou absence = valeur manquante
+
+    Returns:
+        tuple: (valeurs déterminées, rapport avec les listes 'deduits', 'mis_a_zero',
+        'indetermines' et 'incoherences')
+    """
+    frame = pd.DataFrame([{key: (np.nan if value is None else value) for key, value in data.items()}])
+    result = reconstruct_frame(frame, fill_blank_lines)
+
+    values = result['valeurs'].iloc[0]
+    status = result['statuts'].iloc[0]
+    violated = result['incoherences'].iloc[0]
+
+    determined = {name: float(values[name]) for name in values.index if status[name] != INDETERMINE}
+    report = {
+        'deduits': [name for name in status.index if status[name] == DEDUIT],
+        'mis_a_zero': [name for name in status.index if status[name] == MIS_A_ZERO],
+        'indetermines': [name for name in status.index if status[name] == INDETERMINE],
+        'incoherences': [name for name in violated.index if violated[name]]
+    }
+    return determined, report
@@ -0,0 +1,82 @@
+"""
+Cache des rapports PDF générés, indexé par (empreinte de l'analyse, type de rapport, version du modèle)
+
+Un rapport ne dépend que du contenu de l'analyse et de son modèle de mise en page : tant
+que ni l'un ni l'autre ne change, les octets déjà produits sont resservis tels quels
+(nouveau téléchargement, réexécution de la page, autre session sur la même analyse).
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from modules.core.bounded_cache import BoundedLRUCache
+
+# Bornes par défaut du cache
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+ReportKey = Tuple[str, str, str]
+
+
+def make_report_key(analysis_hash: str, report_type: str, template_version: str) -> ReportKey:
+    """Clé d'un rapport (voir analysis_result.content_hash pour l'empreinte de l'analyse)"""
+    return (analysis_hash, report_type, str(template_version))
+
+
+class ReportCache(BoundedLRUCache):
+    """
+    Cache LRU des rapports rendus (octets PDF), borné en nombre d'entrées et en taille
+
+    Partagé par toutes les sessions du processus.
+    """
+
+    ENTRIES_LABEL = 'rapports_en_cache'
+    MAX_ENTRIES_LABEL = 'max_rapports'
+    HITS_LABEL = 'telechargements_servis'
+    MISSES_LABEL = 'generations'
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(max_entries, max_bytes)
+        self.build_seconds = 0.0
+
+    def put(self, key: ReportKey, payload: bytes) -> bytes:
+        """Mémorise un rapport rendu"""
+        return super().put(key, bytes(payload))
+
+    def report(self, key: ReportKey, build: Callable[[], bytes]) -> bytes:
+        """
+        Rapport rendu au premier appel puis resservi depuis le cache
+
+        Args:
+            key (tuple): Clé du rapport (make_report_key)
+            build (callable): Produit les octets du rapport en cas d'absence
+        """
+        payload = self.get(key)
+        if payload is None:
+            start = time.perf_counter()
+            payload = self.put(key, build())
+            with self._lock:
+                self.build_seconds += time.perf_counter() - start
+        return payload
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Statistiques du cache pour le diagnostic"""
+        info = super().cache_info()
+        with self._lock:
+            info['temps_generation_s'] = round(self.build_seconds, 2)
+        return info
+
+
+_cache: Optional[ReportCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> ReportCache:
+    """Retourne le cache de rapports partagé par tout le processus"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReportCache()
+    return _cache
@@ -0,0 +1,222 @@
+"""
+Grille de notation BCEAO pilotée par table (calcul unitaire et vectorisé)
+"""
+
+import copy
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.core.norms import memoize_on, get_norms_registry
+
+# Nom du fichier de normes (data/scoring_grid.json) produit par la calibration
+SCORING_GRID_NORMS = 'scoring_grid'
+
+CATEGORIES = ['liquidite', 'solvabilite', 'rentabilite', 'activite', 'gestion']
+
+# Grille historique : 'hausse' = plus la valeur est élevée, meilleur est le ratio.
+# Les seuils vont de la meilleure tranche à la moins bonne ; la dernière valeur de
+# 'points' s'applique lorsqu'aucun seuil n'est atteint.
+DEFAULT_SCORING_GRID = {
+    'version': 'integree',
+    'total_max': 140,
+    'categories': {
+        'liquidite': {
+            'max': 40,
+            'criteres': [
+                {'ratio': 'ratio_liquidite_generale', 'sens': 'hausse', 'seuils': [2.0, 1.5, 1.0], 'points': [15, 12, 8, 3]},
+                {'ratio': 'ratio_liquidite_immediate', 'sens': 'hausse', 'seuils': [1.0, 0.8, 0.6], 'points': [10, 8, 5, 2]},
+                {'ratio': 'bfr_jours_ca', 'sens': 'baisse', 'seuils': [30, 60, 90], 'points': [10, 7, 4, 1]},
+                {'ratio': 'tresorerie_nette', 'sens': 'hausse', 'seuils': [0], 'points': [5, 1], 'strict': True}
+            ]
+        },
+        'solvabilite': {
+            'max': 40,
+            'criteres': [
+                {'ratio': 'ratio_autonomie_financiere', 'sens': 'hausse', 'seuils': [50, 40, 30, 20], 'points': [20, 16, 12, 8, 3]},
+                {'ratio': 'ratio_endettement', 'sens': 'baisse', 'seuils': [50, 65, 80], 'points': [15, 12, 8, 3]},
+                {'ratio': 'capacite_remboursement', 'sens': 'baisse', 'seuils': [3, 5], 'points': [5, 3, 1]}
+            ]
+        },
+        'rentabilite': {
+            'max': 30,
+            'criteres': [
+                {'ratio': 'roe', 'sens': 'hausse', 'seuils': [15, 10, 5], 'points': [10, 8, 5, 2]},
+                {'ratio': 'roa', 'sens': 'hausse', 'seuils': [5, 3, 1], 'points': [8, 6, 4, 1]},
+                {'ratio': 'marge_nette', 'sens': 'hausse', 'seuils': [10, 5, 2], 'points': [7, 5, 3, 1]},
+                {'ratio': 'marge_exploitation', 'sens': 'hausse', 'seuils': [10, 5, 2], 'points': [5, 4, 2, 1]}
+            ]
+        },
+        'activite': {
+            'max': 15,
+            'criteres': [
+                {'ratio': 'rotation_actif', 'sens': 'hausse', 'seuils': [2.0, 1.5, 1.0], 'points': [5, 4, 3, 1]},
+                {'ratio': 'rotation_stocks', 'sens': 'hausse', 'seuils': [8, 6, 4], 'points': [5, 4, 3, 1]},
+                {'ratio': 'delai_recouvrement_clients', 'sens': 'baisse', 'seuils': [30, 45, 60], 'points': [5, 4, 3, 1]}
+            ]
+        },
+        'gestion': {
+            'max': 15,
+            'criteres': [
+                {'ratio': 'productivite_personnel', 'sens': 'hausse', 'seuils': [3, 2, 1.5], 'points': [5, 4, 3, 1]},
+                {'ratio': 'taux_charges_personnel', 'sens': 'baisse', 'seuils': [40, 50, 60], 'points': [5, 4, 3, 1]},
+                {'ratio': 'ratio_cafg_ca', 'sens': 'hausse', 'seuils': [10, 7, 5], 'points': [5, 4, 3, 1]}
+            ]
+        }
+    }
+}
+
+
+@memoize_on(SCORING_GRID_NORMS)
+def get_scoring_grid() -> Dict[str, Any]:
+    """Grille de notation en vigueur : data/scoring_grid.json s'il existe, sinon la grille intégrée"""
+    grid = get_norms_registry().get(SCORING_GRID_NORMS)
+    if not grid or 'categories' not in grid:
+        return DEFAULT_SCORING_GRID
+    return grid
+
+
+def _criterion_satisfied(value: float, seuil: float, critere: Dict[str, Any]) -> bool:
+    """Indique si une valeur atteint le seuil d'un critère"""
+    if critere['sens'] == 'hausse':
+        return value > seuil if critere.get('strict') else value >= seuil
+    return value < seuil if critere.get('strict') else value <= seuil
+
+
+def score_criterion(value: float, critere: Dict[str, Any]) -> float:
+    """Points obtenus pour une valeur de ratio selon un critère"""
+    for seuil, points in zip(critere['seuils'], critere['points']):
+        if _criterion_satisfied(value, seuil, critere):
+            return points
+    return critere['points'][-1]
+
+
+def _global_score(category_scores: Dict[str, float], grid: Dict[str, Any]) -> int:
+    """Ramène les scores par catégorie à un score global sur 100"""
+    poids = grid.get('poids_categories')
+    if poids:
+        # Grille calibrée : moyenne pondérée des scores normalisés de chaque catégorie
+        total = sum(
+            poids.get(categorie, 0) * category_scores.get(categorie, 0) / spec['max']
+            for categorie, spec in grid['categories'].items() if spec.get('max')
+        )
+        return min(100, int(total * 100))
+
+    score_brut = sum(category_scores.values())
+    return min(100, int(score_brut * 100 / grid['total_max']))
+
+
+def score_ratios(ratios: Dict[str, float], grid: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Calcule les scores par catégorie et le score global d'une entreprise
+
+    Args:
+        ratios (dict): Ratios calculés
+        grid (dict): Grille de notation (grille en vigueur par défaut)
+
+    Returns:
+        dict: Scores par catégorie et score 'global' sur 100
+    """
+    grid = grid or get_scoring_grid()
+    scores = {}
+
+    for categorie, spec in grid['categories'].items():
+        scores[categorie] = sum(
+            score_criterion(ratios[critere['ratio']], critere)
+            for critere in spec['criteres']
+            if critere['ratio'] in ratios
+        )
+
+    scores['global'] = _global_score(scores, grid)
+    return scores
+
+
+def financial_class(score: int) -> str:
+    """Classe financière selon le score BCEAO (A+ à E)"""
+    if score >= 85:
+        return "A+"
+    elif score >= 70:
+        return "A"
+    elif score >= 55:
+        return "B"
+    elif score >= 40:
+        return "C"
+    elif score >= 25:
+        return "D"
+    else:
+        return "E"
+
+
+def score_interpretation(score: int) -> Tuple[str, str]:
+    """Interprétation du score BCEAO et couleur associée"""
+    if score >= 85:
+        return "Excellence financière", "green"
+    elif score >= 70:
+        return "Très bonne situation", "green"
+    elif score >= 55:
+        return "Bonne situation", "orange"
+    elif score >= 40:
+        return "Situation moyenne", "orange"
+    elif score >= 25:
+        return "Situation faible", "red"
+    else:
+        return "Situation très faible", "red"
+
+
+def score_criterion_array(values: np.ndarray, critere: Dict[str, Any]) -> np.ndarray:
+    """Version vectorisée de score_criterion (valeur manquante = 0 point)"""
+    values = np.asarray(values, dtype=float)
+    with np.errstate(invalid='ignore'):
+        conditions = []
+        for seuil in critere['seuils']:
+            if critere['sens'] == 'hausse':
+                conditions.append(values > seuil if critere.get('strict') else values >= seuil)
+            else:
+                conditions.append(values < seuil if critere.get('strict') else values <= seuil)
+    points = np.select(conditions, critere['points'][:len(conditions)], default=critere['points'][-1])
+    return np.where(np.isnan(values), 0, points).astype(float)
+
+
+def score_frame(ratios_frame: pd.DataFrame, grid: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    """
+    Calcule les scores de tout un portefeuille en une passe
+
+    Args:
+        ratios_frame (DataFrame): Une ligne par entreprise, une colonne par ratio (NaN si absent)
+        grid (dict): Grille de notation (grille en vigueur par défaut)
+
+    Returns:
+        DataFrame: Colonnes par catégorie et colonne 'global', même index que l'entrée
+    """
+    grid = grid or get_scoring_grid()
+    n_rows = len(ratios_frame)
+    result = {}
+
+    for categorie, spec in grid['categories'].items():
+        total = np.zeros(n_rows)
+        for critere in spec['criteres']:
+            if critere['ratio'] in ratios_frame.columns:
+                values = pd.to_numeric(ratios_frame[critere['ratio']], errors='coerce').to_numpy(dtype=float)
+                total += score_criterion_array(values, critere)
+        result[categorie] = total
+
+    scores = pd.DataFrame(result, index=ratios_frame.index)
+    poids = grid.get('poids_categories')
+
+    if poids:
+        weighted = sum(
+            poids.get(categorie, 0) * scores[categorie] / spec['max']
+            for categorie, spec in grid['categories'].items() if spec.get('max')
+        )
+        scores['global'] = np.minimum(100, np.floor(weighted * 100)).astype(int)
+    else:
+        brut = scores[list(grid['categories'])].sum(axis=1)
+        scores['global'] = np.minimum(100, np.floor(brut * 100 / grid['total_max'])).astype(int)
+
+    return scores
+
+
+def copy_grid(grid: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Copie profonde d'une grille (pour la modifier sans altérer la grille en vigueur)"""
+    return copy.deepcopy(grid or DEFAULT_SCORING_GRID)
@@ -0,0 +1,297 @@
+"""
+Service HTTP local de notation (asynchrone), avec regroupement des requêtes simultanées
+
+Usage :
+    python -m modules.core.scoring_service --port 8502 --processus 2
+    curl -s localhost:8502/notation -d @assets/sample_data.json
+    curl -s localhost:8502/notation/lot -d '{"etats": [{...}, {...}]}'
+    curl -s localhost:8502/sante
+
+Points d'entrée :
+    POST /notation       un état financier (format de jsonl_pipeline.normalize_statement)
+    POST /notation/lot   une liste d'états (ou {"etats": [...]}), résultats dans l'ordre
+    GET  /sante          état du service, taille moyenne des lots, latences p50/p99
+
+Les requêtes qui arrivent dans la même fenêtre (1 ms par défaut) sont regroupées en un
+seul appel vectorisé (jsonl_pipeline.score_statements). Un seul lot est en calcul par
+processus : pendant un calcul, les requêtes suivantes s'accumulent et forment le lot
+suivant, ce qui borne la file d'attente et la latence sous charge. Au-delà de
+DEFAULT_MAX_QUEUED états en attente, le service répond 503 au lieu d'allonger la file.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from modules.core.jsonl_pipeline import score_statements
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+
+# Fenêtre de regroupement et taille maximale d'un lot de calcul
+DEFAULT_WINDOW_MS = 1.0
+DEFAULT_MAX_BATCH = 1000
+
+# États en attente au-delà desquels les nouvelles requêtes sont refusées (503)
+DEFAULT_MAX_QUEUED = 20000
+
+# États acceptés par requête /notation/lot
+MAX_REQUEST_STATEMENTS = 10000
+
+# Latences conservées pour les percentiles de /sante
+LATENCY_SAMPLES = 2000
+
+WARM_UP_STATEMENT = {'total_actif': 1.0, 'capitaux_propres': 1.0, 'chiffre_affaires': 1.0}
+
+
+class ServiceOverloaded(Exception):
+    """File d'attente pleine : la requête doit être retentée plus tard"""
+
+
+def _warm_up():
+    """Charge pandas, les normes et la grille de notation avant la première requête"""
+    score_statements([WARM_UP_STATEMENT])
+
+
+def _init_worker():
+    """Processus de calcul : messages sur stderr, moteur chargé dès le démarrage"""
+    from modules.core.jsonl_pipeline import _init_worker as init_pipeline_worker
+
+    init_pipeline_worker()
+    _warm_up()
+
+
+def _percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ScoringCoalescer:
+    """
+    Regroupe les états soumis par des requêtes concurrentes en lots de calcul
+
+    Avec un seul processus, le calcul se fait dans un thread du service (pas de
+    sérialisation) ; au-delà, dans un pool de processus.
+    """
+
+    def __init__(self, workers: int = 1, window_ms: float = DEFAULT_WINDOW_MS,
+                 max_batch: int = DEFAULT_MAX_BATCH, max_queued: int = DEFAULT_MAX_QUEUED):
+        self.workers = max(1, workers)
+        self.window = max(0.0, window_ms) / 1000
+        self.max_batch = max(1, max_batch)
+        self.max_queued = max_queued
+        self.queued = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: set = set()
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+        self._stats = {'requetes': 0, 'etats': 0, 'lots': 0, 'refus': 0}
+
+    async def start(self):
+        """Démarre le pool de calcul (préchauffé) et la boucle de regroupement"""
+        loop = asyncio.get_running_loop()
+        if self.workers == 1:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notation')
+            await loop.run_in_executor(self._executor, _warm_up)
+        else:
+            # Processus démarrés (et préchauffés) avant la première requête
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            await asyncio.gather(*(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers)))
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def close(self):
+        """Arrête la boucle de regroupement et le pool (les lots en cours sont terminés)"""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def score(self, records: Sequence[Any]) -> List[Dict[str, Any]]:
+        """
+        Note des états financiers (regroupés avec ceux des autres requêtes en cours)
+
+        Raises:
+            ServiceOverloaded: Trop d'états déjà en attente
+        """
+        if not records:
+            return []
+        if self.queued + len(records) > self.max_queued:
+            self._stats['refus'] += 1
+            raise ServiceOverloaded(f"{self.queued} états en attente")
+
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self.queued += len(records)
+        self._queue.put_nowait((list(records), future))
+        results = await future
+        self._latencies.append(time.perf_counter() - start)
+        self._stats['requetes'] += 1
+        return results
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+
+            # Fenêtre de regroupement à partir de la première requête
+            deadline = loop.time() + self.window
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            # Processus libre : les requêtes arrivées pendant l'attente rejoignent le lot
+            await self._slots.acquire()
+            while size < self.max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                pending.append(item)
+                size += len(item[0])
+
+            task = asyncio.create_task(self._run(pending, size))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, pending: List[Tuple[List[Any], asyncio.Future]], size: int):
+        loop = asyncio.get_running_loop()
+        try:
+            records = [record for batch, _ in pending for record in batch]
+            results, _ = await loop.run_in_executor(self._executor, score_statements, records)
+            self._stats['lots'] += 1
+            self._stats['etats'] += size
+            offset = 0
+            for batch, future in pending:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(batch)])
+                offset += len(batch)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self.queued -= size
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs du service (requêtes, lots, taille moyenne des lots, latences)"""
+        latencies = list(self._latencies)
+        p50 = _percentile(latencies, 0.50)
+        p99 = _percentile(latencies, 0.99)
+        return {
+            **self._stats,
+            'etats_par_lot': round(self._stats['etats'] / self._stats['lots'], 1) if self._stats['lots'] else None,
+            'en_attente': self.queued,
+            'processus': self.workers,
+            'fenetre_ms': self.window * 1000,
+            'latence_p50_ms': round(p50 * 1000, 2) if p50 is not None else None,
+            'latence_p99_ms': round(p99 * 1000, 2) if p99 is not None else None,
+        }
+
+
+def create_app(coalescer: ScoringCoalescer):
+    """Application ASGI (Starlette) ; le pool de calcul suit le cycle de vie du serveur"""
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Route
+
+    def reply(payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+        return Response(json.dumps(payload, ensure_ascii=False, default=str), status_code=status,
+                        headers=headers, media_type='application/json')
+
+    async def read_json(request):
+        try:
+            return json.loads(await request.body())
+        except ValueError as e:
+            raise ValueError(f"JSON invalide : {e}")
+
+    async def overloaded(request, exc: ServiceOverloaded):
+        return reply({'erreur': f"Service saturé ({exc})"}, 503, {'Retry-After': '1'})
+
+    async def notation(request):
+        try:
+            record = await read_json(request)
+        except ValueError as e:
+            return reply({'erreur': str(e)}, 400)
+        results = await coalescer.score([record])
+        return reply(results[0], 422 if 'erreur' in results[0] else 200)
+
+    async def notation_lot(request):
+        try:
+            payload = await read_json(request)
+        except ValueError as e:
+            return reply({'erreur': str(e)}, 400)
+        records = payload.get('etats') if isinstance(payload, dict) else payload
+        if not isinstance(records, list):
+            return reply({'erreur': "Liste d'états attendue (ou {\"etats\": [...]})"}, 400)
+        if len(records) > MAX_REQUEST_STATEMENTS:
+            return reply({'erreur': f"Au plus {MAX_REQUEST_STATEMENTS} états par requête"}, 413)
+        results = await coalescer.score(records)
+        return reply({'resultats': results, 'erreurs': sum('erreur' in result for result in results)})
+
+    async def sante(request):
+        return reply({'statut': 'ok', **coalescer.stats()})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await coalescer.start()
+        try:
+            yield
+        finally:
+            await coalescer.close()
+
+    return Starlette(routes=[
+        Route('/notation', notation, methods=['POST']),
+        Route('/notation/lot', notation_lot, methods=['POST']),
+        Route('/sante', sante, methods=['GET']),
+    ], exception_handlers={ServiceOverloaded: overloaded}, lifespan=lifespan)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 1,
+          window_ms: float = DEFAULT_WINDOW_MS, max_batch: int = DEFAULT_MAX_BATCH):
+    """Démarre le service (bloquant) ; un seul processus serveur, le calcul dans le pool"""
+    import uvicorn
+
+    app = create_app(ScoringCoalescer(workers, window_ms, max_batch))
+    print(f"✅ Service de notation sur http://{host}:{port} ({workers} processus de calcul)")
+    uvicorn.run(app, host=host, port=port, log_level='warning', access_log=False)
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Service HTTP local de notation des états financiers")
+    parser.add_argument('--hote', default=DEFAULT_HOST, help="Adresse d'écoute")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port d'écoute")
+    parser.add_argument('--processus', type=int, default=1,
+                        help="Processus de calcul (0 = nombre de cœurs ; défaut : 1, dans le service)")
+    parser.add_argument('--fenetre-ms', type=float, default=DEFAULT_WINDOW_MS, help="Fenêtre de regroupement")
+    parser.add_argument('--lot-max', type=int, default=DEFAULT_MAX_BATCH, help="États par lot de calcul")
+    args = parser.parse_args(argv)
+
+    workers = args.processus if args.processus > 0 else (os.cpu_count() or 1)
+    serve(args.hote, args.port, workers, args.fenetre_ms, args.lot_max)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+"""
+Comptabilité mémoire par session et budget avec éviction des entrées les plus anciennes
+
+Fonctionne sur n'importe quel dictionnaire d'état (st.session_state en pratique) : la
+taille profonde de chaque entrée est estimée, conservée dans un registre stocké dans
+l'état lui-même, et les entrées volumineuses sont évincées, de la plus ancienne à la
+plus récente, tant que la session dépasse son budget.
+"""
+
+import os
+import sys
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional
+
+# Budget par session (Mo), modifiable par variable d'environnement
+DEFAULT_BUDGET_MB = 50
+BUDGET_ENV = 'OPTIMUSCREDIT_SESSION_BUDGET_MB'
+
+# Seules les entrées au moins aussi volumineuses sont évincées (drapeaux et widgets épargnés)
+EVICTION_MIN_BYTES = 64 * 1024
+
+LEDGER_KEY = '_memory_ledger'
+
+# Clés jamais évincées (navigation, identifiants d'analyse)
+PROTECTED_KEYS = {'current_page', 'reset_counter', 'analysis_id', 'analysis_workspace', 'analysis_job',
+                  'nav_timestamp', LEDGER_KEY}
+
+# Clés supprimées avec l'entrée évincée, pour que les pages se réinitialisent proprement
+EVICTION_GROUPS = {
+    'file_content': ('file_uploaded', 'file_name'),
+    'uploaded_file_content': ('uploaded_file_name', 'uploaded_file_type'),
+}
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """
+    Taille mémoire approximative d'un objet et de tout ce qu'il référence
+
+    Les objets partagés ne sont comptés qu'une fois ; tableaux numpy, DataFrames et
+    tampons (bytes, memoryview) sont mesurés par leur taille de données.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, memoryview):
+        return sys.getsizeof(obj) + obj.nbytes
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return sys.getsizeof(obj)
+    # numpy et pandas ne sont pas importés ici : un objet de ces types implique le module déjà
+    # chargé (getattr : le module peut être en cours d'import dans un autre thread)
+    ndarray = getattr(sys.modules.get('numpy'), 'ndarray', None)
+    if ndarray is not None and isinstance(obj, ndarray):
+        # Une vue ne possède pas ses données : getsizeof ne les compte pas
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is not None else 0)
+    pd = sys.modules.get('pandas')
+    frame_types = tuple(filter(None, (getattr(pd, name, None) for name in ('DataFrame', 'Series', 'Index'))))
+    if frame_types and isinstance(obj, frame_types):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, '__slots__'):
+        size += sum(deep_sizeof(getattr(obj, slot), seen)
+                    for slot in obj.__slots__ if hasattr(obj, slot))
+    return size
+
+
+def get_session_budget() -> int:
+    """Budget mémoire d'une session en octets"""
+    try:
+        budget_mb = float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MB))
+    except ValueError:
+        budget_mb = DEFAULT_BUDGET_MB
+    return int(budget_mb * 1024 * 1024)
+
+
+class SessionMemoryAccountant:
+    """Mesure l'état d'une session et y applique le budget mémoire"""
+
+    def __init__(self, budget_bytes: Optional[int] = None, protected: Iterable[str] = PROTECTED_KEYS,
+                 groups: Optional[Dict[str, Iterable[str]]] = None, min_evictable: int = EVICTION_MIN_BYTES):
+        self.budget_bytes = get_session_budget() if budget_bytes is None else budget_bytes
+        self.protected = set(protected) | {LEDGER_KEY}
+        self.groups = EVICTION_GROUPS if groups is None else groups
+        self.min_evictable = min_evictable
+
+    @staticmethod
+    def _ledger(state: MutableMapping) -> Dict[str, Any]:
+        if LEDGER_KEY not in state:
+            state[LEDGER_KEY] = {'entries': {}, 'evicted': 0, 'evicted_bytes': 0}
+        return state[LEDGER_KEY]
+
+    def measure(self, state: MutableMapping) -> Dict[str, Dict[str, Any]]:
+        """
+        Met à jour le registre des tailles
+
+        Une entrée n'est remesurée que lorsque sa valeur est remplacée ; sa date est
+        alors celle de la dernière écriture.
+
+        Returns:
+            dict: clé -> {'size', 'since'}
+        """
+        ledger = self._ledger(state)
+        entries = ledger['entries']
+        now = time.time()
+
+        current = {}
+        for key in list(state.keys()):
+            if key == LEDGER_KEY:
+                continue
+            value = state[key]
+            entry = entries.get(key)
+            if entry is None or entry['id'] != id(value):
+                entry = {'id': id(value), 'size': deep_sizeof(value), 'since': now}
+            current[key] = entry
+
+        ledger['entries'] = current
+        return current
+
+    def total(self, state: MutableMapping) -> int:
+        """Taille totale de la session (octets)"""
+        return sum(entry['size'] for entry in self.measure(state).values())
+
+    def enforce(self, state: MutableMapping) -> List[str]:
+        """
+        Évince les entrées volumineuses les plus anciennes jusqu'à respecter le budget
+
+        Returns:
+            list: Clés supprimées
+        """
+        entries = self.measure(state)
+        total = sum(entry['size'] for entry in entries.values())
+        if total <= self.budget_bytes:
+            return []
+
+        candidates = sorted(
+            (key for key, entry in entries.items()
+             if key not in self.protected and entry['size'] >= self.min_evictable),
+            key=lambda key: entries[key]['since']
+        )
+
+        ledger = self._ledger(state)
+        evicted = []
+        for key in candidates:
+            if total <= self.budget_bytes:
+                break
+            for name in (key, *self.groups.get(key, ())):
+                if name in state and name not in self.protected:
+                    del state[name]
+                    freed = entries.pop(name, {}).get('size', 0)
+                    total -= freed
+                    ledger['evicted_bytes'] += freed
+                    evicted.append(name)
+
+        ledger['entries'] = entries
+        ledger['evicted'] += len(evicted)
+        if evicted:
+            print(f"⚠️ Budget mémoire de session dépassé - entrées évincées: {', '.join(evicted)}")
+        return evicted
+
+    def report(self, state: MutableMapping) -> Dict[str, Any]:
+        """Synthèse pour le diagnostic (totaux et détail par clé, les plus lourdes d'abord)"""
+        entries = self.measure(state)
+        ledger = self._ledger(state)
+        total = sum(entry['size'] for entry in entries.values())
+        detail = sorted(
+            ({'cle': key, 'taille_ko': round(entry['size'] / 1024, 1),
+              'depuis': time.strftime('%H:%M:%S', time.localtime(entry['since'])),
+              'protegee': key in self.protected}
+             for key, entry in entries.items()),
+            key=lambda row: row['taille_ko'], reverse=True
+        )
+        return {
+            'total_mo': round(total / (1024 * 1024), 3),
+            'budget_mo': round(self.budget_bytes / (1024 * 1024), 1),
+            'utilisation_pct': round(100 * total / self.budget_bytes, 1) if self.budget_bytes else None,
+            'entrees': len(entries),
+            'evictions': ledger['evicted'],
+            'evince_mo': round(ledger['evicted_bytes'] / (1024 * 1024), 3),
+            'detail': detail
+        }
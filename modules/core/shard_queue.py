@@ -0,0 +1,295 @@
+"""
+Traitement par lots réparti sur plusieurs machines, sans courtier : file de travail sur fichiers
+
+Usage :
+    python -m modules.core.shard_queue plan portefeuille/ --racine /partage/notation_T4 --shards 64
+    python -m modules.core.shard_queue travail --racine /partage/notation_T4          (sur chaque machine)
+    python -m modules.core.shard_queue reprise --racine /partage/notation_T4 --delai 900
+    python -m modules.core.shard_queue fusion --racine /partage/notation_T4 --sortie resultats.jsonl
+
+Les entrées (classeurs Excel, états financiers ou résultats JSON) sont réparties par
+hachage de leur chemin absolu en shards, décrits dans le répertoire partagé :
+
+    a_faire/shard-0007.json             liste des entrées du shard
+    en_cours/shard-0007@noeud.json      shard réservé par un nœud (renommage atomique)
+    resultats/shard-0007.jsonl          une ligne JSON par entrée, triée par chemin
+    termines/shard-0007.json            shard terminé
+
+Un nœud réserve un shard en le renommant de a_faire/ vers en_cours/ : un seul renommage
+réussit, les autres nœuds passent au shard suivant. Les résultats sont écrits dans un
+fichier temporaire puis renommés, un shard retraité remplace donc simplement son
+résultat. Un nœud arrêté laisse son shard dans en_cours/ ; 'reprise' remet dans a_faire/
+les shards dont le nœud n'a plus donné signe de vie depuis le délai indiqué. La fusion
+interclasse les résultats par chemin d'entrée : la sortie ne dépend ni du nombre de
+nœuds ni de l'ordre de traitement.
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import re
+import socket
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+TODO_DIR = 'a_faire'
+CLAIMED_DIR = 'en_cours'
+RESULTS_DIR = 'resultats'
+DONE_DIR = 'termines'
+QUEUE_DIRS = (TODO_DIR, CLAIMED_DIR, RESULTS_DIR, DONE_DIR)
+
+NODE_SEPARATOR = '@'
+DEFAULT_SHARDS = 16
+
+# Délai sans signe de vie au-delà duquel un shard réservé peut être repris
+DEFAULT_STALE_S = 900
+
+
+def shard_of(key: str, shards: int) -> int:
+    """Shard d'une entrée (hachage stable d'une machine et d'une exécution à l'autre)"""
+    return int.from_bytes(hashlib.sha1(key.encode('utf-8')).digest()[:8], 'big') % shards
+
+
+def shard_name(index: int) -> str:
+    return f"shard-{index:04d}"
+
+
+def default_node() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _node(name: str) -> str:
+    """Nom de nœud utilisable dans un nom de fichier"""
+    return re.sub(r'[^A-Za-z0-9_-]', '-', name)
+
+
+def _write_atomic(path: Path, text: str):
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _dirs(root: str) -> Dict[str, Path]:
+    return {name: Path(root) / name for name in QUEUE_DIRS}
+
+
+def plan(entries: List[str], root: str, shards: int = DEFAULT_SHARDS) -> Dict[str, Any]:
+    """
+    Répartit les entrées en shards dans un répertoire partagé neuf
+
+    Les chemins sont enregistrés (et hachés) sous forme absolue : les nœuds peuvent être
+    lancés depuis n'importe quel répertoire, pourvu que le partage soit monté au même endroit.
+
+    Raises:
+        ValueError: Le répertoire contient déjà une file de travail
+    """
+    from modules.core.batch_reports import collect_inputs
+
+    dirs = _dirs(root)
+    if any(path.exists() and any(path.iterdir()) for path in dirs.values()):
+        raise ValueError(f"{root} contient déjà une file de travail")
+    for path in dirs.values():
+        path.mkdir(parents=True, exist_ok=True)
+
+    partitions: Dict[int, List[str]] = {}
+    for path in collect_inputs(entries):
+        key = str(Path(path).resolve())
+        partitions.setdefault(shard_of(key, shards), []).append(key)
+
+    for index, inputs in sorted(partitions.items()):
+        _write_atomic(dirs[TODO_DIR] / f"{shard_name(index)}.json",
+                      json.dumps({'shard': index, 'entrees': sorted(inputs)}, ensure_ascii=False))
+    return {'entrees': sum(map(len, partitions.values())), 'shards': len(partitions), 'racine': str(root)}
+
+
+def claim(root: str, node: str) -> Optional[Path]:
+    """Réserve le prochain shard disponible (None si la file est vide)"""
+    dirs = _dirs(root)
+    for path in sorted(dirs[TODO_DIR].glob('shard-*.json')):
+        claimed = dirs[CLAIMED_DIR] / f"{path.stem}{NODE_SEPARATOR}{_node(node)}.json"
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            # Réservé par un autre nœud entre la liste et le renommage
+            continue
+        # Le renommage conserve la date du plan : la réservation compte comme signe de vie
+        os.utime(claimed)
+        return claimed
+    return None
+
+
+def _shard_stem(claimed: Path) -> str:
+    return claimed.stem.split(NODE_SEPARATOR)[0]
+
+
+def process_shard(claimed: Path, root: str, secteur: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Analyse les entrées d'un shard réservé et publie ses résultats
+
+    Returns:
+        tuple: (entrées traitées, entrées en erreur)
+    """
+    from modules.core.batch_reports import load_analysis
+
+    dirs = _dirs(root)
+    with open(claimed, encoding='utf-8') as f:
+        inputs = json.load(f)['entrees']
+
+    lines: List[str] = []
+    errors = 0
+    for key in sorted(inputs):
+        try:
+            line = {'fichier': key, **load_analysis(Path(key), secteur)}
+        except Exception as e:
+            errors += 1
+            line = {'fichier': key, 'erreur': f"{type(e).__name__}: {e}"}
+        lines.append(json.dumps(line, ensure_ascii=False, default=str) + "\n")
+        try:
+            # Signe de vie pour 'reprise'
+            os.utime(claimed)
+        except FileNotFoundError:
+            pass
+
+    stem = _shard_stem(claimed)
+    _write_atomic(dirs[RESULTS_DIR] / f"{stem}.jsonl", ''.join(lines))
+    try:
+        os.replace(claimed, dirs[DONE_DIR] / f"{stem}.json")
+    except FileNotFoundError:
+        # Shard repris par un autre nœud : son résultat remplacera celui-ci, à l'identique
+        pass
+    return len(inputs), errors
+
+
+def run_worker(root: str, node: Optional[str] = None, secteur: Optional[str] = None,
+               max_shards: Optional[int] = None) -> Dict[str, Any]:
+    """Réserve et traite des shards jusqu'à épuisement de la file"""
+    node = node or default_node()
+    stats = {'noeud': node, 'shards': 0, 'entrees': 0, 'erreurs': 0}
+    start = time.perf_counter()
+    while max_shards is None or stats['shards'] < max_shards:
+        claimed = claim(root, node)
+        if claimed is None:
+            break
+        count, errors = process_shard(claimed, root, secteur)
+        stats['shards'] += 1
+        stats['entrees'] += count
+        stats['erreurs'] += errors
+    stats['duree_s'] = round(time.perf_counter() - start, 2)
+    return stats
+
+
+def requeue(root: str, stale_s: float = DEFAULT_STALE_S) -> List[str]:
+    """Remet dans la file les shards réservés sans signe de vie depuis stale_s secondes"""
+    dirs = _dirs(root)
+    now = time.time()
+    requeued = []
+    for claimed in sorted(dirs[CLAIMED_DIR].glob('shard-*.json')):
+        try:
+            if now - claimed.stat().st_mtime < stale_s:
+                continue
+            os.rename(claimed, dirs[TODO_DIR] / f"{_shard_stem(claimed)}.json")
+        except FileNotFoundError:
+            # Terminé ou repris entre-temps
+            continue
+        requeued.append(_shard_stem(claimed))
+    return requeued
+
+
+def status(root: str) -> Dict[str, int]:
+    """Nombre de shards par état"""
+    dirs = _dirs(root)
+    return {name: len(list(dirs[name].glob('shard-*.json'))) for name in (TODO_DIR, CLAIMED_DIR, DONE_DIR)}
+
+
+def _result_lines(path: Path) -> Iterator[Tuple[str, str]]:
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)['fichier'], line
+
+
+def merge(root: str, output: str, partial: bool = False) -> Dict[str, Any]:
+    """
+    Interclasse les résultats de tous les shards par chemin d'entrée
+
+    Raises:
+        ValueError: Shards non terminés (sauf partial=True)
+    """
+    current = status(root)
+    if not partial and (current[TODO_DIR] or current[CLAIMED_DIR]):
+        raise ValueError(f"Shards non terminés : {current[TODO_DIR]} à faire, {current[CLAIMED_DIR]} en cours")
+
+    results = sorted(_dirs(root)[RESULTS_DIR].glob('shard-*.jsonl'))
+    count = 0
+    output_path = Path(output)
+    fd, tmp_path = tempfile.mkstemp(dir=str(output_path.parent), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for _, line in heapq.merge(*(_result_lines(path) for path in results), key=lambda item: item[0]):
+                f.write(line)
+                count += 1
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return {'shards': len(results), 'lignes': count, 'sortie': str(output_path)}
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande (messages sur stderr, statistiques JSON sur stdout)"""
+    parser = argparse.ArgumentParser(description="Traitement par lots réparti par shards sur un répertoire partagé")
+    commands = parser.add_subparsers(dest='commande', required=True)
+
+    plan_parser = commands.add_parser('plan', help="Répartit les entrées en shards")
+    plan_parser.add_argument('entrees', nargs='+', help="Fichiers ou répertoires")
+    plan_parser.add_argument('--shards', type=int, default=DEFAULT_SHARDS, help="Nombre de shards")
+
+    worker_parser = commands.add_parser('travail', help="Traite des shards jusqu'à épuisement de la file")
+    worker_parser.add_argument('--noeud', default=None, help="Nom du nœud (défaut : machine-pid)")
+    worker_parser.add_argument('--secteur', default=None, help="Secteur appliqué aux classeurs Excel")
+
+    requeue_parser = commands.add_parser('reprise', help="Remet en file les shards abandonnés")
+    requeue_parser.add_argument('--delai', type=float, default=DEFAULT_STALE_S, help="Secondes sans signe de vie")
+
+    merge_parser = commands.add_parser('fusion', help="Fusionne les résultats dans un fichier JSON Lines")
+    merge_parser.add_argument('--sortie', required=True, help="Fichier JSON Lines")
+    merge_parser.add_argument('--partielle', action='store_true', help="Fusionne sans attendre tous les shards")
+
+    commands.add_parser('etat', help="Nombre de shards par état")
+
+    for sub in commands.choices.values():
+        sub.add_argument('--racine', required=True, help="Répertoire partagé de la file de travail")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout
+    with redirect_stdout(sys.stderr):
+        try:
+            if args.commande == 'plan':
+                stats = plan(args.entrees, args.racine, max(1, args.shards))
+            elif args.commande == 'travail':
+                stats = run_worker(args.racine, args.noeud, args.secteur)
+            elif args.commande == 'reprise':
+                stats = {'repris': requeue(args.racine, args.delai)}
+            elif args.commande == 'fusion':
+                stats = merge(args.racine, args.sortie, args.partielle)
+            else:
+                stats = status(args.racine)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+    print(json.dumps(stats, ensure_ascii=False), file=output)
+    return 1 if stats.get('erreurs') else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,248 @@
+"""
+Validation des états financiers par table de règles (une entreprise ou un lot complet)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Tolérance unique sur l'équilibre du bilan : 1 000 FCFA ou 1% du total actif
+TOLERANCE_BILAN_ABSOLUE = 1000
+TOLERANCE_BILAN_RELATIVE = 0.01
+
+ERREUR = 'erreur'
+AVERTISSEMENT = 'avertissement'
+
+# Postes du bilan qui ne peuvent pas être négatifs
+POSTES_POSITIFS = [
+    'immobilisations_nettes', 'stocks', 'creances_clients', 'tresorerie',
+    'dettes_financieres', 'dettes_court_terme', 'tresorerie_passif'
+]
+
+
+class BatchColumns:
+    """Accès aux colonnes d'un lot comme des tableaux (valeur absente = 0)"""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self._cache = {}
+
+    def __call__(self, name: str) -> np.ndarray:
+        if name not in self._cache:
+            if name in self.frame.columns:
+                values = pd.to_numeric(self.frame[name], errors='coerce').fillna(0).to_numpy(dtype=float)
+            else:
+                values = np.zeros(len(self.frame))
+            self._cache[name] = values
+        return self._cache[name]
+
+    def present(self, name: str) -> np.ndarray:
+        """Indique les lignes où la colonne est renseignée"""
+        if name not in self.frame.columns:
+            return np.zeros(len(self.frame), dtype=bool)
+        return self.frame[name].notna().to_numpy()
+
+
+def total_passif(c: BatchColumns) -> np.ndarray:
+    """Total passif reconstitué à partir de ses composantes"""
+    return c('capitaux_propres') + c('dettes_financieres') + c('dettes_court_terme') + c('tresorerie_passif')
+
+
+def ecart_bilan(c: BatchColumns) -> np.ndarray:
+    """Écart absolu entre actif et passif"""
+    return np.abs(c('total_actif') - total_passif(c))
+
+
+def _ratio(numerateur: np.ndarray, denominateur: np.ndarray) -> np.ndarray:
+    """Division protégée (0 si le dénominateur est nul)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominateur != 0, numerateur / np.where(denominateur != 0, denominateur, 1), 0.0)
+
+
+# Table des règles : 'condition' renvoie le masque des lignes en anomalie ;
+# 'valeur' (optionnelle) alimente le message via {valeur}.
+VALIDATION_RULES = [
+    {
+        'id': 'total_actif_invalide', 'niveau': ERREUR, 'categorie': 'bilan',
+        'condition': lambda c: c('total_actif') <= 0,
+        'message': "Total actif invalide ou nul"
+    },
+    {
+        'id': 'chiffre_affaires_invalide', 'niveau': ERREUR, 'categorie': 'resultat',
+        'condition': lambda c: c('chiffre_affaires') <= 0,
+        'message': "Chiffre d'affaires invalide ou nul"
+    },
+    {
+        'id': 'bilan_desequilibre', 'niveau': ERREUR, 'categorie': 'bilan',
+        'condition': lambda c: ecart_bilan(c) > np.maximum(TOLERANCE_BILAN_ABSOLUE,
+                                                          TOLERANCE_BILAN_RELATIVE * np.abs(c('total_actif'))),
+        'valeur': ecart_bilan,
+        'message': "Bilan non équilibré (écart: {valeur:,.0f} FCFA)"
+    },
+] + [
+    {
+        'id': f"{poste}_negatif", 'niveau': ERREUR, 'categorie': 'bilan',
+        'condition': (lambda poste: lambda c: c(poste) < 0)(poste),
+        'valeur': (lambda poste: lambda c: c(poste))(poste),
+        'message': f"Valeur négative anormale pour {poste}: {{valeur:,.0f}}"
+    }
+    for poste in POSTES_POSITIFS
+] + [
+    {
+        'id': 'capitaux_propres_negatifs', 'niveau': AVERTISSEMENT, 'categorie': 'bilan',
+        'condition': lambda c: c('capitaux_propres') <= 0,
+        'message': "Capitaux propres négatifs ou nuls - Situation critique"
+    },
+    {
+        'id': 'resultat_negatif', 'niveau': AVERTISSEMENT, 'categorie': 'resultat',
+        'condition': lambda c: c('resultat_net') < 0,
+        'message': "Résultat net négatif - Perte de l'exercice"
+    },
+    {
+        'id': 'perte_importante', 'niveau': AVERTISSEMENT, 'categorie': 'resultat',
+        'condition': lambda c: (c('chiffre_affaires') > 0) & (_ratio(c('resultat_net'), c('chiffre_affaires')) < -0.2),
+        'message': "Perte importante (>20% du CA), situation critique"
+    },
+    {
+        'id': 'marge_suspecte', 'niveau': AVERTISSEMENT, 'categorie': 'resultat',
+        'condition': lambda c: (c('chiffre_affaires') > 0) & (_ratio(c('resultat_net'), c('chiffre_affaires')) > 0.5),
+        'message': "Marge nette très élevée (>50%), vérifier la cohérence"
+    },
+    {
+        'id': 'decouvert_sans_tresorerie', 'niveau': AVERTISSEMENT, 'categorie': 'bilan',
+        'condition': lambda c: (c('tresorerie') == 0) & (c('tresorerie_passif') > 0),
+        'message': "Découvert bancaire sans trésorerie positive"
+    },
+    {
+        'id': 'charges_personnel_superieures_ca', 'niveau': AVERTISSEMENT, 'categorie': 'resultat',
+        'condition': lambda c: (c('chiffre_affaires') > 0) & (c('charges_personnel') > c('chiffre_affaires')),
+        'message': "Charges de personnel supérieures au chiffre d'affaires"
+    },
+    {
+        'id': 'charges_personnel_elevees', 'niveau': AVERTISSEMENT, 'categorie': 'resultat',
+        # Exclusive de la règle précédente : un seul avertissement par dossier
+        'condition': lambda c: ((c('chiffre_affaires') > 0) & (c('charges_personnel') > c('chiffre_affaires') * 0.8)
+                                & ~(c('charges_personnel') > c('chiffre_affaires'))),
+        'message': "Charges de personnel représentent plus de 80% du CA"
+    },
+    {
+        'id': 'charges_exploitation_elevees', 'niveau': AVERTISSEMENT, 'categorie': 'resultat',
+        'condition': lambda c: (c('chiffre_affaires') > 0) & (c('charges_exploitation') > c('chiffre_affaires') * 1.2),
+        'message': "Charges d'exploitation très élevées (>120% du CA)"
+    },
+    {
+        'id': 'immobilisations_dominantes', 'niveau': AVERTISSEMENT, 'categorie': 'bilan',
+        'condition': lambda c: c('immobilisations_nettes') > c('total_actif') * 0.9,
+        'message': "Immobilisations représentent plus de 90% de l'actif"
+    },
+    {
+        'id': 'endettement_eleve', 'niveau': AVERTISSEMENT, 'categorie': 'bilan',
+        'condition': lambda c: c('dettes_financieres') > c('capitaux_propres') * 3,
+        'message': "Endettement financier très élevé (>3x les capitaux propres)"
+    },
+    {
+        'id': 'incoherence_flux_tresorerie', 'niveau': AVERTISSEMENT, 'categorie': 'flux',
+        'condition': lambda c: (c.present('tresorerie_cloture') & c.present('tresorerie')
+                                & (np.abs(c('tresorerie_cloture') - (c('tresorerie') - c('tresorerie_passif'))) > 5000)),
+        'message': "Incohérence entre tableau de flux et bilan (trésorerie)"
+    }
+]
+
+
+def build_batch_frame(records: Iterable[Dict[str, Any]], index: Optional[List[Any]] = None) -> pd.DataFrame:
+    """Construit le lot à valider (une ligne par entreprise, une colonne par poste)"""
+    records = list(records)
+    return pd.DataFrame(records, index=index if index is not None else pd.RangeIndex(len(records)))
+
+
+def _select_rules(rules: Optional[List[Dict[str, Any]]], categories: Optional[Iterable[str]]) -> List[Dict[str, Any]]:
+    """Règles à appliquer, éventuellement restreintes à certaines catégories"""
+    rules = VALIDATION_RULES if rules is None else rules
+    if categories is not None:
+        categories = set(categories)
+        rules = [rule for rule in rules if rule['categorie'] in categories]
+    return rules
+
+
+def validate_frame(frame: pd.DataFrame, rules: Optional[List[Dict[str, Any]]] = None,
+                   categories: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Évalue toutes les règles de validation sur un lot en une passe
+
+    Args:
+        frame (DataFrame): Une ligne par entreprise, une colonne par poste
+        rules (list): Table de règles (VALIDATION_RULES par défaut)
+        categories (iterable): Restreint aux règles de ces catégories ('bilan', 'resultat', 'flux')
+
+    Returns:
+        DataFrame: Matrice d'erreurs booléenne entreprise × règle
+    """
+    rules = _select_rules(rules, categories)
+    columns = BatchColumns(frame)
+
+    return pd.DataFrame(
+        {rule['id']: np.asarray(rule['condition'](columns), dtype=bool) for rule in rules},
+        index=frame.index,
+        columns=[rule['id'] for rule in rules]
+    )
+
+
+def triage(matrix: pd.DataFrame, rules: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+    """
+    Synthèse par entreprise de la matrice d'erreurs
+
+    Returns:
+        DataFrame: Colonnes 'erreurs', 'avertissements' (nombre d'anomalies) et 'valide'
+    """
+    niveaux = {rule['id']: rule['niveau'] for rule in _select_rules(rules, None)}
+    is_error = np.array([niveaux[rule_id] == ERREUR for rule_id in matrix.columns], dtype=bool)
+    values = matrix.to_numpy(dtype=bool)
+
+    erreurs = values[:, is_error].sum(axis=1)
+    return pd.DataFrame({
+        'erreurs': erreurs,
+        'avertissements': values[:, ~is_error].sum(axis=1),
+        'valide': erreurs == 0
+    }, index=matrix.index)
+
+
+def rule_summary(matrix: pd.DataFrame, rules: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+    """Nombre d'entreprises en anomalie par règle, les plus fréquentes en premier"""
+    rules_by_id = {rule['id']: rule for rule in _select_rules(rules, None)}
+    counts = matrix.sum(axis=0)
+
+    summary = pd.DataFrame({
+        'niveau': [rules_by_id[rule_id]['niveau'] for rule_id in matrix.columns],
+        'entreprises': counts.to_numpy(dtype=int)
+    }, index=matrix.columns)
+    return summary[summary['entreprises'] > 0].sort_values('entreprises', ascending=False, kind='stable')
+
+
+def validate_record(data: Dict[str, Any], rules: Optional[List[Dict[str, Any]]] = None,
+                    categories: Optional[Iterable[str]] = None) -> Tuple[List[str], List[str]]:
+    """
+    Valide les données financières d'une entreprise
+
+    Args:
+        data (dict): Données financières
+        rules (list): Table de règles (VALIDATION_RULES par défaut)
+        categories (iterable): Restreint aux règles de ces catégories
+
+    Returns:
+        tuple: (erreurs, avertissements) sous forme de messages
+    """
+    rules = _select_rules(rules, categories)
+    frame = build_batch_frame([data])
+    matrix = validate_frame(frame, rules)
+    columns = BatchColumns(frame)
+
+    errors, warnings = [], []
+    for rule in rules:
+        if not matrix.iat[0, matrix.columns.get_loc(rule['id'])]:
+            continue
+        valeur = rule['valeur'](columns)[0] if 'valeur' in rule else 0
+        message = rule['message'].format(valeur=valeur)
+        (errors if rule['niveau'] == ERREUR else warnings).append(message)
+
+    return errors, warnings
@@ -1,34 +1,18 @@
 """
 Package des pages de l'application d'analyse financière BCEAO
 Toutes les pages utilisent le SessionManager pour la gestion d'état centralisée
-Version corrigée avec imports conditionnels pour éviter les erreurs
+Les pages sont importées à la demande (registre) pour accélérer le démarrage à froid
 """
 
-# Import conditionnel des pages pour éviter les erreurs si les modules ne sont pas encore créés
-try:
-    from .home import show_home_page
-except ImportError:
-    show_home_page = None
+from .registry import PageRegistry
 
-try:
-    from .excel_import import show_excel_import_page
-except ImportError:
-    show_excel_import_page = None
-
-try:
-    from .manual_input import show_manual_input_page
-except ImportError:
-    show_manual_input_page = None
-
-try:
-    from .analysis import show_analysis_page
-except ImportError:
-    show_analysis_page = None
-
-try:
-    from .reports import show_reports_page
-except ImportError:
-    show_reports_page = None
+# Points d'entrée des pages : aucun module n'est importé avant la première visite
+PAGES = PageRegistry(__name__)
+PAGES.register('home', '.home:show_home_page')
+PAGES.register('excel_import', '.excel_import:show_excel_import_page')
+PAGES.register('manual_input', '.manual_input:show_manual_input_page')
+PAGES.register('analysis', '.analysis:show_analysis_page')
+PAGES.register('reports', '.reports:show_reports_page')
 
 # Liste des fonctions exportées
 __all__ = [
@@ -39,27 +23,25 @@ __all__ = [
     'show_reports_page'
 ]
 
+_PAGE_FUNCTIONS = {f"show_{name}_page": name for name in PAGES.names()}
+
+
+def __getattr__(name):
+    """Compatibilité : `from modules.pages import show_home_page` importe la page à ce moment"""
+    if name in _PAGE_FUNCTIONS:
+        return PAGES.load(_PAGE_FUNCTIONS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def load_page(name):
+    """Importe une page et retourne sa fonction d'affichage (None si indisponible)"""
+    return PAGES.load(name)
+
+
 # Fonction utilitaire pour vérifier les pages disponibles
 def get_available_pages():
-    """Retourne la liste des pages disponibles"""
-    available = {}
-    
-    if show_home_page is not None:
-        available['home'] = show_home_page
-    
-    if show_excel_import_page is not None:
-        available['excel_import'] = show_excel_import_page
-    
-    if show_manual_input_page is not None:
-        available['manual_input'] = show_manual_input_page
-    
-    if show_analysis_page is not None:
-        available['analysis'] = show_analysis_page
-    
-    if show_reports_page is not None:
-        available['reports'] = show_reports_page
-    
-    return available
+    """Retourne les pages disponibles (fonctions d'affichage importées à l'appel)"""
+    return PAGES.available_pages()
 
 # Information sur le package
 __version__ = "2.1.0"
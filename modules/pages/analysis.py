@@ -12,6 +12,8 @@ from plotly.subplots import make_subplots
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple
 
+from modules.core.recommendations import recommend, PRIORITES
+
 # Import des modules internes
 try:
     from session_manager import SessionManager
@@ -486,6 +488,12 @@ def create_performance_radar(scores: Dict[str, Any]):
     
     st.subheader("🎯 Radar de Performance")
     
+    fig = SessionManager.get_cached_figure('analysis_radar_performance', lambda: build_performance_radar(scores))
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_performance_radar(scores: Dict[str, Any]):
+    """Construit le radar de performance"""
+    
     categories = ['Liquidité', 'Solvabilité', 'Rentabilité', 'Activité', 'Gestion']
     values = [
         scores.get('liquidite', 0) / 40 * 100,
@@ -529,13 +537,19 @@ def create_performance_radar(scores: Dict[str, Any]):
         height=400
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def create_key_ratios_chart(ratios: Dict[str, Any]):
     """Crée le graphique des ratios clés"""
     
     st.subheader("📊 Ratios Clés vs Normes")
     
+    fig = SessionManager.get_cached_figure('analysis_ratios_cles', lambda: build_key_ratios_chart(ratios))
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_key_ratios_chart(ratios: Dict[str, Any]):
+    """Construit le graphique des ratios clés"""
+    
     # Sélectionner les ratios clés avec leurs normes
     key_ratios = [
         ('Liquidité Générale', ratios.get('ratio_liquidite_generale', 0), 1.5),
@@ -572,7 +586,7 @@ def create_key_ratios_chart(ratios: Dict[str, Any]):
         yaxis_title='Valeur'
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def create_balance_structure_chart(data: Dict[str, Any]):
     """Crée le graphique de structure du bilan"""
@@ -593,22 +607,29 @@ def create_balance_structure_chart(data: Dict[str, Any]):
     if actif_data:
         labels, values = zip(*actif_data)
         
-        fig = go.Figure(data=[go.Pie(
-            labels=labels,
-            values=values,
-            hole=.3,
-            marker_colors=['#ff9999', '#66b3ff', '#99ff99']
-        )])
-        
-        fig.update_layout(
-            title="Répartition de l'Actif",
-            height=400
-        )
-        
+        fig = SessionManager.get_cached_figure('analysis_structure_actif',
+                                               lambda: build_balance_structure_chart(labels, values))
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("Données insuffisantes pour créer le graphique")
 
+def build_balance_structure_chart(labels, values):
+    """Construit le graphique de répartition de l'actif"""
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=.3,
+        marker_colors=['#ff9999', '#66b3ff', '#99ff99']
+    )])
+    
+    fig.update_layout(
+        title="Répartition de l'Actif",
+        height=400
+    )
+    
+    return fig
+
 def create_income_evolution_chart(data: Dict[str, Any]):
     """Crée le graphique d'évolution des soldes intermédiaires"""
     
@@ -618,6 +639,12 @@ def create_income_evolution_chart(data: Dict[str, Any]):
         st.info("Données insuffisantes pour créer le graphique")
         return
     
+    fig = SessionManager.get_cached_figure('analysis_soldes_intermediaires', lambda: build_income_evolution_chart(data))
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_income_evolution_chart(data: Dict[str, Any]):
+    """Construit le graphique des soldes intermédiaires"""
+    
     categories = ['CA', 'Valeur Ajoutée', 'EBE', 'Résultat Exploitation', 'Résultat Net']
     values = [
         data.get('chiffre_affaires', 0),
@@ -642,7 +669,7 @@ def create_income_evolution_chart(data: Dict[str, Any]):
         height=400
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def display_recommendations(data: Dict[str, Any], ratios: Dict[str, Any], scores: Dict[str, Any]):
     """Affiche les recommandations"""
@@ -694,72 +721,17 @@ def display_recommendation_card(rec: Dict[str, Any]):
 def generate_recommendations(data: Dict[str, Any], ratios: Dict[str, Any], scores: Dict[str, Any]) -> list:
     """Génère des recommandations basées sur l'analyse"""
     
-    recommendations = []
-    
-    # Recommandations de liquidité
-    if scores.get('liquidite', 0) < 25:
-        if ratios.get('ratio_liquidite_generale', 0) < 1.2:
-            recommendations.append({
-                "Priorité": "🔴 URGENT",
-                "Catégorie": "💧 Liquidité",
-                "Problème": f"Ratio de liquidité critique ({ratios.get('ratio_liquidite_generale', 0):.2f})",
-                "Impact": "Risque de défaillance à court terme",
-                "Recommandations": [
-                    "Négocier des délais de paiement avec les fournisseurs",
-                    "Accélérer le recouvrement des créances clients",
-                    "Réduire les stocks non essentiels",
-                    "Négocier une ligne de crédit court terme"
-                ],
-                "Indicateurs de suivi": [
-                    "Ratio de liquidité générale > 1.5",
-                    "Délai de recouvrement < 45 jours",
-                    "Rotation des stocks > 6"
-                ]
-            })
-    
-    # Recommandations de solvabilité
-    if scores.get('solvabilite', 0) < 25:
-        if ratios.get('ratio_autonomie_financiere', 0) < 25:
-            recommendations.append({
-                "Priorité": "🟠 IMPORTANT",
-                "Catégorie": "🏛️ Solvabilité",
-                "Problème": f"Autonomie financière insuffisante ({ratios.get('ratio_autonomie_financiere', 0):.1f}%)",
-                "Impact": "Structure financière déséquilibrée",
-                "Recommandations": [
-                    "Préparer une augmentation de capital",
-                    "Renégocier les dettes financières",
-                    "Mettre en réserve tous les bénéfices",
-                    "Rechercher des subventions"
-                ],
-                "Indicateurs de suivi": [
-                    "Ratio d'autonomie financière > 30%",
-                    "Ratio d'endettement < 65%",
-                    "Capacité de remboursement < 5 ans"
-                ]
-            })
-    
-    # Recommandations de rentabilité
-    if scores.get('rentabilite', 0) < 15:
-        if ratios.get('marge_nette', 0) < 3:
-            recommendations.append({
-                "Priorité": "🟡 MOYEN TERME",
-                "Catégorie": "📈 Rentabilité",
-                "Problème": f"Marge nette insuffisante ({ratios.get('marge_nette', 0):.1f}%)",
-                "Impact": "Capacité d'autofinancement limitée",
-                "Recommandations": [
-                    "Analyser la structure des coûts",
-                    "Optimiser les marges commerciales",
-                    "Réduire les charges fixes",
-                    "Améliorer la productivité"
-                ],
-                "Indicateurs de suivi": [
-                    "Marge nette > 5%",
-                    "ROE > 10%",
-                    "Coefficient d'exploitation < 65%"
-                ]
-            })
-    
-    return recommendations
+    return [
+        {
+            "Priorité": f"{PRIORITES[rec['priorite']]['pastille']} {rec['priorite']}",
+            "Catégorie": f"{rec['icone']} {rec['categorie']}",
+            "Problème": rec['probleme'],
+            "Impact": rec['impact'],
+            "Recommandations": rec['actions'],
+            "Indicateurs de suivi": rec['indicateurs']
+        }
+        for rec in recommend(ratios, scores)
+    ]
 
 # Fonctions utilitaires
 
@@ -3,17 +3,18 @@ Page d'import Excel - Version corrigée sans réinitialisation
 """
 
 import streamlit as st
-import tempfile
-import os
 from datetime import datetime
 
 # Import du gestionnaire de session centralisé
 try:
-    from session_manager import SessionManager, store_analysis, reset_app
+    from session_manager import SessionManager, reset_app
 except ImportError:
     st.error("❌ Impossible d'importer session_manager.py")
     st.stop()
 
+from modules.components.analysis_progress import show_analysis_progress, show_analysis_error
+from modules.components.company_identity import show_company_identity_inputs
+
 def show_excel_import_page():
     """Affiche la page d'import Excel - Version stable"""
     
@@ -110,13 +111,20 @@ def show_analysis_interface():
         key=f"secteur_{SessionManager.get_reset_counter()}"
     )
     
+    # Identification (clé de l'historique)
+    st.header("🏢 Entreprise et Exercice")
+    identity = show_company_identity_inputs(f"import_{SessionManager.get_reset_counter()}")
+    
     # Bouton d'analyse
+    show_analysis_error()
+    
     if not st.session_state['analysis_running']:
         if st.button("🔍 Analyser le Fichier", type="primary", use_container_width=True):
-            st.session_state['analysis_running'] = True
-            analyze_file(st.session_state['file_content'], st.session_state['file_name'], secteur)
+            analyze_file(st.session_state['file_content'], st.session_state['file_name'], secteur, identity)
     else:
-        st.info("🔄 Analyse en cours... Veuillez patienter.")
+        st.info("🔄 Analyse en cours... Vous pouvez continuer à consulter la page.")
+        # Progression réelle par étape, puis navigation vers l'analyse
+        show_analysis_progress('analysis')
     
     # Options supplémentaires
     st.markdown("---")
@@ -135,61 +143,18 @@ def show_analysis_interface():
             SessionManager.set_current_page('home')
             st.rerun()
 
-def analyze_file(file_content, filename, secteur):
-    """Analyse le fichier Excel"""
+def analyze_file(file_content, filename, secteur, identity=None):
+    """Soumet l'analyse du fichier au pool d'arrière-plan (même chemin que la page d'import unifiée)"""
     
     try:
-        with st.spinner("📊 Analyse du fichier en cours..."):
-            # Créer un fichier temporaire
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                tmp_file.write(file_content)
-                temp_path = tmp_file.name
-            
-            try:
-                # Importer l'analyseur
-                from modules.core.analyzer import FinancialAnalyzer
-                
-                # Analyser le fichier
-                analyzer = FinancialAnalyzer()
-                data = analyzer.load_excel_template(temp_path)
-                
-                if data is None:
-                    st.error("❌ Erreur lors du chargement du fichier")
-                    st.error("Vérifiez que le fichier contient les feuilles 'Bilan' et 'CR'")
-                    st.session_state['analysis_running'] = False
-                    return
-                
-                # Calculer les ratios et scores
-                ratios = analyzer.calculate_ratios(data)
-                scores = analyzer.calculate_score(ratios, secteur)
-                
-                # Métadonnées
-                metadata = {
-                    'secteur': secteur,
-                    'fichier_nom': filename,
-                    'source': 'excel_import'
-                }
-                
-                # Stocker l'analyse
-                store_analysis(data, ratios, scores, metadata)
-                
-                st.success("✅ Analyse terminée avec succès!")
-                st.balloons()
-                
-                # Réinitialiser le flag
-                st.session_state['analysis_running'] = False
-                
-                # Rediriger vers l'analyse
-                st.rerun()
-                
-            finally:
-                # Nettoyer le fichier temporaire
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-    
+        SessionManager.submit_excel_analysis(file_content, filename, secteur, source='excel_import',
+                                             identity=identity)
     except Exception as e:
         st.error(f"❌ Erreur lors de l'analyse : {str(e)}")
         st.session_state['analysis_running'] = False
+        return
+    
+    st.rerun()
 
 def show_analysis_completed():
     """Affiche l'interface quand l'analyse est terminée"""
@@ -183,10 +183,10 @@ def launch_demo():
         
         try:
             # Importer l'analyseur
-            from modules.core.analyzer import FinancialAnalyzer
+            from modules.core.analyzer import get_financial_analyzer
             
             # Créer l'analyseur
-            analyzer = FinancialAnalyzer()
+            analyzer = get_financial_analyzer()
             
             # Calculer les ratios
             ratios = analyzer.calculate_ratios(demo_data)
@@ -6,6 +6,26 @@ Version corrigée avec SessionManager intégré
 import streamlit as st
 from datetime import datetime
 
+from modules.core.validation import validate_record
+from modules.components.statement_forms import statement_section, record_verdict
+from modules.components.company_identity import show_company_identity_inputs
+
+# Aperçu des ratios sous chaque formulaire (clé du ratio, libellé, unité)
+BILAN_PREVIEW = (
+    ('ratio_liquidite_generale', "Liquidité générale", ''),
+    ('ratio_autonomie_financiere', "Autonomie financière", ' %'),
+    ('ratio_endettement', "Endettement", ' %'),
+)
+CR_PREVIEW = (
+    ('marge_nette', "Marge nette", ' %'),
+    ('marge_excedent_brut', "Marge d'EBE", ' %'),
+    ('taux_charges_personnel', "Charges de personnel / VA", ' %'),
+)
+FLUX_PREVIEW = (
+    ('ratio_cafg_ca', "CAFG / CA", ' %'),
+    ('capacite_remboursement', "Capacité de remboursement", ' ans'),
+)
+
 # Import du gestionnaire de session centralisé
 try:
     from session_manager import SessionManager, store_analysis
@@ -52,395 +72,34 @@ def show_manual_input_page():
         key=secteur_key
     )
     
-    # Onglets pour organiser la saisie
+    # Identification (clé de l'historique)
+    st.header("🏢 Entreprise et Exercice")
+    identity = show_company_identity_inputs(f"manual_{reset_counter}")
+    
+    # Onglets pour organiser la saisie : chaque état est un formulaire isolé (fragment),
+    # la frappe et la validation d'un état ne réexécutent pas le reste de la page
     tab_bilan, tab_cr, tab_flux = st.tabs([
         "📊 Bilan", "📈 Compte de Résultat", "💰 Flux de Trésorerie"
     ])
     
-    # Initialiser les données avec clés uniques
     data = {}
     
     with tab_bilan:
-        st.header("📊 Bilan")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("ACTIF")
-            
-            st.markdown("**Immobilisations (en FCFA)**")
-            immob_key = f"immobilisations_{reset_counter}"
-            data['immobilisations_nettes'] = st.number_input(
-                "Immobilisations nettes", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Valeur nette des immobilisations après amortissements",
-                key=immob_key
-            )
-            
-            st.markdown("**Actif Circulant (en FCFA)**")
-            stocks_key = f"stocks_{reset_counter}"
-            data['stocks'] = st.number_input(
-                "Stocks", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Stocks de marchandises, matières premières et produits finis",
-                key=stocks_key
-            )
-            
-            creances_key = f"creances_{reset_counter}"
-            data['creances_clients'] = st.number_input(
-                "Créances clients", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Montant dû par les clients",
-                key=creances_key
-            )
-            
-            autres_creances_key = f"autres_creances_{reset_counter}"
-            data['autres_creances'] = st.number_input(
-                "Autres créances", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Autres créances (TVA, avances, etc.)",
-                key=autres_creances_key
-            )
-            
-            st.markdown("**Trésorerie (en FCFA)**")
-            tresorerie_key = f"tresorerie_{reset_counter}"
-            data['tresorerie'] = st.number_input(
-                "Banques et caisses", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Disponibilités en banque et en caisse",
-                key=tresorerie_key
-            )
-            
-            # Calcul total actif circulant
-            data['total_actif_circulant'] = data['stocks'] + data['creances_clients'] + data['autres_creances']
-            
-            # Total actif
-            data['total_actif'] = data['immobilisations_nettes'] + data['total_actif_circulant'] + data['tresorerie']
-            
-            st.markdown("---")
-            st.metric("**TOTAL ACTIF**", f"{data['total_actif']:,.0f} FCFA")
-        
-        with col2:
-            st.subheader("PASSIF")
-            
-            st.markdown("**Capitaux Propres (en FCFA)**")
-            capital_key = f"capital_{reset_counter}"
-            data['capital'] = st.number_input(
-                "Capital social", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Capital social de l'entreprise",
-                key=capital_key
-            )
-            
-            reserves_key = f"reserves_{reset_counter}"
-            data['reserves'] = st.number_input(
-                "Réserves", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Réserves accumulées",
-                key=reserves_key
-            )
-            
-            resultat_key = f"resultat_{reset_counter}"
-            data['resultat_net'] = st.number_input(
-                "Résultat net", 
-                value=0.0, 
-                format="%.0f",
-                help="Résultat net de l'exercice (peut être négatif)",
-                key=resultat_key
-            )
-            
-            # Calcul capitaux propres
-            data['capitaux_propres'] = data['capital'] + data['reserves'] + data['resultat_net']
-            
-            st.markdown("**Dettes (en FCFA)**")
-            dettes_fin_key = f"dettes_fin_{reset_counter}"
-            data['dettes_financieres'] = st.number_input(
-                "Dettes financières", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Emprunts bancaires et autres dettes financières",
-                key=dettes_fin_key
-            )
-            
-            fournisseurs_key = f"fournisseurs_{reset_counter}"
-            data['fournisseurs_exploitation'] = st.number_input(
-                "Dettes fournisseurs", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Montant dû aux fournisseurs",
-                key=fournisseurs_key
-            )
-            
-            dettes_sociales_key = f"dettes_sociales_{reset_counter}"
-            data['dettes_sociales_fiscales'] = st.number_input(
-                "Dettes sociales et fiscales", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Dettes envers l'administration (CNSS, impôts, etc.)",
-                key=dettes_sociales_key
-            )
-            
-            autres_dettes_key = f"autres_dettes_{reset_counter}"
-            data['autres_dettes'] = st.number_input(
-                "Autres dettes", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Autres dettes à court terme",
-                key=autres_dettes_key
-            )
-            
-            tresorerie_passif_key = f"tresorerie_passif_{reset_counter}"
-            data['tresorerie_passif'] = st.number_input(
-                "Découverts bancaires", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Découverts et crédits de trésorerie",
-                key=tresorerie_passif_key
-            )
-            
-            # Calculs
-            data['dettes_court_terme'] = (
-                data['fournisseurs_exploitation'] + 
-                data['dettes_sociales_fiscales'] + 
-                data['autres_dettes']
-            )
-            
-            total_passif = (
-                data['capitaux_propres'] + 
-                data['dettes_financieres'] + 
-                data['dettes_court_terme'] + 
-                data['tresorerie_passif']
-            )
-            
-            st.markdown("---")
-            st.metric("**TOTAL PASSIF**", f"{total_passif:,.0f} FCFA")
-            
-            # Vérification équilibre
-            equilibre = abs(data['total_actif'] - total_passif)
-            if equilibre < 1000:
-                st.success(f"✅ Bilan équilibré (écart: {equilibre:,.0f})")
-            else:
-                st.error(f"❌ Bilan déséquilibré (écart: {equilibre:,.0f})")
+        data.update(create_bilan_input_section(reset_counter))
     
     with tab_cr:
-        st.header("📈 Compte de Résultat")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("PRODUITS")
-            
-            st.markdown("**Chiffre d'Affaires (en FCFA)**")
-            ca_key = f"ca_{reset_counter}"
-            data['chiffre_affaires'] = st.number_input(
-                "Chiffre d'affaires", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Chiffre d'affaires total de l'exercice",
-                key=ca_key
-            )
-            
-            autres_produits_key = f"autres_produits_{reset_counter}"
-            data['autres_produits'] = st.number_input(
-                "Autres produits d'exploitation", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Subventions, reprises de provisions, etc.",
-                key=autres_produits_key
-            )
-            
-            st.markdown("**Produits Financiers (en FCFA)**")
-            rev_fin_key = f"rev_fin_{reset_counter}"
-            data['revenus_financiers'] = st.number_input(
-                "Revenus financiers", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Intérêts, dividendes reçus, etc.",
-                key=rev_fin_key
-            )
-        
-        with col2:
-            st.subheader("CHARGES")
-            
-            st.markdown("**Charges d'Exploitation (en FCFA)**")
-            achats_key = f"achats_{reset_counter}"
-            data['achats_matieres_premieres'] = st.number_input(
-                "Achats matières premières", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Achats de matières premières et marchandises",
-                key=achats_key
-            )
-            
-            personnel_key = f"personnel_{reset_counter}"
-            data['charges_personnel'] = st.number_input(
-                "Charges de personnel", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Salaires, charges sociales, etc.",
-                key=personnel_key
-            )
-            
-            autres_charges_key = f"autres_charges_{reset_counter}"
-            data['autres_charges'] = st.number_input(
-                "Autres charges d'exploitation", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Loyers, assurances, services extérieurs, etc.",
-                key=autres_charges_key
-            )
-            
-            amortissements_key = f"amortissements_{reset_counter}"
-            data['dotations_amortissements'] = st.number_input(
-                "Dotations aux amortissements", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Amortissements des immobilisations",
-                key=amortissements_key
-            )
-            
-            st.markdown("**Charges Financières (en FCFA)**")
-            frais_fin_key = f"frais_fin_{reset_counter}"
-            data['frais_financiers'] = st.number_input(
-                "Frais financiers", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Intérêts sur emprunts, frais bancaires, etc.",
-                key=frais_fin_key
-            )
-            
-            impots_key = f"impots_{reset_counter}"
-            data['impots_resultat'] = st.number_input(
-                "Impôts sur le résultat", 
-                min_value=0.0, 
-                value=0.0, 
-                format="%.0f",
-                help="Impôts sur les bénéfices",
-                key=impots_key
-            )
-        
-        # Calculs du compte de résultat
-        total_produits = data['chiffre_affaires'] + data['autres_produits'] + data['revenus_financiers']
-        
-        data['charges_exploitation'] = (
-            data['achats_matieres_premieres'] + 
-            data['charges_personnel'] + 
-            data['autres_charges'] + 
-            data['dotations_amortissements']
-        )
-        
-        total_charges = data['charges_exploitation'] + data['frais_financiers'] + data['impots_resultat']
-        
-        # Soldes intermédiaires
-        data['valeur_ajoutee'] = data['chiffre_affaires'] - data['achats_matieres_premieres']
-        data['excedent_brut'] = data['valeur_ajoutee'] - data['charges_personnel']
-        data['resultat_exploitation'] = data['excedent_brut'] - data['autres_charges'] - data['dotations_amortissements']
-        data['resultat_financier'] = data['revenus_financiers'] - data['frais_financiers']
-        
-        # Cohérence avec le résultat net du bilan
-        resultat_calcule = data['resultat_exploitation'] + data['resultat_financier'] - data['impots_resultat']
-        if abs(resultat_calcule - data['resultat_net']) > 1000:
-            st.warning(f"⚠️ Incohérence détectée: Résultat calculé ({resultat_calcule:,.0f}) vs Résultat bilan ({data['resultat_net']:,.0f})")
-        
-        st.markdown("---")
-        
-        # Affichage des soldes
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Valeur Ajoutée", f"{data['valeur_ajoutee']:,.0f} FCFA")
-        with col2:
-            st.metric("EBE", f"{data['excedent_brut']:,.0f} FCFA")
-        with col3:
-            st.metric("Résultat d'Exploitation", f"{data['resultat_exploitation']:,.0f} FCFA")
+        data.update(create_cr_input_section(reset_counter))
     
     with tab_flux:
-        st.header("💰 Flux de Trésorerie")
-        
-        st.markdown("**Capacité d'Autofinancement et Flux (en FCFA)**")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            cafg_key = f"cafg_{reset_counter}"
-            data['cafg'] = st.number_input(
-                "CAFG (Capacité d'autofinancement)", 
-                value=data.get('resultat_net', 0) + data.get('dotations_amortissements', 0), 
-                format="%.0f",
-                help="Généralement : Résultat net + Dotations aux amortissements",
-                key=cafg_key
-            )
-            
-            flux_op_key = f"flux_op_{reset_counter}"
-            data['flux_activites_operationnelles'] = st.number_input(
-                "Flux des activités opérationnelles", 
-                value=data.get('cafg', 0), 
-                format="%.0f",
-                help="CAFG - variation du BFR",
-                key=flux_op_key
-            )
-        
-        with col2:
-            flux_inv_key = f"flux_inv_{reset_counter}"
-            data['flux_activites_investissement'] = st.number_input(
-                "Flux des activités d'investissement", 
-                value=0.0, 
-                format="%.0f",
-                help="Généralement négatif (acquisitions d'immobilisations)",
-                key=flux_inv_key
-            )
-            
-            flux_fin_key = f"flux_fin_{reset_counter}"
-            data['flux_activites_financement'] = st.number_input(
-                "Flux des activités de financement", 
-                value=0.0, 
-                format="%.0f",
-                help="Emprunts contractés - remboursements - dividendes",
-                key=flux_fin_key
-            )
-        
-        # Calcul variation de trésorerie
-        data['variation_tresorerie'] = (
-            data['flux_activites_operationnelles'] + 
-            data['flux_activites_investissement'] + 
-            data['flux_activites_financement']
-        )
-        
-        st.markdown("---")
-        st.metric("Variation de Trésorerie", f"{data['variation_tresorerie']:,.0f} FCFA")
+        data.update(create_flux_input_section(reset_counter))
     
     # Validation et analyse
     st.markdown("---")
     st.header("🔍 Validation et Analyse")
     
-    # Vérifications de base
+    # Vérifications de base (verdict mémorisé : les sections ne relancent la page que s'il change)
     errors, warnings = validate_financial_data(data)
+    record_verdict(reset_counter, errors, warnings)
     
     # Affichage des erreurs et avertissements
     if errors:
@@ -461,10 +120,10 @@ def show_manual_input_page():
             with st.spinner("📊 Analyse en cours..."):
                 try:
                     # Importer l'analyseur
-                    from modules.core.analyzer import FinancialAnalyzer
+                    from modules.core.analyzer import get_financial_analyzer
                     
                     # Créer l'analyseur
-                    analyzer = FinancialAnalyzer()
+                    analyzer = get_financial_analyzer()
                     
                     # Calculer les ratios
                     ratios = analyzer.calculate_ratios(data)
@@ -474,6 +133,7 @@ def show_manual_input_page():
                     
                     # Métadonnées
                     metadata = {
+                        **identity,
                         'secteur': secteur,
                         'source': 'manual_input',
                         'mode_saisie': 'manuelle',
@@ -522,6 +182,414 @@ def show_manual_input_page():
     # Instructions d'aide
     show_help_instructions()
 
+def create_bilan_input_section(reset_counter):
+    """Section de saisie du bilan (formulaire isolé)"""
+    return statement_section(
+        'bilan', reset_counter,
+        lambda values, context: _bilan_fields(values, context, reset_counter),
+        "✅ Valider le bilan",
+        preview=BILAN_PREVIEW, validate=validate_financial_data
+    )
+
+def create_cr_input_section(reset_counter):
+    """Section de saisie du compte de résultat (formulaire isolé)"""
+    return statement_section(
+        'cr', reset_counter,
+        lambda values, context: _cr_fields(values, context, reset_counter),
+        "✅ Valider le compte de résultat",
+        preview=CR_PREVIEW, validate=validate_financial_data
+    )
+
+def create_flux_input_section(reset_counter):
+    """Section de saisie des flux de trésorerie (formulaire isolé)"""
+    return statement_section(
+        'flux', reset_counter,
+        lambda values, context: _flux_fields(values, context, reset_counter),
+        "✅ Valider les flux",
+        preview=FLUX_PREVIEW, validate=validate_financial_data
+    )
+
+def _bilan_fields(values, context, reset_counter):
+    """Champs et totaux du bilan"""
+    
+    st.header("📊 Bilan")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("ACTIF")
+
+        st.markdown("**Immobilisations (en FCFA)**")
+        immob_key = f"immobilisations_{reset_counter}"
+        values['immobilisations_nettes'] = st.number_input(
+            "Immobilisations nettes", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Valeur nette des immobilisations après amortissements",
+            key=immob_key
+        )
+
+        st.markdown("**Actif Circulant (en FCFA)**")
+        stocks_key = f"stocks_{reset_counter}"
+        values['stocks'] = st.number_input(
+            "Stocks", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Stocks de marchandises, matières premières et produits finis",
+            key=stocks_key
+        )
+
+        creances_key = f"creances_{reset_counter}"
+        values['creances_clients'] = st.number_input(
+            "Créances clients", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Montant dû par les clients",
+            key=creances_key
+        )
+
+        autres_creances_key = f"autres_creances_{reset_counter}"
+        values['autres_creances'] = st.number_input(
+            "Autres créances", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Autres créances (TVA, avances, etc.)",
+            key=autres_creances_key
+        )
+
+        st.markdown("**Trésorerie (en FCFA)**")
+        tresorerie_key = f"tresorerie_{reset_counter}"
+        values['tresorerie'] = st.number_input(
+            "Banques et caisses", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Disponibilités en banque et en caisse",
+            key=tresorerie_key
+        )
+
+        # Calcul total actif circulant
+        values['total_actif_circulant'] = values['stocks'] + values['creances_clients'] + values['autres_creances']
+
+        # Total actif
+        values['total_actif'] = values['immobilisations_nettes'] + values['total_actif_circulant'] + values['tresorerie']
+
+        st.markdown("---")
+        st.metric("**TOTAL ACTIF**", f"{values['total_actif']:,.0f} FCFA")
+
+    with col2:
+        st.subheader("PASSIF")
+
+        st.markdown("**Capitaux Propres (en FCFA)**")
+        capital_key = f"capital_{reset_counter}"
+        values['capital'] = st.number_input(
+            "Capital social", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Capital social de l'entreprise",
+            key=capital_key
+        )
+
+        reserves_key = f"reserves_{reset_counter}"
+        values['reserves'] = st.number_input(
+            "Réserves", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Réserves accumulées",
+            key=reserves_key
+        )
+
+        resultat_key = f"resultat_{reset_counter}"
+        values['resultat_net'] = st.number_input(
+            "Résultat net", 
+            value=0.0, 
+            format="%.0f",
+            help="Résultat net de l'exercice (peut être négatif)",
+            key=resultat_key
+        )
+
+        # Calcul capitaux propres
+        values['capitaux_propres'] = values['capital'] + values['reserves'] + values['resultat_net']
+
+        st.markdown("**Dettes (en FCFA)**")
+        dettes_fin_key = f"dettes_fin_{reset_counter}"
+        values['dettes_financieres'] = st.number_input(
+            "Dettes financières", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Emprunts bancaires et autres dettes financières",
+            key=dettes_fin_key
+        )
+
+        fournisseurs_key = f"fournisseurs_{reset_counter}"
+        values['fournisseurs_exploitation'] = st.number_input(
+            "Dettes fournisseurs", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Montant dû aux fournisseurs",
+            key=fournisseurs_key
+        )
+
+        dettes_sociales_key = f"dettes_sociales_{reset_counter}"
+        values['dettes_sociales_fiscales'] = st.number_input(
+            "Dettes sociales et fiscales", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Dettes envers l'administration (CNSS, impôts, etc.)",
+            key=dettes_sociales_key
+        )
+
+        autres_dettes_key = f"autres_dettes_{reset_counter}"
+        values['autres_dettes'] = st.number_input(
+            "Autres dettes", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Autres dettes à court terme",
+            key=autres_dettes_key
+        )
+
+        tresorerie_passif_key = f"tresorerie_passif_{reset_counter}"
+        values['tresorerie_passif'] = st.number_input(
+            "Découverts bancaires", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Découverts et crédits de trésorerie",
+            key=tresorerie_passif_key
+        )
+
+        # Calculs
+        values['dettes_court_terme'] = (
+            values['fournisseurs_exploitation'] + 
+            values['dettes_sociales_fiscales'] + 
+            values['autres_dettes']
+        )
+
+        total_passif = (
+            values['capitaux_propres'] + 
+            values['dettes_financieres'] + 
+            values['dettes_court_terme'] + 
+            values['tresorerie_passif']
+        )
+
+        st.markdown("---")
+        st.metric("**TOTAL PASSIF**", f"{total_passif:,.0f} FCFA")
+
+        # Vérification équilibre
+        equilibre = abs(values['total_actif'] - total_passif)
+        if equilibre < 1000:
+            st.success(f"✅ Bilan équilibré (écart: {equilibre:,.0f})")
+        else:
+            st.error(f"❌ Bilan déséquilibré (écart: {equilibre:,.0f})")
+
+def _cr_fields(values, context, reset_counter):
+    """Champs et soldes intermédiaires du compte de résultat"""
+    
+    st.header("📈 Compte de Résultat")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("PRODUITS")
+
+        st.markdown("**Chiffre d'Affaires (en FCFA)**")
+        ca_key = f"ca_{reset_counter}"
+        values['chiffre_affaires'] = st.number_input(
+            "Chiffre d'affaires", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Chiffre d'affaires total de l'exercice",
+            key=ca_key
+        )
+
+        autres_produits_key = f"autres_produits_{reset_counter}"
+        values['autres_produits'] = st.number_input(
+            "Autres produits d'exploitation", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Subventions, reprises de provisions, etc.",
+            key=autres_produits_key
+        )
+
+        st.markdown("**Produits Financiers (en FCFA)**")
+        rev_fin_key = f"rev_fin_{reset_counter}"
+        values['revenus_financiers'] = st.number_input(
+            "Revenus financiers", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Intérêts, dividendes reçus, etc.",
+            key=rev_fin_key
+        )
+
+    with col2:
+        st.subheader("CHARGES")
+
+        st.markdown("**Charges d'Exploitation (en FCFA)**")
+        achats_key = f"achats_{reset_counter}"
+        values['achats_matieres_premieres'] = st.number_input(
+            "Achats matières premières", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Achats de matières premières et marchandises",
+            key=achats_key
+        )
+
+        personnel_key = f"personnel_{reset_counter}"
+        values['charges_personnel'] = st.number_input(
+            "Charges de personnel", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Salaires, charges sociales, etc.",
+            key=personnel_key
+        )
+
+        autres_charges_key = f"autres_charges_{reset_counter}"
+        values['autres_charges'] = st.number_input(
+            "Autres charges d'exploitation", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Loyers, assurances, services extérieurs, etc.",
+            key=autres_charges_key
+        )
+
+        amortissements_key = f"amortissements_{reset_counter}"
+        values['dotations_amortissements'] = st.number_input(
+            "Dotations aux amortissements", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Amortissements des immobilisations",
+            key=amortissements_key
+        )
+
+        st.markdown("**Charges Financières (en FCFA)**")
+        frais_fin_key = f"frais_fin_{reset_counter}"
+        values['frais_financiers'] = st.number_input(
+            "Frais financiers", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Intérêts sur emprunts, frais bancaires, etc.",
+            key=frais_fin_key
+        )
+
+        impots_key = f"impots_{reset_counter}"
+        values['impots_resultat'] = st.number_input(
+            "Impôts sur le résultat", 
+            min_value=0.0, 
+            value=0.0, 
+            format="%.0f",
+            help="Impôts sur les bénéfices",
+            key=impots_key
+        )
+
+    # Calculs du compte de résultat
+    total_produits = values['chiffre_affaires'] + values['autres_produits'] + values['revenus_financiers']
+
+    values['charges_exploitation'] = (
+        values['achats_matieres_premieres'] + 
+        values['charges_personnel'] + 
+        values['autres_charges'] + 
+        values['dotations_amortissements']
+    )
+
+    total_charges = values['charges_exploitation'] + values['frais_financiers'] + values['impots_resultat']
+
+    # Soldes intermédiaires
+    values['valeur_ajoutee'] = values['chiffre_affaires'] - values['achats_matieres_premieres']
+    values['excedent_brut'] = values['valeur_ajoutee'] - values['charges_personnel']
+    values['resultat_exploitation'] = values['excedent_brut'] - values['autres_charges'] - values['dotations_amortissements']
+    values['resultat_financier'] = values['revenus_financiers'] - values['frais_financiers']
+
+    # Cohérence avec le résultat net du bilan
+    resultat_calcule = values['resultat_exploitation'] + values['resultat_financier'] - values['impots_resultat']
+    if abs(resultat_calcule - context.get('resultat_net', 0)) > 1000:
+        st.warning(f"⚠️ Incohérence détectée: Résultat calculé ({resultat_calcule:,.0f}) vs Résultat bilan ({context.get('resultat_net', 0):,.0f})")
+
+    st.markdown("---")
+
+    # Affichage des soldes
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Valeur Ajoutée", f"{values['valeur_ajoutee']:,.0f} FCFA")
+    with col2:
+        st.metric("EBE", f"{values['excedent_brut']:,.0f} FCFA")
+    with col3:
+        st.metric("Résultat d'Exploitation", f"{values['resultat_exploitation']:,.0f} FCFA")
+
+def _flux_fields(values, context, reset_counter):
+    """Champs et variation de trésorerie"""
+    
+    st.header("💰 Flux de Trésorerie")
+
+    st.markdown("**Capacité d'Autofinancement et Flux (en FCFA)**")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        cafg_key = f"cafg_{reset_counter}"
+        values['cafg'] = st.number_input(
+            "CAFG (Capacité d'autofinancement)", 
+            value=context.get('resultat_net', 0.0) + context.get('dotations_amortissements', 0.0), 
+            format="%.0f",
+            help="Généralement : Résultat net + Dotations aux amortissements",
+            key=cafg_key
+        )
+
+        flux_op_key = f"flux_op_{reset_counter}"
+        values['flux_activites_operationnelles'] = st.number_input(
+            "Flux des activités opérationnelles", 
+            value=values.get('cafg', 0), 
+            format="%.0f",
+            help="CAFG - variation du BFR",
+            key=flux_op_key
+        )
+
+    with col2:
+        flux_inv_key = f"flux_inv_{reset_counter}"
+        values['flux_activites_investissement'] = st.number_input(
+            "Flux des activités d'investissement", 
+            value=0.0, 
+            format="%.0f",
+            help="Généralement négatif (acquisitions d'immobilisations)",
+            key=flux_inv_key
+        )
+
+        flux_fin_key = f"flux_fin_{reset_counter}"
+        values['flux_activites_financement'] = st.number_input(
+            "Flux des activités de financement", 
+            value=0.0, 
+            format="%.0f",
+            help="Emprunts contractés - remboursements - dividendes",
+            key=flux_fin_key
+        )
+
+    # Calcul variation de trésorerie
+    values['variation_tresorerie'] = (
+        values['flux_activites_operationnelles'] + 
+        values['flux_activites_investissement'] + 
+        values['flux_activites_financement']
+    )
+
+    st.markdown("---")
+    st.metric("Variation de Trésorerie", f"{values['variation_tresorerie']:,.0f} FCFA")
+
 def show_existing_analysis_warning():
     """Affiche un avertissement si une analyse existe déjà"""
     
@@ -548,46 +616,8 @@ def show_existing_analysis_warning():
 def validate_financial_data(data):
     """Valide la cohérence des données financières"""
     
-    errors = []
-    warnings = []
-    
-    # Vérifications obligatoires
-    if data.get('total_actif', 0) <= 0:
-        errors.append("Total actif invalide")
-    
-    if data.get('chiffre_affaires', 0) <= 0:
-        errors.append("Chiffre d'affaires invalide")
-    
-    # Vérifications de cohérence
-    total_passif = (
-        data.get('capitaux_propres', 0) + 
-        data.get('dettes_financieres', 0) + 
-        data.get('dettes_court_terme', 0) + 
-        data.get('tresorerie_passif', 0)
-    )
-    
-    if abs(data.get('total_actif', 0) - total_passif) > 1000:
-        errors.append("Bilan non équilibré (Actif ≠ Passif)")
-    
-    # Avertissements
-    if data.get('capitaux_propres', 0) <= 0:
-        warnings.append("Capitaux propres négatifs ou nuls")
-    
-    if data.get('resultat_net', 0) < 0:
-        warnings.append("Résultat net négatif")
-    
-    if data.get('tresorerie', 0) == 0 and data.get('tresorerie_passif', 0) > 0:
-        warnings.append("Découvert sans trésorerie positive")
-    
-    # Vérifications de vraisemblance
-    if data.get('chiffre_affaires', 0) > 0:
-        if data.get('charges_personnel', 0) > data.get('chiffre_affaires', 0):
-            warnings.append("Charges de personnel supérieures au CA")
-        
-        if data.get('charges_exploitation', 0) > data.get('chiffre_affaires', 0) * 1.2:
-            warnings.append("Charges d'exploitation très élevées par rapport au CA")
-    
-    return errors, warnings
+    # Règles communes à toutes les saisies (modules/core/validation.py)
+    return validate_record(data)
 
 def show_help_instructions():
     """Affiche les instructions d'aide"""
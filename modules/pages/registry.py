@@ -0,0 +1,103 @@
+"""
+Registre de pages importées à la demande
+
+Chaque page est déclarée par un ou plusieurs points d'entrée 'module:fonction', essayés
+dans l'ordre (le premier importable l'emporte). Aucun module de page n'est importé tant
+que la page n'est pas affichée : plotly, reportlab, pandas ou openpyxl ne sont chargés
+que par les pages qui en ont besoin.
+"""
+
+import importlib
+import importlib.util
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Durée du premier import de chaque point d'entrée (ms), partagée par tous les registres
+_import_timings: Dict[str, float] = {}
+_timings_lock = threading.Lock()
+
+
+def _split(target: str) -> Tuple[str, str]:
+    module_name, _, function_name = target.partition(':')
+    return module_name, function_name
+
+
+def import_timings() -> Dict[str, float]:
+    """Durée (ms) du premier import de chaque point d'entrée chargé dans ce processus"""
+    with _timings_lock:
+        return dict(_import_timings)
+
+
+class PageRegistry:
+    """Pages de l'application, chargées à la première visite"""
+
+    def __init__(self, package: Optional[str] = None):
+        self.package = package
+        self._entries: Dict[str, List[str]] = {}
+
+    def register(self, name: str, *targets: str):
+        """
+        Déclare une page
+
+        Args:
+            name (str): Identifiant de la page
+            targets: Points d'entrée 'module:fonction' par ordre de préférence
+                (module relatif au paquet du registre s'il commence par '.')
+        """
+        self._entries[name] = list(targets)
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def _find_spec(self, module_name: str):
+        try:
+            return importlib.util.find_spec(module_name, self.package)
+        except (ImportError, ValueError):
+            return None
+
+    def is_available(self, name: str) -> bool:
+        """Vérifie qu'un module de la page existe, sans l'importer"""
+        return any(self._find_spec(_split(target)[0]) is not None
+                   for target in self._entries.get(name, []))
+
+    def load(self, name: str) -> Optional[Callable]:
+        """
+        Importe la page et retourne sa fonction d'affichage
+
+        Returns:
+            callable: Premier point d'entrée importable, ou None si aucun ne l'est
+        """
+        for target in self._entries.get(name, []):
+            module_name, function_name = _split(target)
+            start = time.perf_counter()
+            try:
+                module = importlib.import_module(module_name, self.package)
+            except ImportError as e:
+                print(f"⚠️ Page '{name}': {target} indisponible ({e})")
+                continue
+            function = getattr(module, function_name, None)
+            if function is None:
+                continue
+            key = f"{module.__name__}:{function_name}"
+            with _timings_lock:
+                _import_timings.setdefault(key, round((time.perf_counter() - start) * 1000, 1))
+            return function
+        return None
+
+    def entry_point(self, name: str) -> Callable:
+        """Fonction d'affichage différée : la page n'est importée qu'à l'appel"""
+        def show_page(*args, **kwargs):
+            function = self.load(name)
+            if function is None:
+                raise ImportError(f"Page '{name}' non disponible")
+            return function(*args, **kwargs)
+        show_page.__name__ = f"show_{name}_page"
+        return show_page
+
+    def available_pages(self) -> Dict[str, Callable]:
+        """Pages dont un module existe, sous forme de fonctions d'affichage différées"""
+        return {name: self.entry_point(name) for name in self._entries if self.is_available(name)}
@@ -1,9 +1,9 @@
+from modules.core.validation import validate_record
+
 def validate_balance_sheet(data):
     """Valide l'équilibre du bilan"""
-    # Logique de validation
-    pass
+    return validate_record(data, categories=['bilan'])
 
 def validate_income_statement(data):
     """Valide la cohérence du compte de résultat"""
-    # Logique de validation  
-    pass
\ No newline at end of file
+    return validate_record(data, categories=['resultat'])
@@ -0,0 +1,7 @@
+"""
+OptimusCredit - moteur d'analyse financière BCEAO utilisable sans interface
+
+    python -m optimuscredit --help
+"""
+
+__version__ = '2.0.0'
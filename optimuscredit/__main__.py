@@ -0,0 +1,14 @@
+"""
+Point d'entrée : python -m optimuscredit
+"""
+
+import os
+import sys
+
+# Les modules du moteur (modules.core) sont à la racine du projet
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from optimuscredit.cli import main
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,354 @@
+"""
+Interface en ligne de commande du moteur d'analyse (sans Streamlit ni plotly)
+
+Usage :
+    python -m optimuscredit analyze etats_2024.xlsx --secteur commerce
+    python -m optimuscredit batch portefeuille/ --manifeste lot_T4.txt --sortie resultats.jsonl
+    python -m optimuscredit report portefeuille/ --format pdf --sortie rapports_T4.zip
+    python -m optimuscredit report portefeuille/ --format parquet --sortie entrepot/
+    python -m optimuscredit bench --lignes 5000
+    python -m optimuscredit serve --port 8502
+    python -m optimuscredit shard travail --racine /partage/notation_T4
+
+Seuls les modules de modules/core sont utilisés, et uniquement importés par la
+sous-commande qui en a besoin : l'aide et l'analyse des arguments restent instantanées.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from optimuscredit import __version__
+
+REPORT_FORMATS = ('pdf', 'xlsx', 'parquet')
+REPORT_TYPES = ('synthese', 'detaille')
+
+# Analyses en cours par processus (borne la mémoire des résultats non encore écrits)
+IN_FLIGHT_PER_WORKER = 4
+
+SAMPLE_PATH = Path(__file__).parent.parent / 'assets' / 'sample_data.json'
+
+Analysis = Tuple[str, Optional[Dict[str, Any]], Optional[str]]
+
+
+def _json(value: Any, indent: Optional[int] = None) -> str:
+    return json.dumps(value, ensure_ascii=False, indent=indent, default=str)
+
+
+def read_manifest(path: str) -> List[str]:
+    """Chemins listés dans un manifeste (un par ligne, relatifs au manifeste, '#' = commentaire)"""
+    base = Path(path).parent
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                entries.append(str(base / line))
+    return entries
+
+
+def collect(entries: Iterable[str], manifest: Optional[str] = None) -> List[Path]:
+    """Entrées d'un lot : fichiers et répertoires donnés, puis ceux du manifeste"""
+    from modules.core.batch_reports import collect_inputs
+
+    entries = list(entries) + (read_manifest(manifest) if manifest else [])
+    return collect_inputs(entries)
+
+
+def analyse_path(path: str, secteur: Optional[str] = None) -> Analysis:
+    """Analyse d'un fichier (exécutée dans un processus du lot)"""
+    from modules.core.batch_reports import load_analysis
+
+    try:
+        return path, load_analysis(Path(path), secteur), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def analyse_all(paths: List[Path], secteur: Optional[str] = None, workers: int = 1) -> Iterator[Analysis]:
+    """Analyses d'un lot, dans l'ordre des entrées (pool de processus à fenêtre bornée)"""
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield analyse_path(str(path), secteur)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque = deque()
+        for path in paths:
+            pending.append(executor.submit(analyse_path, str(path), secteur))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _workers(value: Optional[int]) -> int:
+    if value is None:
+        return 1
+    return value if value > 0 else (os.cpu_count() or 1)
+
+
+def _summary(result: Dict[str, Any]) -> str:
+    """Résumé lisible d'une analyse"""
+    from modules.core.recommendations import PRIORITES
+    from modules.core.scoring import financial_class, score_interpretation
+
+    scores = result['scores']
+    score = scores.get('global', 0)
+    lines = [
+        f"Score global : {score}/100 - classe {financial_class(score)} ({score_interpretation(score)[0]})",
+        "Scores : " + ", ".join(f"{categorie} {value}" for categorie, value in scores.items() if categorie != 'global'),
+    ]
+    for rec in result.get('recommendations', []):
+        pastille = PRIORITES.get(rec.get('priorite'), {}).get('pastille', '•')
+        lines.append(f"{pastille} [{rec.get('categorie', '')}] {rec.get('probleme', '')}")
+    return "\n".join(lines)
+
+
+def cmd_analyze(args) -> int:
+    """Analyse d'un seul fichier"""
+    path, result, error = analyse_path(args.fichier, args.secteur)
+    if error:
+        print(f"❌ {Path(path).name} : {error}", file=sys.stderr)
+        return 1
+
+    text = _json(result, indent=2) if args.format == 'json' else _summary(result)
+    if args.sortie:
+        Path(args.sortie).write_text(text + "\n", encoding='utf-8')
+        print(f"✅ Analyse écrite dans {args.sortie}", file=sys.stderr)
+    else:
+        print(text, file=args.stdout)
+    return 0
+
+
+def cmd_batch(args) -> int:
+    """Analyse d'un lot : une ligne JSON par fichier"""
+    paths = collect(args.entrees, args.manifeste)
+    if not paths:
+        print("❌ Aucun fichier à analyser", file=sys.stderr)
+        return 1
+
+    output = open(args.sortie, 'w', encoding='utf-8') if args.sortie and args.sortie != '-' else args.stdout
+    errors = 0
+    start = time.perf_counter()
+    try:
+        for path, result, error in analyse_all(paths, args.secteur, _workers(args.processus)):
+            if error:
+                errors += 1
+                line = {'fichier': path, 'erreur': error}
+            else:
+                line = {'fichier': path, **result}
+            output.write(_json(line) + "\n")
+    finally:
+        if output is not args.stdout:
+            output.close()
+
+    print(f"✅ {len(paths) - errors}/{len(paths)} analyse(s) en {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def _report_pdf(args, paths: List[Path]) -> int:
+    from modules.core.batch_reports import render_batch, render_one
+
+    # Un seul fichier vers un .pdf : pas d'archive ni de pool
+    if len(paths) == 1 and args.sortie.lower().endswith('.pdf'):
+        _, pdf, pages, error = render_one(str(paths[0]), args.type, args.secteur)
+        if error:
+            print(f"❌ {paths[0].name} : {error}", file=sys.stderr)
+            return 1
+        Path(args.sortie).write_bytes(pdf)
+        print(f"✅ {pages} page(s) -> {args.sortie}", file=sys.stderr)
+        return 0
+
+    stats = render_batch([str(path) for path in paths], args.sortie, report_type=args.type,
+                         secteur=args.secteur, workers=_workers(args.processus))
+    for error in stats['erreurs']:
+        print(f"❌ {Path(error['fichier']).name} : {error['erreur']}", file=sys.stderr)
+    print(f"✅ {stats['rapports']} rapport(s), {stats['pages']} page(s) en {stats['duree_s']} s -> {stats['sortie']}",
+          file=sys.stderr)
+    return 1 if stats['erreurs'] else 0
+
+
+def _successful(analyses: Iterable[Analysis], errors: List[str]) -> Iterator[Dict[str, Any]]:
+    for path, result, error in analyses:
+        if error:
+            errors.append(path)
+            print(f"❌ {Path(path).name} : {error}", file=sys.stderr)
+        else:
+            yield result
+
+
+def cmd_report(args) -> int:
+    """Rapports PDF, classeur Excel du lot ou entrepôt Parquet"""
+    paths = collect(args.entrees, args.manifeste)
+    if not paths:
+        print("❌ Aucun fichier à traiter", file=sys.stderr)
+        return 1
+    if args.format == 'pdf':
+        return _report_pdf(args, paths)
+
+    errors: List[str] = []
+    results = _successful(analyse_all(paths, args.secteur, _workers(args.processus)), errors)
+
+    if args.format == 'parquet':
+        from modules.core.parquet_store import write_analyses
+
+        stats = write_analyses(results, args.sortie)
+        print(f"✅ {stats['analyses']} analyse(s) -> {args.sortie}", file=sys.stderr)
+    else:
+        from modules.core.history import history_row
+        from modules.core.portfolio_export import analysis_columns, export_portfolio
+
+        # Colonnes fixées par le schéma des ratios et des scores : les lignes sont écrites en flux
+        def rows():
+            for result in results:
+                row = history_row(result)
+                if row is None:
+                    name = result['metadata'].get('fichier_nom', 'analyse')
+                    errors.append(name)
+                    print(f"❌ {name} : entreprise ou exercice non renseigné, analyse non exportée", file=sys.stderr)
+                else:
+                    yield row
+
+        stats = export_portfolio(rows(), args.sortie, *analysis_columns())
+        print(f"✅ {stats['entreprises_exercices']} ligne(s) -> {args.sortie}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def _synthetic_lines(count: int, seed: int = 0) -> List[str]:
+    """États financiers d'exemple (assets/sample_data.json) avec des montants perturbés"""
+    from modules.core.jsonl_pipeline import flatten_sample
+
+    with open(SAMPLE_PATH, encoding='utf-8') as f:
+        base = flatten_sample(json.load(f))
+    rng = random.Random(seed)
+    return [
+        _json({'entreprise': f"E{index:06d}",
+               'data': {name: value * rng.uniform(0.5, 1.5) for name, value in base.items()}}) + "\n"
+        for index in range(count)
+    ]
+
+
+def cmd_bench(args) -> int:
+    """Mesures de débit du moteur (analyse unitaire, flux par micro-lots, rendu PDF)"""
+    results: Dict[str, Any] = {'version': __version__}
+
+    start = time.perf_counter()
+    from modules.core.analysis_worker import run_data_analysis
+    from modules.core.jsonl_pipeline import run_pipeline
+    from modules.core.pdf_reports import build_detailed_report_pdf
+    results['import_moteur_s'] = round(time.perf_counter() - start, 3)
+
+    lines = _synthetic_lines(args.lignes)
+    statements = [json.loads(line)['data'] for line in lines[:args.unitaires]]
+
+    start = time.perf_counter()
+    analyses = [run_data_analysis(data, None) for data in statements]
+    duration = time.perf_counter() - start
+    results['analyse_unitaire_ms'] = round(duration / max(1, len(analyses)) * 1000, 3)
+
+    stats = run_pipeline(lines, io.StringIO(), batch_size=args.lot, workers=_workers(args.processus))
+    results['flux_lignes_par_seconde'] = stats['lignes_par_seconde']
+
+    start = time.perf_counter()
+    for analysis in analyses[:args.rapports]:
+        build_detailed_report_pdf(analysis['data'], analysis['ratios'], analysis['scores'], {'secteur': ''})
+    duration = time.perf_counter() - start
+    results['rapports_pdf_par_seconde'] = round(min(args.rapports, len(analyses)) / duration, 2) if duration > 0 else None
+
+    print(_json(results, indent=2), file=args.stdout)
+    return 0
+
+
+def cmd_serve(args) -> int:
+    """Service HTTP local de notation"""
+    from modules.core.scoring_service import serve
+
+    serve(args.hote, args.port, _workers(args.processus), args.fenetre_ms)
+    return 0
+
+
+def cmd_shard(args) -> int:
+    """Traitement par shards sur un répertoire partagé (voir modules/core/shard_queue.py)"""
+    from modules.core.shard_queue import main as shard_main
+
+    with redirect_stdout(args.stdout):
+        return shard_main(args.arguments)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='optimuscredit',
+                                     description="Analyse financière BCEAO en ligne de commande")
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest='commande', required=True)
+
+    analyze = commands.add_parser('analyze', help="Analyse d'un fichier (classeur Excel ou JSON)")
+    analyze.add_argument('fichier', help="Classeur Excel, états financiers ou résultat d'analyse JSON")
+    analyze.add_argument('--secteur', default=None, help="Secteur d'activité")
+    analyze.add_argument('--format', default='texte', choices=('texte', 'json'), help="Format de sortie")
+    analyze.add_argument('--sortie', default=None, help="Fichier de sortie (défaut : sortie standard)")
+    analyze.set_defaults(func=cmd_analyze)
+
+    batch = commands.add_parser('batch', help="Analyse d'un lot (répertoires, fichiers, manifeste) en JSON Lines")
+    batch.add_argument('entrees', nargs='*', help="Fichiers ou répertoires")
+    batch.add_argument('--manifeste', default=None, help="Liste de fichiers (un chemin par ligne)")
+    batch.add_argument('--secteur', default=None, help="Secteur appliqué aux classeurs Excel")
+    batch.add_argument('--sortie', default='-', help="Fichier JSON Lines (défaut : sortie standard)")
+    batch.add_argument('--processus', type=int, default=None, help="Nombre de processus (0 = nombre de cœurs)")
+    batch.set_defaults(func=cmd_batch)
+
+    report = commands.add_parser('report', help="Rapports PDF, classeur Excel ou entrepôt Parquet")
+    report.add_argument('entrees', nargs='*', help="Fichiers ou répertoires")
+    report.add_argument('--manifeste', default=None, help="Liste de fichiers (un chemin par ligne)")
+    report.add_argument('--format', default='pdf', choices=REPORT_FORMATS, help="Format du rapport")
+    report.add_argument('--type', default='detaille', choices=REPORT_TYPES, help="Type de rapport PDF")
+    report.add_argument('--secteur', default=None, help="Secteur appliqué aux classeurs Excel")
+    report.add_argument('--sortie', required=True,
+                        help="Fichier .pdf, archive .zip ou répertoire (pdf), .xlsx (xlsx), répertoire (parquet)")
+    report.add_argument('--processus', type=int, default=None, help="Nombre de processus (0 = nombre de cœurs)")
+    report.set_defaults(func=cmd_report)
+
+    bench = commands.add_parser('bench', help="Mesures de débit du moteur")
+    bench.add_argument('--lignes', type=int, default=2000, help="États financiers du flux JSON Lines")
+    bench.add_argument('--unitaires', type=int, default=200, help="Analyses unitaires mesurées")
+    bench.add_argument('--rapports', type=int, default=5, help="Rapports PDF rendus")
+    bench.add_argument('--lot', type=int, default=1000, help="Lignes par micro-lot")
+    bench.add_argument('--processus', type=int, default=None, help="Nombre de processus (0 = nombre de cœurs)")
+    bench.set_defaults(func=cmd_bench)
+
+    service = commands.add_parser('serve', help="Service HTTP local de notation")
+    service.add_argument('--hote', default='127.0.0.1', help="Adresse d'écoute")
+    service.add_argument('--port', type=int, default=8502, help="Port d'écoute")
+    service.add_argument('--processus', type=int, default=None, help="Processus de calcul (0 = nombre de cœurs)")
+    service.add_argument('--fenetre-ms', type=float, default=1.0, help="Fenêtre de regroupement des requêtes")
+    service.set_defaults(func=cmd_serve)
+
+    shard = commands.add_parser('shard', add_help=False,
+                                help="Lot réparti par shards : plan, travail, reprise, fusion, etat")
+    shard.add_argument('arguments', nargs=argparse.REMAINDER)
+    shard.set_defaults(func=cmd_shard)
+    return parser
+
+
+def main(argv=None) -> int:
+    """Point d'entrée de python -m optimuscredit"""
+    parser = build_parser()
+    args, unknown = parser.parse_known_args(argv)
+    if unknown:
+        if args.commande != 'shard':
+            parser.error(f"arguments non reconnus : {' '.join(unknown)}")
+        # Options placées avant la sous-commande de shard_queue (--help, --racine...)
+        args.arguments = unknown + args.arguments
+    # Seuls les résultats vont sur la sortie standard (les messages du moteur vont sur stderr)
+    args.stdout = sys.stdout
+    with redirect_stdout(sys.stderr):
+        return args.func(args)
@@ -10,6 +10,8 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
 
+from modules.core.recommendations import recommend, PRIORITES
+
 # Import du gestionnaire de session
 try:
     from session_manager import SessionManager
@@ -574,6 +576,12 @@ def create_performance_radar(scores):
     
     st.subheader("🎯 Radar de Performance BCEAO")
     
+    fig = SessionManager.get_cached_figure('pages_radar_performance', lambda: build_performance_radar(scores))
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_performance_radar(scores):
+    """Construit le radar de performance"""
+    
     categories = ['Liquidité', 'Solvabilité', 'Rentabilité', 'Activité', 'Gestion']
     values = [
         scores.get('liquidite', 0) / 40 * 100,
@@ -619,7 +627,7 @@ def create_performance_radar(scores):
         height=500
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def create_sig_waterfall(data):
     """Crée le graphique waterfall des soldes intermédiaires"""
@@ -630,6 +638,12 @@ def create_sig_waterfall(data):
         st.info("Données insuffisantes pour créer le graphique waterfall")
         return
     
+    fig = SessionManager.get_cached_figure('pages_soldes_intermediaires', lambda: build_sig_chart(data))
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_sig_chart(data):
+    """Construit le graphique des soldes intermédiaires"""
+    
     # Graphique en barres simple si waterfall complexe
     categories = ['CA', 'Valeur Ajoutée', 'EBE', 'Résultat Exploitation', 'Résultat Net']
     values = [
@@ -657,13 +671,19 @@ def create_sig_waterfall(data):
         height=400
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def create_ratios_comparison_chart(ratios):
     """Crée le graphique de comparaison avec les normes"""
     
     st.subheader("📈 Vos Ratios vs Normes BCEAO")
     
+    fig = SessionManager.get_cached_figure('pages_ratios_normes', lambda: build_ratios_comparison_chart(ratios))
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_ratios_comparison_chart(ratios):
+    """Construit le graphique de comparaison avec les normes"""
+    
     # Ratios clés avec leurs normes
     ratios_comparison = [
         ('Liquidité Générale', ratios.get('ratio_liquidite_generale', 0), 1.5),
@@ -703,7 +723,7 @@ def create_ratios_comparison_chart(ratios):
         height=400
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def display_detailed_recommendations(data, ratios, scores):
     """Affiche les recommandations détaillées"""
@@ -757,126 +777,17 @@ def display_recommendation_card(rec):
 def generate_detailed_recommendations(data, ratios, scores):
     """Génère des recommandations détaillées basées sur l'analyse"""
     
-    recommendations = []
-    
-    # Recommandations de liquidité
-    if scores.get('liquidite', 0) < 25:
-        if ratios.get('ratio_liquidite_generale', 0) < 1.2:
-            recommendations.append({
-                'priority': 'urgent',
-                'title': '💧 Améliorer la Liquidité Immédiatement',
-                'problem': f"Ratio de liquidité critique ({ratios.get('ratio_liquidite_generale', 0):.2f})",
-                'impact': 'Risque de défaillance à court terme et difficultés de paiement',
-                'actions': [
-                    'Négocier des délais de paiement avec les fournisseurs (30-60 jours)',
-                    'Accélérer le recouvrement des créances clients (relances, escompte)',
-                    'Réduire les stocks non essentiels et obsolètes',
-                    'Négocier une ligne de crédit court terme d\'urgence',
-                    'Reporter tous les investissements non critiques'
-                ],
-                'kpi': [
-                    'Ratio de liquidité générale > 1.5',
-                    'Délai de recouvrement < 45 jours',
-                    'Rotation des stocks > 6',
-                    'Trésorerie nette positive'
-                ]
-            })
-    
-    # Recommandations de solvabilité
-    if scores.get('solvabilite', 0) < 25:
-        if ratios.get('ratio_autonomie_financiere', 0) < 25:
-            recommendations.append({
-                'priority': 'important',
-                'title': '🏛️ Renforcer la Structure Financière',
-                'problem': f"Autonomie financière insuffisante ({ratios.get('ratio_autonomie_financiere', 0):.1f}%)",
-                'impact': 'Structure financière déséquilibrée, dépendance excessive aux dettes',
-                'actions': [
-                    'Préparer une augmentation de capital avec les associés',
-                    'Renégocier les conditions des dettes financières (taux, échéances)',
-                    'Mettre en réserve tous les bénéfices futurs',
-                    'Rechercher des subventions ou aides publiques',
-                    'Envisager l\'entrée d\'un investisseur stratégique',
-                    'Convertir une partie des dettes en capital si possible'
-                ],
-                'kpi': [
-                    'Ratio d\'autonomie financière > 30%',
-                    'Ratio d\'endettement < 65%',
-                    'Capacité de remboursement < 5 ans',
-                    'Couverture des charges financières > 3'
-                ]
-            })
-    
-    # Recommandations de rentabilité
-    if scores.get('rentabilite', 0) < 15:
-        if ratios.get('marge_nette', 0) < 3:
-            recommendations.append({
-                'priority': 'improvement',
-                'title': '📈 Optimiser la Rentabilité',
-                'problem': f"Marge nette insuffisante ({ratios.get('marge_nette', 0):.1f}%)",
-                'impact': 'Capacité d\'autofinancement limitée, développement compromis',
-                'actions': [
-                    'Analyser la structure des coûts par produit/service',
-                    'Revoir la politique de prix (étude de marché)',
-                    'Optimiser les coûts opérationnels (négociation fournisseurs)',
-                    'Améliorer la productivité (formation, outils)',
-                    'Développer les produits/services à forte marge',
-                    'Externaliser les activités non rentables'
-                ],
-                'kpi': [
-                    'Marge nette > 5%',
-                    'ROE > 10%',
-                    'Marge d\'exploitation > 5%',
-                    'Coefficient d\'exploitation < 65%'
-                ]
-            })
-    
-    # Recommandations d'activité
-    if scores.get('activite', 0) < 8:
-        if ratios.get('rotation_stocks', 0) < 4:
-            recommendations.append({
-                'priority': 'improvement',
-                'title': '⚡ Améliorer l\'Efficacité Opérationnelle',
-                'problem': f"Rotation des stocks lente ({ratios.get('rotation_stocks', 0):.1f})",
-                'impact': 'Immobilisation excessive de fonds de roulement',
-                'actions': [
-                    'Analyser les stocks dormants et obsolètes',
-                    'Améliorer la prévision de la demande',
-                    'Négocier des approvisionnements en flux tendu',
-                    'Diversifier les fournisseurs pour réduire les stocks de sécurité',
-                    'Mettre en place un système de gestion des stocks (FIFO, ABC)'
-                ],
-                'kpi': [
-                    'Rotation des stocks > 6',
-                    'Durée d\'écoulement < 60 jours',
-                    'Taux de rupture < 5%',
-                    'BFR en jours de CA < 60'
-                ]
-            })
-    
-    # Recommandations de gestion
-    if scores.get('gestion', 0) < 8:
-        if ratios.get('taux_charges_personnel', 0) > 60:
-            recommendations.append({
-                'priority': 'improvement',
-                'title': '🔧 Optimiser la Gestion',
-                'problem': f"Charges de personnel élevées ({ratios.get('taux_charges_personnel', 0):.1f}% de la VA)",
-                'impact': 'Productivité insuffisante, rigidité de la structure',
-                'actions': [
-                    'Analyser la productivité par service/collaborateur',
-                    'Former le personnel aux nouvelles technologies',
-                    'Optimiser l\'organisation du travail',
-                    'Développer la polyvalence des équipes',
-                    'Automatiser les tâches répétitives'
-                ],
-                'kpi': [
-                    'Charges personnel / VA < 50%',
-                    'Productivité personnel > 2.0',
-                    'CA par employé en progression',
-                    'CAFG / CA > 7%'
-                ]
-            })
-    
-    return recommendations
+    return [
+        {
+            'priority': PRIORITES[rec['priorite']]['code'],
+            'title': f"{rec['icone']} {rec['titre']}",
+            'problem': rec['probleme'],
+            'impact': rec['impact'],
+            'actions': rec['actions'],
+            'kpi': rec['indicateurs']
+        }
+        for rec in recommend(ratios, scores)
+    ]
 
 # Fonctions utilitaires
 
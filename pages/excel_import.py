@@ -189,14 +189,14 @@ def analyze_uploaded_file(file_content, filename, secteur):
             
             # Importer l'analyseur
             try:
-                from modules.core.analyzer import FinancialAnalyzer
+                from modules.core.analyzer import get_financial_analyzer
             except ImportError as e:
-                st.error(f"❌ Impossible d'importer FinancialAnalyzer: {e}")
+                st.error(f"❌ Impossible d'importer l'analyseur: {e}")
                 st.session_state['analysis_in_progress'] = False
                 return
             
             # Créer l'analyseur et analyser
-            analyzer = FinancialAnalyzer()
+            analyzer = get_financial_analyzer()
             data = analyzer.load_excel_template(temp_file_path)
             
             if data is None:
@@ -6,6 +6,8 @@ Version complète avec validation et analyse intégrée
 import streamlit as st
 from datetime import datetime
 
+from modules.core.validation import validate_record
+
 # Import du gestionnaire de session centralisé
 try:
     from session_manager import SessionManager, store_analysis
@@ -387,10 +389,10 @@ def show_manual_input_page():
             with st.spinner("📊 Analyse en cours..."):
                 try:
                     # Importer l'analyseur
-                    from modules.core.analyzer import FinancialAnalyzer
+                    from modules.core.analyzer import get_financial_analyzer
                     
                     # Créer l'analyseur
-                    analyzer = FinancialAnalyzer()
+                    analyzer = get_financial_analyzer()
                     
                     # Calculer les ratios
                     ratios = analyzer.calculate_ratios(data)
@@ -476,42 +478,5 @@ def show_manual_input_page():
 def validate_financial_data(data):
     """Valide la cohérence des données financières"""
     
-    errors = []
-    warnings = []
-    
-    # Vérifications obligatoires
-    if data.get('total_actif', 0) <= 0:
-        errors.append("Total actif invalide")
-    
-    if data.get('chiffre_affaires', 0) <= 0:
-        errors.append("Chiffre d'affaires invalide")
-    
-    # Vérifications de cohérence
-    total_passif = (
-        data.get('capitaux_propres', 0) + 
-        data.get('dettes_financieres', 0) + 
-        data.get('dettes_court_terme', 0) + 
-        data.get('tresorerie_passif', 0)
-    )
-    
-    if abs(data.get('total_actif', 0) - total_passif) > 1000:
-        errors.append("Bilan non équilibré")
-    
-    # Avertissements
-    if data.get('capitaux_propres', 0) <= 0:
-        warnings.append("Capitaux propres négatifs")
-    
-    if data.get('resultat_net', 0) < 0:
-        warnings.append("Résultat net négatif")
-    
-    # Vérifications de cohérence avancées
-    if data.get('immobilisations_nettes', 0) > data.get('total_actif', 0) * 0.8:
-        warnings.append("Immobilisations représentent plus de 80% de l'actif")
-    
-    if data.get('dettes_financieres', 0) > data.get('capitaux_propres', 0) * 2:
-        warnings.append("Endettement financier très élevé")
-    
-    if data.get('charges_personnel', 0) > data.get('chiffre_affaires', 0) * 0.7:
-        warnings.append("Charges de personnel représentent plus de 70% du CA")
-    
-    return errors, warnings
\ No newline at end of file
+    # Règles communes à toutes les saisies (modules/core/validation.py)
+    return validate_record(data)
@@ -8,11 +8,24 @@ import streamlit as st
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple
 
+from modules.core.norms import get_norms_version
+from modules.core.analysis_result import AnalysisResult, LEGACY_VIEWS
+from modules.core.analysis_store import get_analysis_store
+from modules.core.session_memory import SessionMemoryAccountant
+from modules.components.statement_forms import STATEMENT_PREFIX
+# Historique et comparaison (pandas) importés à la première utilisation : démarrage à froid plus court
+
 class SessionManager:
     """Gestionnaire centralisé pour l'état de session de l'application"""
     
     # Clés standardisées pour l'état de session
     ANALYSIS_RESULTS = 'analysis_results'
+    ANALYSIS_HANDLE = 'analysis_id'
+    ANALYSIS_QUERY_PARAM = 'analyse'
+    WORKSPACE = 'analysis_workspace'
+    OWNED_HANDLES = 'analysis_owned_handles'
+    ANALYSIS_JOB = 'analysis_job'
+    MAX_WORKSPACE_ANALYSES = 10
     CURRENT_PAGE = 'current_page'
     RESET_COUNTER = 'reset_counter'
     
@@ -25,14 +38,35 @@ class SessionManager:
         if SessionManager.RESET_COUNTER not in st.session_state:
             st.session_state[SessionManager.RESET_COUNTER] = 0
     
+    @staticmethod
+    def get_analysis_handle() -> Optional[str]:
+        """Identifiant de l'analyse de la session (rétabli depuis l'URL après reconnexion)"""
+        handle = st.session_state.get(SessionManager.ANALYSIS_HANDLE)
+        if handle:
+            return handle
+        
+        try:
+            handle = st.query_params.get(SessionManager.ANALYSIS_QUERY_PARAM)
+        except Exception:
+            handle = None
+        if handle and get_analysis_store().get(handle) is not None:
+            st.session_state[SessionManager.ANALYSIS_HANDLE] = handle
+            SessionManager._add_to_workspace(handle)
+            return handle
+        return None
+    
+    @staticmethod
+    def _current_result() -> Optional[AnalysisResult]:
+        """Résultat désigné par l'identifiant de la session, lu dans le stockage partagé"""
+        return get_analysis_store().get(SessionManager.get_analysis_handle())
+    
     @staticmethod
     def has_analysis_data() -> bool:
         """Vérifie si des données d'analyse valides existent"""
-        if SessionManager.ANALYSIS_RESULTS not in st.session_state:
+        analysis_results = SessionManager._current_result()
+        if analysis_results is None:
             return False
         
-        analysis_results = st.session_state[SessionManager.ANALYSIS_RESULTS]
-        
         # Vérifier la structure complète
         required_keys = ['data', 'ratios', 'scores', 'metadata']
         if not all(key in analysis_results for key in required_keys):
@@ -56,24 +90,34 @@ class SessionManager:
         if not SessionManager.has_analysis_data():
             return 0, {}
         
-        analysis_results = st.session_state[SessionManager.ANALYSIS_RESULTS]
+        analysis_results = SessionManager._current_result()
         score = analysis_results['scores'].get('global', 0)
         metadata = analysis_results.get('metadata', {})
         
         return score, metadata
     
     @staticmethod
-    def get_analysis_data() -> Optional[Dict[str, Any]]:
-        """Récupère toutes les données d'analyse"""
+    def get_analysis_data() -> Optional[AnalysisResult]:
+        """Récupère toutes les données d'analyse (résultat immuable)"""
         if not SessionManager.has_analysis_data():
             return None
         
-        return st.session_state[SessionManager.ANALYSIS_RESULTS]
+        return SessionManager._current_result()
+    
+    @staticmethod
+    def get_legacy_value(key: str, default: Any = None) -> Any:
+        """Résout une ancienne clé de session ('analysis_data', 'analysis_scores', ...) à la demande"""
+        analysis_results = SessionManager._current_result()
+        if analysis_results is None:
+            return default
+        return analysis_results.legacy(key, default)
     
     @staticmethod
     def store_analysis_results(data: Dict[str, Any], ratios: Dict[str, Any], 
-                             scores: Dict[str, Any], metadata: Dict[str, Any]):
-        """Stocke les résultats d'analyse de manière unifiée avec COMPATIBILITÉ BACKWARD"""
+                             scores: Dict[str, Any], metadata: Dict[str, Any]) -> str:
+        """Stocke les résultats d'analyse une seule fois, sous forme de résultat immuable ; retourne l'identifiant"""
+        
+        metadata = dict(metadata)
         
         # Ajouter timestamp si pas présent
         if 'date_analyse' not in metadata:
@@ -82,67 +126,224 @@ class SessionManager:
         # Ajouter compteur de ratios
         metadata['ratios_count'] = len(ratios)
         
-        # Structure unifiée
-        analysis_results = {
-            'data': data,
-            'ratios': ratios,
-            'scores': scores,
-            'metadata': metadata,
-            'version': '2.1.0',  # Version pour compatibilité future
-            'timestamp': datetime.now().isoformat()
-        }
+        # Version des normes ayant produit le score
+        if 'norms_version' not in metadata:
+            metadata['norms_version'] = get_norms_version()
         
-        # Nettoyer d'abord toutes les anciennes données
-        SessionManager.clear_analysis_data()
+        # Structure unifiée (les anciennes clés sont résolues via get_legacy_value)
+        analysis_results = AnalysisResult(data, ratios, scores, metadata)
+        
+        # Nettoyer l'état d'interface ; les analyses précédentes restent dans l'espace de travail
+        SessionManager._clear_interface_state()
         
-        # Stocker la nouvelle analyse
-        st.session_state[SessionManager.ANALYSIS_RESULTS] = analysis_results
+        # Stocker la nouvelle analyse dans le stockage partagé ; la session ne garde que l'identifiant
+        handle = get_analysis_store().put(analysis_results)
+        SessionManager._own(handle)
+        SessionManager._add_to_workspace(handle)
+        SessionManager._set_handle(handle)
         
-        # 🔧 CORRECTION CRITIQUE : Maintenir les variables legacy pour compatibilité
-        # avec d'éventuelles autres pages qui les utilisent encore
-        st.session_state['analysis_data'] = data
-        st.session_state['analysis_ratios'] = ratios
-        st.session_state['analysis_scores'] = scores
-        st.session_state['analysis_secteur'] = metadata.get('secteur', '')
-        st.session_state['analysis_done'] = True
-        st.session_state['analysis_date'] = metadata.get('date_analyse', '')
+        # Historique persistant (une ligne par entreprise-exercice)
+        try:
+            from modules.core.history import get_analysis_history
+            if not get_analysis_history().record(analysis_results):
+                print("ℹ️ Analyse non historisée (entreprise ou exercice non renseigné)")
+        except Exception as e:
+            print(f"⚠️ Historique non mis à jour: {e}")
         
         # 🔧 NOUVEAU : Variables d'état pour contrôler l'affichage
         st.session_state['analysis_completed'] = True
         st.session_state['analysis_running'] = False
         st.session_state['analysis_just_completed'] = True
+        return handle
+    
+    @staticmethod
+    def reuse_stored_analysis(analysis_id: str, identity: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Ouvre dans la session une analyse déjà calculée (doublon d'un import)
+        
+        La session reçoit son propre identifiant, un alias du même résultat (stocké une
+        seule fois) : retirer l'analyse de son espace de travail ne la retire pas à
+        l'analyste d'origine.
+        
+        Args:
+            identity: 'entreprise' et 'exercice' saisis ; l'analyse n'est reprise que si
+                elle porte les mêmes (sinon elle serait historisée sous une autre clé)
+        
+        Returns:
+            str: Identifiant dans la session, None si l'analyse a quitté le stockage
+            ou ne correspond pas à l'identité saisie
+        """
+        store = get_analysis_store()
+        result = store.get(analysis_id)
+        if result is None:
+            return None
+        if any(result.metadata.get(key) != value for key, value in (identity or {}).items()):
+            return None
+        
+        handle = store.alias(analysis_id)
+        if handle is None:
+            return None
+        
+        SessionManager._clear_interface_state()
+        SessionManager._own(handle)
+        SessionManager._add_to_workspace(handle)
+        SessionManager._set_handle(handle)
+        
+        st.session_state['analysis_completed'] = True
+        st.session_state['analysis_running'] = False
+        st.session_state['analysis_just_completed'] = True
+        return handle
+    
+    @staticmethod
+    def _set_handle(handle: str):
+        """Mémorise l'identifiant dans la session et dans l'URL (reprise après reconnexion)"""
+        st.session_state[SessionManager.ANALYSIS_HANDLE] = handle
+        try:
+            st.query_params[SessionManager.ANALYSIS_QUERY_PARAM] = handle
+        except Exception as e:
+            st.session_state['query_params_error'] = str(e)
+    
+    @staticmethod
+    def _own(handle: str):
+        """Marque une analyse comme créée par la session (seule à pouvoir la supprimer du stockage)"""
+        st.session_state.setdefault(SessionManager.OWNED_HANDLES, set()).add(handle)
+    
+    @staticmethod
+    def _release(handle: str):
+        """
+        Libère une analyse retirée de l'espace de travail
+        
+        Seule la session qui l'a créée la supprime du stockage partagé ; une analyse
+        ouverte depuis un lien (?analyse=) reste disponible pour les autres sessions.
+        """
+        owned = st.session_state.get(SessionManager.OWNED_HANDLES, set())
+        if handle in owned:
+            owned.discard(handle)
+            get_analysis_store().discard(handle)
+    
+    @staticmethod
+    def _add_to_workspace(handle: str):
+        """Ajoute une analyse à l'espace de travail (les plus anciennes au-delà du maximum sont retirées)"""
+        workspace = [h for h in st.session_state.get(SessionManager.WORKSPACE, []) if h != handle]
+        workspace.append(handle)
+        
+        while len(workspace) > SessionManager.MAX_WORKSPACE_ANALYSES:
+            SessionManager._release(workspace.pop(0))
+        
+        st.session_state[SessionManager.WORKSPACE] = workspace
+    
+    @staticmethod
+    def get_workspace() -> Dict[str, AnalysisResult]:
+        """
+        Analyses de l'espace de travail de la session, de la plus ancienne à la plus récente
+        
+        Returns:
+            dict: identifiant -> résultat (les analyses évincées du stockage sont ignorées)
+        """
+        store = get_analysis_store()
+        workspace = {}
+        for handle in st.session_state.get(SessionManager.WORKSPACE, []):
+            result = store.get(handle)
+            if result is not None:
+                workspace[handle] = result
+        
+        if len(workspace) != len(st.session_state.get(SessionManager.WORKSPACE, [])):
+            st.session_state[SessionManager.WORKSPACE] = list(workspace)
+        return workspace
+    
+    @staticmethod
+    def get_workspace_labels() -> Dict[str, str]:
+        """Libellés uniques des analyses de l'espace de travail (identifiant -> libellé)"""
+        from modules.core.comparison import analysis_label
+        labels, seen = {}, {}
+        for handle, result in SessionManager.get_workspace().items():
+            label = analysis_label(result)
+            seen[label] = seen.get(label, 0) + 1
+            labels[handle] = label if seen[label] == 1 else f"{label} ({seen[label]})"
+        return labels
+    
+    @staticmethod
+    def compare_workspace() -> Dict[str, Any]:
+        """Compare les analyses de l'espace de travail à l'analyse active (sans recalcul)"""
+        from modules.core.comparison import compare_analyses
+        workspace = SessionManager.get_workspace()
+        labels = SessionManager.get_workspace_labels()
+        active = st.session_state.get(SessionManager.ANALYSIS_HANDLE)
+        return compare_analyses({labels[handle]: workspace[handle] for handle in labels},
+                                reference=labels.get(active))
+    
+    @staticmethod
+    def set_active_analysis(handle: str) -> bool:
+        """Rend active une analyse de l'espace de travail"""
+        if handle not in SessionManager.get_workspace():
+            return False
+        SessionManager._set_handle(handle)
+        return True
+    
+    @staticmethod
+    def remove_from_workspace(handle: str):
+        """Retire une analyse de l'espace de travail (et du stockage partagé si la session l'a créée)"""
+        workspace = [h for h in st.session_state.get(SessionManager.WORKSPACE, []) if h != handle]
+        st.session_state[SessionManager.WORKSPACE] = workspace
+        SessionManager._release(handle)
+        
+        if st.session_state.get(SessionManager.ANALYSIS_HANDLE) == handle:
+            if workspace:
+                SessionManager._set_handle(workspace[-1])
+            else:
+                SessionManager.clear_analysis_data()
     
     @staticmethod
     def ensure_backward_compatibility():
-        """Assure la compatibilité backward avec les anciennes variables"""
+        """
+        Assure la compatibilité backward avec les anciennes variables
         
-        # Si on a analysis_results mais pas les variables legacy, les créer
-        if (SessionManager.ANALYSIS_RESULTS in st.session_state and 
-            'analysis_data' not in st.session_state):
-            
-            analysis_results = st.session_state[SessionManager.ANALYSIS_RESULTS]
-            
-            # Recréer les variables legacy
-            st.session_state['analysis_data'] = analysis_results.get('data', {})
-            st.session_state['analysis_ratios'] = analysis_results.get('ratios', {})
-            st.session_state['analysis_scores'] = analysis_results.get('scores', {})
-            
-            metadata = analysis_results.get('metadata', {})
-            st.session_state['analysis_secteur'] = metadata.get('secteur', '')
-            st.session_state['analysis_done'] = True
-            st.session_state['analysis_date'] = metadata.get('date_analyse', '')
+        Une session d'une version précédente (résultat 'analysis_results' et copies
+        legacy) est transférée dans le stockage partagé ; seules les clés sont supprimées.
+        """
+        analysis_results = st.session_state.get(SessionManager.ANALYSIS_RESULTS)
+        
+        if analysis_results is not None:
+            handle = get_analysis_store().put(AnalysisResult.from_dict(analysis_results))
+            SessionManager._own(handle)
+            SessionManager._add_to_workspace(handle)
+            SessionManager._set_handle(handle)
+            del st.session_state[SessionManager.ANALYSIS_RESULTS]
             st.session_state['analysis_completed'] = True
             st.session_state['analysis_running'] = False
+        
+        for key in LEGACY_VIEWS:
+            if key in st.session_state:
+                del st.session_state[key]
     
     @staticmethod
     def clear_analysis_data():
-        """Nettoie toutes les données d'analyse"""
+        """
+        Nettoie les données de l'analyse active pour en saisir une nouvelle
+        
+        Les analyses déjà présentes restent dans l'espace de travail (comparaison) ;
+        reset_application les supprime toutes.
+        """
+        
+        # Détacher l'analyse active (session et URL)
+        try:
+            if SessionManager.ANALYSIS_QUERY_PARAM in st.query_params:
+                del st.query_params[SessionManager.ANALYSIS_QUERY_PARAM]
+        except Exception:
+            pass
+        
+        for key in (SessionManager.ANALYSIS_RESULTS, SessionManager.ANALYSIS_HANDLE):
+            if key in st.session_state:
+                del st.session_state[key]
+        
+        SessionManager._clear_interface_state()
+    
+    @staticmethod
+    def _clear_interface_state():
+        """Supprime les états d'interface et les données temporaires liés à l'analyse"""
         
         # Liste exhaustive de toutes les clés d'analyse possibles
         analysis_keys = [
-            # Structure principale
-            SessionManager.ANALYSIS_RESULTS,
-            
             # Variables legacy (compatibilité)
             'analysis_data', 'analysis_ratios', 'analysis_scores', 
             'analysis_secteur', 'analysis_done', 'analysis_date',
@@ -184,9 +385,20 @@ class SessionManager:
         # IMPORTANT: Sauvegarder l'ancien reset_counter pour l'incrémenter
         old_counter = st.session_state.get(SessionManager.RESET_COUNTER, 0)
         
-        # Nettoyer toutes les données d'analyse
+        # Nettoyer toutes les données d'analyse, espace de travail compris
+        for handle in st.session_state.get(SessionManager.WORKSPACE, []):
+            SessionManager._release(handle)
+        for key in (SessionManager.WORKSPACE, SessionManager.OWNED_HANDLES):
+            st.session_state.pop(key, None)
+        # Une analyse en arrière-plan éventuelle est abandonnée (le pool oubliera son résultat)
+        st.session_state.pop(SessionManager.ANALYSIS_JOB, None)
+        st.session_state.pop('analysis_error', None)
         SessionManager.clear_analysis_data()
         
+        # Valeurs validées des formulaires de saisie manuelle
+        for key in [key for key in st.session_state.keys() if str(key).startswith(STATEMENT_PREFIX)]:
+            del st.session_state[key]
+        
         # CORRECTION: Incrémenter le compteur de reset pour forcer la recréation des widgets
         st.session_state[SessionManager.RESET_COUNTER] = old_counter + 1
         
@@ -196,6 +408,116 @@ class SessionManager:
         # Retourner à la page d'import pour un nouveau fichier
         st.session_state[SessionManager.CURRENT_PAGE] = 'home'
     
+    @staticmethod
+    def get_company_history():
+        """Historique de l'entreprise de l'analyse courante (DataFrame, vide si inconnu)"""
+        from modules.core.history import get_analysis_history, history_row
+        analysis_results = SessionManager._current_result()
+        if analysis_results is None:
+            return None
+        row = history_row(analysis_results)
+        if row is None:
+            return None
+        try:
+            return get_analysis_history().company_history(row['entreprise'])
+        except Exception as e:
+            print(f"⚠️ Historique indisponible: {e}")
+            return None
+    
+    @staticmethod
+    def submit_excel_analysis(file_content: bytes, filename: str, secteur: str,
+                              source: str = 'excel_import',
+                              identity: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Soumet l'analyse d'un classeur au pool d'arrière-plan ; rend la main immédiatement
+        
+        Args:
+            identity: 'entreprise' et 'exercice' saisis avec le classeur (clé de l'historique)
+        
+        Raises:
+            QueueFullError: Trop d'analyses en cours sur le serveur
+        """
+        from modules.core.analysis_worker import get_analysis_workers
+        job_id = get_analysis_workers().submit(bytes(file_content), filename, secteur)
+        st.session_state[SessionManager.ANALYSIS_JOB] = {
+            'id': job_id, 'fichier_nom': filename, 'secteur': secteur, 'source': source,
+            'identite': dict(identity or {})
+        }
+        st.session_state['analysis_running'] = True
+        st.session_state.pop('analysis_error', None)
+        return job_id
+    
+    @staticmethod
+    def poll_analysis_job() -> Optional[Dict[str, Any]]:
+        """
+        État de l'analyse en arrière-plan de la session
+        
+        À la fin de la tâche, le résultat est stocké comme une analyse ordinaire ; en cas
+        d'échec, le message est conservé dans 'analysis_error'.
+        
+        Returns:
+            dict: État de la tâche ('statut', 'etape_libelle', 'progression'...), None si aucune
+        """
+        from modules.core.analysis_worker import get_analysis_workers, DONE, FAILED
+        job = st.session_state.get(SessionManager.ANALYSIS_JOB)
+        if not job:
+            return None
+        
+        workers = get_analysis_workers()
+        status = workers.status(job['id'])
+        if status is None:
+            status = {'statut': FAILED, 'erreur': "Analyse introuvable (serveur redémarré ?)"}
+        
+        if status['statut'] == DONE:
+            from modules.core.dedup_index import get_dedup_index
+            result = workers.pop_result(job['id'])
+            # Contenu déjà analysé : l'analyse existante est reprise telle quelle
+            identity = job.get('identite', {})
+            reused = result.get('analysis_id') and SessionManager.reuse_stored_analysis(result['analysis_id'],
+                                                                                      identity)
+            if reused:
+                status['doublon_de'] = result['analysis_id']
+            else:
+                metadata = {**identity, 'secteur': job['secteur'], 'fichier_nom': job['fichier_nom'],
+                            'source': job['source'], 'norms_version': result['norms_version']}
+                handle = SessionManager.store_analysis_results(result['data'], result['ratios'],
+                                                               result['scores'], metadata)
+                if result.get('dedup_key'):
+                    get_dedup_index().register(result['dedup_key'], handle)
+            status['scores'] = result['scores']
+            status['recommandations'] = len(result['recommendations'])
+        elif status['statut'] == FAILED:
+            workers.pop_result(job['id'])
+            st.session_state['analysis_error'] = status['erreur']
+            st.session_state['analysis_running'] = False
+        
+        if status['statut'] in (DONE, FAILED):
+            st.session_state.pop(SessionManager.ANALYSIS_JOB, None)
+        return status
+    
+    @staticmethod
+    def get_cached_figure(chart_type: str, build, options: Optional[Dict[str, Any]] = None):
+        """
+        Figure plotly de l'analyse active, relue depuis le cache partagé des figures
+        
+        Args:
+            chart_type (str): Type de graphique, unique par fonction de construction
+            build (callable): Construit la figure si elle n'est pas en cache
+            options (dict): Paramètres qui modifient la figure (référence, filtres...)
+        """
+        from modules.components.figure_cache import get_figure_cache
+        return get_figure_cache().figure(SessionManager.get_analysis_handle(), chart_type, build, options)
+    
+    @staticmethod
+    def enforce_memory_budget() -> list:
+        """Applique le budget mémoire de la session (éviction des entrées volumineuses les plus anciennes)"""
+        return SessionMemoryAccountant().enforce(st.session_state)
+    
+    @staticmethod
+    def get_memory_report() -> Dict[str, Any]:
+        """Occupation mémoire de la session, totaux et détail par clé"""
+        return SessionMemoryAccountant().report(st.session_state)
+    
     @staticmethod
     def get_current_page() -> str:
         """Récupère la page actuelle"""
@@ -214,34 +536,14 @@ class SessionManager:
     @staticmethod
     def get_financial_class(score: int) -> str:
         """Retourne la classe financière selon le score BCEAO"""
-        if score >= 85:
-            return "A+"
-        elif score >= 70:
-            return "A"
-        elif score >= 55:
-            return "B"
-        elif score >= 40:
-            return "C"
-        elif score >= 25:
-            return "D"
-        else:
-            return "E"
+        from modules.core.scoring import financial_class
+        return financial_class(score)
     
     @staticmethod
     def get_interpretation(score: int) -> Tuple[str, str]:
         """Retourne l'interprétation du score avec couleur"""
-        if score >= 85:
-            return "Excellence financière", "green"
-        elif score >= 70:
-            return "Très bonne situation", "green"
-        elif score >= 55:
-            return "Bonne situation", "orange"
-        elif score >= 40:
-            return "Situation moyenne", "orange"
-        elif score >= 25:
-            return "Situation faible", "red"
-        else:
-            return "Situation très faible", "red"
+        from modules.core.scoring import score_interpretation
+        return score_interpretation(score)
     
     @staticmethod
     def debug_session_state() -> Dict[str, Any]:
@@ -258,19 +560,23 @@ class SessionManager:
         # Identifier les clés liées à l'analyse
         analysis_prefixes = ['analysis_', 'show_', 'temp_', 'file_', 'complete_']
         for key in st.session_state.keys():
-            if any(key.startswith(prefix) for prefix in analysis_prefixes) or key == SessionManager.ANALYSIS_RESULTS:
+            if any(key.startswith(prefix) for prefix in analysis_prefixes) or key == SessionManager.ANALYSIS_HANDLE:
                 debug_info['analysis_keys'].append(key)
         
-        # Vérifier la compatibilité backward
-        legacy_vars = ['analysis_data', 'analysis_ratios', 'analysis_scores', 'analysis_done']
-        for var in legacy_vars:
-            debug_info['backward_compatibility'][var] = var in st.session_state
+        # Occupation mémoire (totaux seulement, le détail est dans get_memory_report)
+        memory = SessionManager.get_memory_report()
+        debug_info['memoire'] = {key: value for key, value in memory.items() if key != 'detail'}
+        
+        # Vérifier la compatibilité backward (clés résolues à la demande)
+        for var in LEGACY_VIEWS:
+            debug_info['backward_compatibility'][var] = SessionManager.get_legacy_value(var) is not None
         
         if SessionManager.has_analysis_data():
             score, metadata = SessionManager.get_analysis_info()
             debug_info['score'] = score
             debug_info['secteur'] = metadata.get('secteur', 'N/A')
             debug_info['date_analyse'] = metadata.get('date_analyse', 'N/A')
+            debug_info['norms_version'] = metadata.get('norms_version', 'N/A')
         
         return debug_info
     
@@ -292,6 +598,7 @@ def init_session():
     SessionManager.initialize()
     # 🔧 CORRECTION : Assurer la compatibilité backward à chaque initialisation
     SessionManager.ensure_backward_compatibility()
+    SessionManager.enforce_memory_budget()
 
 def has_analysis() -> bool:
     """Fonction simple pour vérifier la présence d'analyse"""
@@ -0,0 +1,86 @@
+"""
+Tests unitaires pour le module analysis_result.py
+"""
+
+import unittest
+import sys
+import os
+import json
+import pickle
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.analysis_result import AnalysisResult, FrozenDict
+
+
+class TestAnalysisResult(unittest.TestCase):
+    """Tests pour le résultat d'analyse immuable"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.data = {'total_actif': 1000000, 'chiffre_affaires': 1500000}
+        self.ratios = {'ratio_liquidite_generale': 1.4, 'roe': 12.0}
+        self.scores = {'global': 72, 'liquidite': 30, 'details': {'roe': 5}}
+        self.metadata = {'secteur': 'commerce', 'date_analyse': '2024-01-01 10:00:00'}
+        self.result = AnalysisResult(self.data, self.ratios, self.scores, self.metadata)
+
+    def test_reads_like_legacy_dict(self):
+        """Test de la lecture comme l'ancien dictionnaire analysis_results"""
+        self.assertEqual(self.result['scores']['global'], 72)
+        self.assertEqual(self.result.get('metadata', {})['secteur'], 'commerce')
+        self.assertIn('ratios', self.result)
+        self.assertEqual(set(self.result.keys()),
+                         {'data', 'ratios', 'scores', 'metadata', 'version', 'timestamp'})
+        self.assertIsInstance(self.result['scores'], dict)
+
+    def test_immutable(self):
+        """Test que le résultat et ses dictionnaires sont en lecture seule"""
+        with self.assertRaises(TypeError):
+            self.result['scores']['global'] = 100
+        with self.assertRaises(TypeError):
+            self.result['scores']['details']['roe'] = 0
+        with self.assertRaises(TypeError):
+            self.result['data'].update({'total_actif': 0})
+        with self.assertRaises(TypeError):
+            self.result.scores = {}
+
+    def test_isolated_from_caller(self):
+        """Test que modifier les dictionnaires d'origine n'affecte pas le résultat"""
+        self.scores['global'] = 10
+        self.assertEqual(self.result.score, 72)
+
+    def test_legacy_views(self):
+        """Test de la résolution des anciennes clés de session"""
+        self.assertIs(self.result.legacy('analysis_data'), self.result.data)
+        self.assertEqual(self.result.legacy('analysis_scores')['global'], 72)
+        self.assertEqual(self.result.legacy('analysis_secteur'), 'commerce')
+        self.assertTrue(self.result.legacy('analysis_done'))
+        self.assertIsNone(self.result.legacy('inconnue'))
+
+    def test_from_legacy_dict(self):
+        """Test de la conversion d'un ancien dictionnaire de session"""
+        legacy = {'data': self.data, 'ratios': self.ratios, 'scores': self.scores,
+                  'metadata': self.metadata, 'version': '2.0.0', 'timestamp': 't0'}
+        result = AnalysisResult.from_dict(legacy)
+
+        self.assertEqual(result.version, '2.0.0')
+        self.assertEqual(result.timestamp, 't0')
+        self.assertIs(AnalysisResult.from_dict(result), result)
+
+    def test_serialization(self):
+        """Test de l'export JSON et du pickle"""
+        exported = json.loads(json.dumps({**self.result}, default=str))
+        self.assertEqual(exported['scores']['details']['roe'], 5)
+
+        restored = pickle.loads(pickle.dumps(self.result))
+        self.assertEqual(restored.to_dict(), self.result.to_dict())
+        self.assertIsInstance(restored.data, FrozenDict)
+
+        editable = self.result.to_dict()
+        editable['scores']['global'] = 0
+        self.assertEqual(self.result.score, 72)
+
+
+if __name__ == '__main__':
+    unittest.main()
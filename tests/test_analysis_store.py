@@ -0,0 +1,104 @@
+"""
+Tests unitaires pour le module analysis_store.py
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.analysis_result import AnalysisResult
+from modules.core.analysis_store import AnalysisStore, estimate_size
+
+
+def make_result(score: int) -> AnalysisResult:
+    """Résultat d'analyse minimal"""
+    return AnalysisResult({'total_actif': 1000000}, {'roe': 12.0 + score},
+                          {'global': score, 'details': {'roe': 5}}, {'secteur': 'commerce'})
+
+
+class TestAnalysisStore(unittest.TestCase):
+    """Tests pour le stockage partagé des analyses"""
+
+    def test_put_and_get(self):
+        """Test de l'enregistrement et de la relecture par identifiant"""
+        store = AnalysisStore()
+        result = make_result(70)
+        analysis_id = store.put(result)
+
+        self.assertIs(store.get(analysis_id), result)
+        self.assertIsNone(store.get('inconnue'))
+        self.assertIsNone(store.get(None))
+
+    def test_lru_eviction_by_count(self):
+        """Test de l'éviction de l'analyse la moins récemment lue"""
+        store = AnalysisStore(max_entries=2)
+        first = store.put(make_result(1))
+        second = store.put(make_result(2))
+        store.get(first)
+        third = store.put(make_result(3))
+
+        self.assertIsNotNone(store.get(first))
+        self.assertIsNone(store.get(second))
+        self.assertIsNotNone(store.get(third))
+        self.assertEqual(store.cache_info()['evictions'], 1)
+
+    def test_eviction_by_size(self):
+        """Test de la borne sur la taille estimée"""
+        size = estimate_size(make_result(1))
+        store = AnalysisStore(max_bytes=int(size * 2.5))
+        ids = [store.put(make_result(score)) for score in range(5)]
+
+        self.assertEqual(store.cache_info()['analyses_en_memoire'], 2)
+        self.assertIsNotNone(store.get(ids[-1]))
+
+    def test_sqlite_persistence(self):
+        """Test de la reprise d'une analyse depuis la base après éviction ou redémarrage"""
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'analyses.db')
+            store = AnalysisStore(max_entries=1, db_path=db_path)
+            first = store.put(make_result(40))
+            store.put(make_result(50))
+
+            restored = store.get(first)
+            self.assertEqual(restored.score, 40)
+            self.assertEqual(restored['scores']['details']['roe'], 5)
+
+            reopened = AnalysisStore(db_path=db_path)
+            self.assertEqual(reopened.get(first).metadata['secteur'], 'commerce')
+
+            reopened.discard(first)
+            self.assertIsNone(AnalysisStore(db_path=db_path).get(first))
+            store._db.close()
+            reopened._db.close()
+
+    def test_alias_shares_result(self):
+        """Test qu'un alias ne duplique pas le résultat et le garde jusqu'au dernier retrait"""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = AnalysisStore(db_path=os.path.join(tmp, 'analyses.db'))
+            original = store.put(make_result(60))
+            info = store.cache_info()
+            alias = store.alias(original)
+
+            self.assertIs(store.get(alias), store.get(original))
+            self.assertEqual(store.cache_info()['analyses_en_memoire'], info['analyses_en_memoire'])
+            self.assertEqual(store._db.execute("SELECT COUNT(*) FROM analyses").fetchone()[0], 1)
+            self.assertIsNone(store.alias('inconnue'))
+
+            store.discard(original)
+            self.assertIsNone(store.get(original))
+            reopened = AnalysisStore(db_path=store.db_path)
+            self.assertEqual(reopened.get(alias).score, 60)
+
+            reopened.discard(alias)
+            self.assertIsNone(reopened.get(alias))
+            self.assertEqual(reopened._db.execute("SELECT COUNT(*) FROM analyses").fetchone()[0], 0)
+            store._db.close()
+            reopened._db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests unitaires pour le module analysis_worker.py
+"""
+
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.analysis_worker import (
+    AnalysisWorkerPool, QueueFullError, STAGES, DONE, FAILED, PENDING
+)
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'assets', 'template_excel.xlsx')
+
+
+class TestAnalysisWorkerPool(unittest.TestCase):
+    """Tests pour les analyses en arrière-plan"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.release = threading.Event()
+        self.seen_stages = []
+
+    def blocking_runner(self, file_content, secteur, progress):
+        """Analyse factice qui s'arrête à l'étape des ratios jusqu'au signal"""
+        progress('parse')
+        progress('ratios')
+        self.release.wait(5)
+        progress('score')
+        if file_content == b'erreur':
+            raise ValueError("classeur illisible")
+        return {'data': {}, 'ratios': {}, 'scores': {'global': 50}, 'recommendations': [], 'norms_version': 'v1'}
+
+    def test_excel_analysis_end_to_end(self):
+        """Test de l'analyse du modèle Excel, étape par étape"""
+        pool = AnalysisWorkerPool(max_workers=1)
+        with open(TEMPLATE_PATH, 'rb') as f:
+            job_id = pool.submit(f.read(), 'template_excel.xlsx', 'commerce')
+
+        status = pool.wait(job_id, timeout=30)
+        self.assertEqual(status['statut'], DONE)
+        self.assertEqual(status['progression'], 1.0)
+
+        result = pool.pop_result(job_id)
+        self.assertIn('global', result['scores'])
+        self.assertTrue(result['recommendations'])
+        self.assertIsNone(pool.status(job_id))
+
+    def test_progress_is_reported_while_running(self):
+        """Test que la progression par étape est visible pendant l'analyse"""
+        pool = AnalysisWorkerPool(max_workers=1, runner=self.blocking_runner)
+        job_id = pool.submit(b'contenu', 'bilan.xlsx', 'commerce')
+
+        for _ in range(500):
+            status = pool.status(job_id)
+            if status['etape'] == 'ratios':
+                break
+            time.sleep(0.01)
+        self.assertEqual(status['progression'], STAGES.index('ratios') / len(STAGES))
+        self.assertIsNone(pool.pop_result(job_id))
+
+        self.release.set()
+        self.assertEqual(pool.wait(job_id, timeout=5)['statut'], DONE)
+
+    def test_failure_reported(self):
+        """Test qu'une erreur d'analyse est remontée dans l'état de la tâche"""
+        self.release.set()
+        pool = AnalysisWorkerPool(max_workers=1, runner=self.blocking_runner)
+        job_id = pool.submit(b'erreur', 'bilan.xlsx', 'commerce')
+
+        status = pool.wait(job_id, timeout=5)
+        self.assertEqual(status['statut'], FAILED)
+        self.assertIn('illisible', status['erreur'])
+        self.assertEqual(pool.cache_info()['en_erreur'], 1)
+
+    def test_bounded_queue(self):
+        """Test du refus des soumissions au-delà de la file maximale"""
+        pool = AnalysisWorkerPool(max_workers=1, max_pending=1, runner=self.blocking_runner)
+        first = pool.submit(b'a', 'a.xlsx', None)
+        second = pool.submit(b'b', 'b.xlsx', None)
+
+        self.assertEqual(pool.status(second)['statut'], PENDING)
+        with self.assertRaises(QueueFullError):
+            pool.submit(b'c', 'c.xlsx', None)
+
+        self.release.set()
+        for job_id in (first, second):
+            self.assertEqual(pool.wait(job_id, timeout=5)['statut'], DONE)
+        self.assertEqual(pool.cache_info()['refusees'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,14 @@
 import unittest
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Ajouter le dossier parent au path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from modules.core.analyzer import FinancialAnalyzer
+from modules.core import analyzer as analyzer_module
+from modules.core.analyzer import FinancialAnalyzer, get_financial_analyzer
 from modules.core.excel_loader import ExcelDataLoader
 
 class TestFinancialAnalyzer(unittest.TestCase):
@@ -51,5 +54,53 @@ class TestFinancialAnalyzer(unittest.TestCase):
         self.assertIn('errors', validation)
         self.assertIn('warnings', validation)
 
+class TestSharedAnalyzer(unittest.TestCase):
+    """Tests pour l'analyseur partagé par tout le processus"""
+
+    sample_data = {
+        'total_actif': 1000000, 'capitaux_propres': 400000, 'dettes_financieres': 300000,
+        'dettes_court_terme': 300000, 'chiffre_affaires': 1500000, 'resultat_net': 75000,
+        'stocks': 150000, 'creances_clients': 100000, 'tresorerie': 50000
+    }
+
+    def analyze(self, analyzer):
+        ratios = analyzer.calculate_ratios(self.sample_data)
+        return ratios, analyzer.calculate_score(ratios, 'commerce'), analyzer.get_sectoral_comparison(ratios, 'commerce')
+
+    def test_single_instance_across_threads(self):
+        """Test qu'une seule instance est construite malgré des appels concurrents"""
+        analyzer_module._analyzer = None
+        barrier = threading.Barrier(8)
+
+        def worker(_):
+            barrier.wait()
+            return get_financial_analyzer()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            instances = list(pool.map(worker, range(8)))
+
+        self.assertEqual(len({id(instance) for instance in instances}), 1)
+        self.assertIs(instances[0], get_financial_analyzer())
+
+    def test_concurrent_analyses_match_fresh_instance(self):
+        """Test que l'instance partagée donne les mêmes résultats en parallèle qu'une instance neuve"""
+        expected = self.analyze(FinancialAnalyzer())
+        shared = get_financial_analyzer()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: self.analyze(shared), range(32)))
+
+        for result in results:
+            self.assertEqual(result, expected)
+
+    def test_norm_tables_read_only(self):
+        """Test que les tables de normes partagées ne peuvent pas être modifiées"""
+        shared = get_financial_analyzer()
+
+        with self.assertRaises(TypeError):
+            shared.ratios_sectoriels['commerce'] = {}
+        with self.assertRaises(TypeError):
+            shared.ratios_bceao['liquidite']['ratio_transformation'] = {}
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Tests unitaires pour le rendu par lots des rapports PDF (modules/core/batch_reports.py)
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+import zipfile
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.batch_reports import collect_inputs, render_batch
+from modules.core.pdf_reports import render_pdf, executive_summary_story, build_executive_summary_pdf
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'assets', 'template_excel.xlsx')
+
+
+class TestBatchReports(unittest.TestCase):
+    """Tests pour le rendu des rapports d'un portefeuille"""
+
+    def setUp(self):
+        """Configuration initiale des tests : deux classeurs, un résultat JSON et un fichier invalide"""
+        self.tmp = tempfile.mkdtemp()
+        self.inputs = os.path.join(self.tmp, 'portefeuille')
+        os.makedirs(os.path.join(self.inputs, 'agence'))
+        shutil.copy(TEMPLATE_PATH, os.path.join(self.inputs, 'client_a.xlsx'))
+        shutil.copy(TEMPLATE_PATH, os.path.join(self.inputs, 'agence', 'client_a.xlsx'))
+
+        self.result = {
+            'data': {'chiffre_affaires': 1000000, 'total_actif': 800000, 'resultat_net': 50000},
+            'ratios': {'ratio_liquidite_generale': 1.6, 'marge_nette': 5.0},
+            'scores': {'global': 64, 'liquidite': 25},
+            'metadata': {'fichier_nom': 'client_b', 'secteur': 'commerce_detail'}
+        }
+        with open(os.path.join(self.inputs, 'client_b.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.result, f)
+        with open(os.path.join(self.inputs, 'invalide.json'), 'w', encoding='utf-8') as f:
+            json.dump({'data': {}}, f)
+        with open(os.path.join(self.inputs, 'notes.txt'), 'w') as f:
+            f.write('ignoré')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_render_pdf_counts_pages(self):
+        """Test que la mise en page headless retourne les octets et le nombre de pages"""
+        story = executive_summary_story(self.result['data'], self.result['ratios'],
+                                        self.result['scores'], self.result['metadata'])
+        pdf, pages = render_pdf(story)
+
+        self.assertTrue(pdf.startswith(b'%PDF'))
+        self.assertGreaterEqual(pages, 1)
+        self.assertTrue(build_executive_summary_pdf(self.result['data'], self.result['ratios'],
+                                                    self.result['scores'], self.result['metadata']).startswith(b'%PDF'))
+
+    def test_report_stamped_with_analysis_date(self):
+        """Test qu'un rapport porte la date de l'analyse : mêmes octets d'un rendu à l'autre"""
+        metadata = {**self.result['metadata'], 'date_analyse': '2024-03-01 10:05:00'}
+        story = executive_summary_story(self.result['data'], self.result['ratios'], self.result['scores'], metadata)
+        texts = [flowable.getPlainText() for flowable in story if hasattr(flowable, 'getPlainText')]
+
+        self.assertIn("Analyse du 01/03/2024 à 10:05 - Outil d'Analyse Financière BCEAO", texts)
+        first = build_executive_summary_pdf(self.result['data'], self.result['ratios'], self.result['scores'], metadata)
+        second = build_executive_summary_pdf(self.result['data'], self.result['ratios'], self.result['scores'], metadata)
+        self.assertEqual(first, second)
+
+    def test_batch_to_zip(self):
+        """Test du rendu par lots dans une archive ZIP, erreurs comprises"""
+        self.assertEqual(len(collect_inputs([self.inputs])), 4)
+        output = os.path.join(self.tmp, 'rapports.zip')
+
+        stats = render_batch([self.inputs], output, secteur='commerce_detail', workers=2)
+
+        self.assertEqual(stats['rapports'], 3)
+        self.assertEqual(len(stats['erreurs']), 1)
+        self.assertIn('invalide.json', stats['erreurs'][0]['fichier'])
+        self.assertGreaterEqual(stats['pages'], 3)
+        self.assertGreater(stats['pages_par_seconde'], 0)
+
+        with zipfile.ZipFile(output) as archive:
+            names = sorted(archive.namelist())
+            self.assertEqual(names, ['client_a_detaille.pdf', 'client_a_detaille_2.pdf', 'client_b_detaille.pdf'])
+            self.assertTrue(archive.read('client_b_detaille.pdf').startswith(b'%PDF'))
+        self.assertEqual([name for name in os.listdir(self.tmp) if name.endswith('.tmp')], [])
+
+    def test_batch_to_directory(self):
+        """Test du rendu par lots dans un répertoire"""
+        output = os.path.join(self.tmp, 'sortie')
+        stats = render_batch([os.path.join(self.inputs, 'client_b.json')], output,
+                             report_type='synthese', workers=1)
+
+        self.assertEqual(stats['rapports'], 1)
+        self.assertEqual(os.listdir(output), ['client_b_synthese.pdf'])
+
+
+if __name__ == '__main__':
+    unittest.main()
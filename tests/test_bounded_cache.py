@@ -0,0 +1,49 @@
+"""
+Tests unitaires pour le cache LRU borné (modules/core/bounded_cache.py)
+"""
+
+import unittest
+import sys
+import os
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.bounded_cache import BoundedLRUCache
+
+
+class TestBoundedCache(unittest.TestCase):
+    """Tests pour les bornes et l'ordre d'éviction"""
+
+    def test_least_recent_evicted_first(self):
+        """Test de l'éviction par nombre d'entrées et par taille, dans l'ordre LRU"""
+        cache = BoundedLRUCache(max_entries=3, max_bytes=10)
+        cache.put('a', b'xxx')
+        cache.put('b', b'xxx')
+        cache.put('c', b'xxx')
+        self.assertEqual(cache.get('a'), b'xxx')
+
+        cache.put('d', b'xx')
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+
+        cache.put('a', b'xxxxxxxxx')
+        self.assertEqual([key for key in ('a', 'c', 'd') if key in cache], ['a'])
+        info = cache.cache_info()
+        self.assertEqual((info['entrees_en_cache'], info['evictions']), (1, 3))
+        self.assertEqual((info['lectures'], info['constructions']), (1, 0))
+
+    def test_oversized_entry_kept(self):
+        """Test qu'une entrée plus grande que la borne reste servie jusqu'à la suivante"""
+        cache = BoundedLRUCache(max_entries=5, max_bytes=4)
+        cache.put('gros', 'x' * 10)
+        self.assertEqual(cache.get('gros'), 'x' * 10)
+        self.assertIsNone(cache.get('absent'))
+
+        cache.put('petit', 'x')
+        self.assertNotIn('gros', cache)
+        self.assertEqual(cache.cache_info()['taux_succes'], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests unitaires pour le module calibration.py
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.calibration import ScoreCalibrator, isotonic_fit, optimal_bands, roc_auc, save_grid
+from modules.core.norms import NormsRegistry
+from modules.core.scoring import score_ratios
+
+
+class TestCalibration(unittest.TestCase):
+    """Tests pour la calibration de la grille de notation"""
+
+    def setUp(self):
+        """Historique synthétique : le défaut dépend de la liquidité générale"""
+        rng = np.random.default_rng(7)
+        n = 20000
+        liquidite = rng.uniform(0, 4, n)
+        probabilite = np.where(liquidite < 1.0, 0.4, np.where(liquidite < 2.0, 0.15, 0.03))
+        self.frame = pd.DataFrame({
+            'ratio_liquidite_generale': liquidite,
+            'ratio_endettement': rng.uniform(20, 100, n),
+            'defaut': (rng.random(n) < probabilite).astype(int)
+        })
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Nettoyage après les tests"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_isotonic_fit_monotone(self):
+        """Test de la monotonie de la régression isotonique"""
+        fitted = isotonic_fit(np.array([10, 10, 10, 10]), np.array([1, 3, 2, 5]))
+
+        self.assertTrue(np.all(np.diff(fitted) >= 0))
+        self.assertAlmostEqual(fitted[1], 0.25)
+
+    def test_optimal_bands(self):
+        """Test de la découpe optimale en tranches"""
+        counts = np.full(6, 100.0)
+        defaults = np.array([40, 40, 10, 10, 1, 1], dtype=float)
+
+        self.assertEqual(optimal_bands(counts, defaults, 3, min_share=0.0), [2, 4])
+
+    def test_fit_recovers_breakpoints(self):
+        """Test de la calibration des seuils sur un historique synthétique"""
+        calibrator = ScoreCalibrator()
+        grid = calibrator.fit(self.frame)
+        critere = grid['categories']['liquidite']['criteres'][0]
+
+        self.assertEqual(len(critere['seuils']), 3)
+        self.assertTrue(any(abs(seuil - 2.0) < 0.1 for seuil in critere['seuils']))
+        self.assertTrue(any(abs(seuil - 1.0) < 0.1 for seuil in critere['seuils']))
+        self.assertGreater(grid['poids_categories']['liquidite'], 0.5)
+        self.assertGreaterEqual(calibrator.report['auc_calibree'], calibrator.report['auc_initiale'])
+
+    def test_saved_grid_loaded_by_scorer(self):
+        """Test du chargement de la grille calibrée via le registre des normes"""
+        grid = ScoreCalibrator().fit(self.frame)
+        save_grid(grid, os.path.join(self.temp_dir, 'scoring_grid.json'))
+
+        registry = NormsRegistry(self.temp_dir, check_interval=0)
+        loaded = registry.get('scoring_grid')
+
+        self.assertEqual(loaded['version'], grid['version'])
+        self.assertIn('global', score_ratios({'ratio_liquidite_generale': 2.5}, loaded))
+
+    def test_roc_auc(self):
+        """Test de l'aire sous la courbe ROC"""
+        self.assertEqual(roc_auc(np.array([0.1, 0.2, 0.8, 0.9]), np.array([0, 0, 1, 1])), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests unitaires pour l'interface en ligne de commande (optimuscredit/cli.py)
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import shutil
+import subprocess
+import tempfile
+from contextlib import redirect_stderr
+
+# Ajouter le dossier parent au path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from modules.core.parquet_store import read_analyses
+from optimuscredit.cli import main
+
+SAMPLE_PATH = os.path.join(ROOT, 'assets', 'sample_data.json')
+TEMPLATE_PATH = os.path.join(ROOT, 'assets', 'template_excel.xlsx')
+
+
+class TestCli(unittest.TestCase):
+    """Tests pour python -m optimuscredit"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        shutil.copy(SAMPLE_PATH, os.path.join(self.tmp, 'exemple.json'))
+        shutil.copy(TEMPLATE_PATH, os.path.join(self.tmp, 'modele.xlsx'))
+
+    def run_cli(self, *argv):
+        stdout = io.StringIO()
+        with redirect_stderr(io.StringIO()):
+            saved, sys.stdout = sys.stdout, stdout
+            try:
+                code = main(list(argv))
+            finally:
+                sys.stdout = saved
+        return code, stdout.getvalue()
+
+    def test_analyze_json_output(self):
+        """Test de l'analyse d'un fichier : seule la sortie JSON est écrite sur stdout"""
+        code, output = self.run_cli('analyze', SAMPLE_PATH, '--format', 'json')
+        self.assertEqual(code, 0)
+        result = json.loads(output)
+        self.assertEqual(result['data']['total_actif'], 592000000)
+        self.assertIn('global', result['scores'])
+        self.assertEqual(result['metadata']['entreprise'], "Société d'Exemple SARL")
+
+    def test_batch_manifest_and_parquet_report(self):
+        """Test d'un lot décrit par un manifeste, puis de l'export Parquet"""
+        manifest = os.path.join(self.tmp, 'lot.txt')
+        with open(manifest, 'w', encoding='utf-8') as f:
+            f.write("# portefeuille\nexemple.json\nmodele.xlsx\nabsent.json\n")
+
+        code, output = self.run_cli('batch', '--manifeste', manifest)
+        lines = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(code, 1)
+        self.assertEqual([os.path.basename(line['fichier']) for line in lines],
+                         ['exemple.json', 'modele.xlsx', 'absent.json'])
+        self.assertIn('scores', lines[0])
+        self.assertIn('erreur', lines[2])
+
+        store = os.path.join(self.tmp, 'entrepot')
+        code, _ = self.run_cli('report', os.path.join(self.tmp, 'exemple.json'), '--format', 'parquet',
+                               '--sortie', store)
+        self.assertEqual(code, 0)
+        self.assertEqual(len(list(read_analyses(store))), 1)
+
+    def test_xlsx_report_streams_identified_analyses(self):
+        """Test du classeur de portefeuille : colonnes du schéma, analyses non identifiées signalées"""
+        import openpyxl
+        from modules.core.analyzer import RATIO_NAMES, get_financial_analyzer
+        from modules.core.jsonl_pipeline import flatten_sample
+
+        with open(SAMPLE_PATH, encoding='utf-8') as f:
+            ratios = get_financial_analyzer().calculate_ratios(flatten_sample(json.load(f)))
+        self.assertTrue(set(ratios) <= set(RATIO_NAMES))
+
+        output = os.path.join(self.tmp, 'portefeuille.xlsx')
+        code, _ = self.run_cli('report', os.path.join(self.tmp, 'exemple.json'), '--format', 'xlsx',
+                               '--sortie', output)
+        self.assertEqual(code, 0)
+        sheet = openpyxl.load_workbook(output, read_only=True)['Synthèse']
+        self.assertEqual(sheet.cell(2, 1).value, "Société d'Exemple SARL")
+
+        # Classeurs Excel sans entreprise ni exercice : classeur vide et code d'erreur
+        workbooks = os.path.join(self.tmp, 'classeurs')
+        os.mkdir(workbooks)
+        shutil.copy(TEMPLATE_PATH, workbooks)
+        code, _ = self.run_cli('report', workbooks, '--format', 'xlsx', '--sortie', output)
+        self.assertEqual(code, 1)
+
+    def test_help_does_not_load_ui_or_engine(self):
+        """Test du démarrage : l'aide n'importe ni Streamlit, ni plotly, ni pandas"""
+        script = ("import sys, runpy; sys.argv = ['optimuscredit', '--help']\n"
+                  "try:\n    runpy.run_module('optimuscredit', run_name='__main__')\n"
+                  "except SystemExit:\n    pass\n"
+                  "print(sorted(m for m in ('streamlit', 'plotly', 'pandas') if m in sys.modules), file=sys.stderr)")
+        completed = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True)
+        self.assertIn('analyze', completed.stdout)
+        self.assertEqual(completed.stderr.strip().splitlines()[-1], '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
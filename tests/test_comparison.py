@@ -0,0 +1,64 @@
+"""
+Tests unitaires pour le module comparison.py
+"""
+
+import unittest
+import sys
+import os
+import math
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.analysis_result import AnalysisResult
+from modules.core.comparison import analysis_label, build_comparison_frame, compare_analyses
+
+
+class TestComparison(unittest.TestCase):
+    """Tests pour la comparaison de plusieurs analyses"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.results = {
+            'SOC1': AnalysisResult({}, {'roe': 10.0, 'ratio_liquidite_generale': 1.5, 'libelle': 'x'},
+                                   {'global': 60, 'liquidite': 30}, {'entreprise': 'SOC1'}),
+            'SOC2': AnalysisResult({}, {'roe': 15.0, 'ratio_liquidite_generale': 1.2},
+                                   {'global': 45, 'liquidite': 20}, {'entreprise': 'SOC2'}),
+            'SOC3': AnalysisResult({}, {'roe': 0.0},
+                                   {'global': 30}, {'fichier_nom': 'soc3.xlsx'}),
+        }
+
+    def test_frame_from_stored_results(self):
+        """Test de la matrice analyse × indicateur construite sans recalcul"""
+        frame = build_comparison_frame(self.results)
+
+        self.assertEqual(list(frame.index), ['SOC1', 'SOC2', 'SOC3'])
+        self.assertIn('score_global', frame.columns)
+        self.assertNotIn('libelle', frame.columns)
+        self.assertTrue(math.isnan(frame.loc['SOC3', 'ratio_liquidite_generale']))
+
+    def test_deltas_against_reference(self):
+        """Test des écarts absolus et relatifs à la référence"""
+        comparison = compare_analyses(self.results, reference='SOC2')
+
+        self.assertEqual(comparison['reference'], 'SOC2')
+        self.assertEqual(comparison['ecarts'].loc['SOC1', 'roe'], -5.0)
+        self.assertAlmostEqual(comparison['ecarts_pct'].loc['SOC1', 'score_global'], 100 * 15 / 45)
+        self.assertEqual(comparison['ecarts'].loc['SOC2'].fillna(0).abs().sum(), 0)
+
+    def test_zero_reference_gives_nan_percentage(self):
+        """Test d'une référence nulle (écart relatif indéfini)"""
+        comparison = compare_analyses(self.results, reference='SOC3')
+
+        self.assertEqual(comparison['ecarts'].loc['SOC1', 'roe'], 10.0)
+        self.assertTrue(math.isnan(comparison['ecarts_pct'].loc['SOC1', 'roe']))
+
+    def test_default_reference_and_labels(self):
+        """Test de la référence par défaut et des libellés"""
+        self.assertEqual(compare_analyses(self.results)['reference'], 'SOC1')
+        self.assertEqual(analysis_label(self.results['SOC3']), 'soc3.xlsx')
+        self.assertIsNone(compare_analyses({})['reference'])
+
+
+if __name__ == '__main__':
+    unittest.main()
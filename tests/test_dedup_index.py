@@ -0,0 +1,92 @@
+"""
+Tests unitaires pour l'index de déduplication des imports (modules/core/dedup_index.py)
+"""
+
+import unittest
+import sys
+import os
+import io
+import time
+
+import openpyxl
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.analysis_result import AnalysisResult
+from modules.core.analysis_store import AnalysisStore, get_analysis_store
+from modules.core.analysis_worker import run_deduplicated_excel_analysis
+from modules.core.dedup_index import DedupIndex, get_dedup_index, statement_key
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'assets', 'template_excel.xlsx')
+
+
+class TestDedupIndex(unittest.TestCase):
+    """Tests pour l'empreinte normalisée et l'index empreinte -> analyse"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.data = {'total_actif': 1500000, 'capitaux_propres': 600000, 'stocks': 0, 'chiffre_affaires': 2000000.0}
+        self.store = AnalysisStore()
+        self.index = DedupIndex(store=self.store)
+
+    def test_key_ignores_representation(self):
+        """Test de l'empreinte : ordre, type, zéros et bruit d'arrondi sans effet ; secteur et montants pris en compte"""
+        key = statement_key(self.data, 'commerce', 'v1')
+        resaved = {'chiffre_affaires': 2000000, 'capitaux_propres': 600000.0000001, 'total_actif': 1500000.0}
+        self.assertEqual(statement_key(resaved, 'commerce', 'v1'), key)
+        self.assertNotEqual(statement_key(self.data, 'industrie', 'v1'), key)
+        self.assertNotEqual(statement_key(self.data, 'commerce', 'v2'), key)
+        self.assertNotEqual(statement_key({**self.data, 'stocks': 1000}, 'commerce', 'v1'), key)
+
+    def test_lookup_register_expiry_and_orphans(self):
+        """Test de l'index : succès après enregistrement, expiration, analyse disparue du stockage"""
+        key = statement_key(self.data, 'commerce', 'v1')
+        self.assertIsNone(self.index.lookup(key))
+
+        analysis_id = self.store.put(AnalysisResult(self.data, {}, {'global': 60}, {'secteur': 'commerce'}))
+        self.index.register(key, analysis_id)
+        found_id, result = self.index.lookup(key)
+        self.assertEqual(found_id, analysis_id)
+        self.assertEqual(result.scores['global'], 60)
+
+        self.index.register(key, analysis_id)
+        self.index._entries[key] = (analysis_id, time.time() - self.index.ttl - 1)
+        self.assertIsNone(self.index.lookup(key))
+
+        self.index.register(key, analysis_id)
+        self.store.discard(analysis_id)
+        self.assertIsNone(self.index.lookup(key))
+
+        info = self.index.cache_info()
+        self.assertEqual((info['doublons_evites'], info['nouvelles_analyses']), (1, 3))
+        self.assertEqual((info['expirees'], info['analyses_disparues'], info['empreintes']), (1, 1, 0))
+        self.assertEqual(info['taux_succes'], 0.25)
+
+    def test_resaved_workbook_reuses_analysis(self):
+        """Test de bout en bout : un classeur réenregistré retrouve l'analyse existante"""
+        get_dedup_index().clear()
+        with open(TEMPLATE_PATH, 'rb') as f:
+            original = f.read()
+        workbook = openpyxl.load_workbook(io.BytesIO(original))
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        resaved = buffer.getvalue()
+        self.assertNotEqual(resaved, original)
+
+        first = run_deduplicated_excel_analysis(original, 'commerce_detail')
+        self.assertNotIn('analysis_id', first)
+        analysis_id = get_analysis_store().put(AnalysisResult(first['data'], first['ratios'], first['scores'],
+                                                              {'norms_version': first['norms_version']}))
+        get_dedup_index().register(first['dedup_key'], analysis_id)
+
+        second = run_deduplicated_excel_analysis(resaved, 'commerce_detail')
+        self.assertEqual(second['analysis_id'], analysis_id)
+        self.assertEqual(second['scores'], first['scores'])
+        self.assertNotIn('analysis_id', run_deduplicated_excel_analysis(resaved, 'agriculture'))
+        get_analysis_store().discard(analysis_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests unitaires pour la page d'import Excel (modules/pages/excel_import.py)
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+import time
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.testing.v1 import AppTest
+
+from modules.core import history
+from modules.core.analysis_store import get_analysis_store
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(PROJECT_ROOT, 'assets', 'template_excel.xlsx')
+
+
+def excel_import_app():
+    """Application minimale : la page d'import Excel"""
+    import sys
+    import streamlit as st
+    sys.path.insert(0, st.session_state['project_root'])
+
+    from session_manager import SessionManager
+    from modules.pages.excel_import import show_excel_import_page
+
+    SessionManager.initialize()
+    show_excel_import_page()
+
+
+class TestExcelImportPage(unittest.TestCase):
+    """Tests pour l'analyse d'un classeur importé"""
+
+    def setUp(self):
+        """Configuration initiale des tests : historique dans un dossier temporaire"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = mock.patch.dict(os.environ, {history.HISTORY_PATH_ENV: os.path.join(self.tmp.name, 'historique.db')})
+        self.env.start()
+        history._history = None
+
+    def tearDown(self):
+        if history._history is not None:
+            history._history.close()
+        history._history = None
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def test_analysis_runs_in_background_pool(self):
+        """Test que l'analyse passe par le pool d'arrière-plan puis ouvre la page d'analyse"""
+        app = AppTest.from_function(excel_import_app, default_timeout=60)
+        app.session_state['project_root'] = PROJECT_ROOT
+        app.session_state['file_uploaded'] = True
+        with open(TEMPLATE_PATH, 'rb') as f:
+            app.session_state['file_content'] = f.read()
+        app.session_state['file_name'] = 'modele.xlsx'
+        app.run()
+
+        app.button[0].click().run()
+        self.assertEqual(app.session_state['analysis_job']['source'], 'excel_import')
+        for _ in range(60):
+            if 'analysis_job' not in app.session_state:
+                break
+            time.sleep(0.5)
+            app.run()
+
+        self.assertFalse(app.exception)
+        self.assertEqual(app.session_state['current_page'], 'analysis')
+        result = get_analysis_store().get(app.session_state['analysis_id'])
+        self.assertEqual(result.metadata['fichier_nom'], 'modele.xlsx')
+        self.assertIn('global', result.scores)
+
+
+if __name__ == '__main__':
+    unittest.main()
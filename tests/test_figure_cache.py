@@ -0,0 +1,86 @@
+"""
+Tests unitaires pour le cache des figures (modules/components/figure_cache.py)
+"""
+
+import unittest
+import sys
+import os
+import json
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.components.charts import create_radar_chart
+from modules.components.figure_cache import FigureCache, figure_from_json, figure_to_json
+
+SCORES = {'global': 70, 'liquidite': 30, 'solvabilite': 25, 'rentabilite': 20, 'activite': 10, 'gestion': 5}
+
+
+class TestFigureCache(unittest.TestCase):
+    """Tests pour le cache des figures plotly sérialisées"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.cache = FigureCache()
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return create_radar_chart(SCORES)
+
+    def test_round_trip_identical(self):
+        """Test que la figure relue est identique à une construction neuve"""
+        fig = create_radar_chart(SCORES)
+        restored = figure_from_json(figure_to_json(fig))
+
+        self.assertEqual(json.loads(pio.to_json(restored, validate=False)),
+                         json.loads(pio.to_json(fig, validate=False)))
+        self.assertNotIn('template', json.loads(figure_to_json(fig))['layout'])
+
+    def test_built_once_per_key(self):
+        """Test qu'une figure n'est construite qu'une fois par (analyse, type, options)"""
+        for _ in range(3):
+            self.cache.figure('a1', 'radar', self.build)
+        self.cache.figure('a1', 'radar', self.build, {'reference': 'x'})
+        self.cache.figure('a2', 'radar', self.build)
+
+        self.assertEqual(self.builds, 3)
+        info = self.cache.cache_info()
+        self.assertEqual((info['lectures'], info['constructions']), (2, 3))
+
+    def test_options_order_irrelevant(self):
+        """Test de la normalisation des options"""
+        self.cache.figure('a1', 'radar', self.build, {'x': 1, 'y': [1, 2]})
+        self.cache.figure('a1', 'radar', self.build, {'y': [1, 2], 'x': 1})
+        self.assertEqual(self.builds, 1)
+
+    def test_no_analysis_id_not_cached(self):
+        """Test qu'une figure sans identifiant d'analyse n'est pas mise en cache"""
+        self.cache.figure(None, 'radar', self.build)
+        self.cache.figure(None, 'radar', self.build)
+        self.assertEqual(self.builds, 2)
+        self.assertEqual(self.cache.cache_info()['figures_en_cache'], 0)
+
+    def test_cached_copy_independent(self):
+        """Test que modifier une figure relue ne modifie pas le cache"""
+        self.cache.figure('a1', 'radar', self.build)
+        fig = self.cache.figure('a1', 'radar', self.build)
+        fig.update_layout(title="modifié")
+
+        self.assertNotEqual(self.cache.figure('a1', 'radar', self.build).layout.title.text, "modifié")
+
+    def test_lru_bounds(self):
+        """Test de l'éviction au-delà des bornes"""
+        cache = FigureCache(max_entries=2)
+        for analysis_id in ('a1', 'a2', 'a3'):
+            cache.figure(analysis_id, 'barres', lambda: go.Figure(go.Bar(y=[1, 2])))
+
+        info = cache.cache_info()
+        self.assertEqual((info['figures_en_cache'], info['evictions']), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests unitaires pour le module history.py
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import pandas as pd
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.analysis_result import AnalysisResult
+from modules.core.history import AnalysisHistory, history_row
+
+
+def make_result(entreprise: str, exercice: int, roe: float, secteur: str = 'commerce') -> AnalysisResult:
+    """Résultat d'analyse minimal pour une entreprise-exercice"""
+    return AnalysisResult(
+        {'total_actif': 1000000},
+        {'roe': roe, 'ratio_liquidite_generale': 1.5, 'libelle': 'ignoré'},
+        {'global': 60, 'liquidite': 25},
+        {'entreprise': entreprise, 'exercice': exercice, 'secteur': secteur, 'norms_version': 'v1'}
+    )
+
+
+class TestAnalysisHistory(unittest.TestCase):
+    """Tests pour l'historique persistant des analyses"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history = AnalysisHistory(os.path.join(self.tmp.name, 'historique.db'))
+
+    def tearDown(self):
+        self.history.close()
+        self.tmp.cleanup()
+
+    def test_history_row(self):
+        """Test de la construction d'une ligne d'historique"""
+        row = history_row(make_result('SOC1', 2023, 12.0))
+
+        self.assertEqual((row['entreprise'], row['exercice']), ('SOC1', 2023))
+        self.assertEqual(row['roe'], 12.0)
+        self.assertEqual(row['score_liquidite'], 25.0)
+        self.assertNotIn('libelle', row)
+
+    def test_unidentified_analysis_is_not_recorded(self):
+        """Test sans entreprise ou sans exercice : ni le nom du fichier ni la date ne les remplacent"""
+        result = AnalysisResult({}, {}, {'global': 50},
+                                {'fichier_nom': 'bilan_soc2.xlsx', 'date_analyse': '2024-03-01 10:00:00'})
+        self.assertIsNone(history_row(result))
+        self.assertIsNone(history_row(AnalysisResult({}, {}, {'global': 50}, {'entreprise': 'SOC2'})))
+        self.assertIsNone(history_row(AnalysisResult({}, {}, {'global': 50}, {'exercice': 2024})))
+        self.assertFalse(self.history.record(result))
+
+        row = history_row(AnalysisResult({}, {}, {'global': 50}, {'entreprise': ' SOC2 ', 'exercice': '2024'}))
+        self.assertEqual((row['entreprise'], row['exercice']), ('SOC2', 2024))
+
+    def test_company_history_sorted_and_upserted(self):
+        """Test d'une ligne par entreprise-exercice, triée par exercice"""
+        self.history.record(make_result('SOC1', 2023, 12.0))
+        self.history.record(make_result('SOC1', 2021, 8.0))
+        self.history.record(make_result('SOC1', 2023, 15.0))
+        self.history.record(make_result('SOC2', 2023, 3.0))
+
+        history = self.history.company_history('SOC1')
+        self.assertEqual(history['exercice'].tolist(), [2021, 2023])
+        self.assertEqual(history['roe'].tolist(), [8.0, 15.0])
+
+    def test_bulk_insert_and_range_query(self):
+        """Test de l'insertion en masse et de la recherche par plage de ratio"""
+        frame = pd.DataFrame({
+            'entreprise': [f"E{i}" for i in range(100)],
+            'exercice': 2023,
+            'secteur': ['commerce' if i % 2 else 'industrie' for i in range(100)],
+            'roe': [float(i) for i in range(100)],
+            'nouveau_ratio': [None] * 99 + [1.0]
+        })
+        self.assertEqual(self.history.record_frame(frame), 100)
+        self.history.ensure_ratio_index('roe')
+
+        result = self.history.query(secteur='commerce', ranges={'roe': (10, 20)}, columns=['roe'])
+        self.assertEqual(result['roe'].tolist(), [11.0, 13.0, 15.0, 17.0, 19.0])
+        self.assertTrue(self.history.query(ranges={'inconnu': (0, None)}).empty)
+        self.assertEqual(self.history.cache_info()['lignes'], 100)
+
+    def test_persistence(self):
+        """Test de la relecture après réouverture de la base"""
+        self.history.record(make_result('SOC1', 2023, 12.0))
+        reopened = AnalysisHistory(self.history.db_path)
+
+        self.assertEqual(reopened.company_history('SOC1', columns=['roe'])['roe'].tolist(), [12.0])
+        reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
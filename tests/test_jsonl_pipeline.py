@@ -0,0 +1,87 @@
+"""
+Tests unitaires pour la notation en flux JSON Lines (modules/core/jsonl_pipeline.py)
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.analyzer import get_financial_analyzer
+from modules.core.jsonl_pipeline import normalize_statement, run_pipeline, score_lines
+from modules.core.recommendations import DEFAULT_RECOMMENDATION, recommend
+from modules.core.scoring import score_ratios
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'assets', 'sample_data.json')
+
+
+class TestJsonlPipeline(unittest.TestCase):
+    """Tests pour le pipeline stdin -> stdout"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        with open(SAMPLE_PATH, encoding='utf-8') as f:
+            self.sample = json.load(f)
+        self.flat = {'entreprise': 'SOC1', 'secteur': 'commerce', 'total_actif': 1000000,
+                     'capitaux_propres': 200000, 'dettes_court_terme': 300000, 'stocks': 100000,
+                     'tresorerie': 50000, 'chiffre_affaires': 2000000, 'resultat_net': -10000}
+
+    def test_normalize_both_shapes(self):
+        """Test de la lecture du format sample_data.json et du format à plat"""
+        data, metadata = normalize_statement(self.sample)
+        self.assertEqual(data['total_actif'], 592000000)
+        self.assertEqual(data['dettes_court_terme'], 139000000)
+        self.assertEqual(metadata['entreprise'], "Société d'Exemple SARL")
+
+        data, metadata = normalize_statement(self.flat)
+        self.assertEqual(data['chiffre_affaires'], 2000000)
+        self.assertEqual(metadata, {'entreprise': 'SOC1', 'secteur': 'commerce'})
+
+        with self.assertRaises(ValueError):
+            normalize_statement({'entreprise': 'vide'})
+
+    def test_batch_matches_single_analysis(self):
+        """Test que la notation vectorisée d'un lot est identique à l'analyse unitaire"""
+        (line,), errors = score_lines([json.dumps(self.flat)])
+        result = json.loads(line)
+        self.assertEqual(errors, 0)
+
+        ratios = get_financial_analyzer().calculate_ratios(self.flat)
+        scores = score_ratios(ratios)
+        self.assertEqual(result['scores'], scores)
+        self.assertEqual([rec['id'] for rec in result['recommandations']],
+                         [rec['id'] for rec in recommend(ratios, scores)])
+
+    def test_default_recommendation_when_no_rule_fires(self):
+        """Test que le pipeline propose la même suggestion par défaut que l'analyse unitaire"""
+        (line,), _ = score_lines([json.dumps(self.sample)])
+        result = json.loads(line)
+
+        data, _ = normalize_statement(self.sample)
+        analyzer = get_financial_analyzer()
+        ratios = analyzer.calculate_ratios(data)
+        expected = analyzer.generate_recommendations(data, ratios, score_ratios(ratios))
+        self.assertEqual(len(result['recommandations']), len(expected))
+        self.assertEqual([rec['probleme'] for rec in result['recommandations']],
+                         [rec['probleme'] for rec in expected])
+        self.assertEqual(result['recommandations'][0]['id'], DEFAULT_RECOMMENDATION['id'])
+
+    def test_stream_order_and_errors(self):
+        """Test de l'ordre des lignes, des lignes vides et des lignes invalides"""
+        lines = [json.dumps(self.sample) + '\n', '\n', 'pas du json\n'] + [json.dumps(self.flat) + '\n'] * 5
+        output = io.StringIO()
+        stats = run_pipeline(lines, output, batch_size=3)
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([result['ligne'] for result in results], [1, 3, 4, 5, 6, 7, 8])
+        self.assertIn('erreur', results[1])
+        self.assertEqual((stats['lignes'], stats['erreurs'], stats['lots']), (7, 1, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Tests unitaires pour le module norms.py
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core import norms
+from modules.core.norms import NormsRegistry, get_sector_benchmarks
+
+
+class TestNormsRegistry(unittest.TestCase):
+    """Tests pour la classe NormsRegistry"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.write_norms('sectoral_norms', {
+            'commerce': {'liquidite_generale': {'q1': 1.1, 'median': 1.5, 'q3': 2.2}},
+            'metadata': {'version': '1.0'}
+        })
+        self.write_norms('bceao_norms', {
+            'liquidite': {'liquidite_generale': {'min': 1.0, 'optimal': 1.5, 'poids': 25}},
+            'metadata': {'version': '2.0.0'}
+        })
+        self.registry = NormsRegistry(self.temp_dir, check_interval=0)
+
+    def tearDown(self):
+        """Nettoyage après les tests"""
+        shutil.rmtree(self.temp_dir)
+
+    def write_norms(self, name, content, mtime_shift=0):
+        """Écrit un fichier de normes et décale sa date de modification"""
+        path = os.path.join(self.temp_dir, f"{name}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(content, f)
+        if mtime_shift:
+            stat = os.stat(path)
+            os.utime(path, (stat.st_atime, stat.st_mtime + mtime_shift))
+
+    def test_compiled_indexes(self):
+        """Test des index compilés avec les alias de ratios"""
+        snapshot = self.registry.snapshot
+
+        self.assertIn('ratio_liquidite_generale', snapshot.sector_index['commerce'])
+        self.assertNotIn('metadata', snapshot.sector_index)
+        self.assertEqual(snapshot.ratio_index['ratio_liquidite_generale']['categorie'], 'liquidite')
+
+    def test_version_stable_without_change(self):
+        """Test de la stabilité de la version sans modification"""
+        version = self.registry.version
+
+        self.assertEqual(self.registry.refresh(), set())
+        self.assertEqual(self.registry.version, version)
+
+    def test_reload_on_change(self):
+        """Test du rechargement après modification d'un fichier"""
+        version = self.registry.version
+        self.write_norms('sectoral_norms', {
+            'commerce': {'liquidite_generale': {'q1': 1.0, 'median': 1.4, 'q3': 2.0}}
+        }, mtime_shift=10)
+
+        changed = self.registry.refresh()
+
+        self.assertEqual(changed, {'sectoral_norms'})
+        self.assertNotEqual(self.registry.version, version)
+        self.assertEqual(self.registry.snapshot.sector_index['commerce']['ratio_liquidite_generale']['median'], 1.4)
+
+    def test_invalidation_limited_to_dependents(self):
+        """Test de l'invalidation sélective des résultats mémorisés"""
+        calls = {'sector': 0, 'bceao': 0}
+
+        def compute_sector():
+            calls['sector'] += 1
+            return calls['sector']
+
+        def compute_bceao():
+            calls['bceao'] += 1
+            return calls['bceao']
+
+        self.registry.memoized(('sector',), ['sectoral_norms'], compute_sector)
+        self.registry.memoized(('bceao',), ['bceao_norms'], compute_bceao)
+
+        self.write_norms('sectoral_norms', {'btp': {}}, mtime_shift=10)
+        self.registry.refresh()
+
+        self.assertEqual(self.registry.memoized(('sector',), ['sectoral_norms'], compute_sector), 2)
+        self.assertEqual(self.registry.memoized(('bceao',), ['bceao_norms'], compute_bceao), 1)
+
+    def test_app_sector_ids_follow_file_edits(self):
+        """Test des identifiants de secteur de l'application : une modification du fichier change leur référence"""
+        previous, norms._registry = norms._registry, self.registry
+        try:
+            self.assertEqual(get_sector_benchmarks('commerce_detail')['ratio_liquidite_generale']['median'], 1.5)
+            self.write_norms('sectoral_norms', {
+                'commerce': {'liquidite_generale': {'q1': 1.0, 'median': 1.4, 'q3': 2.0}},
+                'commerce_gros': {'liquidite_generale': {'q1': 0.9, 'median': 1.2, 'q3': 1.8}}
+            }, mtime_shift=10)
+            self.registry.refresh()
+
+            self.assertEqual(get_sector_benchmarks('commerce_detail')['ratio_liquidite_generale']['median'], 1.4)
+            self.assertEqual(get_sector_benchmarks('commerce_gros')['ratio_liquidite_generale']['median'], 1.2)
+            self.assertEqual(get_sector_benchmarks('construction_btp'), {})
+        finally:
+            norms._registry = previous
+
+    def test_invalid_file_keeps_previous_version(self):
+        """Test de la conservation des normes précédentes si le fichier est invalide"""
+        version = self.registry.version
+        path = os.path.join(self.temp_dir, 'sectoral_norms.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"commerce": ')
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        self.assertEqual(self.registry.refresh(), set())
+        self.assertEqual(self.registry.version, version)
+        self.assertIn('commerce', self.registry.snapshot.sector_index)
+
+
+if __name__ == '__main__':
+    unittest.main()
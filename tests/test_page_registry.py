@@ -0,0 +1,86 @@
+"""
+Tests unitaires pour le registre de pages (modules/pages/registry.py) et la mesure des imports
+"""
+
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.pages.registry import PageRegistry, import_timings
+from modules.core.import_profile import parse_importtime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestPageRegistry(unittest.TestCase):
+    """Tests pour le chargement des pages à la demande"""
+
+    def setUp(self):
+        """Configuration initiale des tests : deux modules de page temporaires"""
+        self.tmp = tempfile.TemporaryDirectory()
+        for name, body in (('page_lente_test', "def show():\n    return 'lente'\n"),
+                           ('page_cassee_test', "import module_inexistant_test\n")):
+            with open(os.path.join(self.tmp.name, f"{name}.py"), 'w') as f:
+                f.write(body)
+        sys.path.insert(0, self.tmp.name)
+
+        self.registry = PageRegistry()
+        self.registry.register('lente', 'page_lente_test:show')
+        self.registry.register('repli', 'page_cassee_test:show', 'page_lente_test:show')
+        self.registry.register('absente', 'page_absente_test:show')
+
+    def tearDown(self):
+        sys.path.remove(self.tmp.name)
+        for name in ('page_lente_test', 'page_cassee_test'):
+            sys.modules.pop(name, None)
+        self.tmp.cleanup()
+
+    def test_not_imported_before_load(self):
+        """Test qu'une page n'est importée qu'au chargement"""
+        self.assertTrue(self.registry.is_available('lente'))
+        self.assertFalse(self.registry.is_available('absente'))
+        show = self.registry.available_pages()['lente']
+        self.assertNotIn('page_lente_test', sys.modules)
+
+        self.assertEqual(show(), 'lente')
+        self.assertIn('page_lente_test', sys.modules)
+        self.assertIn('page_lente_test:show', import_timings())
+
+    def test_fallback_order(self):
+        """Test du repli sur le point d'entrée suivant si l'import échoue"""
+        self.assertEqual(self.registry.load('repli')(), 'lente')
+        self.assertIsNone(self.registry.load('absente'))
+        with self.assertRaises(ImportError):
+            self.registry.entry_point('absente')()
+
+    def test_pages_package_is_lazy(self):
+        """Test que l'import du paquet des pages ne charge ni les pages ni plotly/reportlab/pandas"""
+        code = ("import sys, modules.pages as p; "
+                "assert sorted(p.get_available_pages()) == ['analysis', 'excel_import', 'home', 'manual_input', 'reports']; "
+                "loaded = [m for m in ('modules.pages.reports', 'modules.pages.analysis', 'plotly', 'reportlab', 'pandas') "
+                "if m in sys.modules]; "
+                "print(','.join(loaded))")
+        completed = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                                   capture_output=True, text=True, timeout=60)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertEqual(completed.stdout.strip(), '')
+
+    def test_parse_importtime(self):
+        """Test de l'analyse de la sortie -X importtime"""
+        output = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |     _io\n"
+                  "import time:      2000 |       5000 | pandas\n")
+        rows = parse_importtime(output)
+
+        self.assertEqual([row['module'] for row in rows], ['_io', 'pandas'])
+        self.assertEqual(rows[1]['cumulative_ms'], 5.0)
+        self.assertEqual((rows[0]['profondeur'], rows[1]['profondeur']), (2, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests unitaires pour l'entrepôt Parquet des analyses (modules/core/parquet_store.py)
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.analysis_result import AnalysisResult
+from modules.core.parquet_store import write_analyses, read_analyses, read_ratios_frame, analysis_parquet_bytes
+from modules.core.scoring import score_frame
+
+
+def make_result(entreprise, exercice, secteur, roe, **metadata):
+    """Résultat d'analyse minimal"""
+    return AnalysisResult(
+        {'total_actif': 1000000, 'libelle': 'Bilan'},
+        {'roe': roe, 'ratio_liquidite_generale': 1.5},
+        {'global': 60, 'liquidite': 25},
+        {'entreprise': entreprise, 'exercice': exercice, 'secteur': secteur, **metadata}
+    )
+
+
+class TestParquetStore(unittest.TestCase):
+    """Tests pour l'export et la relecture Parquet"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, 'entrepot')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test de la reconstitution fidèle d'une analyse"""
+        original = make_result('SOC1', 2023, 'commerce', 12.5, source='import_excel', notes=['a', 'b'])
+        write_analyses([original], self.root)
+
+        (result,) = list(read_analyses(self.root))
+        self.assertEqual(result.ratios, {'roe': 12.5, 'ratio_liquidite_generale': 1.5})
+        self.assertEqual(result.data['libelle'], 'Bilan')
+        self.assertEqual(result.scores['global'], 60)
+        self.assertEqual(result.metadata['notes'], ('a', 'b'))
+        self.assertEqual(result.metadata['secteur'], 'commerce')
+        self.assertEqual(result.timestamp, original.timestamp)
+
+    def test_partitions_and_appends(self):
+        """Test du partitionnement exercice/secteur et des exports successifs"""
+        write_analyses([make_result('SOC1', 2023, 'commerce', 10.0), make_result('SOC2', 2024, 'commerce', 8.0)],
+                       self.root)
+        # Export ultérieur avec une colonne supplémentaire et un secteur vide
+        extra = AnalysisResult({}, {'marge_nette': 4.0}, {'global': 30}, {'entreprise': 'SOC3', 'exercice': 2024})
+        stats = write_analyses([extra], self.root)
+        self.assertEqual(stats['analyses'], 1)
+
+        self.assertTrue(os.path.isdir(os.path.join(self.root, 'exercice=2023', 'secteur=commerce')))
+        self.assertEqual([r.metadata['entreprise'] for r in read_analyses(self.root, exercice=2023)], ['SOC1'])
+        self.assertEqual(len(list(read_analyses(self.root, secteur='commerce'))), 2)
+        self.assertEqual(sorted(r.metadata['secteur'] for r in read_analyses(self.root, exercice=2024)),
+                         ['', 'commerce'])
+
+        frame = read_ratios_frame(self.root)
+        self.assertEqual(len(frame), 3)
+        self.assertIn('marge_nette', frame.columns)
+        self.assertEqual(len(score_frame(frame)), 3)
+
+    def test_missing_exercice_not_guessed(self):
+        """Test qu'un exercice absent ou non numérique n'est pas remplacé par l'année de l'analyse"""
+        from modules.core.history import history_row
+
+        sans = AnalysisResult({}, {'roe': 5.0}, {'global': 40},
+                              {'entreprise': 'SOC4', 'date_analyse': '2026-01-15 09:00:00'})
+        decale = AnalysisResult({}, {'roe': 6.0}, {'global': 45}, {'entreprise': 'SOC5', 'exercice': '2023/2024'})
+        write_analyses([sans, decale], self.root)
+
+        results = {r.metadata['entreprise']: r for r in read_analyses(self.root)}
+        self.assertNotIn('exercice', results['SOC4'].metadata)
+        self.assertIsNone(history_row(results['SOC4']))
+        self.assertEqual(results['SOC5'].metadata['exercice'], '2023/2024')
+        self.assertEqual(list(read_analyses(self.root, exercice=2026)), [])
+
+    def test_single_file_bytes(self):
+        """Test du fichier Parquet d'une seule analyse"""
+        self.assertTrue(analysis_parquet_bytes(make_result('SOC1', 2023, 'commerce', 10.0)).startswith(b'PAR1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
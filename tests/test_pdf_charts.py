@@ -0,0 +1,69 @@
+"""
+Tests unitaires pour les graphiques vectoriels des rapports PDF (modules/core/pdf_charts.py)
+"""
+
+import unittest
+import sys
+import os
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.graphics.shapes import Drawing, Line
+
+from modules.core.pdf_charts import (
+    score_gauge_drawing, category_bars_drawing, balance_structure_drawing,
+    sector_positioning_drawing, sector_rows
+)
+from modules.core.pdf_reports import render_pdf, detailed_report_story
+
+
+class TestPdfCharts(unittest.TestCase):
+    """Tests pour les gabarits de graphiques des rapports"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.data = {
+            'total_actif': 800000, 'immobilisations_nettes': 300000, 'total_actif_circulant': 400000,
+            'tresorerie': 100000, 'capitaux_propres': 350000, 'dettes_financieres': 200000,
+            'dettes_court_terme': 250000
+        }
+        self.ratios = {'ratio_liquidite_generale': 1.6, 'marge_nette': 5.0, 'roe': 30.0}
+        self.scores = {'global': 64, 'liquidite': 25, 'solvabilite': 30, 'rentabilite': 12,
+                       'activite': 9, 'gestion': 14}
+
+    def test_static_part_shared_between_companies(self):
+        """Test que la partie fixe d'un gabarit est partagée et seules les séries changent"""
+        low, high = score_gauge_drawing(10), score_gauge_drawing(90)
+
+        self.assertIs(low.contents[0], high.contents[0])
+        needles = [next(shape for shape in drawing.contents if isinstance(shape, Line)) for drawing in (low, high)]
+        self.assertLess(needles[0].x2, needles[1].x2)
+
+        self.assertIs(category_bars_drawing(self.scores).contents[0],
+                      category_bars_drawing({'global': 20}).contents[0])
+
+    def test_sector_positioning(self):
+        """Test du positionnement sectoriel (ratios avec référence uniquement)"""
+        benchmarks = {'roe': {'q1': 5, 'median': 12, 'q3': 20}, 'rotation_stocks': {'q1': 4, 'median': 6, 'q3': 12}}
+        self.assertEqual(sector_rows(self.ratios, benchmarks), (('roe', 5.0, 12.0, 20.0),))
+
+        self.assertIsInstance(sector_positioning_drawing(self.ratios, 'commerce_detail'), Drawing)
+        self.assertIsNone(sector_positioning_drawing(self.ratios, 'secteur_inconnu'))
+
+    def test_charts_embedded_in_report(self):
+        """Test de la mise en page des graphiques dans le rapport détaillé"""
+        story = detailed_report_story(self.data, self.ratios, self.scores, {'secteur': 'commerce_detail'})
+        drawings = [flowable for flowable in story if isinstance(flowable, Drawing)]
+        self.assertEqual(len(drawings), 4)
+
+        pdf, pages = render_pdf(story)
+        self.assertTrue(pdf.startswith(b'%PDF'))
+        self.assertGreaterEqual(pages, 2)
+
+        # Bilan vide : le graphique est produit sans division par zéro
+        self.assertIsInstance(balance_structure_drawing({}), Drawing)
+
+
+if __name__ == '__main__':
+    unittest.main()
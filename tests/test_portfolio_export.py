@@ -0,0 +1,79 @@
+"""
+Tests unitaires pour l'export Excel du portefeuille (modules/core/portfolio_export.py)
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import openpyxl
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.history import AnalysisHistory
+from modules.core.portfolio_export import SUMMARY_SHEET, export_history, split_columns
+
+
+class TestPortfolioExport(unittest.TestCase):
+    """Tests pour l'export du portefeuille en flux"""
+
+    def setUp(self):
+        """Configuration initiale des tests : trois entreprises dans l'historique"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history = AnalysisHistory(os.path.join(self.tmp.name, 'historique.db'))
+        self.history.record_rows([
+            {'entreprise': f'SOC{i}', 'exercice': 2024, 'secteur': 'commerce' if i < 2 else 'industrie',
+             'score_global': 50 + i, 'score_liquidite': 20.0 + i,
+             'ratio_liquidite_generale': 1.5 + i, 'roe': 12.5, 'rotation_actif': None}
+            for i in range(3)
+        ])
+        self.output = os.path.join(self.tmp.name, 'portefeuille.xlsx')
+
+    def tearDown(self):
+        self.history.close()
+        self.tmp.cleanup()
+
+    def test_iter_rows_streams_filtered_rows(self):
+        """Test du parcours en flux de l'historique"""
+        rows = list(self.history.iter_rows(secteur='commerce', fetch_size=1))
+
+        self.assertEqual([row['entreprise'] for row in rows], ['SOC0', 'SOC1'])
+        self.assertEqual(rows[1]['ratio_liquidite_generale'], 2.5)
+        self.assertEqual(list(self.history.iter_rows(ranges={'inconnu': (0, 1)})), [])
+
+    def test_numeric_cells_and_category_sheets(self):
+        """Test des cellules numériques, des formats et des feuilles par catégorie"""
+        stats = export_history(self.output, self.history)
+        self.assertEqual(stats['entreprises_exercices'], 3)
+
+        workbook = openpyxl.load_workbook(self.output)
+        self.assertEqual(workbook.sheetnames, [SUMMARY_SHEET, 'Liquidité', 'Rentabilité', 'Activité'])
+
+        liquidite = workbook['Liquidité']
+        self.assertEqual(liquidite['A1'].value, 'Entreprise')
+        self.assertEqual(liquidite['C3'].value, 2.5)
+        self.assertIsInstance(liquidite['C3'].value, float)
+
+        rentabilite = workbook['Rentabilité']
+        self.assertEqual(rentabilite['C1'].value, 'Roe (%)')
+        self.assertEqual(rentabilite['C2'].number_format, '0.00" %"')
+
+        # Valeur manquante : cellule vide
+        self.assertIsNone(workbook['Activité']['C2'].value)
+
+        summary = [row for row in workbook[SUMMARY_SHEET].iter_rows(min_row=2, values_only=True)]
+        self.assertEqual([row[0] for row in summary], ['SOC0', 'SOC1', 'SOC2'])
+
+    def test_split_columns(self):
+        """Test de la séparation des colonnes de ratios et de scores"""
+        ratios, scores = split_columns(self.history.columns)
+
+        self.assertIn('roe', ratios)
+        self.assertNotIn('secteur', ratios)
+        self.assertEqual(scores, ['score_liquidite'])
+
+
+if __name__ == '__main__':
+    unittest.main()
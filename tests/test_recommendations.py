@@ -0,0 +1,66 @@
+"""
+Tests unitaires pour le module recommendations.py
+"""
+
+import unittest
+import sys
+import os
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.recommendations import (
+    build_portfolio_frame, evaluate_rules, recommend, recommend_portfolio
+)
+
+
+class TestRecommendations(unittest.TestCase):
+    """Tests pour le moteur de recommandations"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.fragile = {
+            'ratios': {'ratio_liquidite_generale': 0.9, 'marge_nette': 1.0, 'ratio_autonomie_financiere': 40},
+            'scores': {'liquidite': 10, 'solvabilite': 30, 'rentabilite': 5, 'global': 30}
+        }
+        self.saine = {
+            'ratios': {'ratio_liquidite_generale': 2.1, 'marge_nette': 8.0, 'rotation_stocks': 9},
+            'scores': {'liquidite': 35, 'solvabilite': 35, 'rentabilite': 25, 'activite': 12, 'gestion': 12, 'global': 85}
+        }
+
+    def test_rules_masks(self):
+        """Test de l'évaluation vectorisée des règles"""
+        frame = build_portfolio_frame([self.fragile, self.saine], index=['A', 'B'])
+        masks = evaluate_rules(frame)
+
+        self.assertTrue(masks.loc['A', 'liquidite_critique'])
+        self.assertTrue(masks.loc['A', 'marge_insuffisante'])
+        self.assertFalse(masks.loc['A', 'autonomie_insuffisante'])
+        self.assertFalse(masks.loc['B'].any())
+
+    def test_portfolio_sorted_by_priority(self):
+        """Test de l'ordre des recommandations du portefeuille"""
+        frame = build_portfolio_frame([self.saine, self.fragile], index=['B', 'A'])
+        result = recommend_portfolio(frame)
+
+        self.assertEqual(list(result['entreprise']), ['A', 'A', 'A'])
+        self.assertEqual(list(result['priorite']), ['URGENT', 'MOYEN TERME', 'MOYEN TERME'])
+        self.assertAlmostEqual(result.iloc[0]['valeur'], 0.9)
+
+    def test_missing_values_count_as_zero(self):
+        """Test des valeurs absentes (équivalent de dict.get(cle, 0))"""
+        regles = [rec['id'] for rec in recommend({}, {})]
+
+        self.assertIn('rotation_stocks_lente', regles)
+        self.assertNotIn('charges_personnel_elevees', regles)
+
+    def test_single_company_format(self):
+        """Test du format d'une recommandation unitaire"""
+        recommendations = recommend(self.fragile['ratios'], self.fragile['scores'])
+
+        self.assertEqual(recommendations[0]['probleme'], 'Ratio de liquidité générale critique (0.90)')
+        self.assertNotIn('conditions', recommendations[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
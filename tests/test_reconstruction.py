@@ -0,0 +1,163 @@
+"""
+Tests unitaires pour le module reconstruction.py
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.reconstruction import (
+    IdentitySystem, get_identity_system, reconstruct_frame, reconstruct_record, FOURNI, DEDUIT, INDETERMINE
+)
+
+
+class TestReconstruction(unittest.TestCase):
+    """Tests pour la reconstitution des agrégats manquants"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.bilan_detaille = {
+            'terrains': 100, 'batiments': 200, 'stocks': 50, 'creances_clients': 70,
+            'banques_caisses': 30, 'capital': 150, 'resultat_net_bilan': 20,
+            'emprunts_dettes_financieres': 200, 'fournisseurs_exploitation': 80
+        }
+        # Bilan détaillé complet : toutes les autres lignes saisies à zéro
+        system = get_identity_system()
+        lignes_bilan = [name for identity in system.identities if identity['etat'] == 'bilan'
+                        for name in identity['termes'] if system.is_line[system.field_index[name]]]
+        self.bilan_complet = dict(dict.fromkeys(lignes_bilan, 0), **self.bilan_detaille)
+
+    def test_totals_derived_from_lines(self):
+        """Test de la déduction exacte des totaux à partir des lignes"""
+        values, report = reconstruct_record(self.bilan_complet)
+
+        self.assertEqual(values['immobilisations_nettes'], 300)
+        self.assertEqual(values['capitaux_propres'], 170)
+        self.assertEqual(values['total_actif'], 450)
+        self.assertEqual(values['total_passif'], 450)
+        self.assertIn('total_actif', report['deduits'])
+        self.assertEqual(report['incoherences'], [])
+
+    def test_no_guess_when_undetermined(self):
+        """Test qu'un total seul ne permet pas d'inventer le détail"""
+        values, report = reconstruct_record({'total_actif': 1000000})
+
+        self.assertEqual(values['total_passif'], 1000000)
+        self.assertNotIn('immobilisations_nettes', values)
+        self.assertNotIn('ecart_conversion_actif', values)
+        self.assertIn('immobilisations_nettes', report['indetermines'])
+        self.assertEqual(report['mis_a_zero'], [])
+
+    def test_sparse_input_not_completed_with_zeros(self):
+        """Test que des lignes vides sous un total inconnu ne sont pas mises à zéro"""
+        values, report = reconstruct_record({'chiffre_affaires': 1000, 'resultat_net': 50})
+
+        self.assertNotIn('total_actif', values)
+        self.assertIn('total_actif', report['indetermines'])
+        self.assertNotIn('capitaux_propres', values)
+        self.assertNotIn('valeur_ajoutee', values)
+        self.assertEqual(report['mis_a_zero'], [])
+        self.assertEqual(values['resultat_net_bilan'], 50)
+
+    def test_value_derived_from_zeroed_line_keeps_status(self):
+        """Test qu'une valeur calculée à partir d'une ligne mise à zéro n'est pas présentée comme déduite"""
+        values, report = reconstruct_record({'capital': 100, 'capitaux_propres': 100})
+
+        self.assertIn('resultat_net_bilan', report['mis_a_zero'])
+        self.assertEqual(values['resultat_net'], 0)
+        self.assertIn('resultat_net', report['mis_a_zero'])
+        self.assertNotIn('resultat_net', report['deduits'])
+
+    def test_undetermined_values_stay_missing_after_cleaning(self):
+        """Test que le nettoyage du chargeur ne transforme pas une valeur indéterminée en zéro"""
+        from modules.core.excel_loader import ExcelDataLoader
+
+        loader = ExcelDataLoader()
+        values, report = reconstruct_record({'total_actif': 1000000, 'immobilisations_nettes': None})
+        data = loader._clean_and_validate_data(loader._apply_aggregates({'immobilisations_nettes': None}, values))
+
+        self.assertIn('immobilisations_nettes', report['indetermines'])
+        self.assertNotIn('immobilisations_nettes', data)
+        self.assertEqual(data['total_actif'], 1000000)
+
+    def test_missing_subtotal_derived_from_parent(self):
+        """Test de la déduction d'un sous-total par différence"""
+        data = dict(self.bilan_complet, total_actif=450, banques_caisses=None,
+                    titres_placement=None, valeurs_encaisser=None)
+        values, report = reconstruct_record(data)
+
+        self.assertEqual(values['tresorerie'], 30)
+        self.assertIn('tresorerie', report['deduits'])
+        # La répartition entre les lignes de trésorerie reste inconnue
+        self.assertIn('banques_caisses', report['indetermines'])
+
+    def test_income_statement_cascade(self):
+        """Test de la cascade des soldes intermédiaires de gestion"""
+        values, _ = reconstruct_record({
+            'ventes_marchandises': 1000, 'achats_marchandises': -600, 'variation_stocks_marchandises': 0,
+            'ventes_produits_fabriques': 0, 'travaux_services_vendus': 0, 'produits_accessoires': 0,
+            'charges_personnel': -100, 'excedent_brut': 250
+        })
+
+        self.assertEqual(values['marge_commerciale'], 400)
+        self.assertEqual(values['chiffre_affaires'], 1000)
+        self.assertEqual(values['valeur_ajoutee'], 350)
+
+    def test_incoherence_detected(self):
+        """Test du signalement d'une identité violée"""
+        data = dict(self.bilan_detaille, resultat_net=25)
+        _, report = reconstruct_record(data)
+
+        self.assertIn('resultat_net_bilan', report['incoherences'])
+
+    def test_blank_line_not_used_as_balancing_item(self):
+        """Test qu'une ligne vide sous un total connu n'est pas mise à zéro pour absorber l'écart"""
+        values, report = reconstruct_record(dict(self.bilan_detaille, total_actif=460))
+        self.assertNotIn('ecart_conversion_actif', report['mis_a_zero'])
+        self.assertIn('ecart_conversion_actif', report['indetermines'])
+
+        complet = {name: value for name, value in self.bilan_complet.items() if name != 'ecart_conversion_actif'}
+        values, report = reconstruct_record(dict(complet, total_actif=460))
+        self.assertNotIn('ecart_conversion_actif', report['mis_a_zero'])
+        self.assertEqual(values['ecart_conversion_actif'], 10)
+
+    def test_coupled_unknowns(self):
+        """Test de la résolution exacte de deux inconnues couplées"""
+        system = IdentitySystem([
+            {'nom': 'a', 'etat': 'e', 'type': 'somme', 'total': 't', 'termes': ['x', 'y']},
+            {'nom': 'b', 'etat': 'e', 'type': 'somme', 'total': 'u', 'termes': ['x', '-y']}
+        ])
+        frame = pd.DataFrame({'t': [10.0], 'u': [2.0]})
+        result = reconstruct_frame(frame, fill_blank_lines=False, system=system)
+
+        self.assertAlmostEqual(result['valeurs'].at[0, 'x'], 6)
+        self.assertAlmostEqual(result['valeurs'].at[0, 'y'], 4)
+        self.assertEqual(result['statuts'].at[0, 'x'], DEDUIT)
+        self.assertEqual(result['statuts'].at[0, 't'], FOURNI)
+
+    def test_batch_matches_records(self):
+        """Test que le lot donne le même résultat que chaque entreprise isolée"""
+        records = [
+            self.bilan_detaille,
+            {'total_actif': 1000000},
+            dict(self.bilan_detaille, total_actif=460)
+        ]
+        result = reconstruct_frame(pd.DataFrame(records))
+
+        for row, record in enumerate(records):
+            values, report = reconstruct_record(record)
+            statuts = result['statuts'].iloc[row]
+            self.assertEqual(sorted(report['indetermines']),
+                             sorted(statuts.index[statuts == INDETERMINE]))
+            for name, value in values.items():
+                self.assertTrue(np.isclose(result['valeurs'].iloc[row][name], value))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests unitaires pour le cache des rapports PDF (modules/core/report_cache.py)
+"""
+
+import unittest
+import sys
+import os
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.report_cache import ReportCache, make_report_key
+from modules.core.analysis_result import AnalysisResult, content_hash
+
+
+class TestReportCache(unittest.TestCase):
+    """Tests pour le cache des rapports générés"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.data = {'chiffre_affaires': 1000000, 'total_actif': 500000}
+        self.ratios = {'ratio_liquidite_generale': 1.8}
+        self.scores = {'global': 72}
+        self.metadata = {'secteur': 'commerce_detail'}
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return b'%PDF-1.4 rapport'
+
+    def test_content_hash(self):
+        """Test que l'empreinte dépend du contenu et non de l'ordre des clés ni du figeage"""
+        frozen = AnalysisResult(self.data, self.ratios, self.scores, self.metadata)
+        reordered = dict(reversed(list(self.data.items())))
+
+        reference = content_hash(self.data, self.ratios, self.scores, self.metadata)
+        self.assertEqual(content_hash(frozen.data, frozen.ratios, frozen.scores, frozen.metadata), reference)
+        self.assertEqual(content_hash(reordered, self.ratios, self.scores, self.metadata), reference)
+        self.assertNotEqual(content_hash(self.data, self.ratios, {'global': 71}, self.metadata), reference)
+
+    def test_report_built_once(self):
+        """Test qu'un rapport n'est généré qu'une fois par analyse, type et version de modèle"""
+        cache = ReportCache()
+        key = make_report_key(content_hash(self.data), 'synthese', '1')
+
+        self.assertNotIn(key, cache)
+        self.assertEqual(cache.report(key, self.build), b'%PDF-1.4 rapport')
+        self.assertIn(key, cache)
+        cache.report(key, self.build)
+        self.assertEqual(self.builds, 1)
+
+        cache.report(make_report_key(content_hash(self.data), 'synthese', '2'), self.build)
+        cache.report(make_report_key(content_hash(self.data), 'detaille', '1'), self.build)
+        self.assertEqual(self.builds, 3)
+        self.assertEqual(cache.cache_info()['telechargements_servis'], 1)
+
+    def test_bounded_eviction(self):
+        """Test de l'éviction des rapports les moins récemment servis"""
+        cache = ReportCache(max_entries=10, max_bytes=25)
+        for name in ('a', 'b', 'c'):
+            cache.put((name, 'synthese', '1'), b'x' * 10)
+
+        self.assertNotIn(('a', 'synthese', '1'), cache)
+        self.assertIn(('c', 'synthese', '1'), cache)
+        self.assertEqual(cache.cache_info()['evictions'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
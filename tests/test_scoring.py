@@ -0,0 +1,80 @@
+"""
+Tests unitaires pour le module scoring.py
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.scoring import DEFAULT_SCORING_GRID, score_ratios, score_frame, score_criterion
+
+
+class TestScoring(unittest.TestCase):
+    """Tests pour la grille de notation"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.ratios = {
+            'ratio_liquidite_generale': 1.6,
+            'ratio_liquidite_immediate': 0.7,
+            'bfr_jours_ca': 45,
+            'tresorerie_nette': 0,
+            'ratio_autonomie_financiere': 40,
+            'ratio_endettement': 60,
+            'roe': 12,
+            'roa': 4,
+            'marge_nette': 6,
+            'rotation_actif': 1.2,
+            'delai_recouvrement_clients': 50,
+            'taux_charges_personnel': 45
+        }
+
+    def test_default_grid_bands(self):
+        """Test des tranches de la grille intégrée"""
+        scores = score_ratios(self.ratios, DEFAULT_SCORING_GRID)
+
+        self.assertEqual(scores['liquidite'], 12 + 5 + 7 + 1)
+        self.assertEqual(scores['solvabilite'], 16 + 12)
+        self.assertEqual(scores['rentabilite'], 8 + 6 + 5)
+        self.assertEqual(scores['activite'], 3 + 3)
+        self.assertEqual(scores['gestion'], 4)
+        self.assertEqual(scores['global'], int(sum(v for k, v in scores.items() if k != 'global') * 100 / 140))
+
+    def test_strict_threshold(self):
+        """Test du seuil strict (trésorerie nette > 0)"""
+        critere = DEFAULT_SCORING_GRID['categories']['liquidite']['criteres'][3]
+
+        self.assertEqual(score_criterion(0, critere), 1)
+        self.assertEqual(score_criterion(0.01, critere), 5)
+
+    def test_frame_matches_scalar(self):
+        """Test de l'équivalence entre calcul vectorisé et calcul unitaire"""
+        rng = np.random.default_rng(42)
+        records = []
+        for _ in range(200):
+            records.append({key: float(rng.normal(value, abs(value) + 1))
+                            for key, value in self.ratios.items() if rng.random() < 0.8})
+
+        frame_scores = score_frame(pd.DataFrame(records), DEFAULT_SCORING_GRID)
+
+        for i, record in enumerate(records):
+            expected = score_ratios(record, DEFAULT_SCORING_GRID)
+            for key, value in expected.items():
+                self.assertEqual(frame_scores.iloc[i][key], value)
+
+    def test_weighted_grid(self):
+        """Test du score global avec poids de catégories calibrés"""
+        grid = dict(DEFAULT_SCORING_GRID, poids_categories={'liquidite': 1.0})
+        scores = score_ratios(self.ratios, grid)
+
+        self.assertEqual(scores['global'], int(scores['liquidite'] / 40 * 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
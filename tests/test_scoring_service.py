@@ -0,0 +1,109 @@
+"""
+Tests unitaires pour le service HTTP de notation (modules/core/scoring_service.py)
+"""
+
+import unittest
+import sys
+import os
+import json
+import asyncio
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.jsonl_pipeline import score_statements
+from modules.core.scoring_service import ScoringCoalescer, ServiceOverloaded, create_app
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'assets', 'sample_data.json')
+
+
+async def call(app, method, path, body=b''):
+    """Appel ASGI direct (sans serveur) : (statut, corps JSON)"""
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+             'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+             'query_string': b'', 'headers': [], 'server': ('test', 80), 'client': ('test', 1)}
+    await app(scope, receive, send)
+    return sent[0]['status'], json.loads(b''.join(message.get('body', b'') for message in sent[1:]))
+
+
+class TestScoringService(unittest.TestCase):
+    """Tests pour le regroupement des requêtes et les points d'entrée HTTP"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        with open(SAMPLE_PATH, encoding='utf-8') as f:
+            self.sample = json.load(f)
+        self.statements = [{'entreprise': f"E{i}", 'total_actif': 1000000 * (i + 1), 'capitaux_propres': 300000,
+                            'dettes_court_terme': 200000 * i, 'chiffre_affaires': 900000, 'resultat_net': 5000 * i}
+                           for i in range(5)]
+
+    def test_concurrent_requests_are_coalesced(self):
+        """Test du regroupement : requêtes simultanées notées en un seul lot, résultats identiques"""
+        async def scenario():
+            coalescer = ScoringCoalescer(window_ms=20)
+            await coalescer.start()
+            try:
+                results = await asyncio.gather(*(coalescer.score([statement]) for statement in self.statements))
+                return results, coalescer.stats()
+            finally:
+                await coalescer.close()
+
+        results, stats = asyncio.run(scenario())
+        expected, _ = score_statements(self.statements)
+        self.assertEqual([result[0] for result in results], expected)
+        self.assertEqual(stats['lots'], 1)
+        self.assertEqual(stats['requetes'], 5)
+
+    def test_overload_is_refused(self):
+        """Test de la file bornée : au-delà de la limite, la requête est refusée"""
+        async def scenario():
+            coalescer = ScoringCoalescer(max_queued=2)
+            await coalescer.start()
+            try:
+                with self.assertRaises(ServiceOverloaded):
+                    await coalescer.score(self.statements)
+                return coalescer.stats()
+            finally:
+                await coalescer.close()
+
+        self.assertEqual(asyncio.run(scenario())['refus'], 1)
+
+    def test_http_endpoints(self):
+        """Test des points d'entrée /notation, /notation/lot et /sante"""
+        async def scenario():
+            coalescer = ScoringCoalescer()
+            await coalescer.start()
+            app = create_app(coalescer)
+            try:
+                return [
+                    await call(app, 'POST', '/notation', json.dumps(self.sample).encode()),
+                    await call(app, 'POST', '/notation', b'{pas du json'),
+                    await call(app, 'POST', '/notation/lot', json.dumps({'etats': [self.sample, {'x': 'y'}]}).encode()),
+                    await call(app, 'GET', '/sante'),
+                ]
+            finally:
+                await coalescer.close()
+
+        (status, single), (bad_status, _), (lot_status, lot), (_, health) = asyncio.run(scenario())
+        self.assertEqual(status, 200)
+        self.assertEqual(single['metadata']['entreprise'], "Société d'Exemple SARL")
+        self.assertIn('global', single['scores'])
+        self.assertEqual(bad_status, 400)
+        self.assertEqual(lot_status, 200)
+        self.assertEqual(lot['erreurs'], 1)
+        self.assertEqual(lot['resultats'][0]['scores'], single['scores'])
+        self.assertEqual(health['requetes'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Tests unitaires pour le module session_memory.py
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.session_memory import SessionMemoryAccountant, deep_sizeof, LEDGER_KEY
+
+
+class TestSessionMemory(unittest.TestCase):
+    """Tests pour la comptabilité mémoire des sessions"""
+
+    def test_deep_sizeof(self):
+        """Test de l'estimation de taille profonde"""
+        payload = bytes(200_000)
+
+        self.assertGreaterEqual(deep_sizeof(payload), 200_000)
+        self.assertGreaterEqual(deep_sizeof(memoryview(payload)), 200_000)
+        self.assertGreaterEqual(deep_sizeof({'a': [payload]}), 200_000)
+        self.assertGreaterEqual(deep_sizeof(np.zeros(50_000)), 400_000)
+        self.assertGreaterEqual(deep_sizeof(pd.DataFrame({'x': np.zeros(50_000)})), 400_000)
+        # Un objet partagé n'est compté qu'une fois
+        self.assertLess(deep_sizeof([payload, payload]), 2 * 200_000)
+
+    def test_under_budget_keeps_everything(self):
+        """Test qu'aucune entrée n'est évincée sous le budget"""
+        state = {'current_page': 'home', 'file_content': bytes(100_000)}
+        accountant = SessionMemoryAccountant(budget_bytes=1024 * 1024)
+
+        self.assertEqual(accountant.enforce(state), [])
+        self.assertIn('file_content', state)
+
+    def test_oldest_first_eviction(self):
+        """Test de l'éviction de la plus ancienne entrée volumineuse, avec son groupe"""
+        accountant = SessionMemoryAccountant(budget_bytes=300_000)
+        state = {'current_page': 'home', 'file_content': bytes(200_000),
+                 'file_uploaded': True, 'file_name': 'bilan.xlsx', 'petit': 1}
+        accountant.measure(state)
+        state[LEDGER_KEY]['entries']['file_content']['since'] -= 10
+
+        state['figure_cache'] = bytes(200_000)
+        evicted = accountant.enforce(state)
+
+        self.assertEqual(evicted, ['file_content', 'file_uploaded', 'file_name'])
+        self.assertIn('figure_cache', state)
+        self.assertIn('petit', state)
+        self.assertEqual(state[LEDGER_KEY]['evicted'], 3)
+
+    def test_protected_keys_never_evicted(self):
+        """Test que les clés protégées et les petites entrées sont épargnées"""
+        accountant = SessionMemoryAccountant(budget_bytes=1000)
+        state = {'current_page': 'x' * 200_000, 'flag': True}
+
+        self.assertEqual(accountant.enforce(state), [])
+        self.assertIn('current_page', state)
+
+    def test_report(self):
+        """Test de la synthèse de diagnostic"""
+        accountant = SessionMemoryAccountant(budget_bytes=1024 * 1024)
+        state = {'file_content': bytes(100_000), 'flag': True}
+        report = accountant.report(state)
+
+        self.assertEqual(report['entrees'], 2)
+        self.assertEqual(report['detail'][0]['cle'], 'file_content')
+        self.assertGreater(report['utilisation_pct'], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests unitaires pour l'espace de travail des sessions (session_manager.py)
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.testing.v1 import AppTest
+
+from modules.core import history
+from modules.core.analysis_store import get_analysis_store
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def workspace_app():
+    """Application minimale : crée, ouvre ou retire une analyse selon la session"""
+    import sys
+    import streamlit as st
+    sys.path.insert(0, st.session_state['project_root'])
+
+    from session_manager import SessionManager
+
+    SessionManager.initialize()
+    action = st.session_state.pop('action', None)
+    if action == 'creer':
+        st.session_state['cree'] = SessionManager.store_analysis_results(
+            {'total_actif': 1000}, {'roe': 10.0}, {'global': 70}, {'secteur': 'commerce'})
+    elif action == 'retirer':
+        SessionManager.remove_from_workspace(SessionManager.get_analysis_handle())
+    elif action == 'reinitialiser':
+        SessionManager.reset_application()
+    st.session_state['ouverte'] = SessionManager.get_analysis_handle()
+
+
+class TestSessionWorkspace(unittest.TestCase):
+    """Tests pour le partage des analyses entre sessions"""
+
+    def setUp(self):
+        """Configuration initiale des tests : historique dans un dossier temporaire"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = mock.patch.dict(os.environ, {history.HISTORY_PATH_ENV: os.path.join(self.tmp.name, 'historique.db')})
+        self.env.start()
+        history._history = None
+
+    def tearDown(self):
+        if history._history is not None:
+            history._history.close()
+        history._history = None
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def session(self, action=None, handle=None):
+        app = AppTest.from_function(workspace_app, default_timeout=60)
+        app.session_state['project_root'] = PROJECT_ROOT
+        if handle:
+            app.query_params['analyse'] = handle
+        if action:
+            app.session_state['action'] = action
+        return app.run()
+
+    def act(self, app, action):
+        app.session_state['action'] = action
+        return app.run()
+
+    def test_only_owner_discards_shared_analysis(self):
+        """Test qu'une session ouverte par lien ne supprime pas l'analyse de la session d'origine"""
+        owner = self.session('creer')
+        handle = owner.session_state['cree']
+
+        visitor = self.session(handle=handle)
+        self.assertEqual(visitor.session_state['ouverte'], handle)
+        self.act(visitor, 'retirer')
+        self.assertIsNone(visitor.session_state['ouverte'])
+        self.assertIsNotNone(get_analysis_store().get(handle))
+
+        visitor = self.session(handle=handle)
+        self.act(visitor, 'reinitialiser')
+        self.assertIsNotNone(get_analysis_store().get(handle))
+
+        self.act(owner, 'retirer')
+        self.assertIsNone(get_analysis_store().get(handle))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests unitaires pour le traitement par shards sur fichiers (modules/core/shard_queue.py)
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+
+# Ajouter le dossier parent au path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from modules.core.shard_queue import claim, merge, plan, requeue, run_worker, shard_of, status
+
+
+class TestShardQueue(unittest.TestCase):
+    """Tests pour la répartition, la réservation et la fusion des shards"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.inputs = os.path.join(self.tmp, 'entrees')
+        os.mkdir(self.inputs)
+        for i in range(12):
+            with open(os.path.join(self.inputs, f"e{i:02d}.json"), 'w', encoding='utf-8') as f:
+                json.dump({'entreprise': f"E{i:02d}", 'total_actif': 1000000 + i * 50000, 'capitaux_propres': 400000,
+                           'dettes_court_terme': 150000 + i * 10000, 'chiffre_affaires': 2000000,
+                           'resultat_net': 20000 * (i - 3)}, f)
+        with open(os.path.join(self.inputs, 'invalide.json'), 'w', encoding='utf-8') as f:
+            json.dump({'entreprise': 'sans postes'}, f)
+
+    def merged(self, root, name):
+        output = os.path.join(self.tmp, name)
+        merge(root, output)
+        with open(output, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_plan_is_stable_and_exclusive(self):
+        """Test de la répartition : hachage stable, file existante refusée"""
+        self.assertEqual(shard_of('a/b.xlsx', 16), shard_of('a/b.xlsx', 16))
+        self.assertTrue(all(0 <= shard_of(f"f{i}", 5) < 5 for i in range(50)))
+
+        root = os.path.join(self.tmp, 'file')
+        stats = plan([self.inputs], root, shards=4)
+        self.assertEqual(stats['entrees'], 13)
+        self.assertEqual(status(root)['a_faire'], stats['shards'])
+        with self.assertRaises(ValueError):
+            plan([self.inputs], root, shards=4)
+
+    def test_multiple_processes_merge_deterministically(self):
+        """Test de plusieurs nœuds concurrents : chaque entrée traitée une fois, fusion identique à un nœud seul"""
+        root = os.path.join(self.tmp, 'multi')
+        shards = plan([self.inputs], root, shards=6)['shards']
+        nodes = [subprocess.Popen([sys.executable, '-m', 'modules.core.shard_queue', 'travail',
+                                   '--racine', root, '--noeud', f"noeud{n}"],
+                                  cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+                 for n in range(3)]
+        stats = [json.loads(node.communicate()[0]) for node in nodes]
+        self.assertEqual(sum(stat['entrees'] for stat in stats), 13)
+        self.assertEqual(status(root), {'a_faire': 0, 'en_cours': 0, 'termines': shards})
+
+        single = os.path.join(self.tmp, 'seul')
+        plan([self.inputs], single, shards=2)
+        run_worker(single, 'seul')
+
+        multi_lines, single_lines = self.merged(root, 'multi.jsonl'), self.merged(single, 'seul.jsonl')
+        files = [line['fichier'] for line in multi_lines]
+        self.assertEqual(files, sorted(files))
+        self.assertEqual(files, [line['fichier'] for line in single_lines])
+        self.assertEqual([line.get('scores') for line in multi_lines], [line.get('scores') for line in single_lines])
+        self.assertEqual(sum('erreur' in line for line in multi_lines), 1)
+
+    def test_worker_runs_from_another_directory(self):
+        """Test d'un plan aux chemins relatifs traité par un nœud lancé depuis un autre répertoire"""
+        root = os.path.join(self.tmp, 'ailleurs')
+        saved = os.getcwd()
+        os.chdir(self.tmp)
+        try:
+            plan(['entrees'], root, shards=2)
+        finally:
+            os.chdir(saved)
+
+        elsewhere = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, elsewhere)
+        env = {**os.environ, 'PYTHONPATH': ROOT}
+        completed = subprocess.run([sys.executable, '-m', 'modules.core.shard_queue', 'travail', '--racine', root],
+                                   cwd=elsewhere, env=env, capture_output=True, text=True)
+        self.assertEqual(json.loads(completed.stdout)['erreurs'], 1)
+        lines = self.merged(root, 'ailleurs.jsonl')
+        self.assertTrue(all(os.path.isabs(line['fichier']) for line in lines))
+        self.assertEqual(sum('scores' in line for line in lines), 12)
+
+    def test_requeue_stale_claims(self):
+        """Test de la reprise : seul un shard sans signe de vie retourne dans la file"""
+        root = os.path.join(self.tmp, 'reprise')
+        plan([self.inputs], root, shards=3)
+        stale, alive = claim(root, 'arrete'), claim(root, 'actif')
+        old = time.time() - 3600
+        os.utime(stale, (old, old))
+
+        self.assertEqual(requeue(root, stale_s=600), [stale.stem.split('@')[0]])
+        self.assertTrue(alive.exists())
+        with self.assertRaises(ValueError):
+            merge(root, os.path.join(self.tmp, 'partiel.jsonl'))
+
+
+if __name__ == '__main__':
+    unittest.main()
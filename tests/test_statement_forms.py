@@ -0,0 +1,71 @@
+"""
+Tests unitaires pour les sections de saisie isolées (modules/components/statement_forms.py)
+"""
+
+import unittest
+import sys
+import os
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.testing.v1 import AppTest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def manual_input_app():
+    """Application minimale : la page de saisie manuelle"""
+    import sys
+    import streamlit as st
+    sys.path.insert(0, st.session_state['project_root'])
+
+    from session_manager import SessionManager
+    from modules.pages.manual_input import show_manual_input_page
+
+    SessionManager.initialize()
+    show_manual_input_page()
+
+
+class TestStatementForms(unittest.TestCase):
+    """Tests pour la saisie par formulaires isolés"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.app = AppTest.from_function(manual_input_app, default_timeout=60)
+        self.app.session_state['project_root'] = PROJECT_ROOT
+        self.app.run()
+
+    def submit(self, label_start):
+        for button in self.app.get('form_submit_button'):
+            if button.label.startswith(label_start):
+                return button.click().run()
+        self.fail(f"Bouton {label_start} introuvable")
+
+    def test_values_kept_until_submit(self):
+        """Test que les valeurs saisies ne sont prises en compte qu'à la validation du formulaire"""
+        self.assertFalse(self.app.exception)
+        self.app.number_input(key='immobilisations_0').set_value(1000000)
+        self.app.run()
+        self.assertEqual(self.app.session_state['statement_bilan_0']['total_actif'], 0)
+
+        self.app.number_input(key='immobilisations_0').set_value(1000000)
+        self.app.number_input(key='capital_0').set_value(1000000)
+        self.submit("✅ Valider le bilan")
+        self.assertEqual(self.app.session_state['statement_bilan_0']['total_actif'], 1000000)
+
+    def test_sections_share_validated_values(self):
+        """Test que la validation de la page porte sur toutes les sections validées"""
+        self.app.number_input(key='immobilisations_0').set_value(1000000)
+        self.app.number_input(key='capital_0').set_value(1000000)
+        self.submit("✅ Valider le bilan")
+        self.app.number_input(key='ca_0').set_value(5000000)
+        self.submit("✅ Valider le compte")
+
+        self.assertEqual([e.value for e in self.app.error], [])
+        errors, warnings = self.app.session_state['statement_verdict_0']
+        self.assertEqual(errors, ())
+
+
+if __name__ == '__main__':
+    unittest.main()
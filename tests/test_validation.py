@@ -0,0 +1,82 @@
+"""
+Tests unitaires pour le module validation.py
+"""
+
+import unittest
+import sys
+import os
+
+# Ajouter le dossier parent au path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.core.validation import (
+    build_batch_frame, validate_frame, validate_record, triage, rule_summary
+)
+
+
+class TestValidation(unittest.TestCase):
+    """Tests pour les règles de validation"""
+
+    def setUp(self):
+        """Configuration initiale des tests"""
+        self.equilibree = {
+            'total_actif': 1000000, 'capitaux_propres': 400000, 'dettes_financieres': 300000,
+            'dettes_court_terme': 250000, 'tresorerie_passif': 50000, 'tresorerie': 80000,
+            'chiffre_affaires': 1500000, 'resultat_net': 60000, 'charges_personnel': 300000
+        }
+
+    def test_balanced_record_is_valid(self):
+        """Test d'un bilan équilibré sans anomalie"""
+        errors, warnings = validate_record(self.equilibree)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+
+    def test_balance_tolerance(self):
+        """Test de la tolérance unique sur l'équilibre du bilan"""
+        within = dict(self.equilibree, total_actif=1009000)
+        beyond = dict(self.equilibree, total_actif=1011000)
+
+        self.assertEqual(validate_record(within)[0], [])
+        self.assertEqual(validate_record(beyond)[0], ["Bilan non équilibré (écart: 11,000 FCFA)"])
+
+    def test_error_matrix(self):
+        """Test de la matrice d'erreurs entreprise × règle"""
+        frame = build_batch_frame([
+            self.equilibree,
+            dict(self.equilibree, stocks=-10, resultat_net=-400000),
+            {}
+        ], index=['A', 'B', 'C'])
+        matrix = validate_frame(frame)
+        synthese = triage(matrix)
+
+        self.assertEqual(matrix.shape[0], 3)
+        self.assertFalse(matrix.loc['A'].any())
+        self.assertTrue(matrix.loc['B', 'stocks_negatif'])
+        self.assertTrue(matrix.loc['B', 'perte_importante'])
+        self.assertTrue(matrix.loc['C', 'total_actif_invalide'])
+        self.assertEqual(list(synthese['valide']), [True, False, False])
+        self.assertEqual(rule_summary(matrix).loc['total_actif_invalide', 'entreprises'], 1)
+
+    def test_personnel_warnings_are_exclusive(self):
+        """Test des charges de personnel : un seul avertissement selon le niveau"""
+        matrix = validate_frame(build_batch_frame([
+            dict(self.equilibree, charges_personnel=1300000),
+            dict(self.equilibree, charges_personnel=1600000)
+        ], index=['eleve', 'superieur']))
+
+        self.assertTrue(matrix.loc['eleve', 'charges_personnel_elevees'])
+        self.assertFalse(matrix.loc['eleve', 'charges_personnel_superieures_ca'])
+        self.assertTrue(matrix.loc['superieur', 'charges_personnel_superieures_ca'])
+        self.assertFalse(matrix.loc['superieur', 'charges_personnel_elevees'])
+
+    def test_category_filter(self):
+        """Test de la restriction aux règles du bilan"""
+        matrix = validate_frame(build_batch_frame([{}]), categories=['bilan'])
+
+        self.assertIn('bilan_desequilibre', matrix.columns)
+        self.assertNotIn('chiffre_affaires_invalide', matrix.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
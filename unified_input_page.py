@@ -5,9 +5,6 @@ Version avec tests de navigation intégrés
 """
 
 import streamlit as st
-import tempfile
-import os
-import time
 from datetime import datetime
 
 # Import du gestionnaire de session centralisé
@@ -17,6 +14,9 @@ except ImportError:
     st.error("❌ Impossible d'importer session_manager.py")
     st.stop()
 
+from modules.components.analysis_progress import show_analysis_progress, show_analysis_error
+from modules.components.company_identity import show_company_identity_inputs
+
 def show_unified_input_page():
     """Affiche la page unifiée de saisie des données"""
     
@@ -301,91 +301,43 @@ def display_uploaded_file_section():
         key="secteur_selection"
     )
     
+    # Identification (clé de l'historique)
+    st.markdown("### 🏢 Entreprise et Exercice")
+    identity = show_company_identity_inputs("unified")
+    
     # Bouton d'analyse
     st.markdown("### 🚀 Lancement de l'Analyse")
     
+    show_analysis_error()
+    
     if not st.session_state.get('analysis_running', False):
         if st.button("🔍 Analyser le Fichier", 
                     key="analyze_file_btn", 
                     type="primary", 
                     use_container_width=True):
-            st.session_state['analysis_running'] = True
             analyze_uploaded_file(
                 st.session_state['file_content'],
                 st.session_state['file_name'],
-                secteur
+                secteur,
+                identity
             )
     else:
-        st.info("🔄 Analyse en cours... Veuillez patienter.")
-        # Simuler une barre de progression
-        progress_bar = st.progress(0)
-        for i in range(100):
-            time.sleep(0.01)
-            progress_bar.progress(i + 1)
+        st.info("🔄 Analyse en cours... Vous pouvez continuer à consulter la page.")
+        # Progression réelle par étape, puis navigation vers l'analyse
+        show_analysis_progress('analysis')
 
-def analyze_uploaded_file(file_content, filename, secteur):
-    """Analyse le fichier uploadé"""
+def analyze_uploaded_file(file_content, filename, secteur, identity=None):
+    """Soumet l'analyse du fichier uploadé au pool d'arrière-plan"""
     
-    with st.spinner("📊 Extraction et analyse des données en cours..."):
-        temp_file_path = None
-        
-        try:
-            # Créer un fichier temporaire
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                tmp_file.write(file_content)
-                temp_file_path = tmp_file.name
-            
-            # Importer l'analyseur
-            try:
-                from modules.core.analyzer import FinancialAnalyzer
-            except ImportError as e:
-                st.error(f"❌ Impossible d'importer FinancialAnalyzer: {e}")
-                st.session_state['analysis_running'] = False
-                return
-            
-            # Analyser le fichier
-            analyzer = FinancialAnalyzer()
-            data = analyzer.load_excel_template(temp_file_path)
-            
-            if data is None:
-                st.error("❌ Erreur lors du chargement du fichier Excel")
-                st.error("Vérifiez que le fichier contient les feuilles 'Bilan' et 'CR'")
-                st.session_state['analysis_running'] = False
-                return
-            
-            # Calculer les ratios et scores
-            ratios = analyzer.calculate_ratios(data)
-            scores = analyzer.calculate_score(ratios, secteur)
-            
-            # Stocker les résultats
-            metadata = {
-                'secteur': secteur,
-                'fichier_nom': filename,
-                'source': 'excel_import_unified'
-            }
-            
-            store_analysis(data, ratios, scores, metadata)
-            
-            # Mettre à jour l'état
-            st.session_state['analysis_running'] = False
-            st.session_state['analysis_completed'] = True
-            st.session_state['analysis_just_completed'] = True
-            
-            st.success("✅ Analyse terminée avec succès!")
-            st.balloons()
-            st.rerun()
-            
-        except Exception as e:
-            st.error(f"❌ Erreur lors de l'analyse: {str(e)}")
-            st.session_state['analysis_running'] = False
-            
-        finally:
-            # Nettoyer le fichier temporaire
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
+    try:
+        SessionManager.submit_excel_analysis(file_content, filename, secteur, source='excel_import_unified',
+                                             identity=identity)
+    except Exception as e:
+        st.error(f"❌ Erreur lors de l'analyse: {str(e)}")
+        st.session_state['analysis_running'] = False
+        return
+    
+    st.rerun()
 
 def display_manual_input_section():
     """Section de saisie manuelle"""